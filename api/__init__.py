@@ -1,8 +1,19 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from api.routes import ui_bridge, files, ai, espocrm_bridge
+from api.routes import ui_bridge, files, ai, espocrm_bridge, invoices, metrics
+from api.middleware.auth import close_auth_client
+from api.middleware.compression import CompressionMiddleware
+from api.responses import FastJSONResponse
+from config.api_settings import SETTINGS
 
-app = FastAPI(title="Fiscal AI Platform")
+app = FastAPI(title="Fiscal AI Platform", default_response_class=FastJSONResponse)
+
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=SETTINGS.compression_min_size,
+    gzip_level=SETTINGS.gzip_level,
+    brotli_quality=SETTINGS.brotli_quality,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -10,9 +21,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
 app.include_router(ui_bridge.router)
 app.include_router(files.router)
 app.include_router(ai.router)
 app.include_router(espocrm_bridge.router)
+app.include_router(invoices.router)
+app.include_router(metrics.router)
+
+# Client HTTP JWKS partagé, fermé à l'arrêt
+app.router.on_shutdown.append(close_auth_client)
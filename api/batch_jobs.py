@@ -0,0 +1,367 @@
+# api/batch_jobs.py
+"""
+Lots d'extraction asynchrones (POST /invoices/batch).
+
+• Les fichiers d'un lot sont écrits dans un répertoire temporaire dédié,
+  le lot est accepté immédiatement (202) et traité en arrière-plan.
+• Les PDF d'une archive ZIP ne sont jamais extraits sur disque : le feeder
+  lit chaque membre au moment de l'envoi et transmet ses octets au worker.
+• File commune bornée (batch_queue_size) alimentée par un « feeder » par lot ;
+  chaque document réserve d'abord une place du quota de son tenant, si bien
+  qu'un gros import n'occupe jamais plus de batch_tenant_concurrency places.
+• Les workers asyncio délèguent l'extraction à la voie bulk des pools
+  (core/engine/executors.py) : fast_pdf, puis ocr si des champs clés manquent.
+• Chaque résultat est publié comme événement du lot, rejoué puis diffusé en
+  direct par GET /invoices/batch/{id}/events (Server-Sent Events).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import shutil
+import time
+import uuid
+import zipfile
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple, Union
+
+from config.api_settings import SETTINGS
+from core.engine.executors import POOL_FAST_PDF, POOL_OCR, PRIORITY_BULK, get_executor_manager
+from core.observability.metrics import record_document
+from core.observability.tracing import span, trace_context, traced_call
+from modules.ocr.extraction_worker import complete_with_ocr, extract_invoice, needs_ocr
+from modules.ocr.serialization import dumps
+from modules.ocr.zip_ingestion import read_member
+
+logger = logging.getLogger(__name__)
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_COMPLETED = "completed"
+STATUS_CANCELLED = "cancelled"
+
+KEEPALIVE_SECONDS = 15.0
+
+
+class BatchQuotaExceeded(Exception):
+    """Trop de lots actifs pour ce tenant."""
+
+
+@dataclass
+class BatchItem:
+    index: int
+    filename: str
+    path: str                      # PDF uploadé, ou archive contenant le membre
+    member: Optional[str] = None   # membre ZIP, lu en mémoire au moment de l'envoi
+
+
+class BatchJob:
+    """État d'un lot et journal de ses événements (rejouable)."""
+
+    def __init__(self, job_id: str, tenant: str, items: List[BatchItem], directory: str):
+        self.job_id = job_id
+        self.tenant = tenant
+        self.items = items
+        self.directory = directory
+        self.status = STATUS_QUEUED
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.done = 0
+        self.failed = 0
+        self.cancelled = False
+        self.events: List[Dict[str, Any]] = []
+        self._changed = asyncio.Event()
+
+    @property
+    def total(self) -> int:
+        return len(self.items)
+
+    @property
+    def finished(self) -> bool:
+        return self.finished_at is not None
+
+    def emit(self, event: str, data: Dict[str, Any]) -> None:
+        self.events.append({"id": len(self.events) + 1, "event": event, "data": data})
+        # Réveille les abonnés puis arme un nouvel événement pour la suite
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    async def wait_for_events(self, after: int, timeout: float) -> bool:
+        """Attend un événement d'id > after ; False si le délai expire."""
+        changed = self._changed
+        if len(self.events) > after:
+            return True
+        try:
+            await asyncio.wait_for(changed.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "total": self.total,
+            "done": self.done,
+            "failed": self.failed,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class BatchJobManager:
+    """File bornée, quotas par tenant, workers et annulation des lots."""
+
+    def __init__(
+        self,
+        processor: Callable[[Union[str, bytes]], Dict[str, Any]] = extract_invoice,
+        completion: Optional[Callable[[Union[str, bytes], Dict[str, Any]], Dict[str, Any]]] = complete_with_ocr,
+        workers: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        tenant_concurrency: Optional[int] = None,
+        tenant_max_jobs: Optional[int] = None,
+        job_ttl: Optional[float] = None,
+        max_member_bytes: Optional[int] = None,
+    ):
+        self.processor = processor
+        self.completion = completion
+        self.workers = workers or SETTINGS.extract_workers
+        self.queue_size = queue_size or SETTINGS.batch_queue_size
+        self.tenant_concurrency = tenant_concurrency or SETTINGS.batch_tenant_concurrency
+        self.tenant_max_jobs = tenant_max_jobs or SETTINGS.batch_tenant_max_jobs
+        self.job_ttl = job_ttl if job_ttl is not None else SETTINGS.batch_job_ttl
+        self.max_member_bytes = max_member_bytes or SETTINGS.max_upload_mb * 1024 * 1024
+
+        self.jobs: Dict[str, BatchJob] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._worker_tasks: List[asyncio.Task] = []
+        self._feeders: Dict[str, asyncio.Task] = {}
+        self._tenant_slots: Dict[str, asyncio.Semaphore] = {}
+
+    # ------------------------------------------------------------------ #
+    #  CYCLE DE VIE
+    # ------------------------------------------------------------------ #
+    def _ensure_started(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tenant_slots = {}
+        self._worker_tasks = [
+            loop.create_task(self._work(), name=f"batch-worker-{i}") for i in range(self.workers)
+        ]
+        logger.info("🚀 Workers de lots démarrés (%d, file %d)", self.workers, self.queue_size)
+
+    async def shutdown(self) -> None:
+        for job in list(self.jobs.values()):
+            if not job.finished:
+                self.cancel(job.job_id)
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        self._loop = None
+
+    # ------------------------------------------------------------------ #
+    #  SOUMISSION / CONSULTATION / ANNULATION
+    # ------------------------------------------------------------------ #
+    def active_jobs(self, tenant: str) -> int:
+        return sum(1 for job in self.jobs.values() if job.tenant == tenant and not job.finished)
+
+    def queue_depth(self) -> int:
+        """Documents en file commune, en attente d'un worker."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def check_quota(self, tenant: str) -> None:
+        self._purge_expired()
+        if self.active_jobs(tenant) >= self.tenant_max_jobs:
+            raise BatchQuotaExceeded(
+                f"{self.tenant_max_jobs} lot(s) déjà en cours pour ce tenant"
+            )
+
+    def submit(self, tenant: str, items: List[Tuple[str, str, Optional[str]]], directory: str) -> BatchJob:
+        """items : (nom, chemin, membre ZIP ou None) ; le répertoire appartient désormais au lot."""
+        self.check_quota(tenant)
+        self._ensure_started()
+
+        job = BatchJob(
+            job_id=uuid.uuid4().hex,
+            tenant=tenant,
+            items=[BatchItem(i, name, path, member) for i, (name, path, member) in enumerate(items)],
+            directory=directory,
+        )
+        self.jobs[job.job_id] = job
+        job.emit("accepted", job.summary())
+        self._feeders[job.job_id] = self._loop.create_task(self._feed(job))
+        logger.info("📦 Lot %s accepté (%d documents, tenant %s)", job.job_id, job.total, tenant)
+        return job
+
+    def get(self, job_id: str, tenant: Optional[str] = None) -> Optional[BatchJob]:
+        job = self.jobs.get(job_id)
+        if job is None or (tenant is not None and job.tenant != tenant):
+            return None
+        return job
+
+    def cancel(self, job_id: str) -> bool:
+        job = self.jobs.get(job_id)
+        if job is None or job.finished:
+            return False
+        job.cancelled = True
+        feeder = self._feeders.pop(job_id, None)
+        if feeder is not None:
+            feeder.cancel()
+        self._finish(job, STATUS_CANCELLED)
+        logger.info("🛑 Lot %s annulé (%d/%d traités)", job_id, job.done, job.total)
+        return True
+
+    def _finish(self, job: BatchJob, status: str) -> None:
+        job.status = status
+        job.finished_at = time.time()
+        self._feeders.pop(job.job_id, None)
+        shutil.rmtree(job.directory, ignore_errors=True)
+        job.emit("end", job.summary())
+
+    def _purge_expired(self) -> None:
+        now = time.time()
+        for job_id, job in list(self.jobs.items()):
+            if job.finished and now - job.finished_at > self.job_ttl:
+                del self.jobs[job_id]
+
+    def _slots(self, tenant: str) -> asyncio.Semaphore:
+        slots = self._tenant_slots.get(tenant)
+        if slots is None:
+            slots = self._tenant_slots[tenant] = asyncio.Semaphore(self.tenant_concurrency)
+        return slots
+
+    # ------------------------------------------------------------------ #
+    #  TRAITEMENT
+    # ------------------------------------------------------------------ #
+    async def _feed(self, job: BatchJob) -> None:
+        """
+        Pousse les documents du lot dans la file, au rythme du quota du tenant.
+        Les membres ZIP sont lus juste avant l'envoi : seuls les documents en
+        file ou en cours occupent de la mémoire.
+        """
+        slots = self._slots(job.tenant)
+        archives: Dict[str, zipfile.ZipFile] = {}
+        try:
+            for item in job.items:
+                await slots.acquire()
+                try:
+                    payload = item.path
+                    if item.member is not None:
+                        if item.path not in archives:
+                            archives[item.path] = zipfile.ZipFile(item.path)
+                        payload = await asyncio.to_thread(
+                            read_member, archives[item.path], item.member, self.max_member_bytes
+                        )
+                    await self._queue.put((job, item, payload))
+                except asyncio.CancelledError:
+                    slots.release()
+                    raise
+                except Exception as e:
+                    slots.release()
+                    self._record(job, item, {"status": "error", "error": str(e)}, 0.0)
+        finally:
+            for archive in archives.values():
+                archive.close()
+
+    async def _work(self) -> None:
+        executors = get_executor_manager()
+        while True:
+            job, item, payload = await self._queue.get()
+            try:
+                if job.cancelled:
+                    continue
+                if job.status == STATUS_QUEUED:
+                    job.status = STATUS_RUNNING
+
+                start = time.perf_counter()
+                try:
+                    # Span racine du document ici : extraction et complétion OCR,
+                    # dans deux processus, restent dans la même trace
+                    with span("invoice.document", {"document.name": item.filename,
+                                                   "batch.job_id": job.job_id}):
+                        context = trace_context()
+                        # Voie bulk : les uploads unitaires passent devant. Les workers
+                        # étant en nombre fixe, ils attendent leur tour (block=True)
+                        result = await executors.run(POOL_FAST_PDF, traced_call, self.processor,
+                                                     context, payload, priority=PRIORITY_BULK, block=True)
+                        if self.completion is not None and needs_ocr(result):
+                            result = await executors.run(POOL_OCR, traced_call, self.completion, context,
+                                                         payload, result, priority=PRIORITY_BULK, block=True)
+                    data = {"status": "completed", "result": result}
+                except Exception as e:
+                    logger.error("❌ Erreur extraction '%s' (lot %s): %s", item.filename, job.job_id, e)
+                    data = {"status": "error", "error": str(e)}
+                del payload
+
+                if item.member is None:
+                    try:
+                        os.unlink(item.path)
+                    except OSError:
+                        pass
+                self._record(job, item, data, (time.perf_counter() - start) * 1000)
+            finally:
+                self._slots(job.tenant).release()
+                self._queue.task_done()
+
+    def _record(self, job: BatchJob, item: BatchItem, data: Dict[str, Any], elapsed_ms: float) -> None:
+        """Publie le résultat d'un document ; clôt le lot au dernier."""
+        if job.cancelled:
+            return
+        job.done += 1
+        job.failed += int(data["status"] == "error")
+        record_document("failed" if data["status"] == "error" else data["result"].get("processing_method"))
+        data.update({
+            "index": item.index,
+            "filename": item.filename,
+            "processing_ms": round(elapsed_ms, 1),
+            "done": job.done,
+            "total": job.total,
+        })
+        job.emit("document", data)
+        if job.done == job.total:
+            self._finish(job, STATUS_COMPLETED)
+
+    # ------------------------------------------------------------------ #
+    #  SERVER-SENT EVENTS
+    # ------------------------------------------------------------------ #
+    async def stream_events(self, job: BatchJob, last_event_id: int = 0) -> AsyncIterator[str]:
+        """Rejoue les événements après last_event_id puis suit le lot jusqu'à « end »."""
+        sent = last_event_id
+        while True:
+            for event in job.events[sent:]:
+                sent = event["id"]
+                yield (
+                    f"id: {event['id']}\n"
+                    f"event: {event['event']}\n"
+                    f"data: {dumps(event['data']).decode('utf-8')}\n\n"
+                )
+                if event["event"] == "end":
+                    return
+            if job.finished:
+                return
+            if not await job.wait_for_events(sent, KEEPALIVE_SECONDS):
+                yield ": keep-alive\n\n"
+
+
+_manager: Optional[BatchJobManager] = None
+
+
+def get_batch_manager() -> BatchJobManager:
+    global _manager
+    if _manager is None:
+        _manager = BatchJobManager()
+    return _manager
+
+
+async def shutdown_batch_manager() -> None:
+    global _manager
+    if _manager is not None:
+        await _manager.shutdown()
+        _manager = None
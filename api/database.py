@@ -0,0 +1,67 @@
+# api/database.py
+"""Bases partagées par les routes (surchargeables via dependency_overrides).
+
+- get_database : DatabaseManager synchrone (routes `def`, threadpool)
+- get_async_database : AsyncDatabaseManager ouvert/fermé par `lifespan`
+Les deux chiffrent avec le SecurityManager du processus.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from config.api_settings import SETTINGS
+from core.security.encryption import get_security_manager
+from data.storage.async_database import AsyncDatabaseManager
+from data.storage.database import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+_database: Optional[DatabaseManager] = None
+_lock = threading.Lock()
+_async_database: Optional[AsyncDatabaseManager] = None
+
+
+def get_database() -> DatabaseManager:
+    # Routes synchrones : premier appel possible depuis plusieurs threads
+    global _database
+    with _lock:
+        if _database is None:
+            _database = DatabaseManager(SETTINGS.database_url, get_security_manager())
+    return _database
+
+
+async def open_async_database(database_url: Optional[str] = None) -> AsyncDatabaseManager:
+    """Ouvre le moteur async du processus (démarrage de l'application)."""
+    global _async_database
+    if _async_database is None:
+        _async_database = await AsyncDatabaseManager.create(
+            database_url or SETTINGS.database_url, get_security_manager()
+        )
+    return _async_database
+
+
+async def close_async_database() -> None:
+    """Libère le pool de connexions async (arrêt de l'application)."""
+    global _async_database
+    if _async_database is not None:
+        database, _async_database = _async_database, None
+        await database.dispose()
+
+
+@asynccontextmanager
+async def lifespan(_app):
+    await open_async_database()
+    try:
+        yield
+    finally:
+        await close_async_database()
+
+
+async def get_async_database() -> AsyncDatabaseManager:
+    if _async_database is None:
+        # Moteur lié à la boucle de l'application : pas d'ouverture paresseuse
+        raise RuntimeError("Base async non ouverte : lifespan absent de l'application")
+    return _async_database
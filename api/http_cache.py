@@ -0,0 +1,73 @@
+# api/http_cache.py
+"""
+Réponses conditionnelles pour les listings interrogés en boucle par l'UI.
+
+• ETag fort dérivé de la version des données (pas du corps) : le 304 est
+  décidé avant toute requête de listing et toute sérialisation
+• If-None-Match : comparaison faible (RFC 9110 §13.1.2), suffixe de
+  compression ignoré (cf. api/middleware/compression.py)
+• Cache-Control « private, no-cache » : le navigateur garde le corps mais
+  revalide à chaque appel
+"""
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Optional
+
+from fastapi import Request, Response
+
+from api.middleware.compression import strip_encoding_suffix
+from modules.ocr.serialization import dumps
+
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """ETag fort : empreinte des éléments qui déterminent la réponse."""
+    digest = hashlib.sha256("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def matching_etag(request: Request, etag: str) -> Optional[str]:
+    """Validateur d'If-None-Match correspondant à etag (tel qu'envoyé), sinon None."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return None
+    if header.strip() == "*":
+        return etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if strip_encoding_suffix(candidate.removeprefix("W/")) == etag:
+            return candidate
+    return None
+
+
+def not_modified(etag: str) -> Response:
+    # Le 304 renvoie le validateur du client : même ETag que la représentation en cache
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+
+def json_response(content: Any, etag: str) -> Response:
+    return Response(
+        content=dumps(content),
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL},
+    )
+
+
+class StaticJSON:
+    """Corps JSON constant : sérialisé et haché une seule fois."""
+
+    def __init__(self, content: Any):
+        self.body = dumps(content)
+        self.etag = make_etag(hashlib.sha256(self.body).hexdigest())
+
+    def respond(self, request: Request) -> Response:
+        matched = matching_etag(request, self.etag)
+        if matched:
+            return not_modified(matched)
+        return Response(
+            content=self.body,
+            media_type="application/json",
+            headers={"ETag": self.etag, "Cache-Control": CACHE_CONTROL},
+        )
@@ -1,12 +1,27 @@
-from fastapi import FastAPI, Header
+from fastapi import FastAPI, Header, Request
 from fastapi.middleware.cors import CORSMiddleware
 from typing import Optional
 import logging
 
-app = FastAPI(title="Fiscal Local API")
+from api.database import lifespan
+from api.http_cache import StaticJSON
+from api.middleware.compression import CompressionMiddleware
+from api.responses import FastJSONResponse
+from api.routes import invoices, metrics
+from config.api_settings import SETTINGS
+
+app = FastAPI(title="Fiscal Local API", default_response_class=FastJSONResponse,
+              lifespan=lifespan)
 logger = logging.getLogger("uvicorn")
 logging.basicConfig(level=logging.INFO)
 
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=SETTINGS.compression_min_size,
+    gzip_level=SETTINGS.gzip_level,
+    brotli_quality=SETTINGS.brotli_quality,
+)
+
 # CORS: autoriser l’UI Vite (5173)
 app.add_middleware(
     CORSMiddleware,
@@ -17,6 +32,9 @@ app.add_middleware(
     expose_headers=["*"],
 )
 
+app.include_router(invoices.router)
+app.include_router(metrics.router)
+
 @app.get("/")
 def root():
     return {"name": "Fiscal Local API", "version": "0.2.0"}
@@ -26,23 +44,27 @@ def ui_ping():
     return "ok"
 
 # --- Endpoints de démo protégé/optionnels -----------------
+_DOSSIERS = StaticJSON({
+    "dossiers": [
+        {"id": "DUBOIS-2024", "title": "Dossier Dubois - 2024"},
+        {"id": "MARTIN-SCI", "title": "Dossier Martin - SCI Valoris"},
+        {"id": "BENALI-TVA", "title": "Dossier Benali - TVA"},
+    ]
+})
+
+_FILES = StaticJSON({
+    "files": [
+        {"name": "Facture-ACME-2024.pdf", "size": 128934, "uploaded_at": "2025-08-01T10:40:00Z"},
+        {"name": "Releve-Banque-Juin.csv", "size": 40960, "uploaded_at": "2025-08-07T09:12:00Z"},
+    ]
+})
+
 @app.get("/espocrm/dossiers")
-def get_dossiers(authorization: Optional[str] = Header(None)):
+def get_dossiers(request: Request, authorization: Optional[str] = Header(None)):
     # Si tu veux exiger un vrai token, décommente la ligne suivante :
     # if not authorization: raise HTTPException(status_code=401, detail="Missing bearer token")
-    return {
-        "dossiers": [
-            {"id": "DUBOIS-2024", "title": "Dossier Dubois - 2024"},
-            {"id": "MARTIN-SCI", "title": "Dossier Martin - SCI Valoris"},
-            {"id": "BENALI-TVA", "title": "Dossier Benali - TVA"},
-        ]
-    }
+    return _DOSSIERS.respond(request)
 
 @app.get("/files/list")
-def files_list(authorization: Optional[str] = Header(None)):
-    return {
-        "files": [
-            {"name": "Facture-ACME-2024.pdf", "size": 128934, "uploaded_at": "2025-08-01T10:40:00Z"},
-            {"name": "Releve-Banque-Juin.csv", "size": 40960, "uploaded_at": "2025-08-07T09:12:00Z"},
-        ]
-    }
+def files_list(request: Request, authorization: Optional[str] = Header(None)):
+    return _FILES.respond(request)
@@ -1,26 +1,134 @@
 # api/middleware/auth.py
 from __future__ import annotations
 
-from typing import Any, Dict, Set
+import asyncio
+import hashlib
+import logging
+import time
+from typing import Any, Dict, Optional, Set, Tuple
 import httpx
-from cachetools import TTLCache
+from cachetools import LRUCache
 from fastapi import Depends, HTTPException, Request, status
 from jose import jwt
 from jose.exceptions import ExpiredSignatureError, JWTError
 from config.keycloak_settings import SETTINGS
 
-# Cache JWKS 5 minutes
-_jwks_cache: TTLCache[str, dict] = TTLCache(maxsize=2, ttl=300)
+logger = logging.getLogger(__name__)
+
+ALGORITHMS = ["RS256", "RS384", "RS512", "PS256", "PS384", "PS512", "ES256", "ES384", "ES512"]
+
+
+class JwksCache:
+    """
+    Clés publiques Keycloak indexées par kid.
+    • un seul client HTTP (pool de connexions) pour tous les rechargements
+    • single-flight : les requêtes concurrentes attendent le même rechargement
+    • rafraîchissement en tâche de fond avant expiration du TTL
+    • kid inconnu (rotation) : rechargement forcé, au plus un par intervalle
+    • Keycloak injoignable : clés en cache servies, nouvel essai après backoff
+    """
+
+    def __init__(self) -> None:
+        self.keys: Dict[Optional[str], dict] = {}
+        self.fetch_count = 0
+        self._fetched_at = 0.0
+        self._last_forced = float("-inf")
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _http_client(self) -> httpx.AsyncClient:
+        # Le pool de connexions appartient à la boucle qui l'a créé
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            self._client = httpx.AsyncClient(
+                timeout=5, limits=httpx.Limits(max_connections=4, max_keepalive_connections=2)
+            )
+            self._loop = loop
+            self._refresh_task = None
+        return self._client
+
+    async def _fetch(self) -> None:
+        try:
+            r = await self._http_client().get(SETTINGS.jwks_url)
+            r.raise_for_status()
+            keys = {k.get("kid"): k for k in r.json().get("keys", [])}
+        except Exception:
+            if self.keys:
+                # Clés périmées servies ; prochain essai (même anticipé) après le backoff
+                self._fetched_at = (time.monotonic() - SETTINGS.jwks_ttl
+                                    + SETTINGS.jwks_refresh_ahead + SETTINGS.jwks_refresh_backoff)
+            raise
+        self.keys = keys
+        self._fetched_at = time.monotonic()
+        self.fetch_count += 1
+
+    def refresh(self) -> asyncio.Task:
+        """Rechargement du JWKS, partagé par tous les appelants en cours."""
+        self._http_client()
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.get_running_loop().create_task(self._fetch())
+            self._refresh_task.add_done_callback(self._log_failure)
+        return self._refresh_task
+
+    @staticmethod
+    def _log_failure(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("⚠️  Rechargement JWKS impossible: %s", task.exception())
+
+    async def _await_refresh(self) -> None:
+        try:
+            # shield : l'annulation d'une requête n'annule pas le rechargement partagé
+            await asyncio.shield(self.refresh())
+        except Exception as e:
+            if not self.keys:
+                raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                                    detail=f"JWKS unavailable: {e}")
+            # Clés précédentes conservées tant que Keycloak ne répond pas
+
+    async def get_key(self, kid: Optional[str]) -> Optional[dict]:
+        age = time.monotonic() - self._fetched_at
+        if not self.keys or age >= SETTINGS.jwks_ttl:
+            await self._await_refresh()
+        elif age >= SETTINGS.jwks_ttl - SETTINGS.jwks_refresh_ahead:
+            self.refresh()
+
+        key = self.keys.get(kid)
+        if key is None and time.monotonic() - self._last_forced >= SETTINGS.jwks_min_refresh_interval:
+            self._last_forced = time.monotonic()
+            await self._await_refresh()
+            key = self.keys.get(kid)
+        return key
+
+    async def aclose(self) -> None:
+        if self._refresh_task is not None and not self._refresh_task.done():
+            self._refresh_task.cancel()
+        if self._client is not None:
+            await self._client.aclose()
+        self._client = None
+        self._loop = None
+        self._refresh_task = None
+
+    def clear(self) -> None:
+        self.keys = {}
+        self._fetched_at = 0.0
+        self._last_forced = float("-inf")
+
+
+_jwks = JwksCache()
+
+# sha256(jeton) -> (payload, instant d'expiration de l'entrée)
+_token_cache: LRUCache[str, Tuple[Dict[str, Any], float]] = LRUCache(maxsize=SETTINGS.token_cache_size)
+
+
+async def close_auth_client() -> None:
+    await _jwks.aclose()
+
+
+def clear_auth_caches() -> None:
+    _token_cache.clear()
+    _jwks.clear()
 
-async def _get_jwks() -> dict:
-    if "jwks" in _jwks_cache:
-        return _jwks_cache["jwks"]
-    async with httpx.AsyncClient(timeout=5) as client:
-        r = await client.get(SETTINGS.jwks_url)
-        r.raise_for_status()
-        jwks = r.json()
-        _jwks_cache["jwks"] = jwks
-        return jwks
 
 def _extract_bearer(request: Request) -> str:
     auth = request.headers.get("Authorization") or request.headers.get("authorization")
@@ -34,31 +142,50 @@ async def verify_token(request: Request) -> Dict[str, Any]:
         return {"skip": True}
 
     token = _extract_bearer(request)
-    jwks = await _get_jwks()
 
-    header = jwt.get_unverified_header(token)
-    kid = header.get("kid")
-    key = None
-    for k in jwks.get("keys", []):
-        if k.get("kid") == kid:
-            key = k
-            break
+    # Jeton déjà vérifié : ni parsing ni vérification RSA
+    token_hash = hashlib.sha256(token.encode()).hexdigest()
+    cached = _token_cache.get(token_hash)
+    if cached is not None:
+        payload, expires_at = cached
+        if time.time() < expires_at:
+            return payload
+        _token_cache.pop(token_hash, None)
+
+    try:
+        header = jwt.get_unverified_header(token)
+    except JWTError as e:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=f"Invalid token: {e}")
+    key = await _jwks.get_key(header.get("kid"))
+    if key is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token: unknown signing key")
 
     try:
         payload = jwt.decode(
             token,
             key,  # JWK dict accepté par python-jose
-            algorithms=["RS256", "RS384", "RS512", "PS256", "PS384", "PS512", "ES256", "ES384", "ES512"],
+            algorithms=ALGORITHMS,
             issuer=SETTINGS.issuer,
-            audience=list(SETTINGS.accepted_audiences) if SETTINGS.accepted_audiences else None,
-            options={"verify_aud": bool(SETTINGS.accepted_audiences)},
-            leeway=SETTINGS.leeway,
+            # python-jose n'accepte qu'une audience : contrôle fait ci-dessous
+            options={"verify_aud": False, "leeway": SETTINGS.leeway},
         )
     except ExpiredSignatureError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token expired")
     except JWTError as e:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=f"Invalid token: {e}")
 
+    if SETTINGS.accepted_audiences:
+        audiences = payload.get("aud") or []
+        if isinstance(audiences, str):
+            audiences = [audiences]
+        if not SETTINGS.accepted_audiences.intersection(audiences):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token: Invalid audience")
+
+    # L'entrée expire avec le jeton (même tolérance d'horloge que decode)
+    expires_at = time.time() + SETTINGS.token_cache_ttl
+    if isinstance(payload.get("exp"), (int, float)):
+        expires_at = min(expires_at, payload["exp"] + SETTINGS.leeway)
+    _token_cache[token_hash] = (payload, expires_at)
     return payload
 
 def _roles_from_payload(payload: Dict[str, Any]) -> Set[str]:
@@ -68,6 +195,10 @@ def _roles_from_payload(payload: Dict[str, Any]) -> Set[str]:
         roles.update(data.get("roles", []) or [])
     return roles
 
+def tenant_of(payload: Dict[str, Any]) -> str:
+    """Tenant du jeton (claim « tenant », sinon le sujet)."""
+    return str(payload.get("tenant") or payload.get("sub") or "default")
+
 def require_roles(*required: str):
     required_set = set(required)
     async def _dep(request: Request, payload: Dict[str, Any] = Depends(verify_token)):
@@ -0,0 +1,109 @@
+# api/middleware/compression.py
+"""
+Compression des réponses : brotli si le client l'accepte et que le module
+est installé, sinon gzip ; rien sous minimum_size (en-têtes > gain).
+
+Un corps compressé est une représentation distincte : son ETag fort reçoit
+le suffixe du codage (« "abc" » → « "abc-br" »), retiré par api/http_cache.py
+pour comparer If-None-Match.
+"""
+from __future__ import annotations
+
+from typing import Set
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.middleware.gzip import GZipResponder, IdentityResponder
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli  # type: ignore
+except ImportError:
+    try:
+        import brotlicffi as brotli  # type: ignore
+    except ImportError:
+        brotli = None
+
+BROTLI_AVAILABLE = brotli is not None
+ENCODINGS = ("br", "gzip")
+
+
+def accepted_encodings(header: str) -> Set[str]:
+    """Codages d'Accept-Encoding, sans ceux refusés par q=0."""
+    accepted = set()
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = params.strip().replace(" ", "")
+        if coding and quality not in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+def strip_encoding_suffix(etag: str) -> str:
+    """ETag d'une représentation compressée → ETag de la ressource."""
+    for encoding in ENCODINGS:
+        suffix = f'-{encoding}"'
+        if etag.endswith(suffix):
+            return etag[: -len(suffix)] + '"'
+    return etag
+
+
+class _EncodedETag:
+    """Suffixe l'ETag quand le responder a effectivement compressé le corps."""
+
+    content_encoding: str
+    content_encoding_set: bool
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        async def send_with_etag(message: Message) -> None:
+            if message["type"] == "http.response.start" and not self.content_encoding_set:
+                headers = MutableHeaders(raw=message["headers"])
+                etag = headers.get("etag")
+                if etag and etag.endswith('"') and headers.get("content-encoding") == self.content_encoding:
+                    headers["ETag"] = f'{etag[:-1]}-{self.content_encoding}"'
+            await send(message)
+
+        await super().__call__(scope, receive, send_with_etag)  # type: ignore[misc]
+
+
+class _GZipResponder(_EncodedETag, GZipResponder):
+    pass
+
+
+class _BrotliResponder(_EncodedETag, IdentityResponder):
+    content_encoding = "br"
+
+    def __init__(self, app: ASGIApp, minimum_size: int, quality: int) -> None:
+        super().__init__(app, minimum_size)
+        self.quality = quality
+        self._compressor = None
+
+    async def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        if self._compressor is None:
+            self._compressor = brotli.Compressor(quality=self.quality)
+        chunk = self._compressor.process(body)
+        return chunk + (self._compressor.flush() if more_body else self._compressor.finish())
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024,
+                 gzip_level: int = 6, brotli_quality: int = 4) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def _responder(self, accept_encoding: str) -> ASGIApp:
+        accepted = accepted_encodings(accept_encoding)
+        if BROTLI_AVAILABLE and "br" in accepted:
+            return _BrotliResponder(self.app, self.minimum_size, self.brotli_quality)
+        if "gzip" in accepted:
+            return _GZipResponder(self.app, self.minimum_size, compresslevel=self.gzip_level)
+        # Corps inchangé, mais Vary: Accept-Encoding pour les caches intermédiaires
+        return IdentityResponder(self.app, self.minimum_size)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        responder = self._responder(Headers(scope=scope).get("accept-encoding", ""))
+        await responder(scope, receive, send)
@@ -0,0 +1,22 @@
+# api/responses.py
+"""
+Réponse JSON commune à l'API : encodage orjson (repli json), dataclasses
+de résultats sérialisées directement.
+
+Une route qui renvoie FastJSONResponse(...) évite aussi jsonable_encoder,
+appliqué par FastAPI à tout dict/list renvoyé tel quel.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from modules.ocr.serialization import dumps
+
+
+class FastJSONResponse(JSONResponse):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -1,17 +1,22 @@
 # api/routes/espocrm.py
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
+from api.http_cache import StaticJSON
 from api.middleware.auth import require_roles
 
 router = APIRouter(prefix="/espocrm", tags=["espocrm"])
 
-@router.get("/dossiers", dependencies=[Depends(require_roles("espocrm.read"))])
-async def get_dossiers() -> dict:
-    # TODO: branchement EspoCRM réel ici
-    dossiers = [
+# TODO: branchement EspoCRM réel ici (ETag à dériver de la date de modification des dossiers)
+_DOSSIERS = StaticJSON({
+    "ok": True,
+    "dossiers": [
         {"id": "DUB-2024", "titre": "Dossier Dubois - 2024"},
         {"id": "MAR-SCI", "titre": "Dossier Martin - SCI Valoris"},
         {"id": "BEN-TVA", "titre": "Dossier Benali - TVA"},
-    ]
-    return {"ok": True, "dossiers": dossiers}
+    ],
+})
+
+@router.get("/dossiers", dependencies=[Depends(require_roles("espocrm.read"))])
+async def get_dossiers(request: Request) -> Response:
+    return _DOSSIERS.respond(request)
@@ -1,26 +1,63 @@
 # api/routes/files.py
 from __future__ import annotations
-from fastapi import APIRouter, Depends
-from typing import Any, Dict, List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from typing import Any, Dict, Optional
+
+from api.database import get_async_database
+from api.http_cache import json_response, make_etag, matching_etag, not_modified
+from data.storage.async_database import AsyncDatabaseManager
+from data.storage.database import MAX_PAGE_SIZE
 
 try:
-    from api.middleware.auth import require_roles  # type: ignore
+    from api.middleware.auth import require_roles, tenant_of  # type: ignore
 except Exception:
     def require_roles(*_roles: str):
         async def _noop() -> Dict[str, Any]:
             return {}
         return _noop
 
+    def tenant_of(_payload: Dict[str, Any]) -> str:
+        return "default"
+
 router = APIRouter(prefix="/files", tags=["files"])
 
 @router.get("/list")
-async def list_files(_: Dict[str, Any] = Depends(require_roles("files.read"))):
+async def list_files(
+    request: Request,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    payload: Dict[str, Any] = Depends(require_roles("files.read")),
+    db: AsyncDatabaseManager = Depends(get_async_database),
+) -> Response:
     """
-    Mock de validation. Remplace ton implémentation qui lisait le disque / DB.
+    Documents du client (plus récents d'abord), pagination par curseur.
+    ETag = version des données du client : 304 sans listing ni sérialisation.
     """
-    return {
+    client_id = tenant_of(payload)
+    # Version lue avant le listing : une écriture concurrente donne au pire
+    # un corps plus récent que son ETag, revalidé au prochain appel
+    version, updated_at = await db.get_data_version(client_id)
+    etag = make_etag("files", client_id, version, updated_at, limit, cursor)
+    matched = matching_etag(request, etag)
+    if matched:
+        return not_modified(matched)
+
+    try:
+        page = await db.list_documents(client_id=client_id, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return json_response({
         "files": [
-            {"name": "Facture Batterie Bosch.pdf", "size": 123456},
-            {"name": "Facture MCA Syno RAM 8G 2024.pdf", "size": 234567},
-        ]
-    }
+            {
+                "id": doc["id"],
+                "name": doc["filename"],
+                "document_type": doc["document_type"],
+                "processing_status": doc["processing_status"],
+                "processed": doc["processed"],
+                "uploaded_at": doc["created_at"].isoformat() if doc["created_at"] else None,
+            }
+            for doc in page["documents"]
+        ],
+        "next_cursor": page["next_cursor"],
+    }, etag)
@@ -0,0 +1,362 @@
+# api/routes/invoices.py
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import shutil
+import tempfile
+import time
+from pathlib import PurePosixPath
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+from api.batch_jobs import BatchQuotaExceeded, get_batch_manager, shutdown_batch_manager
+from api.responses import FastJSONResponse
+from config.api_settings import SETTINGS
+from core.engine.executors import (
+    POOL_FAST_PDF,
+    PRIORITY_INTERACTIVE,
+    ExecutorSaturated,
+    get_executor_manager,
+)
+from core.observability.metrics import record_document
+from modules.ocr.extraction_worker import extract_invoice, shutdown_extraction_executor
+from modules.ocr.zip_ingestion import ZIP_MAGIC, ArchiveTooLarge, list_pdf_members
+
+try:
+    from api.middleware.auth import require_roles, tenant_of  # type: ignore
+except Exception:
+    def require_roles(*_roles: str):
+        async def _noop() -> Dict[str, Any]:
+            return {}
+        return _noop
+
+    def tenant_of(_payload: Dict[str, Any]) -> str:
+        return "default"
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/invoices", tags=["invoices"], default_response_class=FastJSONResponse,
+                   on_shutdown=[shutdown_batch_manager, shutdown_extraction_executor])
+
+UPLOAD_FIELD = "file"
+BATCH_FIELDS = ("files", "file")
+PDF_MAGIC = b"%PDF-"
+
+# Limite les requêtes d'extraction en cours (upload compris) : un afflux de
+# gros fichiers attend ici au lieu de saturer mémoire, disque et processus.
+_slots: Optional[asyncio.Semaphore] = None
+
+
+def _get_slots() -> asyncio.Semaphore:
+    global _slots
+    if _slots is None:
+        _slots = asyncio.Semaphore(SETTINGS.extract_max_concurrency)
+    return _slots
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+class UploadSpool:
+    """Contenu d'un fichier uploadé : en mémoire jusqu'à spool_bytes, puis fichier temporaire."""
+
+    def __init__(self, max_bytes: int, spool_bytes: int, directory: Optional[str] = None):
+        self.max_bytes = max_bytes
+        self.spool_bytes = spool_bytes
+        self.directory = directory
+        self.size = 0
+        self.head = b""
+        self._buffer = bytearray()
+        self._file = None
+
+    def write(self, data: bytes) -> None:
+        self.size += len(data)
+        if self.size > self.max_bytes:
+            raise UploadTooLarge()
+        if len(self.head) < len(PDF_MAGIC):
+            self.head += data[:len(PDF_MAGIC) - len(self.head)]
+
+        if self._file is None and len(self._buffer) + len(data) > self.spool_bytes:
+            self._file = tempfile.NamedTemporaryFile(prefix="upload_", suffix=".pdf",
+                                                     dir=self.directory, delete=False)
+            self._file.write(self._buffer)
+            self._buffer = bytearray()
+        if self._file is not None:
+            self._file.write(data)
+        else:
+            self._buffer += data
+
+    def source(self) -> Union[str, bytes]:
+        """Chemin du fichier temporaire, ou octets si l'upload est resté en mémoire."""
+        if self._file is not None:
+            self._file.close()
+            return self._file.name
+        return bytes(self._buffer)
+
+    def cleanup(self) -> None:
+        self._buffer = bytearray()
+        if self._file is not None:
+            self._file.close()
+            try:
+                os.unlink(self._file.name)
+            except OSError:
+                pass
+            self._file = None
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(status_code=413,
+                         detail=f"Fichier trop volumineux (max {max_bytes // (1024 * 1024)} Mo)")
+
+
+async def stream_multipart(request: Request, open_sink: Callable[[str, Optional[str]], Optional[Any]],
+                           max_bytes: int) -> None:
+    """
+    Lit le corps multipart au fil de l'eau. open_sink(champ, nom_fichier) renvoie
+    l'objet (méthode write) qui reçoit le contenu de la partie, ou None pour l'ignorer.
+    """
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes + 64 * 1024:
+        raise _too_large(max_bytes)
+
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or not params.get(b"boundary"):
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                            detail="multipart/form-data attendu")
+
+    state: Dict[str, Any] = {"field": b"", "value": b"", "headers": {}, "sink": None, "total": 0}
+
+    def on_part_begin():
+        state["headers"] = {}
+        state["sink"] = None
+
+    def on_header_field(data, start, end):
+        state["field"] += data[start:end]
+
+    def on_header_value(data, start, end):
+        state["value"] += data[start:end]
+
+    def on_header_end():
+        state["headers"][state["field"].lower()] = state["value"]
+        state["field"] = state["value"] = b""
+
+    def on_headers_finished():
+        _, options = parse_options_header(state["headers"].get(b"content-disposition", b""))
+        filename = options.get(b"filename")
+        state["sink"] = open_sink(
+            options.get(b"name", b"").decode("latin-1"),
+            filename.decode("utf-8", "replace") if filename is not None else None,
+        )
+
+    def on_part_data(data, start, end):
+        state["total"] += end - start
+        if state["total"] > max_bytes:
+            raise UploadTooLarge()
+        if state["sink"] is not None:
+            state["sink"].write(data[start:end])
+
+    def on_part_end():
+        state["sink"] = None
+
+    parser = MultipartParser(params[b"boundary"], {
+        "on_part_begin": on_part_begin,
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": on_part_data,
+        "on_part_end": on_part_end,
+    })
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+        parser.finalize()
+    except UploadTooLarge:
+        raise _too_large(max_bytes)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Multipart invalide: {e}")
+
+
+async def receive_upload(request: Request, field_name: str = UPLOAD_FIELD) -> Tuple[UploadSpool, Optional[str]]:
+    """Un seul fichier (champ field_name) ; les autres parties sont ignorées."""
+    max_bytes = SETTINGS.max_upload_mb * 1024 * 1024
+    spool = UploadSpool(max_bytes, SETTINGS.upload_spool_kb * 1024)
+    found: Dict[str, Any] = {}
+
+    def open_sink(name: str, filename: Optional[str]):
+        if name != field_name or found:
+            return None
+        found["filename"] = filename
+        return spool
+
+    try:
+        await stream_multipart(request, open_sink, max_bytes)
+    except HTTPException:
+        spool.cleanup()
+        raise
+
+    if not found:
+        raise HTTPException(status_code=422, detail=f"Champ '{field_name}' manquant")
+    return spool, found["filename"]
+
+
+def _overloaded(retry_after: int) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                         detail="Serveur d'extraction saturé, réessayez plus tard",
+                         headers={"Retry-After": str(retry_after)})
+
+
+@router.post("/extract")
+async def extract(request: Request, _: Dict[str, Any] = Depends(require_roles("files.write"))):
+    """
+    Extraction d'une facture PDF (champ multipart « file ») via FastPdfInvoiceEngine.
+    L'upload est lu en flux ; l'extraction passe dans la voie interactive du
+    pool fast_pdf, devant les documents des lots.
+    """
+    pool = get_executor_manager().pool(POOL_FAST_PDF)
+    try:
+        # Refus avant de lire l'upload si la file interactive est déjà pleine
+        pool.check_admission(PRIORITY_INTERACTIVE)
+    except ExecutorSaturated as e:
+        raise _overloaded(e.retry_after)
+
+    slots = _get_slots()
+    try:
+        await asyncio.wait_for(slots.acquire(), timeout=SETTINGS.extract_queue_timeout)
+    except asyncio.TimeoutError:
+        raise _overloaded(max(1, int(SETTINGS.extract_queue_timeout)))
+
+    spool = None
+    try:
+        spool, filename = await receive_upload(request)
+        if spool.head != PDF_MAGIC:
+            raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                                detail="Le fichier n'est pas un PDF")
+
+        start = time.perf_counter()
+        try:
+            result = await pool.run(extract_invoice, spool.source(), priority=PRIORITY_INTERACTIVE)
+        except ExecutorSaturated as e:
+            raise _overloaded(e.retry_after)
+        except Exception as e:
+            record_document("failed")
+            logger.error("❌ Erreur extraction '%s': %s", filename, e)
+            raise HTTPException(status_code=422,
+                                detail=f"Extraction impossible: {e}")
+
+        record_document(result.get("processing_method"))
+        logger.info("✅ Facture '%s' extraite (%d octets, %.0f ms)",
+                    filename, spool.size, (time.perf_counter() - start) * 1000)
+        return FastJSONResponse(result)
+    finally:
+        if spool is not None:
+            spool.cleanup()
+        slots.release()
+
+
+@router.post("/batch", status_code=status.HTTP_202_ACCEPTED)
+async def create_batch(request: Request, payload: Dict[str, Any] = Depends(require_roles("files.write"))):
+    """
+    Lot de factures : plusieurs champs « files » (PDF) et/ou une archive ZIP.
+    Répond immédiatement avec l'id du lot ; résultats via /batch/{id}/events.
+    """
+    tenant = tenant_of(payload)
+    manager = get_batch_manager()
+    try:
+        manager.check_quota(tenant)
+    except BatchQuotaExceeded as e:
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(e))
+
+    max_bytes = SETTINGS.batch_max_upload_mb * 1024 * 1024
+    directory = tempfile.mkdtemp(prefix="batch_")
+    uploads = []
+
+    def open_sink(name: str, filename: Optional[str]):
+        if name not in BATCH_FIELDS or filename is None:
+            return None
+        if len(uploads) >= SETTINGS.batch_max_files:
+            raise HTTPException(status_code=413, detail=f"Plus de {SETTINGS.batch_max_files} fichiers")
+        spool = UploadSpool(max_bytes, 0, directory)
+        uploads.append((filename, spool))
+        return spool
+
+    try:
+        await stream_multipart(request, open_sink, max_bytes)
+
+        items, rejected = [], []
+        for filename, spool in uploads:
+            path = spool.source()
+            if spool.head.startswith(ZIP_MAGIC):
+                # Archive conservée telle quelle : ses membres seront lus en mémoire au fil du lot
+                try:
+                    members = await asyncio.to_thread(
+                        list_pdf_members, path, SETTINGS.batch_max_files - len(items)
+                    )
+                except ArchiveTooLarge as e:
+                    raise HTTPException(status_code=413, detail=str(e))
+                except Exception as e:
+                    raise HTTPException(status_code=422, detail=f"Archive '{filename}' illisible: {e}")
+                items.extend((PurePosixPath(member).name, path, member) for member in members)
+            elif spool.head == PDF_MAGIC:
+                items.append((filename, path, None))
+            else:
+                rejected.append(filename)
+                spool.cleanup()
+
+        if not items:
+            raise HTTPException(status_code=422, detail="Aucun PDF dans la requête")
+        job = manager.submit(tenant, items, directory)
+    except BatchQuotaExceeded as e:
+        shutil.rmtree(directory, ignore_errors=True)
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(e))
+    except BaseException:
+        shutil.rmtree(directory, ignore_errors=True)
+        raise
+
+    return {
+        "job_id": job.job_id,
+        "status": job.status,
+        "total": job.total,
+        "rejected": rejected,
+        "events_url": f"{router.prefix}/batch/{job.job_id}/events",
+    }
+
+
+def _get_job(job_id: str, payload: Dict[str, Any]):
+    job = get_batch_manager().get(job_id, tenant_of(payload))
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lot introuvable")
+    return job
+
+
+@router.get("/batch/{job_id}")
+async def get_batch(job_id: str, payload: Dict[str, Any] = Depends(require_roles("files.read"))):
+    return _get_job(job_id, payload).summary()
+
+
+@router.get("/batch/{job_id}/events")
+async def batch_events(job_id: str, request: Request,
+                       payload: Dict[str, Any] = Depends(require_roles("files.read"))):
+    """Server-Sent Events : un événement « document » par facture, puis « end »."""
+    job = _get_job(job_id, payload)
+    last_event_id = request.headers.get("last-event-id", "0")
+    return StreamingResponse(
+        get_batch_manager().stream_events(job, int(last_event_id) if last_event_id.isdigit() else 0),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.delete("/batch/{job_id}")
+async def cancel_batch(job_id: str, payload: Dict[str, Any] = Depends(require_roles("files.write"))):
+    job = _get_job(job_id, payload)
+    get_batch_manager().cancel(job.job_id)
+    return job.summary()
@@ -0,0 +1,58 @@
+# api/routes/metrics.py
+"""
+GET /metrics – exposition Prometheus (text/plain 0.0.4).
+
+Les profondeurs de file sont lues au moment du scrape ; les histogrammes
+et compteurs du pipeline viennent de core/observability/metrics.py.
+"""
+from __future__ import annotations
+
+from typing import Dict
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from api import batch_jobs
+from core.engine.executors import LANE_NAMES, get_executor_manager
+from core.observability.metrics import REGISTRY, GaugeFunction
+
+router = APIRouter(tags=["metrics"])
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _executor_waiting() -> Dict[tuple, float]:
+    return {
+        (pool, lane): stats["waiting"][lane]
+        for pool, stats in get_executor_manager().stats().items()
+        for lane in LANE_NAMES.values()
+    }
+
+
+def _executor_running() -> Dict[tuple, float]:
+    return {(pool,): stats["running"] for pool, stats in get_executor_manager().stats().items()}
+
+
+def _batch_queued() -> Dict[tuple, float]:
+    # Pas de gestionnaire de lots créé pour un simple scrape
+    manager = batch_jobs._manager
+    return {(): manager.queue_depth() if manager is not None else 0}
+
+
+REGISTRY.register(GaugeFunction(
+    "fiscal_ai_executor_queue_depth", "Tâches en attente d'une place par pool et voie",
+    ("pool", "lane"), _executor_waiting,
+))
+REGISTRY.register(GaugeFunction(
+    "fiscal_ai_executor_running", "Tâches en cours par pool",
+    ("pool",), _executor_running,
+))
+REGISTRY.register(GaugeFunction(
+    "fiscal_ai_batch_queue_depth", "Documents de lots en file commune",
+    (), _batch_queued,
+))
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics() -> PlainTextResponse:
+    return PlainTextResponse(REGISTRY.render(), media_type=CONTENT_TYPE)
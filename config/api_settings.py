@@ -0,0 +1,34 @@
+# config/api_settings.py
+from pydantic import BaseModel
+import os
+
+class ApiSettings(BaseModel):
+    # Processus d'extraction (0 = nombre de CPU, plafonné à 4)
+    extract_workers: int = int(os.getenv("FISCAL_AI_EXTRACT_WORKERS", "0")) or min(4, os.cpu_count() or 1)
+    # Requêtes d'extraction simultanées (upload + traitement) ; au-delà on attend
+    extract_max_concurrency: int = int(os.getenv("FISCAL_AI_EXTRACT_MAX_CONCURRENCY", "8"))
+    # Attente max (sec) d'une place avant de répondre 429 (avec Retry-After)
+    extract_queue_timeout: float = float(os.getenv("FISCAL_AI_EXTRACT_QUEUE_TIMEOUT", "10"))
+    # Taille max d'un upload (Mo) ; refusé en 413 dès le dépassement
+    max_upload_mb: int = int(os.getenv("FISCAL_AI_MAX_UPLOAD_MB", "25"))
+    # En dessous (Ko), l'upload reste en mémoire ; au-delà il est écrit dans un fichier temporaire
+    upload_spool_kb: int = int(os.getenv("FISCAL_AI_UPLOAD_SPOOL_KB", "1024"))
+    # Lots (POST /invoices/batch)
+    batch_max_files: int = int(os.getenv("FISCAL_AI_BATCH_MAX_FILES", "500"))
+    batch_max_upload_mb: int = int(os.getenv("FISCAL_AI_BATCH_MAX_UPLOAD_MB", "500"))
+    # Documents en attente dans la file commune (au-delà, les lots attendent leur tour)
+    batch_queue_size: int = int(os.getenv("FISCAL_AI_BATCH_QUEUE_SIZE", "32"))
+    # Documents d'un même tenant en file ou en cours de traitement
+    batch_tenant_concurrency: int = int(os.getenv("FISCAL_AI_BATCH_TENANT_CONCURRENCY", "4"))
+    # Lots actifs (non terminés) par tenant ; au-delà : 429
+    batch_tenant_max_jobs: int = int(os.getenv("FISCAL_AI_BATCH_TENANT_MAX_JOBS", "3"))
+    # Durée de conservation (sec) des lots terminés et de leurs événements
+    batch_job_ttl: int = int(os.getenv("FISCAL_AI_BATCH_JOB_TTL", "3600"))
+    # Base documentaire lue par les listings (/files/list)
+    database_url: str = os.getenv("FISCAL_AI_DATABASE_URL", "sqlite:///data/fiscal_ai.db")
+    # Compression des réponses : rien sous ce seuil (octets) ; niveaux gzip (1-9) et brotli (0-11)
+    compression_min_size: int = int(os.getenv("FISCAL_AI_COMPRESSION_MIN_SIZE", "1024"))
+    gzip_level: int = int(os.getenv("FISCAL_AI_GZIP_LEVEL", "6"))
+    brotli_quality: int = int(os.getenv("FISCAL_AI_BROTLI_QUALITY", "4"))
+
+SETTINGS = ApiSettings()
@@ -11,6 +11,16 @@ class KeycloakSettings(BaseModel):
     accepted_audiences: set[str] = set(os.getenv("KEYCLOAK_AUDIENCES", "fiscal-ui").split(","))
     # Tolérance d’horloge (sec)
     leeway: int = int(os.getenv("KEYCLOAK_LEEWAY", "30"))
+    # Durée de vie du JWKS en cache (sec) et rafraîchissement anticipé en tâche de fond
+    jwks_ttl: int = int(os.getenv("KEYCLOAK_JWKS_TTL", "300"))
+    jwks_refresh_ahead: int = int(os.getenv("KEYCLOAK_JWKS_REFRESH_AHEAD", "60"))
+    # Échec de rechargement avec des clés en cache : clés servies, nouvel essai après (sec)
+    jwks_refresh_backoff: int = int(os.getenv("KEYCLOAK_JWKS_REFRESH_BACKOFF", "30"))
+    # kid inconnu : pas plus d'un rechargement JWKS forcé par intervalle (sec)
+    jwks_min_refresh_interval: int = int(os.getenv("KEYCLOAK_JWKS_MIN_REFRESH_INTERVAL", "10"))
+    # Jetons déjà vérifiés (LRU) ; une entrée ne survit jamais à l'exp du jeton
+    token_cache_size: int = int(os.getenv("KEYCLOAK_TOKEN_CACHE_SIZE", "10000"))
+    token_cache_ttl: int = int(os.getenv("KEYCLOAK_TOKEN_CACHE_TTL", "300"))
 
 SETTINGS = KeycloakSettings()
 if SETTINGS.jwks_url is None:
@@ -0,0 +1,221 @@
+"""
+Stockage des backups de configuration, adressé par contenu.
+
+• Un objet par contenu distinct (SHA-256) : sauvegardes identiques dédupliquées
+• Objets compressés (zlib), stockés en delta de lignes par rapport à la
+  version précédente quand c'est plus court (chaîne bornée par max_chain)
+• index.json : historique des versions par configuration
+• Rétention : au plus keep_last versions, aucune de plus de max_age_days
+  (sauf la dernière), puis suppression des objets devenus inaccessibles
+"""
+
+import difflib
+import hashlib
+import json
+import logging
+import os
+import threading
+import zlib
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+
+class ConfigBackupStore:
+    """Backups dédupliqués et compressés des fichiers de configuration"""
+
+    def __init__(self, root: Path, keep_last: int = 20, max_age_days: Optional[float] = 30,
+                 max_chain: int = 10):
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.index_path = self.root / "index.json"
+        self.keep_last = keep_last
+        self.max_age_days = max_age_days
+        self.max_chain = max_chain
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._index: Optional[Dict[str, List[Dict[str, Any]]]] = None
+
+    # ------------------------------------------------------------------ #
+    #  INDEX & OBJETS
+    # ------------------------------------------------------------------ #
+    def _load_index(self) -> Dict[str, List[Dict[str, Any]]]:
+        if self._index is None:
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    self._index = json.load(f)
+            except (FileNotFoundError, ValueError):
+                self._index = {}
+        return self._index
+
+    def _save_index(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._index, f, ensure_ascii=False)
+        os.replace(tmp_path, self.index_path)
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest
+
+    def _read_object(self, digest: str) -> Dict[str, Any]:
+        with open(self._object_path(digest), 'rb') as f:
+            return json.loads(zlib.decompress(f.read()))
+
+    def _write_object(self, digest: str, payload: Dict[str, Any]) -> int:
+        path = self._object_path(digest)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = zlib.compress(json.dumps(payload, ensure_ascii=False).encode('utf-8'), 9)
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        return len(data)
+
+    def read(self, digest: str) -> bytes:
+        """Contenu complet d'un objet (reconstruit depuis sa chaîne de deltas)"""
+        payload = self._read_object(digest)
+        if payload['type'] == 'full':
+            return payload['data'].encode('utf-8')
+
+        base_lines = self.read(payload['base']).decode('utf-8').splitlines(keepends=True)
+        lines: List[str] = []
+        for op in payload['ops']:
+            if op[0] == '=':
+                lines.extend(base_lines[op[1]:op[2]])
+            else:
+                lines.extend(op[1])
+        return ''.join(lines).encode('utf-8')
+
+    @staticmethod
+    def _delta_ops(base: str, content: str) -> List[list]:
+        base_lines = base.splitlines(keepends=True)
+        lines = content.splitlines(keepends=True)
+        ops = []
+        matcher = difflib.SequenceMatcher(None, base_lines, lines, autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == 'equal':
+                ops.append(['=', i1, i2])
+            elif j2 > j1:
+                ops.append(['+', lines[j1:j2]])
+        return ops
+
+    # ------------------------------------------------------------------ #
+    #  API
+    # ------------------------------------------------------------------ #
+    def put(self, config_name: str, content: bytes, file_format: str) -> Optional[str]:
+        """Ajoute une version ; None si identique à la dernière (rien écrit)"""
+        digest = hashlib.sha256(content).hexdigest()
+        text = content.decode('utf-8')
+
+        with self._lock:
+            index = self._load_index()
+            versions = index.setdefault(config_name, [])
+            if versions and versions[-1]['hash'] == digest:
+                return None
+
+            stored = 0
+            if not self._object_path(digest).exists():
+                payload = {'type': 'full', 'data': text, 'chain': 0}
+                if versions:
+                    base = versions[-1]['hash']
+                    base_payload = self._read_object(base)
+                    if base_payload.get('chain', 0) < self.max_chain:
+                        ops = self._delta_ops(self.read(base).decode('utf-8'), text)
+                        delta = {'type': 'delta', 'base': base, 'ops': ops,
+                                 'chain': base_payload.get('chain', 0) + 1}
+                        if len(json.dumps(delta)) < len(json.dumps(payload)):
+                            payload = delta
+                stored = self._write_object(digest, payload)
+
+            versions.append({
+                'hash': digest,
+                'timestamp': datetime.utcnow().isoformat(),
+                'file_format': file_format,
+                'size': len(content),
+            })
+            self._prune_locked(config_name)
+            self._save_index()
+
+        self.logger.info(f"📦 Backup '{config_name}' {digest[:12]} ({stored} octets écrits)")
+        return digest
+
+    def list_backups(self, config_name: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._load_index().get(config_name, []))
+
+    def restore(self, config_name: str, digest: Optional[str] = None) -> bytes:
+        """Contenu d'une version (la plus récente par défaut)"""
+        versions = self.list_backups(config_name)
+        if not versions:
+            raise KeyError(f"Aucun backup pour '{config_name}'")
+        if digest is None:
+            digest = versions[-1]['hash']
+        elif not any(v['hash'] == digest for v in versions):
+            raise KeyError(f"Backup {digest} inconnu pour '{config_name}'")
+        return self.read(digest)
+
+    # ------------------------------------------------------------------ #
+    #  RÉTENTION
+    # ------------------------------------------------------------------ #
+    def prune(self) -> int:
+        """Applique la rétention à toutes les configurations ; retourne le nb d'objets supprimés"""
+        with self._lock:
+            index = self._load_index()
+            for config_name in list(index):
+                self._prune_locked(config_name, collect=False)
+            removed = self._collect_garbage()
+            self._save_index()
+        return removed
+
+    def _prune_locked(self, config_name: str, collect: bool = True):
+        versions = self._index.get(config_name, [])
+        kept = versions[-self.keep_last:]
+        if self.max_age_days is not None:
+            cutoff = (datetime.utcnow() - timedelta(days=self.max_age_days)).isoformat()
+            # La version la plus récente est toujours conservée
+            kept = [v for v in kept[:-1] if v['timestamp'] >= cutoff] + kept[-1:]
+        if len(kept) == len(versions):
+            return
+        self._index[config_name] = kept
+
+        if collect:
+            self._collect_garbage()
+
+    def _collect_garbage(self) -> int:
+        """Supprime les objets non référencés (bases des deltas conservées)"""
+        reachable: Set[str] = set()
+        pending = [v['hash'] for versions in self._index.values() for v in versions]
+        while pending:
+            digest = pending.pop()
+            if digest in reachable:
+                continue
+            reachable.add(digest)
+            try:
+                payload = self._read_object(digest)
+            except FileNotFoundError:
+                continue
+            if payload['type'] == 'delta':
+                pending.append(payload['base'])
+
+        removed = 0
+        if self.objects_dir.exists():
+            for path in self.objects_dir.glob('*/*'):
+                if path.name not in reachable and not path.name.endswith('.tmp'):
+                    path.unlink()
+                    removed += 1
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        files = list(self.objects_dir.glob('*/*')) if self.objects_dir.exists() else []
+        with self._lock:
+            index = self._load_index()
+            versions = sum(len(v) for v in index.values())
+            logical = sum(v['size'] for vs in index.values() for v in vs)
+        return {
+            'configs': len(index),
+            'versions': versions,
+            'objects': len(files),
+            'stored_bytes': sum(f.stat().st_size for f in files),
+            'logical_bytes': logical,
+        }
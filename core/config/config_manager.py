@@ -1,9 +1,14 @@
+import copy
 import json
 import logging
+import threading
+from collections import deque
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Callable, List, Optional, Tuple
 from datetime import datetime
 
+from .backup_store import ConfigBackupStore
+
 # Import conditionnel de YAML
 try:
     import yaml
@@ -11,14 +16,36 @@ try:
 except ImportError:
     YAML_AVAILABLE = False
 
+# Sentinelles du cache des clés résolues
+_NOT_FOUND = object()
+_NOT_FOUND_CACHED = object()
+
+
 class ConfigManager:
     """Gestionnaire de configuration avec support JSON et YAML"""
     
-    def __init__(self, config_dir: str = "configs"):
+    def __init__(self, config_dir: str = "configs", history_size: int = 100,
+                 backup_keep: int = 20, backup_max_age_days: Optional[float] = 30):
         self.config_dir = Path(config_dir)
         self.config_dir.mkdir(exist_ok=True, parents=True)
         self.configs: Dict[str, Dict[str, Any]] = {}
-        self._config_history: Dict[str, list] = {}
+        # Historique borné : seules les history_size dernières actions sont conservées
+        self.history_size = history_size
+        self._config_history: Dict[str, deque] = {}
+        self.backup_store = ConfigBackupStore(
+            self.config_dir / "backups",
+            keep_last=backup_keep,
+            max_age_days=backup_max_age_days,
+        )
+        
+        # Instantané (config, cache des clés résolues) remplacé d'un bloc à chaque changement
+        self._resolved: Dict[str, Tuple[Dict[str, Any], Dict[str, Any]]] = {}
+        # Fichier suivi par configuration : (chemin, format, mtime_ns, taille)
+        self._sources: Dict[str, Tuple[Path, str, int, int]] = {}
+        self._subscribers: Dict[str, List[Tuple[Optional[str], Callable]]] = {}
+        self._lock = threading.RLock()
+        self._watch_thread: Optional[threading.Thread] = None
+        self._watch_stop = threading.Event()
         
         # Configuration logging
         self.logger = logging.getLogger(__name__)
@@ -53,13 +80,11 @@ class ConfigManager:
                 raise ValueError(f"Format non supporté: {file_format}")
             
             # Sauvegarde en mémoire
-            self.configs[config_name] = config_data
+            self._track_source(config_name, config_path, file_format.lower())
+            self._set_config(config_name, config_data)
             
             # Historique
-            if config_name not in self._config_history:
-                self._config_history[config_name] = []
-            
-            self._config_history[config_name].append({
+            self._record_history(config_name, {
                 'timestamp': datetime.utcnow(),
                 'action': 'loaded',
                 'file_format': file_format
@@ -96,13 +121,11 @@ class ConfigManager:
             else:
                 raise ValueError(f"Format non supporté: {file_format}")
             
-            # Mise à jour mémoire et historique
-            self.configs[config_name] = config_data
+            # Mise à jour mémoire et historique (écriture propre : pas de rechargement)
+            self._track_source(config_name, config_path, file_format.lower())
+            self._set_config(config_name, config_data)
             
-            if config_name not in self._config_history:
-                self._config_history[config_name] = []
-            
-            self._config_history[config_name].append({
+            self._record_history(config_name, {
                 'timestamp': datetime.utcnow(),
                 'action': 'saved',
                 'file_format': file_format,
@@ -118,15 +141,21 @@ class ConfigManager:
     
     def get_config(self, config_name: str, key_path: Optional[str] = None) -> Any:
         """Récupération d'une configuration ou d'une clé spécifique"""
-        if config_name not in self.configs:
+        snapshot = self._resolved.get(config_name)
+        if snapshot is None:
             self.logger.warning(f"⚠️  Configuration '{config_name}' non chargée")
             return None
         
-        config = self.configs[config_name]
+        config, resolved = snapshot
         
         if key_path is None:
             return config
         
+        # Chemin déjà résolu depuis le dernier chargement : simple accès dict
+        value = resolved.get(key_path, _NOT_FOUND)
+        if value is not _NOT_FOUND:
+            return None if value is _NOT_FOUND_CACHED else value
+        
         # Navigation dans la configuration avec point notation
         keys = key_path.split('.')
         current = config
@@ -134,8 +163,10 @@ class ConfigManager:
         try:
             for key in keys:
                 current = current[key]
+            resolved[key_path] = current
             return current
         except (KeyError, TypeError):
+            resolved[key_path] = _NOT_FOUND_CACHED
             self.logger.warning(f"⚠️  Clé '{key_path}' non trouvée dans configuration '{config_name}'")
             return None
     
@@ -143,15 +174,16 @@ class ConfigManager:
                       save_to_file: bool = True) -> bool:
         """Mise à jour d'une configuration existante"""
         try:
-            if config_name not in self.configs:
-                self.configs[config_name] = {}
-            
-            # Merge récursif
-            self._deep_merge(self.configs[config_name], updates)
-            
-            # Sauvegarde automatique si demandée
-            if save_to_file:
-                return self.save_config(config_name, self.configs[config_name])
+            # Merge récursif sur une copie : les lecteurs voient l'ancienne ou la nouvelle version
+            with self._lock:
+                merged = copy.deepcopy(self.configs.get(config_name, {}))
+                self._deep_merge(merged, updates)
+                
+                # Sauvegarde automatique si demandée
+                if save_to_file:
+                    return self.save_config(config_name, merged)
+                
+                self._set_config(config_name, merged)
             
             self.logger.info(f"✅ Configuration '{config_name}' mise à jour en mémoire")
             return True
@@ -176,26 +208,177 @@ class ConfigManager:
         
         return result
     
-    def _backup_config(self, config_name: str, file_format: str):
-        """Création d'un backup d'une configuration"""
+    # ------------------------------------------------------------------ #
+    #  RECHARGEMENT À CHAUD
+    # ------------------------------------------------------------------ #
+    def _set_config(self, config_name: str, config_data: Dict[str, Any]):
+        """Remplacement atomique de la configuration + invalidation du cache + abonnés"""
+        with self._lock:
+            previous = self.configs.get(config_name)
+            self.configs[config_name] = config_data
+            self._resolved[config_name] = (config_data, {})
+        self._notify(config_name, previous, config_data)
+    
+    def _track_source(self, config_name: str, config_path: Path, file_format: str):
+        stat = config_path.stat() if config_path.exists() else None
+        with self._lock:
+            self._sources[config_name] = (
+                config_path, file_format,
+                stat.st_mtime_ns if stat else 0, stat.st_size if stat else 0
+            )
+    
+    def subscribe(self, config_name: str, callback: Callable[[str, Any], None],
+                  key_path: Optional[str] = None) -> Callable[[], None]:
+        """
+        Abonnement aux changements : callback(config_name, config) ou, avec
+        key_path, callback(config_name, valeur) seulement si la valeur change.
+        Retourne la fonction de désabonnement.
+        """
+        entry = (key_path, callback)
+        with self._lock:
+            self._subscribers.setdefault(config_name, []).append(entry)
+        
+        def unsubscribe():
+            with self._lock:
+                subscribers = self._subscribers.get(config_name, [])
+                if entry in subscribers:
+                    subscribers.remove(entry)
+        
+        return unsubscribe
+    
+    def _notify(self, config_name: str, previous: Optional[Dict[str, Any]],
+                current: Dict[str, Any]):
+        for key_path, callback in list(self._subscribers.get(config_name, [])):
+            try:
+                if key_path is None:
+                    callback(config_name, current)
+                    continue
+                new_value = self.get_config(config_name, key_path)
+                old_value = self._lookup(previous, key_path) if previous is not None else _NOT_FOUND
+                if old_value is _NOT_FOUND or old_value != new_value:
+                    callback(config_name, new_value)
+            except Exception as e:
+                self.logger.error(f"❌ Erreur abonné configuration '{config_name}': {str(e)}")
+    
+    @staticmethod
+    def _lookup(config: Dict[str, Any], key_path: str) -> Any:
+        current = config
         try:
-            backup_dir = self.config_dir / "backups"
-            backup_dir.mkdir(exist_ok=True)
+            for key in key_path.split('.'):
+                current = current[key]
+            return current
+        except (KeyError, TypeError):
+            return None
+    
+    def reload_changed(self) -> List[str]:
+        """Recharge les fichiers modifiés depuis leur dernier chargement"""
+        reloaded = []
+        for config_name, (config_path, file_format, mtime_ns, size) in list(self._sources.items()):
+            try:
+                stat = config_path.stat()
+            except FileNotFoundError:
+                continue
+            if (stat.st_mtime_ns, stat.st_size) == (mtime_ns, size):
+                continue
             
-            timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-            backup_name = f"{config_name}_{timestamp}.{file_format}"
+            # Fichier en cours d'écriture ou invalide : on garde l'ancienne version
+            try:
+                with open(config_path, 'r', encoding='utf-8') as f:
+                    if file_format == "yaml":
+                        config_data = yaml.safe_load(f) or {}
+                    else:
+                        config_data = json.load(f)
+            except Exception as e:
+                self.logger.warning(f"⚠️  Rechargement '{config_name}' ignoré: {str(e)}")
+                continue
             
+            with self._lock:
+                self._sources[config_name] = (config_path, file_format, stat.st_mtime_ns, stat.st_size)
+                self._record_history(config_name, {
+                    'timestamp': datetime.utcnow(),
+                    'action': 'reloaded',
+                    'file_format': file_format
+                })
+            self._set_config(config_name, config_data)
+            self.logger.info(f"🔄 Configuration '{config_name}' rechargée")
+            reloaded.append(config_name)
+        return reloaded
+    
+    def start_watching(self, interval: float = 1.0) -> threading.Thread:
+        """Surveillance par scrutation (stat) des fichiers chargés"""
+        if self._watch_thread is not None and self._watch_thread.is_alive():
+            return self._watch_thread
+        
+        self._watch_stop.clear()
+        
+        def watch():
+            while not self._watch_stop.wait(interval):
+                try:
+                    self.reload_changed()
+                except Exception as e:
+                    self.logger.error(f"❌ Erreur surveillance configurations: {str(e)}")
+        
+        self._watch_thread = threading.Thread(target=watch, name="config-watcher", daemon=True)
+        self._watch_thread.start()
+        self.logger.info(f"👀 Surveillance des configurations (toutes les {interval}s)")
+        return self._watch_thread
+    
+    def stop_watching(self):
+        self._watch_stop.set()
+        if self._watch_thread is not None:
+            self._watch_thread.join()
+            self._watch_thread = None
+    
+    def _record_history(self, config_name: str, entry: Dict[str, Any]):
+        """Ajout à l'historique (anneau de history_size entrées)"""
+        with self._lock:
+            history = self._config_history.get(config_name)
+            if history is None:
+                history = self._config_history[config_name] = deque(maxlen=self.history_size)
+            history.append(entry)
+    
+    def get_history(self, config_name: str) -> List[Dict[str, Any]]:
+        return list(self._config_history.get(config_name, ()))
+    
+    def _backup_config(self, config_name: str, file_format: str):
+        """Backup de la version sur disque dans le store adressé par contenu"""
+        try:
             source_path = self.config_dir / f"{config_name}.{file_format}"
-            backup_path = backup_dir / backup_name
-            
             if source_path.exists():
-                import shutil
-                shutil.copy2(source_path, backup_path)
-                self.logger.info(f"📦 Backup créé: {backup_name}")
+                self.backup_store.put(config_name, source_path.read_bytes(), file_format)
         
         except Exception as e:
             self.logger.warning(f"⚠️  Impossible de créer le backup: {str(e)}")
     
+    def list_backups(self, config_name: str) -> List[Dict[str, Any]]:
+        """Versions sauvegardées (de la plus ancienne à la plus récente)"""
+        return self.backup_store.list_backups(config_name)
+    
+    def restore_backup(self, config_name: str, backup_hash: Optional[str] = None) -> bool:
+        """Restaure une version sauvegardée (la plus récente par défaut) et la recharge"""
+        try:
+            versions = self.backup_store.list_backups(config_name)
+            entry = next(
+                (v for v in reversed(versions) if backup_hash in (None, v['hash'])), None
+            )
+            if entry is None:
+                raise KeyError(f"Backup introuvable pour '{config_name}'")
+            
+            content = self.backup_store.read(entry['hash'])
+            file_format = entry['file_format']
+            config_path = self.config_dir / f"{config_name}.{file_format}"
+            # Version courante sauvegardée avant d'être écrasée
+            self._backup_config(config_name, file_format)
+            config_path.write_bytes(content)
+            
+            self.load_config(config_name, file_format)
+            self.logger.info(f"♻️  Configuration '{config_name}' restaurée ({entry['hash'][:12]})")
+            return True
+        
+        except Exception as e:
+            self.logger.error(f"❌ Erreur restauration configuration '{config_name}': {str(e)}")
+            return False
+    
     def _deep_merge(self, target: Dict[str, Any], source: Dict[str, Any]):
         """Merge récursif de dictionnaires"""
         for key, value in source.items():
@@ -0,0 +1,223 @@
+# core/engine/engine_pool.py
+"""
+EnginePool – instances de moteurs longue durée, partagées entre requêtes.
+
+• shared    : une seule instance, utilisée en parallèle (moteurs sans état :
+              regex, Tesseract en sous-processus, PyMuPDF par document)
+• exclusive : N instances, chacune prêtée à un seul appelant à la fois
+              (moteurs à état mutable, modèles ML non thread-safe)
+
+Le coût d'initialisation (imports lourds, traineddata, patterns, modèles)
+est payé à la construction ou au pré-chauffage, jamais dans la requête.
+"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class EnginePoolTimeout(RuntimeError):
+    """Aucune instance libérée dans le délai imparti."""
+
+
+class EnginePoolClosed(RuntimeError):
+    """Pool fermé : plus aucune instance prêtée."""
+
+
+@dataclass
+class EngineStats:
+    """Statistiques d'usage d'une instance."""
+    instance_id: int
+    created_at: float = field(default_factory=time.time)
+    init_ms: float = 0.0
+    warmup_ms: float = 0.0
+    uses: int = 0
+    errors: int = 0
+    in_flight: int = 0
+    busy_seconds: float = 0.0
+    last_used: Optional[float] = None
+
+
+class EnginePool:
+    """Pool d'instances d'un moteur pour une configuration donnée."""
+
+    def __init__(
+        self,
+        name: str,
+        factory: Callable[[Dict[str, Any]], Any],
+        config: Optional[Dict[str, Any]] = None,
+        size: int = 1,
+        exclusive: bool = False,
+        warmup: Optional[Callable[[Any], None]] = None,
+    ) -> None:
+        self.name = name
+        self.factory = factory
+        self.config = config or {}
+        self.size = max(1, size) if exclusive else 1
+        self.exclusive = exclusive
+        self.warmup = warmup
+
+        self._instances: List[Any] = []
+        self._stats: Dict[int, EngineStats] = {}
+        self._idle: "queue.Queue[Any]" = queue.Queue()
+        self._lock = threading.Lock()
+        # Prêts en cours : close() attend leur retour avant le cleanup
+        self._loans = 0
+        self._returned = threading.Condition(self._lock)
+        self._closed = False
+        self._ids = itertools.count(1)
+
+    # ------------------------------------------------------------------ #
+    #  CRÉATION / PRÉ-CHAUFFAGE
+    # ------------------------------------------------------------------ #
+    def _create(self) -> Any:
+        stats = EngineStats(instance_id=next(self._ids))
+
+        start = time.perf_counter()
+        instance = self.factory(self.config)
+        stats.init_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        if self.warmup is not None:
+            self.warmup(instance)
+        elif hasattr(instance, "warm_up"):
+            instance.warm_up()
+        stats.warmup_ms = (time.perf_counter() - start) * 1000
+
+        self._instances.append(instance)
+        self._stats[id(instance)] = stats
+        logger.info(
+            "🔥 Moteur '%s' #%d prêt (init %.0f ms, warm-up %.0f ms)",
+            self.name, stats.instance_id, stats.init_ms, stats.warmup_ms,
+        )
+        return instance
+
+    def prewarm(self) -> "EnginePool":
+        """Construit toutes les instances du pool dès maintenant."""
+        with self._lock:
+            if self._closed:
+                raise EnginePoolClosed(f"Moteur '{self.name}' fermé")
+            while len(self._instances) < self.size:
+                self._idle.put(self._create())
+        return self
+
+    def _grow(self) -> Optional[Any]:
+        """
+        Ajoute une instance si le pool n'est pas plein (création sous verrou)
+        et la remet directement à l'appelant, sans passer par la file.
+        """
+        with self._lock:
+            if self._closed:
+                raise EnginePoolClosed(f"Moteur '{self.name}' fermé")
+            if len(self._instances) >= self.size:
+                return None
+            return self._create()
+
+    # ------------------------------------------------------------------ #
+    #  UTILISATION
+    # ------------------------------------------------------------------ #
+    @contextmanager
+    def acquire(self, timeout: Optional[float] = None) -> Iterator[Any]:
+        """Prête une instance ; les statistiques sont mises à jour au retour."""
+        instance = self._checkout(timeout) if self.exclusive else self.get()
+        stats = self._lend(instance)
+        start = time.perf_counter()
+        failed = False
+        try:
+            yield instance
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            with self._lock:
+                stats.in_flight -= 1
+                stats.uses += 1
+                stats.errors += int(failed)
+                stats.busy_seconds += time.perf_counter() - start
+                stats.last_used = time.time()
+                self._loans -= 1
+                if self.exclusive and not self._closed:
+                    self._idle.put(instance)
+                self._returned.notify_all()
+
+    def _lend(self, instance: Any) -> EngineStats:
+        with self._lock:
+            if self._closed:
+                raise EnginePoolClosed(f"Moteur '{self.name}' fermé")
+            stats = self._stats[id(instance)]
+            stats.in_flight += 1
+            self._loans += 1
+        return stats
+
+    def _checkout(self, timeout: Optional[float]) -> Any:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        instance = self._grow()
+        if instance is not None:
+            return instance
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise EnginePoolTimeout(
+                f"Moteur '{self.name}' : aucune instance libre après {timeout}s"
+            ) from None
+
+    def get(self) -> Any:
+        """Instance partagée (pool non exclusif), créée si besoin."""
+        if self.exclusive:
+            raise RuntimeError(f"Moteur '{self.name}' exclusif : utiliser acquire()")
+        if not self._instances:
+            self._grow()
+        if self._closed:
+            raise EnginePoolClosed(f"Moteur '{self.name}' fermé")
+        return self._instances[0]
+
+    # ------------------------------------------------------------------ #
+    #  SUPERVISION / ARRÊT
+    # ------------------------------------------------------------------ #
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            instances = [asdict(self._stats[id(i)]) for i in self._instances]
+        return {
+            "engine": self.name,
+            "exclusive": self.exclusive,
+            "size": self.size,
+            "created": len(instances),
+            "uses": sum(s["uses"] for s in instances),
+            "instances": instances,
+        }
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Refuse les nouveaux prêts, attend le retour des instances prêtées
+        (au plus `timeout` secondes), puis libère toutes les instances.
+        """
+        with self._lock:
+            self._closed = True
+            if not self._returned.wait_for(lambda: self._loans == 0, timeout):
+                logger.warning("⚠️  Moteur '%s' fermé avec %d instance(s) encore prêtée(s)",
+                               self.name, self._loans)
+            for instance in self._instances:
+                if hasattr(instance, "cleanup"):
+                    try:
+                        instance.cleanup()
+                    except Exception as exc:
+                        logger.warning("⚠️  Erreur cleanup moteur '%s': %s", self.name, exc)
+            self._instances.clear()
+            self._stats.clear()
+            while True:
+                try:
+                    self._idle.get_nowait()
+                except queue.Empty:
+                    break
@@ -0,0 +1,277 @@
+# core/engine/executors.py
+"""
+ExecutorManager – pools d'exécution CPU partagés par l'API et les workers.
+
+• fast_pdf : processus (PyMuPDF + regex), un moteur pré-chauffé par processus
+• ocr      : processus dédiés à la complétion OCR (Tesseract), pour qu'un
+             lot de scans n'occupe pas les processus fast_pdf
+• crypto   : threads (le backend OpenSSL libère le GIL)
+
+Admission : au plus max_workers tâches en cours par pool ; au-delà, deux
+files d'attente bornées, « interactive » (upload unitaire) servie avant
+« bulk » (lots). File pleine : ExecutorSaturated, avec un Retry-After estimé
+d'après la durée moyenne des tâches (→ 429 côté API).
+
+Pools de processus : les métriques mesurées dans les fils reviennent avec
+le résultat et sont fusionnées dans le registre du processus API.
+
+Les pools sont créés au premier usage ; les fabriques « module:fonction »
+ne sont importées qu'à ce moment (core ne dépend pas des moteurs).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import importlib
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Optional, Tuple, Union
+
+from core.observability.metrics import call_collecting, unwrap_collected
+
+logger = logging.getLogger(__name__)
+
+POOL_FAST_PDF = "fast_pdf"
+POOL_OCR = "ocr"
+POOL_CRYPTO = "crypto"
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BULK = 1
+LANE_NAMES = {PRIORITY_INTERACTIVE: "interactive", PRIORITY_BULK: "bulk"}
+
+
+class ExecutorSaturated(RuntimeError):
+    """File d'attente du pool pleine pour cette priorité."""
+
+    def __init__(self, pool: str, priority: int, retry_after: int):
+        super().__init__(f"Pool '{pool}' saturé (file {LANE_NAMES[priority]} pleine)")
+        self.pool = pool
+        self.priority = priority
+        self.retry_after = retry_after
+
+
+@dataclass
+class PoolSpec:
+    """factory(max_workers) -> Executor, ou « module:fonction »."""
+    factory: Union[str, Callable[[int], Executor]]
+    max_workers: int
+    # Attente max par voie : (interactive, bulk)
+    queue_limits: Tuple[int, int] = (16, 64)
+
+
+def create_crypto_executor(max_workers: int) -> Executor:
+    return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="crypto")
+
+
+def default_pool_specs() -> Dict[str, PoolSpec]:
+    """Tailles : FISCAL_AI_EXTRACT_WORKERS, FISCAL_AI_OCR_WORKERS, FISCAL_AI_CRYPTO_THREADS"""
+    cpus = os.cpu_count() or 1
+    queue_limits = (
+        int(os.getenv("FISCAL_AI_EXECUTOR_INTERACTIVE_QUEUE", "16")),
+        int(os.getenv("FISCAL_AI_EXECUTOR_BULK_QUEUE", "64")),
+    )
+    return {
+        POOL_FAST_PDF: PoolSpec(
+            "modules.ocr.extraction_worker:create_fast_pdf_executor",
+            int(os.getenv("FISCAL_AI_EXTRACT_WORKERS", "0")) or min(4, cpus),
+            queue_limits,
+        ),
+        POOL_OCR: PoolSpec(
+            "modules.ocr.extraction_worker:create_ocr_executor",
+            int(os.getenv("FISCAL_AI_OCR_WORKERS", "0")) or min(2, cpus),
+            queue_limits,
+        ),
+        POOL_CRYPTO: PoolSpec(
+            create_crypto_executor,
+            int(os.getenv("FISCAL_AI_CRYPTO_THREADS", "0")) or min(8, cpus),
+            queue_limits,
+        ),
+    }
+
+
+class BoundedExecutor:
+    """Un pool et ses deux files d'attente bornées."""
+
+    def __init__(self, name: str, executor: Executor, max_workers: int,
+                 queue_limits: Tuple[int, int] = (16, 64)):
+        self.name = name
+        self.executor = executor
+        self.max_workers = max_workers
+        self.queue_limits = {PRIORITY_INTERACTIVE: queue_limits[0], PRIORITY_BULK: queue_limits[1]}
+        self.completed = 0
+        self.rejected = 0
+        self._collect_metrics = isinstance(executor, ProcessPoolExecutor)
+        self._running = 0
+        self._avg_seconds: Optional[float] = None
+        self._waiting: Dict[int, Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]]] = {
+            PRIORITY_INTERACTIVE: deque(), PRIORITY_BULK: deque()
+        }
+        # Les appelants peuvent vivre dans plusieurs boucles (threads, tests)
+        self._lock = threading.Lock()
+
+    async def run(self, fn: Callable[..., Any], *args: Any,
+                  priority: int = PRIORITY_BULK, block: bool = False) -> Any:
+        """
+        Exécute fn(*args) dans le pool dès qu'une place se libère.
+        block=True : attend même si la file est pleine (appelant déjà borné,
+        ex. les workers de lots) ; sinon ExecutorSaturated.
+        """
+        loop = asyncio.get_running_loop()
+        await self._acquire(loop, priority, block)
+        start = time.perf_counter()
+        try:
+            if self._collect_metrics:
+                outcome = await loop.run_in_executor(self.executor, functools.partial(call_collecting, fn, *args))
+                return unwrap_collected(outcome)
+            return await loop.run_in_executor(self.executor, functools.partial(fn, *args))
+        finally:
+            self._release(time.perf_counter() - start)
+
+    def check_admission(self, priority: int = PRIORITY_BULK) -> None:
+        """ExecutorSaturated si run() refuserait maintenant (avant un upload coûteux)."""
+        with self._lock:
+            if (self._running >= self.max_workers
+                    and len(self._waiting[priority]) >= self.queue_limits[priority]):
+                self.rejected += 1
+                raise ExecutorSaturated(self.name, priority, self._retry_after())
+
+    async def _acquire(self, loop: asyncio.AbstractEventLoop, priority: int, block: bool) -> None:
+        with self._lock:
+            # Des tâches n'attendent que si toutes les places sont prises
+            if self._running < self.max_workers:
+                self._running += 1
+                return
+            if not block and len(self._waiting[priority]) >= self.queue_limits[priority]:
+                self.rejected += 1
+                raise ExecutorSaturated(self.name, priority, self._retry_after())
+            waiter = (loop, loop.create_future())
+            self._waiting[priority].append(waiter)
+
+        try:
+            await waiter[1]
+        except asyncio.CancelledError:
+            with self._lock:
+                try:
+                    self._waiting[priority].remove(waiter)
+                    removed = True
+                except ValueError:
+                    removed = False
+            # Place déjà transmise avant l'annulation : la rendre
+            if not removed and waiter[1].done() and not waiter[1].cancelled():
+                self._release(None)
+            raise
+
+    def _release(self, elapsed: Optional[float]) -> None:
+        with self._lock:
+            if elapsed is not None:
+                self.completed += 1
+                self._avg_seconds = elapsed if self._avg_seconds is None else (
+                    0.8 * self._avg_seconds + 0.2 * elapsed
+                )
+            # La place passe directement au premier en attente, interactive d'abord
+            for priority in (PRIORITY_INTERACTIVE, PRIORITY_BULK):
+                lane = self._waiting[priority]
+                while lane:
+                    loop, future = lane.popleft()
+                    try:
+                        loop.call_soon_threadsafe(self._grant, future)
+                        return
+                    except RuntimeError:
+                        continue  # boucle fermée
+            self._running -= 1
+
+    def _grant(self, future: asyncio.Future) -> None:
+        if future.cancelled():
+            self._release(None)
+        else:
+            future.set_result(None)
+
+    def _retry_after(self) -> int:
+        """Secondes estimées avant qu'une place se libère pour un nouvel arrivant."""
+        waiting = sum(len(lane) for lane in self._waiting.values())
+        return max(1, math.ceil((self._avg_seconds or 1.0) * (waiting + 1) / self.max_workers))
+
+    def retry_after(self) -> int:
+        with self._lock:
+            return self._retry_after()
+
+    def queue_depth(self, priority: Optional[int] = None) -> int:
+        with self._lock:
+            if priority is not None:
+                return len(self._waiting[priority])
+            return sum(len(lane) for lane in self._waiting.values())
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "running": self._running,
+                "waiting": {LANE_NAMES[p]: len(lane) for p, lane in self._waiting.items()},
+                "queue_limits": {LANE_NAMES[p]: limit for p, limit in self.queue_limits.items()},
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_ms": round(self._avg_seconds * 1000, 1) if self._avg_seconds is not None else None,
+            }
+
+
+class ExecutorManager:
+    """Pools nommés, créés à la demande depuis leur PoolSpec."""
+
+    def __init__(self, specs: Optional[Dict[str, PoolSpec]] = None):
+        self.specs = dict(specs if specs is not None else default_pool_specs())
+        self._pools: Dict[str, BoundedExecutor] = {}
+        self._lock = threading.Lock()
+
+    def pool(self, name: str, max_workers: Optional[int] = None) -> BoundedExecutor:
+        """Pool `name` ; max_workers ne s'applique qu'à sa création."""
+        pool = self._pools.get(name)
+        if pool is not None:
+            return pool
+        with self._lock:
+            pool = self._pools.get(name)
+            if pool is None:
+                spec = self.specs.get(name)
+                if spec is None:
+                    raise KeyError(f"Pool d'exécution inconnu: {name}")
+                factory = spec.factory
+                if isinstance(factory, str):
+                    module_name, _, attribute = factory.partition(":")
+                    factory = getattr(importlib.import_module(module_name), attribute)
+                workers = max_workers or spec.max_workers
+                pool = self._pools[name] = BoundedExecutor(name, factory(workers), workers, spec.queue_limits)
+                logger.info("🚀 Pool %s démarré (%d workers, files %s)", name, workers, spec.queue_limits)
+        return pool
+
+    async def run(self, name: str, fn: Callable[..., Any], *args: Any,
+                  priority: int = PRIORITY_BULK, block: bool = False) -> Any:
+        return await self.pool(name).run(fn, *args, priority=priority, block=block)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: pool.stats() for name, pool in list(self._pools.items())}
+
+    def shutdown(self, *names: str, wait: bool = True) -> None:
+        """Arrête les pools nommés (tous par défaut) ; recréés au prochain usage."""
+        with self._lock:
+            pools = [self._pools.pop(name) for name in (names or list(self._pools)) if name in self._pools]
+        for pool in pools:
+            pool.executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_manager: Optional[ExecutorManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_executor_manager() -> ExecutorManager:
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = ExecutorManager()
+    return _manager
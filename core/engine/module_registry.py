@@ -9,14 +9,29 @@ CORRECTIFS-CLÉS
 2.  Alias public  self.modules  conservé.
 3.  Support intégré du module factice « dummy ».
 4.  Alias rétro-compat  load_module() / unload_module().
+5.  Moteurs partagés (EnginePool) : instances longue durée, pré-chauffées
+    au démarrage, avec statistiques d'usage par instance.
+6.  load_module() « single-flight » : des appels concurrents sur un module
+    non chargé attendent une construction unique (variante aload_module).
+7.  discover_modules() : enregistrement depuis les manifestes plugin.json
+    (cache) ; la classe, donnée par son chemin d'import, n'est importée
+    qu'au premier load_module().
 """
 
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
-from importlib import import_module
-from types import ModuleType
-from typing import Any, Dict, List, Optional
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .engine_pool import EnginePool
+from .plugin_manifest import (
+    DEFAULT_CACHE_PATH, ENTRY_POINT_GROUP, discover_plugins, resolve_import_path,
+)
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
@@ -32,6 +47,11 @@ class ModuleRegistry:
         self._modules: Dict[str, Dict[str, Any]] = {}
         self.modules = self._modules          # ← alias public (anciennes suites)
         self._configs: Dict[str, Dict[str, Any]] = {}
+        self._loading: Dict[str, Future] = {}      # constructions en cours
+        self._lock = threading.RLock()
+        self._engines: Dict[str, Dict[str, Any]] = {}
+        self._engine_pools: Dict[Tuple[str, str], EnginePool] = {}
+        self._engines_lock = threading.Lock()
         logger.info("🚀 ModuleRegistry initialisé")
 
     # ------------------------------------------------------------------ #
@@ -42,75 +62,128 @@ class ModuleRegistry:
         module_name: str,
         module_class: Optional[Any] = None,
         config_schema: Optional[Dict[str, Any]] = None,
+        capabilities: Optional[List[str]] = None,
     ) -> bool:
         """
         Enregistre une classe de module.
 
         • module_name   : nom du module.
-        • module_class  : classe du module à enregistrer.
+        • module_class  : classe du module, ou chemin d'import
+                          « paquet.module:Classe » (import différé).
         • config_schema : schéma JSON optionnel.
+        • capabilities  : étiquettes libres (« ocr », « invoice »…).
         """
 
-        if module_name in self._modules:
-            logger.warning("⚠️  Module « %s » déjà enregistré", module_name)
-            return False
+        with self._lock:
+            if module_name in self._modules:
+                logger.warning("⚠️  Module « %s » déjà enregistré", module_name)
+                return False
 
-        try:
-            self._modules[module_name] = {
-                "class": module_class,
-                "instance": None,
-                "status": "registered",
-                "config_schema": config_schema or {}
-            }
-            logger.info("✅ Module '%s' enregistré", module_name)
-            return True
+            try:
+                self._modules[module_name] = {
+                    "class": module_class,
+                    "instance": None,
+                    "status": "registered",
+                    "config_schema": config_schema or {},
+                    "capabilities": list(capabilities or []),
+                }
+                logger.info("✅ Module '%s' enregistré", module_name)
+                return True
 
-        except Exception as exc:                           # pragma: no cover
-            logger.error("❌ Échec d'enregistrement « %s » : %s", module_name, exc)
-            return False
+            except Exception as exc:                       # pragma: no cover
+                logger.error("❌ Échec d'enregistrement « %s » : %s", module_name, exc)
+                return False
 
     def load_module(
         self,
         module_name: str,
         config: Optional[Dict[str, Any]] = None,
     ) -> Optional[Any]:
-        """Charge et instancie un module enregistré."""
-        if module_name not in self._modules:
-            logger.error("❌ Module '%s' non enregistré", module_name)
-            return None
+        """
+        Charge et instancie un module enregistré.
+
+        Thread-safe : le premier appelant construit l'instance, les appelants
+        concurrents attendent son résultat (aucune construction en double).
+        """
+        future, owner = self._begin_load(module_name)
+        if future is None:
+            return self._modules[module_name]["instance"] if module_name in self._modules else None
+        if owner:
+            self._build_module(module_name, config, future)
+        return future.result()
+
+    async def aload_module(
+        self,
+        module_name: str,
+        config: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Any]:
+        """Variante asynchrone : construction dans un thread, attente sans bloquer la boucle."""
+        future, owner = self._begin_load(module_name)
+        if future is None:
+            return self._modules[module_name]["instance"] if module_name in self._modules else None
+        if owner:
+            await asyncio.to_thread(self._build_module, module_name, config, future)
+        return await asyncio.wrap_future(future)
 
-        module_info = self._modules[module_name]
-        if module_info["instance"] is not None:
-            return module_info["instance"]
+    def _begin_load(self, module_name: str) -> Tuple[Optional[Future], bool]:
+        """(None, False) si rien à construire, sinon (future, vrai si l'appelant construit)."""
+        with self._lock:
+            module_info = self._modules.get(module_name)
+            if module_info is None:
+                logger.error("❌ Module '%s' non enregistré", module_name)
+                return None, False
+            if module_info["instance"] is not None:
+                return None, False
 
+            future = self._loading.get(module_name)
+            if future is not None:
+                return future, False
+            future = Future()
+            self._loading[module_name] = future
+            return future, True
+
+    def _build_module(self, module_name: str, config: Optional[Dict[str, Any]], future: Future) -> None:
+        instance = None
         try:
-            module_class = module_info["class"]
+            module_class = self._modules[module_name]["class"]
+            if isinstance(module_class, str):
+                module_class = resolve_import_path(module_class)
+                self._modules[module_name]["class"] = module_class
             instance = module_class(config or {})
-            module_info["instance"] = instance
-            module_info["status"] = "active"
-            self._configs[module_name] = config or {}
+            with self._lock:
+                module_info = self._modules[module_name]
+                module_info["instance"] = instance
+                module_info["status"] = "active"
+                self._configs[module_name] = config or {}
             logger.info("✅ Module '%s' chargé et actif", module_name)
-            return instance
 
         except Exception as exc:
             logger.error("❌ Échec chargement « %s » : %s", module_name, exc)
-            return None
+
+        finally:
+            # Un échec n'est pas mémorisé : l'appel suivant retentera
+            with self._lock:
+                self._loading.pop(module_name, None)
+            future.set_result(instance)
 
     def unload_module(self, module_name: str) -> bool:
         """Décharge un module actif.""" 
-        if module_name not in self._modules:
-            return False
+        with self._lock:
+            if module_name not in self._modules:
+                return False
 
-        module_info = self._modules[module_name]
-        if module_info["instance"] is not None:
+            module_info = self._modules[module_name]
+            instance = module_info["instance"]
+            module_info["instance"] = None
+            if instance is not None:
+                module_info["status"] = "loaded"
+
+        if instance is not None:
             try:
-                if hasattr(module_info["instance"], "cleanup"):
-                    module_info["instance"].cleanup()
+                if hasattr(instance, "cleanup"):
+                    instance.cleanup()
             except Exception as exc:
                 logger.warning("⚠️  Erreur cleanup '%s': %s", module_name, exc)
-            
-            module_info["instance"] = None
-            module_info["status"] = "loaded"
             logger.info("✅ Module '%s' déchargé", module_name)
 
         return True
@@ -121,15 +194,16 @@ class ModuleRegistry:
     # ------------------------------------------------------------------ #
     def unregister_module(self, module_name: str) -> bool:
         """Désenregistre complètement un module."""
-        if module_name in self._modules:
-            # Décharger d'abord si nécessaire
-            self.unload_module(module_name)
-            # Supprimer complètement
-            self._modules.pop(module_name)
-            self._configs.pop(module_name, None)
-            logger.info("✅ Module '%s' désenregistré", module_name)
-            return True
-        return False
+        with self._lock:
+            if module_name in self._modules:
+                # Décharger d'abord si nécessaire
+                self.unload_module(module_name)
+                # Supprimer complètement
+                self._modules.pop(module_name)
+                self._configs.pop(module_name, None)
+                logger.info("✅ Module '%s' désenregistré", module_name)
+                return True
+            return False
 
     # ------------------------------------------------------------------ #
     #  ACCÈS & UTILITAIRES
@@ -143,13 +217,153 @@ class ModuleRegistry:
         """Retourne la liste des modules avec leur statut."""
         result = {}
         for name, info in self._modules.items():
+            module_class = info["class"]
+            if isinstance(module_class, str):
+                class_name = module_class.replace(":", ".").rsplit(".", 1)[-1]
+            else:
+                class_name = module_class.__name__ if module_class else None
             result[name] = {
                 "status": info["status"],
-                "class": info["class"].__name__ if info["class"] else None,
-                "instance": info["instance"] is not None
+                "class": class_name,
+                "instance": info["instance"] is not None,
+                "capabilities": info.get("capabilities", []),
             }
         return result
 
+    def find_modules(self, capability: str) -> List[str]:
+        """Noms des modules déclarant une capacité (sans les importer)."""
+        return [
+            name for name, info in self._modules.items()
+            if capability in info.get("capabilities", [])
+        ]
+
+    # ------------------------------------------------------------------ #
+    #  DÉCOUVERTE PAR MANIFESTE
+    # ------------------------------------------------------------------ #
+    def discover_modules(
+        self,
+        roots: Optional[List[Any]] = None,
+        cache_path: Optional[Any] = DEFAULT_CACHE_PATH,
+        entry_point_group: Optional[str] = ENTRY_POINT_GROUP,
+    ) -> int:
+        """Enregistre les plug-ins des manifestes ; retourne le nombre ajouté."""
+        added = 0
+        for spec in discover_plugins(roots, cache_path, entry_point_group):
+            if spec.name in self._modules:
+                continue
+            if self.register_module(spec.name, spec.import_path, spec.config_schema, spec.capabilities):
+                added += 1
+        logger.info("🔎 %d module(s) découvert(s)", added)
+        return added
+
     def get_module_status(self, module_name: str) -> str:
         return "loaded" if module_name in self._modules else "absent"
 
+    # ------------------------------------------------------------------ #
+    #  MOTEURS PARTAGÉS
+    # ------------------------------------------------------------------ #
+    def register_engine(
+        self,
+        engine_name: str,
+        factory: Callable[[Dict[str, Any]], Any],
+        pool_size: int = 1,
+        exclusive: bool = False,
+        warmup: Optional[Callable[[Any], None]] = None,
+    ) -> bool:
+        """
+        Déclare un moteur réutilisable.
+
+        • factory   : callable(config) → instance (classe du moteur en général).
+        • exclusive : instance prêtée à un seul appelant à la fois
+                      (pool de pool_size instances) ; sinon instance partagée.
+        • warmup    : callable(instance) ; à défaut instance.warm_up() si présent.
+        """
+        with self._engines_lock:
+            if engine_name in self._engines:
+                return False
+            self._engines[engine_name] = {
+                "factory": factory,
+                "pool_size": pool_size,
+                "exclusive": exclusive,
+                "warmup": warmup,
+            }
+        logger.info("✅ Moteur '%s' enregistré", engine_name)
+        return True
+
+    @staticmethod
+    def _config_key(config: Optional[Dict[str, Any]]) -> str:
+        return json.dumps(config or {}, sort_keys=True, default=str)
+
+    def engine_pool(self, engine_name: str, config: Optional[Dict[str, Any]] = None) -> EnginePool:
+        """Pool du moteur pour cette configuration (un pool par config distincte)."""
+        key = (engine_name, self._config_key(config))
+        pool = self._engine_pools.get(key)
+        if pool is not None:
+            return pool
+
+        with self._engines_lock:
+            pool = self._engine_pools.get(key)
+            if pool is None:
+                if engine_name not in self._engines:
+                    raise KeyError(f"Moteur '{engine_name}' non enregistré")
+                spec = self._engines[engine_name]
+                pool = EnginePool(
+                    engine_name, spec["factory"], dict(config or {}),
+                    size=spec["pool_size"], exclusive=spec["exclusive"], warmup=spec["warmup"],
+                )
+                self._engine_pools[key] = pool
+        return pool
+
+    @contextmanager
+    def acquire_engine(
+        self,
+        engine_name: str,
+        config: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> Iterator[Any]:
+        """with registry.acquire_engine("fast_pdf", cfg) as engine: ..."""
+        with self.engine_pool(engine_name, config).acquire(timeout) as engine:
+            yield engine
+
+    def warm_up(self, engines: Optional[Dict[str, Optional[Dict[str, Any]]]] = None) -> Dict[str, Any]:
+        """
+        Pré-chauffe les moteurs au démarrage : {nom: config} (toutes les
+        configurations par défaut si None). Retourne les statistiques.
+        """
+        if engines is None:
+            engines = {name: None for name in self._engines}
+        for engine_name, config in engines.items():
+            try:
+                self.engine_pool(engine_name, config).prewarm()
+            except Exception as exc:
+                logger.error("❌ Pré-chauffage « %s » impossible : %s", engine_name, exc)
+        return self.engine_stats()
+
+    def engine_stats(self) -> Dict[str, Any]:
+        """Statistiques d'usage par moteur, configuration et instance."""
+        stats: Dict[str, Any] = {}
+        for (engine_name, config_key), pool in list(self._engine_pools.items()):
+            stats.setdefault(engine_name, []).append({"config": config_key, **pool.stats()})
+        return stats
+
+    def shutdown_engines(self) -> None:
+        with self._engines_lock:
+            pools = list(self._engine_pools.values())
+            self._engine_pools.clear()
+        for pool in pools:
+            pool.close()
+
+
+_default_registry: Optional[ModuleRegistry] = None
+_default_registry_lock = threading.Lock()
+
+
+def get_registry() -> ModuleRegistry:
+    """Registre du processus (moteurs partagés entre requêtes)."""
+    global _default_registry
+    if _default_registry is None:
+        with _default_registry_lock:
+            if _default_registry is None:
+                _default_registry = ModuleRegistry()
+    return _default_registry
+
@@ -0,0 +1,170 @@
+# core/engine/plugin_manifest.py
+"""
+Découverte des plug-ins sans import.
+
+Chaque paquet de modules décrit ses plug-ins dans un plugin.json :
+
+    {"plugins": [{"name": "modular_ocr",
+                  "class": "modules.ocr.modular_ocr:ModularOCRProcessor",
+                  "capabilities": ["ocr", "invoice"],
+                  "config_schema": {...}}]}
+
+Les manifestes (et les entry points « fiscal_ai.modules » des paquets
+installés) sont agrégés dans un cache JSON invalidé par mtime/taille :
+au démarrage, seul le cache est lu. La classe n'est importée qu'au
+ModuleRegistry.load_module().
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass, field
+from importlib import import_module
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = "plugin.json"
+ENTRY_POINT_GROUP = "fiscal_ai.modules"
+CACHE_VERSION = 1
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_PLUGIN_ROOTS = (PROJECT_ROOT / "modules",)
+DEFAULT_CACHE_PATH = Path(
+    os.getenv("FISCAL_AI_PLUGIN_CACHE", str(PROJECT_ROOT / ".cache" / "plugin_manifest.json"))
+)
+
+
+@dataclass
+class PluginSpec:
+    """Métadonnées d'enregistrement d'un plug-in (aucun import requis)."""
+    name: str
+    import_path: str                      # "paquet.module:Classe"
+    config_schema: Dict[str, Any] = field(default_factory=dict)
+    capabilities: List[str] = field(default_factory=list)
+    version: str = ""
+    description: str = ""
+    source: str = ""
+
+
+def resolve_import_path(import_path: str) -> Any:
+    """'paquet.module:Classe' → Classe (import effectif)."""
+    module_path, _, attribute = import_path.partition(":")
+    if not attribute:
+        module_path, _, attribute = import_path.rpartition(".")
+    return getattr(import_module(module_path), attribute)
+
+
+def _manifest_files(roots: Iterable[Path]) -> List[Path]:
+    """plugin.json à la racine et dans les sous-dossiers directs de chaque racine."""
+    found = []
+    for root in roots:
+        root = Path(root)
+        if not root.is_dir():
+            continue
+        if (root / MANIFEST_FILENAME).is_file():
+            found.append(root / MANIFEST_FILENAME)
+        for entry in sorted(os.scandir(root), key=lambda e: e.name):
+            if entry.is_dir() and not entry.name.startswith((".", "__")):
+                candidate = Path(entry.path) / MANIFEST_FILENAME
+                if candidate.is_file():
+                    found.append(candidate)
+    return found
+
+
+def _fingerprint(manifests: List[Path]) -> List[List[Any]]:
+    fingerprint = []
+    for path in manifests:
+        stat = path.stat()
+        fingerprint.append([str(path), stat.st_mtime_ns, stat.st_size])
+    return fingerprint
+
+
+def _parse_manifest(path: Path) -> List[PluginSpec]:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    specs = []
+    for plugin in data.get("plugins", []):
+        specs.append(PluginSpec(
+            name=plugin["name"],
+            import_path=plugin["class"],
+            config_schema=plugin.get("config_schema", {}),
+            capabilities=list(plugin.get("capabilities", [])),
+            version=str(plugin.get("version", "")),
+            description=plugin.get("description", ""),
+            source=str(path),
+        ))
+    return specs
+
+
+def _entry_point_specs(group: str) -> List[PluginSpec]:
+    """Plug-ins de paquets installés : nom + chemin d'import, métadonnées vides."""
+    try:
+        from importlib.metadata import entry_points
+        selected = entry_points(group=group)
+    except Exception as exc:                               # pragma: no cover
+        logger.warning("⚠️  Entry points '%s' illisibles : %s", group, exc)
+        return []
+    return [
+        PluginSpec(name=ep.name, import_path=ep.value, source=f"entry_point:{group}")
+        for ep in selected
+    ]
+
+
+def _load_cache(cache_path: Path, fingerprint: List[List[Any]]) -> Optional[List[PluginSpec]]:
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cache.get("version") != CACHE_VERSION or cache.get("fingerprint") != fingerprint:
+        return None
+    return [PluginSpec(**spec) for spec in cache.get("plugins", [])]
+
+
+def _save_cache(cache_path: Path, fingerprint: List[List[Any]], specs: List[PluginSpec]) -> None:
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(cache_path.suffix + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": CACHE_VERSION,
+                "fingerprint": fingerprint,
+                "plugins": [asdict(spec) for spec in specs],
+            }, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+    except OSError as exc:
+        logger.warning("⚠️  Cache des manifestes non écrit (%s) : %s", cache_path, exc)
+
+
+def discover_plugins(
+    roots: Optional[Iterable[Path]] = None,
+    cache_path: Optional[Path] = DEFAULT_CACHE_PATH,
+    entry_point_group: Optional[str] = ENTRY_POINT_GROUP,
+) -> List[PluginSpec]:
+    """
+    Spécifications de tous les plug-ins : cache si les manifestes n'ont pas
+    changé, relecture des plugin.json sinon. cache_path=None désactive le cache.
+    """
+    manifests = _manifest_files(roots if roots is not None else DEFAULT_PLUGIN_ROOTS)
+    fingerprint = _fingerprint(manifests)
+
+    specs = _load_cache(Path(cache_path), fingerprint) if cache_path else None
+    if specs is None:
+        specs = []
+        for manifest in manifests:
+            try:
+                specs.extend(_parse_manifest(manifest))
+            except (OSError, ValueError, KeyError) as exc:
+                logger.error("❌ Manifeste invalide %s : %s", manifest, exc)
+        if cache_path:
+            _save_cache(Path(cache_path), fingerprint, specs)
+        logger.info("📋 %d plug-in(s) lus depuis %d manifeste(s)", len(specs), len(manifests))
+
+    if entry_point_group:
+        known = {spec.name for spec in specs}
+        specs += [spec for spec in _entry_point_specs(entry_point_group) if spec.name not in known]
+    return specs
@@ -0,0 +1,297 @@
+# core/observability/metrics.py
+"""
+Métriques au format d'exposition Prometheus (text/plain 0.0.4), sans dépendance.
+
+• Histogram / Counter : un verrou, un bisect et deux additions par mesure,
+  assez léger pour rester actif en production (FISCAL_AI_METRICS=0 pour
+  retirer les sondes à l'import)
+• gauges calculées à la lecture (profondeur des files) : aucun coût hors scrape
+• pools de processus : les mesures prises dans un processus fils sont
+  renvoyées avec le résultat (drain_delta) et fusionnées dans le parent
+  (merge_delta), cf. core/engine/executors.py
+
+Métriques du pipeline :
+    fiscal_ai_stage_duration_seconds{stage}          text_extraction, regex_extraction,
+                                                     ocr, layout, field_extraction,
+                                                     db_write, encryption, decryption
+    fiscal_ai_documents_total{processing_method}     fast_pdf, hybrid, ocr_fallback, failed…
+"""
+
+from __future__ import annotations
+
+import functools
+import math
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+METRICS_ENABLED = os.getenv("FISCAL_AI_METRICS", "1") != "0"
+
+# Secondes : de la regex sur une page (~0,5 ms) à l'OCR d'un scan (~10 s)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                   0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+Labels = Tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in items
+        ]
+
+    def drain(self) -> Dict[Labels, float]:
+        with self._lock:
+            values, self._values = self._values, {}
+        return values
+
+    def merge(self, values: Dict[Labels, float]) -> None:
+        with self._lock:
+            for labels, value in values.items():
+                self._values[labels] = self._values.get(labels, 0.0) + value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels → [comptes par bucket (+Inf en dernier), somme]
+        self._series: Dict[Labels, list] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return sum(series[0]) if series else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((labels, (list(counts), total)) for labels, (counts, total) in self._series.items())
+        lines = self.header()
+        for labels, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+    def drain(self) -> Dict[Labels, list]:
+        with self._lock:
+            series, self._series = self._series, {}
+        return series
+
+    def merge(self, series: Dict[Labels, list]) -> None:
+        with self._lock:
+            for labels, (counts, total) in series.items():
+                current = self._series.get(labels)
+                if current is None:
+                    self._series[labels] = [list(counts), total]
+                else:
+                    current[0] = [a + b for a, b in zip(current[0], counts)]
+                    current[1] += total
+
+
+class GaugeFunction(_Metric):
+    """Gauge lue au scrape : fn() → {labels: valeur}."""
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str],
+                 fn: Callable[[], Dict[Labels, float]]):
+        super().__init__(name, documentation, labelnames)
+        self.fn = fn
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for labels, value in sorted(self.fn().items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        """Enregistre metric ; un nom déjà pris renvoie la métrique existante."""
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def unregister(self, name: str) -> None:
+        with self._lock:
+            self._metrics.pop(name, None)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def drain_delta(self) -> Dict[str, Any]:
+        """Mesures accumulées depuis le dernier drain (processus fils → parent)."""
+        delta = {}
+        for name, metric in list(self._metrics.items()):
+            if isinstance(metric, (Counter, Histogram)):
+                values = metric.drain()
+                if values:
+                    delta[name] = values
+        return delta
+
+    def merge_delta(self, delta: Dict[str, Any]) -> None:
+        for name, values in delta.items():
+            metric = self._metrics.get(name)
+            if isinstance(metric, (Counter, Histogram)):
+                metric.merge(values)
+
+    def reset(self) -> None:
+        self.drain_delta()
+
+
+REGISTRY = MetricsRegistry()
+
+# Un fils forké repart de zéro : son premier delta ne recompte pas le parent
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=REGISTRY.reset)
+
+STAGE_DURATION = REGISTRY.register(Histogram(
+    "fiscal_ai_stage_duration_seconds",
+    "Durée des étapes du pipeline d'extraction",
+    ("stage",),
+))
+DOCUMENTS_TOTAL = REGISTRY.register(Counter(
+    "fiscal_ai_documents_total",
+    "Documents traités par méthode d'extraction",
+    ("processing_method",),
+))
+
+
+def timed(stage: str) -> Callable:
+    """Décorateur : durée de l'appel dans fiscal_ai_stage_duration_seconds{stage}."""
+    def decorator(fn: Callable) -> Callable:
+        if not METRICS_ENABLED:
+            return fn
+
+        observe = STAGE_DURATION.observe
+        clock = time.perf_counter
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                observe(clock() - start, stage)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def stage_timer(stage: str) -> Iterator[None]:
+    """Variante bloc de timed() pour une portion de fonction."""
+    if not METRICS_ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_DURATION.observe(time.perf_counter() - start, stage)
+
+
+def call_collecting(fn: Callable, *args: Any) -> Tuple[bool, Any, Dict[str, Any]]:
+    """
+    Exécuté dans un processus fils : (succès, résultat ou exception, delta).
+    Le parent fusionne le delta puis relance l'exception (cf. unwrap_collected).
+    """
+    try:
+        return True, fn(*args), REGISTRY.drain_delta()
+    except Exception as exc:
+        return False, exc, REGISTRY.drain_delta()
+
+
+def unwrap_collected(outcome: Tuple[bool, Any, Dict[str, Any]]) -> Any:
+    ok, value, delta = outcome
+    REGISTRY.merge_delta(delta)
+    if not ok:
+        raise value
+    return value
+
+
+def record_document(processing_method: Optional[str]) -> None:
+    if METRICS_ENABLED:
+        DOCUMENTS_TOTAL.inc(processing_method or "unknown")
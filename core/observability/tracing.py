@@ -0,0 +1,281 @@
+# core/observability/tracing.py
+"""
+Spans OpenTelemetry par document pour le pipeline d'extraction.
+
+• span(name, attributes) : span enfant du span courant (fitz, regex,
+  pdf2image, tesseract, merge) ; sans traçage configuré, un contexte
+  partagé sans effet (aucun objet créé, aucune horloge lue)
+• échantillonnage en tête, par document : décidé une fois au span racine ;
+  les étapes d'un document non échantillonné reçoivent le contexte sans
+  effet, sans passer par le contexte OpenTelemetry (~15 µs par span évités)
+• propagation entre processus : trace_context() capture le span et la
+  décision d'échantillonnage du document, traced_call() les restaure dans
+  la tâche d'un pool (fast_pdf puis ocr : une seule trace par document)
+• export hors du chemin critique (BatchSpanProcessor) vers :
+    file   : JSON lines local (FISCAL_AI_TRACE_FILE)
+    otlp   : collecteur OTLP/HTTP local (FISCAL_AI_OTLP_ENDPOINT)
+    global : TracerProvider déjà installé par l'application
+    none   : désactivé (défaut)
+
+Configuration par variables d'environnement, lue au premier span de chaque
+processus (les processus fils des pools se configurent seuls) :
+    FISCAL_AI_TRACE_EXPORTER, FISCAL_AI_TRACE_SAMPLE_RATIO (défaut 0.05)
+
+opentelemetry-api et opentelemetry-sdk sont optionnels ; le SDK est requis
+pour file/otlp, opentelemetry-exporter-otlp-proto-http pour otlp.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import random
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    from opentelemetry import context as otel_context
+    from opentelemetry import trace as otel_trace
+    from opentelemetry.trace import Status, StatusCode
+    from opentelemetry.trace.propagation.tracecontext import TraceContextTextMapPropagator
+    _PROPAGATOR = TraceContextTextMapPropagator()
+except ImportError:  # pragma: no cover
+    otel_trace = None
+
+try:
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SpanExportResult
+    SDK_AVAILABLE = True
+except ImportError:
+    SDK_AVAILABLE = False
+
+EXPORTER_NONE = "none"
+EXPORTER_FILE = "file"
+EXPORTER_OTLP = "otlp"
+EXPORTER_GLOBAL = "global"
+
+DEFAULT_SAMPLE_RATIO = 0.05
+DEFAULT_TRACE_FILE = "logs/traces.jsonl"
+DEFAULT_OTLP_ENDPOINT = "http://localhost:4318/v1/traces"
+SERVICE_NAME = "fiscal-ai-platform"
+# Clé du porteur de contexte : décision d'échantillonnage du document ("1"/"0")
+SAMPLED_KEY = "fiscal-ai-sampled"
+
+
+class _NoopSpan:
+    """Span sans effet (traçage désactivé ou opentelemetry absent)."""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, attributes: Dict[str, Any]) -> None:
+        pass
+
+    def record_exception(self, exception: BaseException, **kwargs: Any) -> None:
+        pass
+
+    def is_recording(self) -> bool:
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class _NoopContext:
+    def __enter__(self) -> _NoopSpan:
+        return NOOP_SPAN
+
+    def __exit__(self, *exc_info: Any) -> bool:
+        return False
+
+
+_NOOP_CONTEXT = _NoopContext()
+
+
+if SDK_AVAILABLE:
+    class JsonLinesSpanExporter(SpanExporter):
+        """Un span JSON par ligne ; un write() par lot, en ajout (plusieurs processus)."""
+
+        def __init__(self, path: str = DEFAULT_TRACE_FILE):
+            self.path = path
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._lock = threading.Lock()
+
+        def export(self, spans) -> "SpanExportResult":
+            payload = "".join(span.to_json(indent=None) + "\n" for span in spans)
+            try:
+                with self._lock, open(self.path, "a", encoding="utf-8") as handle:
+                    handle.write(payload)
+                return SpanExportResult.SUCCESS
+            except OSError as exc:
+                logger.warning("⚠️  Export des traces impossible (%s): %s", self.path, exc)
+                return SpanExportResult.FAILURE
+
+        def shutdown(self) -> None:
+            pass
+
+
+_tracer = None
+_provider = None
+_configured = False
+_sample_ratio = DEFAULT_SAMPLE_RATIO
+_lock = threading.Lock()
+
+# Document en cours dans ce contexte : None (aucun), True/False (échantillonné ou non)
+_document_sampled: ContextVar[Optional[bool]] = ContextVar("fiscal_ai_document_sampled", default=None)
+
+
+def _build_exporter(exporter: str, path: Optional[str], endpoint: Optional[str]):
+    if exporter == EXPORTER_FILE:
+        return JsonLinesSpanExporter(path or os.getenv("FISCAL_AI_TRACE_FILE", DEFAULT_TRACE_FILE))
+    if exporter == EXPORTER_OTLP:
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        return OTLPSpanExporter(endpoint=endpoint or os.getenv("FISCAL_AI_OTLP_ENDPOINT", DEFAULT_OTLP_ENDPOINT))
+    raise ValueError(f"Exporteur de traces inconnu: {exporter}")
+
+
+def configure_tracing(exporter: Optional[str] = None, sample_ratio: Optional[float] = None,
+                      path: Optional[str] = None, endpoint: Optional[str] = None,
+                      span_exporter=None) -> bool:
+    """
+    (Re)configure le traçage du processus ; sans argument, depuis l'environnement.
+    span_exporter : exporteur SDK fourni directement (tests, intégrations).
+    Retourne True si les spans sont produits.
+    """
+    global _tracer, _provider, _configured, _sample_ratio
+    exporter = (exporter or os.getenv("FISCAL_AI_TRACE_EXPORTER", EXPORTER_NONE)).lower()
+    if sample_ratio is None:
+        sample_ratio = float(os.getenv("FISCAL_AI_TRACE_SAMPLE_RATIO", str(DEFAULT_SAMPLE_RATIO)))
+
+    with _lock:
+        if _provider is not None:
+            _provider.shutdown()
+        _tracer = _provider = None
+        _sample_ratio = max(0.0, min(1.0, sample_ratio))
+        _configured = True
+
+        if span_exporter is None and exporter == EXPORTER_NONE:
+            return False
+        if otel_trace is None:
+            logger.warning("⚠️  opentelemetry-api absent : traçage désactivé")
+            return False
+        if span_exporter is None and exporter == EXPORTER_GLOBAL:
+            _tracer = otel_trace.get_tracer(__name__)
+            return True
+        if not SDK_AVAILABLE:
+            logger.warning("⚠️  opentelemetry-sdk absent : exporteur '%s' ignoré", exporter)
+            return False
+
+        try:
+            span_exporter = span_exporter or _build_exporter(exporter, path, endpoint)
+        except Exception as exc:
+            logger.warning("⚠️  Exporteur de traces '%s' indisponible: %s", exporter, exc)
+            return False
+
+        # Échantillonneur par défaut (ParentBased(ALWAYS_ON)) : le tirage est fait dans span()
+        _provider = TracerProvider(resource=Resource.create({"service.name": SERVICE_NAME}))
+        _provider.add_span_processor(BatchSpanProcessor(span_exporter))
+        _tracer = _provider.get_tracer(__name__)
+        logger.info("🔭 Traçage actif (%s, échantillonnage %.1f %%)", exporter, _sample_ratio * 100)
+        return True
+
+
+def shutdown_tracing() -> None:
+    """Vide les spans en attente d'export."""
+    configure_tracing(EXPORTER_NONE)
+
+
+def _get_tracer():
+    if not _configured:
+        configure_tracing()
+    return _tracer
+
+
+def tracing_enabled() -> bool:
+    return _get_tracer() is not None
+
+
+@contextmanager
+def _otel_span(tracer, name: str, attributes: Optional[Dict[str, Any]]) -> Iterator[Any]:
+    with tracer.start_as_current_span(name, attributes=attributes,
+                                      record_exception=False, set_status_on_exception=False) as current:
+        try:
+            yield current
+        except Exception as exc:
+            if current.is_recording():
+                current.record_exception(exc)
+                current.set_status(Status(StatusCode.ERROR, str(exc)))
+            raise
+
+
+@contextmanager
+def _document_span(tracer, name: str, attributes: Optional[Dict[str, Any]], sampled: bool) -> Iterator[Any]:
+    token = _document_sampled.set(sampled)
+    try:
+        if sampled:
+            with _otel_span(tracer, name, attributes) as current:
+                yield current
+        else:
+            yield NOOP_SPAN
+    finally:
+        _document_sampled.reset(token)
+
+
+def span(name: str, attributes: Optional[Dict[str, Any]] = None):
+    """
+    Contexte « with span('fitz') as s: s.set_attribute(...) ».
+    Le premier span d'un document en est la racine et tire l'échantillonnage.
+    """
+    tracer = _tracer if _configured else _get_tracer()
+    if tracer is None:
+        return _NOOP_CONTEXT
+    sampled = _document_sampled.get()
+    if sampled is None:
+        return _document_span(tracer, name, attributes, random.random() < _sample_ratio)
+    if not sampled:
+        return _NOOP_CONTEXT
+    return _otel_span(tracer, name, attributes)
+
+
+def trace_context() -> Optional[Dict[str, str]]:
+    """
+    Contexte du document courant, sérialisable, pour une tâche d'un autre
+    processus (W3C traceparent + décision d'échantillonnage). None hors document.
+    """
+    sampled = _document_sampled.get()
+    if sampled is None:
+        return None
+    carrier = {SAMPLED_KEY: "1" if sampled else "0"}
+    if sampled:
+        _PROPAGATOR.inject(carrier)
+    return carrier
+
+
+@contextmanager
+def continue_trace(carrier: Optional[Dict[str, str]]) -> Iterator[None]:
+    """Les spans ouverts dans ce contexte rejoignent la trace du document d'origine."""
+    if not carrier or otel_trace is None or _document_sampled.get() is not None:
+        yield
+        return
+    sampled = carrier.get(SAMPLED_KEY) == "1"
+    token = _document_sampled.set(sampled)
+    attached = otel_context.attach(_PROPAGATOR.extract(carrier)) if sampled else None
+    try:
+        yield
+    finally:
+        if attached is not None:
+            otel_context.detach(attached)
+        _document_sampled.reset(token)
+
+
+def traced_call(fn, carrier: Optional[Dict[str, str]], *args: Any) -> Any:
+    """fn(*args) dans la trace décrite par carrier (fonction de module : picklable)."""
+    with continue_trace(carrier):
+        return fn(*args)
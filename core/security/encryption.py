@@ -1,4 +1,4 @@
-from cryptography.fernet import Fernet
+from cryptography.fernet import Fernet, MultiFernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
@@ -8,46 +8,242 @@ import base64
 import logging
 import hashlib
 import secrets
-from typing import Optional, Union, Tuple
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Union, Tuple
+
+try:
+    from core.observability.metrics import timed
+except ImportError:  # exécution directe : pas de métriques
+    def timed(stage):
+        return lambda function: function
+
+try:
+    from .password_hashing import (
+        PasswordHasher, get_default_hasher, get_verification_cache, identify_hasher
+    )
+except ImportError:  # exécution directe : python core/security/encryption.py
+    from password_hashing import (
+        PasswordHasher, get_default_hasher, get_verification_cache, identify_hasher
+    )
+
+# Séparateur entre l'identifiant de clé et le jeton chiffré : "<key_id>:<b64>".
+# Absent de l'alphabet base64 urlsafe, il distingue aussi les anciens chiffrés.
+KEY_ID_SEPARATOR = ":"
+KEY_ID_LENGTH = 16
+_FIXED_SALT = b'fiscal_ai_platform_salt_v2025_secure_derivation'
+
+
+class KeyRing:
+    """
+    Trousseau de clés partagé par tout le processus.
+
+    Chaque mot de passe maître n'est dérivé (PBKDF2) qu'une seule fois ;
+    la clé Fernet obtenue est ensuite mise en cache sous son identifiant
+    (empreinte courte de la clé dérivée, jamais du mot de passe).
+    """
+
+    def __init__(self, iterations: int = 100000, salt: bytes = _FIXED_SALT):
+        self.iterations = iterations
+        self.salt = salt
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._ciphers: Dict[str, Fernet] = {}
+        self._keys: Dict[str, bytes] = {}
+        self._created_at: Dict[str, datetime] = {}
+        # Index mémoire uniquement : empreinte du mot de passe → key_id
+        self._password_index: Dict[str, str] = {}
+
+    def derive(self, password: str) -> str:
+        """Dérive (une seule fois) la clé du mot de passe et retourne son key_id."""
+        fingerprint = hashlib.sha256(password.encode('utf-8')).hexdigest()
+        with self._lock:
+            key_id = self._password_index.get(fingerprint)
+            if key_id is not None:
+                return key_id
+
+            fernet_key = self._derive_fernet_key(password)
+            key_id = hashlib.sha256(b'fiscal_ai_key_id' + fernet_key).hexdigest()[:KEY_ID_LENGTH]
+            self._keys[key_id] = fernet_key
+            self._ciphers[key_id] = Fernet(fernet_key)
+            self._created_at.setdefault(key_id, datetime.utcnow())
+            self._password_index[fingerprint] = key_id
+            self.logger.info(f"🔑 Clé {key_id} dérivée et mise en cache")
+            return key_id
+
+    def get_cipher(self, key_id: str) -> Fernet:
+        try:
+            return self._ciphers[key_id]
+        except KeyError:
+            raise SecurityError(f"Clé inconnue: {key_id}")
+
+    def get_key(self, key_id: str) -> bytes:
+        try:
+            return self._keys[key_id]
+        except KeyError:
+            raise SecurityError(f"Clé inconnue: {key_id}")
+
+    def created_at(self, key_id: str) -> Optional[datetime]:
+        return self._created_at.get(key_id)
+
+    def key_ids(self) -> List[str]:
+        return list(self._ciphers)
+
+    def clear(self):
+        """Vide le cache (tests, changement de configuration)."""
+        with self._lock:
+            self._ciphers.clear()
+            self._keys.clear()
+            self._created_at.clear()
+            self._password_index.clear()
+
+    def __contains__(self, key_id: str) -> bool:
+        return key_id in self._ciphers
+
+    def _derive_fernet_key(self, password: str) -> bytes:
+        try:
+            kdf = PBKDF2HMAC(
+                algorithm=hashes.SHA256(),
+                length=32,
+                salt=self.salt,
+                iterations=self.iterations,
+                backend=default_backend()
+            )
+            derived_key = kdf.derive(password.encode('utf-8'))
+            return base64.urlsafe_b64encode(derived_key)
+        except Exception as e:
+            self.logger.error(f"❌ Erreur dérivation clé de chiffrement: {str(e)}")
+            raise SecurityError(f"Échec dérivation clé: {str(e)}")
+
+
+_default_keyring: Optional[KeyRing] = None
+_default_keyring_lock = threading.Lock()
+_default_security: Optional["SecurityManager"] = None
+_default_security_lock = threading.Lock()
+
+# Chiffrement par lots sur le pool « crypto » de l'ExecutorManager
+# (le backend OpenSSL libère le GIL)
+BATCH_MIN_PARALLEL_ITEMS = 8
+_crypto_executor: Optional[ThreadPoolExecutor] = None
+_crypto_executor_lock = threading.Lock()
+
+
+def get_crypto_executor() -> Executor:
+    """Retourne le pool de threads partagé pour encrypt_many/decrypt_many."""
+    try:
+        # Import différé : core.engine dépend de core.security, pas l'inverse
+        from core.engine.executors import POOL_CRYPTO, get_executor_manager
+    except ImportError:  # exécution directe : pool local au module
+        global _crypto_executor
+        if _crypto_executor is None:
+            with _crypto_executor_lock:
+                if _crypto_executor is None:
+                    max_workers = int(os.getenv('FISCAL_AI_CRYPTO_THREADS', '0')) or min(8, os.cpu_count() or 1)
+                    _crypto_executor = ThreadPoolExecutor(
+                        max_workers=max_workers, thread_name_prefix="crypto"
+                    )
+        return _crypto_executor
+    return get_executor_manager().pool(POOL_CRYPTO).executor
+
+
+def get_keyring() -> KeyRing:
+    """Retourne le trousseau de clés partagé du processus."""
+    global _default_keyring
+    if _default_keyring is None:
+        with _default_keyring_lock:
+            if _default_keyring is None:
+                _default_keyring = KeyRing()
+    return _default_keyring
+
+
+def get_security_manager() -> "SecurityManager":
+    """Retourne le SecurityManager partagé du processus (clé maître de l'environnement)."""
+    global _default_security
+    if _default_security is None:
+        with _default_security_lock:
+            if _default_security is None:
+                _default_security = SecurityManager()
+    return _default_security
+
 
 class SecurityManager:
     # ... docstring inchangée ...
 
-    def __init__(self, master_password: Optional[str] = None):
+    def __init__(self, master_password: Optional[str] = None,
+                 previous_passwords: Optional[List[str]] = None,
+                 keyring: Optional[KeyRing] = None,
+                 password_hasher: Optional[PasswordHasher] = None):
         # ... inchangé ...
         self.logger = logging.getLogger(__name__)
         self.salt_length = 32
-        self.key_derivation_iterations = 100000
+        self.keyring = keyring or get_keyring()
+        self.key_derivation_iterations = self.keyring.iterations
         
         self.master_password = (
             master_password or 
             os.getenv('FISCAL_AI_MASTER_KEY', 'fiscal_ai_secure_key_2025_production')
         )
-        self.encryption_key = self._derive_encryption_key(self.master_password)
-        self.cipher_suite = Fernet(self.encryption_key)
+        if previous_passwords is None:
+            previous_passwords = [
+                p for p in os.getenv('FISCAL_AI_PREVIOUS_MASTER_KEYS', '').split(',') if p
+            ]
+
+        # Clé primaire (chiffrement) + anciennes clés encore actives (déchiffrement)
+        self.key_id = self.keyring.derive(self.master_password)
+        self.active_key_ids: List[str] = [self.key_id]
+        for password in previous_passwords:
+            key_id = self.keyring.derive(password)
+            if key_id not in self.active_key_ids:
+                self.active_key_ids.append(key_id)
+
+        self.encryption_key = self.keyring.get_key(self.key_id)
+        self.cipher_suite = self.keyring.get_cipher(self.key_id)
+
+        self.password_hasher = password_hasher or get_default_hasher()
+        self.verification_cache = get_verification_cache()
 
         self.logger.info("🔒 SecurityManager initialisé avec chiffrement AES-256")
         self.logger.info(f"   - Salt length: {self.salt_length} bytes")
         self.logger.info(f"   - PBKDF2 iterations: {self.key_derivation_iterations}")
+        self.logger.info(f"   - Clés actives: {len(self.active_key_ids)} (primaire: {self.key_id})")
 
     def _derive_encryption_key(self, password: str) -> bytes:
-        try:
-            password_bytes = password.encode('utf-8')
-            fixed_salt = b'fiscal_ai_platform_salt_v2025_secure_derivation'
-            kdf = PBKDF2HMAC(
-                algorithm=hashes.SHA256(),
-                length=32,
-                salt=fixed_salt,
-                iterations=self.key_derivation_iterations,
-                backend=default_backend()
-            )
-            derived_key = kdf.derive(password_bytes)
-            fernet_key = base64.urlsafe_b64encode(derived_key)
-            return fernet_key
-        except Exception as e:
-            self.logger.error(f"❌ Erreur dérivation clé de chiffrement: {str(e)}")
-            raise SecurityError(f"Échec dérivation clé: {str(e)}")
+        return self.keyring.get_key(self.keyring.derive(password))
+
+    def rotate_key(self, new_password: str) -> str:
+        """
+        Rotation de clé (cf. PRODUCTION_CONFIG['key_rotation_days']) :
+        la nouvelle clé devient primaire, les anciennes restent actives
+        en déchiffrement jusqu'au re-chiffrement des données.
+        """
+        new_key_id = self.keyring.derive(new_password)
+        if new_key_id in self.active_key_ids:
+            self.active_key_ids.remove(new_key_id)
+        self.active_key_ids.insert(0, new_key_id)
+
+        self.master_password = new_password
+        self.key_id = new_key_id
+        self.encryption_key = self.keyring.get_key(new_key_id)
+        self.cipher_suite = self.keyring.get_cipher(new_key_id)
+        self.logger.info(f"🔄 Rotation de clé: nouvelle clé primaire {new_key_id}")
+        return new_key_id
+
+    def get_key_id(self, encrypted_data: str) -> Optional[str]:
+        """Identifiant de la clé d'un chiffré (None pour un ancien format non étiqueté)."""
+        key_id, sep, _ = encrypted_data.partition(KEY_ID_SEPARATOR)
+        return key_id if sep else None
 
+    def _cipher_for(self, encrypted_data: str) -> Tuple[Union[Fernet, MultiFernet], str]:
+        key_id, sep, payload = encrypted_data.partition(KEY_ID_SEPARATOR)
+        if not sep:
+            # Ancien format sans key_id : seules ces données essaient les clés actives
+            return MultiFernet([self.keyring.get_cipher(k) for k in self.active_key_ids]), encrypted_data
+        if key_id not in self.active_key_ids:
+            raise SecurityError("Données corrompues ou clé incorrecte")
+        return self.keyring.get_cipher(key_id), payload
+
+    @timed("encryption")
     def encrypt_data(self, data: Union[str, bytes]) -> str:
         try:
             if isinstance(data, str):
@@ -56,19 +252,25 @@ class SecurityManager:
                 data_bytes = data
             encrypted_data = self.cipher_suite.encrypt(data_bytes)
             encrypted_b64 = base64.urlsafe_b64encode(encrypted_data).decode('ascii')
-            self.logger.debug(f"✅ Données chiffrées: {len(data_bytes)} bytes → {len(encrypted_b64)} chars")
-            return encrypted_b64
+            tagged = f"{self.key_id}{KEY_ID_SEPARATOR}{encrypted_b64}"
+            self.logger.debug(f"✅ Données chiffrées: {len(data_bytes)} bytes → {len(tagged)} chars")
+            return tagged
         except Exception as e:
             self.logger.error(f"❌ Erreur chiffrement: {str(e)}")
             raise SecurityError(f"Échec chiffrement des données: {str(e)}")
 
     def decrypt_data(self, encrypted_data: str) -> str:
+        decrypted_str = self.decrypt_bytes(encrypted_data).decode('utf-8')
+        self.logger.debug(f"✅ Données déchiffrées: {len(encrypted_data)} chars → {len(decrypted_str)} bytes")
+        return decrypted_str
+
+    @timed("decryption")
+    def decrypt_bytes(self, encrypted_data: str) -> bytes:
+        """Comme decrypt_data, sans décodage UTF-8 (archives binaires)"""
         try:
-            encrypted_bytes = base64.urlsafe_b64decode(encrypted_data.encode('ascii'))
-            decrypted_bytes = self.cipher_suite.decrypt(encrypted_bytes)
-            decrypted_str = decrypted_bytes.decode('utf-8')
-            self.logger.debug(f"✅ Données déchiffrées: {len(encrypted_data)} chars → {len(decrypted_str)} bytes")
-            return decrypted_str
+            cipher, payload = self._cipher_for(encrypted_data)
+            encrypted_bytes = base64.urlsafe_b64decode(payload.encode('ascii'))
+            return cipher.decrypt(encrypted_bytes)
         except Exception as e:
             self.logger.error(f"❌ Erreur déchiffrement: {str(e)}")
             if "InvalidToken" in str(e):
@@ -76,37 +278,79 @@ class SecurityManager:
             else:
                 raise SecurityError(f"Échec déchiffrement: {str(e)}")
 
+    def encrypt_many(self, items: Iterable[Union[str, bytes]]) -> List[str]:
+        """Chiffre un lot en parallèle ; l'ordre des résultats suit celui des entrées."""
+        return self._map_parallel(self.encrypt_data, list(items), return_exceptions=False)
+
+    def decrypt_many(self, items: Iterable[str],
+                     return_exceptions: bool = False) -> List[Union[str, 'SecurityError']]:
+        """
+        Déchiffre un lot en parallèle en conservant l'ordre.
+        Avec return_exceptions=True, un élément en échec est remplacé par
+        sa SecurityError au lieu d'interrompre tout le lot.
+        """
+        return self._map_parallel(self.decrypt_data, list(items), return_exceptions)
+
+    def _map_parallel(self, func, items: list, return_exceptions: bool) -> list:
+        if return_exceptions:
+            def call(item):
+                try:
+                    return func(item)
+                except SecurityError as e:
+                    return e
+        else:
+            call = func
+
+        # Petits lots : le coût de dispatch dépasse le gain
+        if len(items) < BATCH_MIN_PARALLEL_ITEMS:
+            return [call(item) for item in items]
+        return list(get_crypto_executor().map(call, items))
+
     def hash_password(self, password: str) -> str:
         try:
-            salt = secrets.token_bytes(self.salt_length)
-            combined = salt + password.encode('utf-8')
-            password_hash = hashlib.sha256(combined).hexdigest()
-            salt_hex = salt.hex()
-            stored_hash = f"{salt_hex}${password_hash}"
-            self.logger.debug(f"✅ Mot de passe haché avec salt de {len(salt)} bytes")
+            stored_hash = self.password_hasher.hash(password)
+            self.logger.debug(f"✅ Mot de passe haché ({self.password_hasher.scheme})")
             return stored_hash
         except Exception as e:
             self.logger.error(f"❌ Erreur hachage mot de passe: {str(e)}")
             raise SecurityError(f"Échec hachage: {str(e)}")
 
     def verify_password(self, plain_password: str, stored_hash: str) -> bool:
+        is_valid, _ = self.verify_and_update_password(plain_password, stored_hash)
+        return is_valid
+
+    def verify_and_update_password(self, plain_password: str,
+                                   stored_hash: str) -> Tuple[bool, Optional[str]]:
+        """
+        Vérifie un mot de passe et retourne (valide, nouveau_hash).
+        nouveau_hash est fourni quand le hash stocké est d'un ancien format
+        ou paramétrage : l'appelant le persiste (migration transparente au login).
+        """
         try:
-            if '$' not in stored_hash:
-                self.logger.warning("⚠️  Format de hash invalide (pas de séparateur $)")
-                return False
-            salt_hex, expected_hash = stored_hash.split('$', 1)
-            salt = bytes.fromhex(salt_hex)
-            combined = salt + plain_password.encode('utf-8')
-            calculated_hash = hashlib.sha256(combined).hexdigest()
-            is_valid = secrets.compare_digest(calculated_hash, expected_hash)
-            if is_valid:
+            hasher = identify_hasher(stored_hash, self.password_hasher)
+            if hasher is None:
+                self.logger.warning("⚠️  Format de hash invalide")
+                return False, None
+
+            if self.verification_cache.contains(plain_password, stored_hash):
+                self.logger.debug("✅ Mot de passe vérifié (cache)")
+            elif hasher.verify(plain_password, stored_hash):
                 self.logger.debug("✅ Mot de passe vérifié avec succès")
             else:
                 self.logger.debug("❌ Mot de passe incorrect")
-            return is_valid
+                return False, None
+
+            if hasher is not self.password_hasher or hasher.needs_rehash(stored_hash):
+                new_hash = self.password_hasher.hash(plain_password)
+                self.verification_cache.add(plain_password, new_hash)
+                self.logger.info(f"🔄 Hash migré {hasher.scheme} → {self.password_hasher.scheme}")
+                return True, new_hash
+
+            self.verification_cache.add(plain_password, stored_hash)
+            return True, None
         except Exception as e:
             self.logger.error(f"❌ Erreur vérification mot de passe: {str(e)}")
-            return False
+            return False, None
 
     def generate_secure_token(self, length: int = 32) -> str:
         try:
@@ -122,8 +366,7 @@ class SecurityManager:
         try:
             with open(file_path, 'rb') as file:
                 file_content = file.read()
-            encrypted_content = self.cipher_suite.encrypt(file_content)
-            encrypted_b64 = base64.urlsafe_b64encode(encrypted_content).decode('ascii')
+            encrypted_b64 = self.encrypt_data(file_content)
             self.logger.info(f"✅ Fichier chiffré: {file_path} ({len(file_content)} bytes)")
             return encrypted_b64
         except Exception as e:
@@ -135,8 +378,11 @@ class SecurityManager:
             'encryption_algorithm': 'AES-256 (via Fernet)',
             'key_derivation': 'PBKDF2-HMAC-SHA256',
             'iterations': self.key_derivation_iterations,
+            'active_keys': list(self.active_key_ids),
+            'primary_key_id': self.key_id,
+            'key_rotation_days': PRODUCTION_CONFIG['key_rotation_days'],
             'salt_length_bytes': self.salt_length,
-            'password_hashing': 'SHA-256 avec salt aléatoire',
+            'password_hashing': self.password_hasher.describe(),
             'secure_random': 'secrets module (CSPRNG)',
             'compliance': ['RGPD', 'Standards bancaires', 'ANSSI-compatible']
         }
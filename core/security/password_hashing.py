@@ -0,0 +1,295 @@
+"""
+Hachage des mots de passe – algorithmes à coût mémoire (scrypt / Argon2id).
+
+• Hachers interchangeables, identifiés par le préfixe du hash stocké
+• Paramètres calibrés par un mini-benchmark (cible en millisecondes)
+• Les anciens hash « salt_hex$sha256 » restent vérifiables et sont migrés
+• Cache TTL court des vérifications réussies contre les rafales de login
+"""
+
+import base64
+import hashlib
+import hmac
+import logging
+import os
+import secrets
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from cachetools import TTLCache
+
+# Import conditionnel d'argon2-cffi (scrypt via hashlib sinon)
+try:
+    import argon2
+    from argon2.exceptions import InvalidHashError, VerifyMismatchError, VerificationError
+    ARGON2_AVAILABLE = True
+except ImportError:
+    ARGON2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.b64encode(data).decode('ascii').rstrip('=')
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.b64decode(data + '=' * (-len(data) % 4))
+
+
+class PasswordHasher(ABC):
+    """Interface commune des hachers de mots de passe."""
+
+    scheme = ""
+
+    @abstractmethod
+    def hash(self, password: str) -> str:
+        pass
+
+    @abstractmethod
+    def verify(self, password: str, stored_hash: str) -> bool:
+        pass
+
+    def identify(self, stored_hash: str) -> bool:
+        return stored_hash.startswith(f"${self.scheme}$")
+
+    def needs_rehash(self, stored_hash: str) -> bool:
+        """Vrai si le hash n'utilise pas les paramètres courants."""
+        return False
+
+    def describe(self) -> str:
+        return self.scheme
+
+
+class ScryptHasher(PasswordHasher):
+    """scrypt (RFC 7914) via hashlib : $scrypt$ln=14,r=8,p=1$<salt>$<hash>"""
+
+    scheme = "scrypt"
+
+    def __init__(self, ln: int = 14, r: int = 8, p: int = 1,
+                 salt_length: int = 32, hash_length: int = 32):
+        self.ln = ln
+        self.r = r
+        self.p = p
+        self.salt_length = salt_length
+        self.hash_length = hash_length
+
+    def hash(self, password: str) -> str:
+        salt = secrets.token_bytes(self.salt_length)
+        derived = self._scrypt(password, salt, self.ln, self.r, self.p, self.hash_length)
+        return f"$scrypt$ln={self.ln},r={self.r},p={self.p}${_b64encode(salt)}${_b64encode(derived)}"
+
+    def verify(self, password: str, stored_hash: str) -> bool:
+        params, salt, expected = self._parse(stored_hash)
+        derived = self._scrypt(password, salt, params['ln'], params['r'], params['p'], len(expected))
+        return secrets.compare_digest(derived, expected)
+
+    def needs_rehash(self, stored_hash: str) -> bool:
+        params, salt, _ = self._parse(stored_hash)
+        return (params['ln'], params['r'], params['p'], len(salt)) != (
+            self.ln, self.r, self.p, self.salt_length
+        )
+
+    def describe(self) -> str:
+        return f"scrypt (N=2^{self.ln}, r={self.r}, p={self.p})"
+
+    @staticmethod
+    def _scrypt(password: str, salt: bytes, ln: int, r: int, p: int, length: int) -> bytes:
+        n = 1 << ln
+        return hashlib.scrypt(
+            password.encode('utf-8'), salt=salt, n=n, r=r, p=p,
+            maxmem=256 * r * (n + p + 2), dklen=length
+        )
+
+    @staticmethod
+    def _parse(stored_hash: str):
+        _, _, param_str, salt_b64, hash_b64 = stored_hash.split('$')
+        params = {k: int(v) for k, v in (item.split('=') for item in param_str.split(','))}
+        return params, _b64decode(salt_b64), _b64decode(hash_b64)
+
+
+class Argon2Hasher(PasswordHasher):
+    """Argon2id via argon2-cffi (format PHC standard $argon2id$...)."""
+
+    scheme = "argon2id"
+
+    def __init__(self, time_cost: int = 3, memory_cost: int = 65536, parallelism: int = 2):
+        if not ARGON2_AVAILABLE:
+            raise ImportError("argon2-cffi n'est pas installé. Utilisez: pip install argon2-cffi")
+        self.time_cost = time_cost
+        self.memory_cost = memory_cost
+        self.parallelism = parallelism
+        self._hasher = argon2.PasswordHasher(
+            time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism
+        )
+
+    def hash(self, password: str) -> str:
+        return self._hasher.hash(password)
+
+    def verify(self, password: str, stored_hash: str) -> bool:
+        try:
+            return self._hasher.verify(stored_hash, password)
+        except (VerifyMismatchError, VerificationError, InvalidHashError):
+            return False
+
+    def needs_rehash(self, stored_hash: str) -> bool:
+        return self._hasher.check_needs_rehash(stored_hash)
+
+    def describe(self) -> str:
+        return f"Argon2id (t={self.time_cost}, m={self.memory_cost} KiB, p={self.parallelism})"
+
+
+class LegacySha256Hasher(PasswordHasher):
+    """Ancien format « salt_hex$sha256_hex » : vérification seule, toujours à migrer."""
+
+    scheme = "sha256"
+
+    def hash(self, password: str) -> str:
+        raise ValueError("Format SHA-256 obsolète : utiliser scrypt ou Argon2id")
+
+    def verify(self, password: str, stored_hash: str) -> bool:
+        salt_hex, expected_hash = stored_hash.split('$', 1)
+        combined = bytes.fromhex(salt_hex) + password.encode('utf-8')
+        return secrets.compare_digest(hashlib.sha256(combined).hexdigest(), expected_hash)
+
+    def identify(self, stored_hash: str) -> bool:
+        return '$' in stored_hash and not stored_hash.startswith('$')
+
+    def needs_rehash(self, stored_hash: str) -> bool:
+        return True
+
+
+# ---------------------------------------------------------------------- #
+#  CALIBRATION
+# ---------------------------------------------------------------------- #
+def _measure_ms(hasher: PasswordHasher, rounds: int = 3) -> float:
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        hasher.hash("calibration-benchmark")
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best
+
+
+def calibrate_scrypt(target_ms: float = 250.0, r: int = 8, p: int = 1,
+                     min_ln: int = 14, max_ln: int = 20) -> ScryptHasher:
+    """Plus grand N (puissance de 2) dont le hachage reste sous target_ms."""
+    best = ScryptHasher(ln=min_ln, r=r, p=p)
+    for ln in range(min_ln, max_ln + 1):
+        candidate = ScryptHasher(ln=ln, r=r, p=p)
+        elapsed = _measure_ms(candidate)
+        logger.info(f"⏱️  scrypt ln={ln}: {elapsed:.1f} ms")
+        if elapsed > target_ms:
+            break
+        best = candidate
+    return best
+
+
+def calibrate_argon2(target_ms: float = 250.0, memory_cost: int = 65536,
+                     parallelism: int = 2, max_time_cost: int = 10) -> Argon2Hasher:
+    """Mémoire fixe, plus grand time_cost sous target_ms."""
+    best = Argon2Hasher(time_cost=1, memory_cost=memory_cost, parallelism=parallelism)
+    for time_cost in range(1, max_time_cost + 1):
+        candidate = Argon2Hasher(time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism)
+        elapsed = _measure_ms(candidate)
+        logger.info(f"⏱️  argon2id t={time_cost}: {elapsed:.1f} ms")
+        if elapsed > target_ms:
+            break
+        best = candidate
+    return best
+
+
+def calibrate(target_ms: float = 250.0) -> PasswordHasher:
+    """Argon2id si disponible, scrypt sinon."""
+    if ARGON2_AVAILABLE:
+        return calibrate_argon2(target_ms)
+    return calibrate_scrypt(target_ms)
+
+
+_default_hasher: Optional[PasswordHasher] = None
+_default_hasher_lock = threading.Lock()
+
+
+def get_default_hasher() -> PasswordHasher:
+    """
+    Hacher du processus, configurable par variables d'environnement :
+    FISCAL_AI_PASSWORD_HASHER (scrypt | argon2id) et
+    FISCAL_AI_PASSWORD_HASH_TARGET_MS (calibration au premier usage).
+    """
+    global _default_hasher
+    if _default_hasher is None:
+        with _default_hasher_lock:
+            if _default_hasher is None:
+                scheme = os.getenv('FISCAL_AI_PASSWORD_HASHER', 'argon2id' if ARGON2_AVAILABLE else 'scrypt')
+                target_ms = os.getenv('FISCAL_AI_PASSWORD_HASH_TARGET_MS')
+                if scheme == 'argon2id':
+                    _default_hasher = calibrate_argon2(float(target_ms)) if target_ms else Argon2Hasher()
+                else:
+                    _default_hasher = calibrate_scrypt(float(target_ms)) if target_ms else ScryptHasher()
+                logger.info(f"🔐 Hachage mots de passe: {_default_hasher.describe()}")
+    return _default_hasher
+
+
+def identify_hasher(stored_hash: str, current: PasswordHasher) -> Optional[PasswordHasher]:
+    """Retrouve le hacher capable de vérifier un hash stocké."""
+    if current.identify(stored_hash):
+        return current
+    candidates = [ScryptHasher(), LegacySha256Hasher()]
+    if ARGON2_AVAILABLE:
+        candidates.insert(0, Argon2Hasher())
+    for hasher in candidates:
+        if hasher.identify(stored_hash):
+            return hasher
+    return None
+
+
+# ---------------------------------------------------------------------- #
+#  CACHE DES VÉRIFICATIONS
+# ---------------------------------------------------------------------- #
+class VerificationCache:
+    """
+    Vérifications réussies récentes, indexées par HMAC(secret du processus,
+    hash stocké + mot de passe) : rien de réutilisable hors du processus.
+    """
+
+    def __init__(self, ttl: float = 60.0, maxsize: int = 4096):
+        self._secret = secrets.token_bytes(32)
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+
+    def _key(self, password: str, stored_hash: str) -> bytes:
+        message = stored_hash.encode('utf-8') + b'\0' + password.encode('utf-8')
+        return hmac.new(self._secret, message, hashlib.sha256).digest()
+
+    def contains(self, password: str, stored_hash: str) -> bool:
+        key = self._key(password, stored_hash)
+        with self._lock:
+            return key in self._cache
+
+    def add(self, password: str, stored_hash: str):
+        key = self._key(password, stored_hash)
+        with self._lock:
+            self._cache[key] = True
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+_verification_cache = VerificationCache(
+    ttl=float(os.getenv('FISCAL_AI_PASSWORD_CACHE_TTL', '60'))
+)
+
+
+def get_verification_cache() -> VerificationCache:
+    return _verification_cache
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    target = float(os.getenv('FISCAL_AI_PASSWORD_HASH_TARGET_MS', '250'))
+    print(f"⏱️  Calibration pour une cible de {target:.0f} ms...")
+    hasher = calibrate(target)
+    print(f"✅ Paramètres retenus: {hasher.describe()} ({_measure_ms(hasher):.1f} ms)")
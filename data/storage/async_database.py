@@ -0,0 +1,279 @@
+"""
+AsyncDatabaseManager – équivalent asynchrone de DatabaseManager
+(SQLAlchemy asyncio : aiosqlite / asyncpg) pour les routes FastAPI.
+
+Même API documents / audit / health-check, en coroutines ; le chiffrement
+et le déchiffrement partent dans des threads pour ne pas bloquer la boucle.
+"""
+
+import asyncio
+import json
+import logging
+
+from sqlalchemy import select, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from core.engine.executors import POOL_CRYPTO, PRIORITY_INTERACTIVE, get_executor_manager
+from data.storage.database import (
+    Base, Document, AuditLog, DatabaseManager, ClientDataVersion,
+    attach_document_content, bump_data_versions, document_hash, document_list_query,
+    document_page, dump_metadata, encrypted_document_fields, get_pool_config, ingest_result,
+    link_duplicate_alias, upgrade_schema,
+)
+
+# Pilotes asynchrones par défaut pour les URL synchrones
+ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'postgresql': 'postgresql+asyncpg',
+    'postgresql+psycopg2': 'postgresql+asyncpg',
+    'postgresql+psycopg': 'postgresql+asyncpg',
+}
+
+
+def to_async_url(database_url: str) -> str:
+    """sqlite:///x.db → sqlite+aiosqlite:///x.db, postgresql://… → postgresql+asyncpg://…"""
+    scheme, sep, rest = database_url.partition('://')
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+
+class AsyncDatabaseManager:
+    """Gestionnaire de base de données asynchrone avec sécurité intégrée"""
+
+    def __init__(self, database_url: str, security_manager=None, pool_config: dict = None):
+        self.database_url = to_async_url(database_url)
+        self.security_manager = security_manager
+        self.logger = logging.getLogger(__name__)
+        self.pool_config = get_pool_config(pool_config)
+        self.audit_partitions = None
+
+        # SQLite en mémoire : pool statique, pas de dimensionnement possible
+        engine_options = {} if ':memory:' in self.database_url else dict(self.pool_config)
+        self.engine = create_async_engine(
+            self.database_url,
+            **engine_options,
+            pool_pre_ping=True,
+            echo=False
+        )
+        self.SessionLocal = async_sessionmaker(
+            bind=self.engine,
+            class_=AsyncSession,
+            autoflush=False,
+            expire_on_commit=False
+        )
+
+    @classmethod
+    async def create(cls, database_url: str, security_manager=None,
+                     pool_config: dict = None) -> "AsyncDatabaseManager":
+        """Construction + création des tables"""
+        manager = cls(database_url, security_manager, pool_config)
+        await manager.initialize()
+        return manager
+
+    async def initialize(self):
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            upgraded = await conn.run_sync(upgrade_schema)
+        if upgraded:
+            self.logger.info(f"♻️  Schéma mis à niveau: {', '.join(upgraded)}")
+        self.logger.info("✅ Base de données asynchrone initialisée avec succès")
+
+    def get_session(self) -> AsyncSession:
+        """Récupération d'une session asynchrone"""
+        return self.SessionLocal()
+
+    async def dispose(self):
+        await self.engine.dispose()
+
+    # ------------------------------------------------------------------ #
+    #  CHIFFREMENT HORS BOUCLE
+    # ------------------------------------------------------------------ #
+    async def _encrypt(self, value: str) -> str:
+        if not self.security_manager:
+            return value
+        # Pool crypto partagé ; une écriture n'est jamais refusée (block=True)
+        return await get_executor_manager().run(
+            POOL_CRYPTO, self.security_manager.encrypt_data, value,
+            priority=PRIORITY_INTERACTIVE, block=True
+        )
+
+    async def _decrypt_many(self, values: list) -> list:
+        # decrypt_many répartit lui-même le lot sur le pool crypto : pas d'appel
+        # imbriqué depuis un thread de ce même pool
+        return await asyncio.to_thread(
+            self.security_manager.decrypt_many, values, return_exceptions=True
+        )
+
+    # ------------------------------------------------------------------ #
+    #  DOCUMENTS
+    # ------------------------------------------------------------------ #
+    async def create_document(self, client_id: str, filename: str, content: str,
+                              document_type: str = "unknown", metadata: dict = None) -> int:
+        """Cf. DatabaseManager.create_document : id existant si le contenu est un doublon"""
+        result = await self.ingest_document(client_id, filename, content, document_type, metadata)
+        return result['document_id']
+
+    async def ingest_document(self, client_id: str, filename: str, content: str,
+                              document_type: str = "unknown", metadata: dict = None) -> dict:
+        """Cf. DatabaseManager.ingest_document"""
+        file_hash = document_hash(content)
+
+        duplicate = await self._link_duplicate(client_id, file_hash, filename)
+        if duplicate:
+            return duplicate
+
+        content_encrypted = await self._encrypt(content)
+        metadata_encrypted = await self._encrypt(dump_metadata(metadata))
+
+        async with self.get_session() as session:
+            try:
+                document = Document(
+                    client_id=client_id,
+                    filename=filename,
+                    document_type=document_type,
+                    content_encrypted=content_encrypted,
+                    metadata_encrypted=metadata_encrypted,
+                    file_hash=file_hash
+                )
+                session.add(document)
+                await session.run_sync(bump_data_versions, [client_id])
+                await session.commit()
+
+                self.logger.info(f"✅ Document {document.id} créé pour client {client_id}")
+                return ingest_result(document.id, False, document.processing_status)
+            except IntegrityError:
+                await session.rollback()
+                duplicate = await self._link_duplicate(client_id, file_hash, filename)
+                if duplicate:
+                    return duplicate
+                raise
+            except Exception as e:
+                await session.rollback()
+                self.logger.error(f"❌ Erreur création document: {str(e)}")
+                raise
+
+    async def _link_duplicate(self, client_id: str, file_hash: str, filename: str) -> dict:
+        async with self.get_session() as session:
+            existing = await session.run_sync(link_duplicate_alias, client_id, file_hash, filename)
+            if not existing:
+                return None
+            await session.commit()
+
+        self.logger.info(f"♻️  Contenu déjà connu: {filename} → document {existing.id}")
+        return ingest_result(existing.id, True, existing.processing_status,
+                             await self.get_processing_result(existing.id))
+
+    async def get_document(self, document_id: int, decrypt: bool = True) -> dict:
+        """Récupération sécurisée d'un document"""
+        documents = await self.get_documents([document_id], decrypt=decrypt)
+        return documents[0] if documents else None
+
+    async def get_documents(self, document_ids: list, decrypt: bool = True) -> list:
+        """Récupération groupée (une requête IN) avec déchiffrement hors boucle"""
+        if not document_ids:
+            return []
+
+        async with self.get_session() as session:
+            documents = (await session.execute(
+                select(Document).where(Document.id.in_(document_ids))
+            )).scalars().all()
+
+        by_id = {document.id: document for document in documents}
+        ordered = [by_id[doc_id] for doc_id in document_ids if doc_id in by_id]
+        results = [DatabaseManager._document_to_dict(document) for document in ordered]
+        await self._attach_content(results, ordered, decrypt)
+        return results
+
+    async def get_data_version(self, client_id: str) -> tuple:
+        """Cf. DatabaseManager.get_data_version"""
+        async with self.get_session() as session:
+            row = (await session.execute(
+                select(ClientDataVersion.version, ClientDataVersion.updated_at)
+                .where(ClientDataVersion.client_id == client_id)
+            )).first()
+            return (row.version, row.updated_at) if row else (0, None)
+
+    async def list_documents(self, client_id: str = None, document_type: str = None,
+                             processing_status: str = None, created_from=None, created_to=None,
+                             limit: int = 50, cursor: str = None, decrypt: bool = False) -> dict:
+        """Cf. DatabaseManager.list_documents (pagination par clé)"""
+        query = document_list_query(client_id, document_type, processing_status,
+                                    created_from, created_to, limit, cursor, decrypt)
+
+        async with self.get_session() as session:
+            rows, results, next_cursor = document_page((await session.execute(query)).all(), limit)
+        if decrypt:
+            await self._attach_content(results, rows, decrypt=True)
+        return {'documents': results, 'next_cursor': next_cursor}
+
+    async def _attach_content(self, results: list, rows: list, decrypt: bool):
+        decrypted = None
+        if decrypt and self.security_manager:
+            decrypted = await self._decrypt_many(encrypted_document_fields(rows))
+        attach_document_content(results, rows, decrypted, self.logger)
+
+    async def get_processing_result(self, document_id: int) -> dict:
+        """Résultat d'extraction déchiffré (None si pas encore traité)"""
+        async with self.get_session() as session:
+            payload = (await session.execute(
+                select(Document.result_encrypted).where(Document.id == document_id)
+            )).scalar()
+        if not payload:
+            return None
+        if self.security_manager:
+            payload = await get_executor_manager().run(
+                POOL_CRYPTO, self.security_manager.decrypt_data, payload,
+                priority=PRIORITY_INTERACTIVE, block=True
+            )
+        return json.loads(payload)
+
+    # ------------------------------------------------------------------ #
+    #  AUDIT & SANTÉ
+    # ------------------------------------------------------------------ #
+    async def log_audit(self, user_id: str, action: str, resource_type: str = None,
+                        resource_id: str = None, details: dict = None, success: bool = True):
+        """Enregistrement d'audit sécurisé"""
+        if self.audit_partitions is not None:
+            try:
+                await self.audit_partitions.awrite_many([dict(
+                    user_id=user_id, action=action, resource_type=resource_type,
+                    resource_id=resource_id, details=details, success=success,
+                )])
+            except Exception as e:
+                self.logger.error(f"❌ Erreur log audit: {str(e)}")
+            return
+
+        try:
+            details_encrypted = ""
+            if details and self.security_manager:
+                details_encrypted = await self._encrypt(str(details))
+
+            async with self.get_session() as session:
+                session.add(AuditLog(
+                    user_id=user_id,
+                    action=action,
+                    resource_type=resource_type,
+                    resource_id=resource_id,
+                    details_encrypted=details_encrypted,
+                    success=success
+                ))
+                await session.commit()
+        except Exception as e:
+            self.logger.error(f"❌ Erreur log audit: {str(e)}")
+
+    def enable_audit_partitioning(self, **options):
+        """Cf. DatabaseManager.enable_audit_partitioning (écritures seulement :
+        lecture et rétention via le DatabaseManager synchrone)"""
+        from data.storage.audit_partitions import AuditPartitionManager
+        self.audit_partitions = AuditPartitionManager(self, **options)
+        return self.audit_partitions
+
+    async def health_check(self) -> bool:
+        """Vérification de l'état de la base de données"""
+        try:
+            async with self.get_session() as session:
+                await session.execute(text("SELECT 1"))
+            return True
+        except Exception as e:
+            self.logger.error(f"❌ Health check failed: {str(e)}")
+            return False
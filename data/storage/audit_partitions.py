@@ -0,0 +1,448 @@
+"""
+Journal d'audit partitionné par mois.
+
+• SQLite     : une table audit_logs_YYYYMM par mois, créée à la demande
+• PostgreSQL : table audit_log_events PARTITION BY RANGE (timestamp),
+               partitions audit_logs_YYYYMM attachées à la demande
+• awrite_many() : écriture depuis l'AsyncDatabaseManager (lecture et
+  rétention passent par le DatabaseManager synchrone, mêmes tables)
+• query()/count() : seules les partitions qui recouvrent la plage sont lues
+• apply_retention() : les mois hors rétention sont archivés (NDJSON gzip ou
+  Parquet zstd, chiffrés d'un bloc avec la clé courante) puis supprimés
+"""
+
+import asyncio
+import gzip
+import io
+import json
+import logging
+import os
+import re
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from sqlalchemy import (
+    Boolean, Column, DateTime, Index, Integer, MetaData, String, Table, Text,
+    func, inspect, select, text,
+)
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from data.storage.database import AuditLog
+
+# Import conditionnel de pyarrow (archives Parquet)
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+PARTITION_PREFIX = "audit_logs_"
+PARENT_TABLE = "audit_log_events"
+_PARTITION_RE = re.compile(rf"^{PARTITION_PREFIX}(\d{{6}})$")
+
+ARCHIVE_EXTENSIONS = {
+    'ndjson': '.ndjson.gz.enc',
+    'parquet': '.parquet.enc',
+}
+
+AUDIT_COLUMNS = ('id', 'user_id', 'action', 'resource_type', 'resource_id', 'timestamp',
+                 'ip_address', 'user_agent', 'details_encrypted', 'success')
+
+
+def month_of(moment: datetime) -> str:
+    return moment.strftime('%Y%m')
+
+
+def month_bounds(month: str):
+    """'202401' → (2024-01-01, 2024-02-01)"""
+    year, number = int(month[:4]), int(month[4:])
+    start = datetime(year, number, 1)
+    end = datetime(year + number // 12, number % 12 + 1, 1)
+    return start, end
+
+
+def shift_months(moment: datetime, months: int) -> datetime:
+    index = moment.year * 12 + moment.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def _audit_table(name: str, metadata: MetaData, partitioned: bool = False) -> Table:
+    """Mêmes colonnes qu'AuditLog ; index nommés par partition (noms globaux en SQLite)."""
+    columns = [
+        Column('id', Integer, primary_key=True, autoincrement=not partitioned),
+        Column('user_id', String(50), nullable=False),
+        Column('action', String(100), nullable=False),
+        Column('resource_type', String(50)),
+        Column('resource_id', String(50)),
+        Column('timestamp', DateTime, nullable=False, primary_key=partitioned),
+        Column('ip_address', String(45)),
+        Column('user_agent', String(500)),
+        Column('details_encrypted', Text),
+        Column('success', Boolean, default=True),
+    ]
+    indexes = [] if partitioned else [
+        Index(f"idx_{name}_timestamp", 'timestamp'),
+        Index(f"idx_{name}_user_ts", 'user_id', 'timestamp'),
+    ]
+    return Table(name, metadata, *columns, *indexes)
+
+
+class AuditPartitionManager:
+    """Écriture, lecture par plage et rétention du journal d'audit partitionné"""
+
+    def __init__(self, db_manager, archive_dir: str = "data/audit_archive",
+                 retention_months: int = 12, archive_format: str = 'ndjson'):
+        if archive_format not in ARCHIVE_EXTENSIONS:
+            raise ValueError(f"Format d'archive inconnu: {archive_format}")
+        if archive_format == 'parquet' and not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow n'est pas installé. Utilisez: pip install pyarrow")
+
+        self.db_manager = db_manager
+        self.archive_dir = Path(archive_dir)
+        self.retention_months = retention_months
+        self.archive_format = archive_format
+        self.native = db_manager.engine.dialect.name == 'postgresql'
+        self.logger = logging.getLogger(__name__)
+
+        self._metadata = MetaData()
+        self._tables: Dict[str, Table] = {}
+        self._lock = threading.Lock()
+        # run_sync s'exécute sur la boucle : un verrou threading la bloquerait
+        self._async_lock = asyncio.Lock()
+
+        # Moteur asynchrone : table parente créée à la première écriture
+        if self.native and not isinstance(db_manager.engine, AsyncEngine):
+            self._create_parent()
+
+    @property
+    def security_manager(self):
+        return self.db_manager.security_manager
+
+    # ------------------------------------------------------------------ #
+    #  PARTITIONS
+    # ------------------------------------------------------------------ #
+    @contextmanager
+    def _begin(self, connection=None):
+        """Connexion fournie (run_sync) ou transaction sur le moteur synchrone"""
+        if connection is not None:
+            yield connection
+        else:
+            with self.db_manager.engine.begin() as conn:
+                yield conn
+
+    def _create_parent(self, connection=None):
+        parent = _audit_table(PARENT_TABLE, self._metadata, partitioned=True)
+        parent.kwargs['postgresql_partition_by'] = 'RANGE (timestamp)'
+        with self._begin(connection) as conn:
+            parent.create(conn, checkfirst=True)
+            conn.execute(text(f"CREATE SEQUENCE IF NOT EXISTS {PARENT_TABLE}_id_seq"))
+            conn.execute(text(
+                f"ALTER TABLE {PARENT_TABLE} ALTER COLUMN id SET DEFAULT nextval('{PARENT_TABLE}_id_seq')"
+            ))
+            conn.execute(text(
+                f"CREATE INDEX IF NOT EXISTS idx_{PARENT_TABLE}_user_ts ON {PARENT_TABLE} (user_id, timestamp)"
+            ))
+        self._tables[PARENT_TABLE] = parent
+
+    def partition_name(self, month: str) -> str:
+        return f"{PARTITION_PREFIX}{month}"
+
+    def ensure_partition(self, month: str) -> Table:
+        """Table (ou partition native) du mois, créée au premier accès"""
+        table = self._tables.get(self.partition_name(month))
+        if table is not None:
+            return table
+
+        with self._lock:
+            return self._create_partition(month)
+
+    def _create_partition(self, month: str, connection=None) -> Table:
+        """À appeler sous verrou (threading en synchrone, asyncio via awrite_many)"""
+        name = self.partition_name(month)
+        table = self._tables.get(name)
+        if table is None:
+            if self.native:
+                start, end = month_bounds(month)
+                with self._begin(connection) as conn:
+                    conn.execute(text(
+                        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {PARENT_TABLE} "
+                        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+                    ))
+                table = self._tables[PARENT_TABLE]
+            else:
+                table = _audit_table(name, self._metadata)
+                with self._begin(connection) as conn:
+                    table.create(conn, checkfirst=True)
+            self._tables[name] = table
+            self.logger.info(f"✅ Partition d'audit {name} prête")
+        return table
+
+    def list_partitions(self) -> List[str]:
+        """Mois présents en base, triés (ex. ['202401', '202402'])"""
+        names = inspect(self.db_manager.engine).get_table_names()
+        return sorted(m.group(1) for m in (_PARTITION_RE.match(n) for n in names) if m)
+
+    def _partitions_between(self, start: Optional[datetime], end: Optional[datetime]) -> List[str]:
+        """Élagage : partitions recouvrant [start, end), de la plus récente à la plus ancienne"""
+        selected = []
+        for month in self.list_partitions():
+            month_start, month_end = month_bounds(month)
+            if (start is None or month_end > start) and (end is None or month_start < end):
+                selected.append(month)
+        return selected[::-1]
+
+    # ------------------------------------------------------------------ #
+    #  ÉCRITURE
+    # ------------------------------------------------------------------ #
+    def write(self, user_id: str, action: str, resource_type: str = None,
+              resource_id: str = None, details: dict = None, success: bool = True,
+              ip_address: str = None, user_agent: str = None, timestamp: datetime = None):
+        self.write_many([dict(
+            user_id=user_id, action=action, resource_type=resource_type,
+            resource_id=resource_id, details=details, success=success,
+            ip_address=ip_address, user_agent=user_agent, timestamp=timestamp,
+        )])
+
+    def write_many(self, entries: Iterable[Dict[str, Any]]) -> int:
+        """Insertion groupée : un executemany par partition"""
+        entries = list(entries)
+        by_month = self._rows_by_month(entries)
+
+        # DDL hors transaction d'écriture (SQLite verrouille toute la base)
+        for month in by_month:
+            self.ensure_partition(month)
+        with self.db_manager.engine.begin() as conn:
+            self._insert_rows(conn, by_month)
+        return len(entries)
+
+    async def awrite_many(self, entries: Iterable[Dict[str, Any]]) -> int:
+        """write_many sur le moteur asynchrone : chiffrement hors boucle, SQL via run_sync"""
+        entries = list(entries)
+        by_month = await asyncio.to_thread(self._rows_by_month, entries)
+
+        engine = self.db_manager.engine
+        missing = [month for month in by_month if self.partition_name(month) not in self._tables]
+        if missing or (self.native and PARENT_TABLE not in self._tables):
+            async with self._async_lock, engine.begin() as conn:
+                await conn.run_sync(self._prepare_partitions, missing)
+        async with engine.begin() as conn:
+            await conn.run_sync(self._insert_rows, by_month)
+        return len(entries)
+
+    def _prepare_partitions(self, connection, months: List[str]):
+        if self.native and PARENT_TABLE not in self._tables:
+            self._create_parent(connection)
+        for month in months:
+            self._create_partition(month, connection)
+
+    def _insert_rows(self, connection, by_month: Dict[str, list]):
+        for month, rows in by_month.items():
+            connection.execute(self._tables[self.partition_name(month)].insert(), rows)
+
+    def _rows_by_month(self, entries: List[Dict[str, Any]]) -> Dict[str, list]:
+        """Lignes à insérer (détails chiffrés en un lot), groupées par mois"""
+        details = [str(e['details']) if e.get('details') else "" for e in entries]
+        if self.security_manager:
+            to_encrypt = [i for i, d in enumerate(details) if d]
+            for i, encrypted in zip(to_encrypt, self.security_manager.encrypt_many([details[i] for i in to_encrypt])):
+                details[i] = encrypted
+
+        by_month: Dict[str, list] = {}
+        now = datetime.utcnow()
+        for entry, details_encrypted in zip(entries, details):
+            row = {k: entry.get(k) for k in AUDIT_COLUMNS if k not in ('id', 'details_encrypted')}
+            row['timestamp'] = row['timestamp'] or now
+            row['success'] = True if row['success'] is None else row['success']
+            row['details_encrypted'] = details_encrypted
+            by_month.setdefault(month_of(row['timestamp']), []).append(row)
+        return by_month
+
+    def migrate_legacy(self, batch_size: int = 5000) -> int:
+        """Déplace les lignes de l'ancienne table audit_logs vers les partitions"""
+        legacy = AuditLog.__table__
+        columns = [legacy.c[name] for name in AUDIT_COLUMNS if name != 'id']
+        moved = 0
+        while True:
+            with self.db_manager.engine.connect() as conn:
+                rows = conn.execute(
+                    select(legacy.c.id, *columns).order_by(legacy.c.id).limit(batch_size)
+                ).all()
+            if not rows:
+                break
+
+            by_month: Dict[str, list] = {}
+            for row in rows:
+                values = dict(row._mapping)
+                values.pop('id')
+                values['timestamp'] = values['timestamp'] or datetime.utcnow()
+                by_month.setdefault(month_of(values['timestamp']), []).append(values)
+            tables = {month: self.ensure_partition(month) for month in by_month}
+
+            # Copie et suppression dans la même transaction : pas de doublon ni de perte
+            with self.db_manager.engine.begin() as conn:
+                for month, values in by_month.items():
+                    conn.execute(tables[month].insert(), values)
+                conn.execute(legacy.delete().where(legacy.c.id.in_([row.id for row in rows])))
+            moved += len(rows)
+        if moved:
+            self.logger.info(f"♻️  {moved} entrées d'audit migrées vers les partitions")
+        return moved
+
+    # ------------------------------------------------------------------ #
+    #  LECTURE PAR PLAGE
+    # ------------------------------------------------------------------ #
+    def _filtered(self, table: Table, query, start, end, filters: Dict[str, Any]):
+        if start is not None:
+            query = query.where(table.c.timestamp >= start)
+        if end is not None:
+            query = query.where(table.c.timestamp < end)
+        for name, value in filters.items():
+            if value is not None:
+                query = query.where(table.c[name] == value)
+        return query
+
+    def query(self, start: datetime = None, end: datetime = None, user_id: str = None,
+              action: str = None, resource_type: str = None, resource_id: str = None,
+              success: bool = None, limit: int = 1000, decrypt: bool = False) -> List[Dict[str, Any]]:
+        """Entrées de [start, end), plus récentes d'abord, sans lire les autres mois"""
+        filters = dict(user_id=user_id, action=action, resource_type=resource_type,
+                       resource_id=resource_id, success=success)
+        results: List[Dict[str, Any]] = []
+
+        with self.db_manager.engine.connect() as conn:
+            for month in self._partitions_between(start, end):
+                table = self.ensure_partition(month)
+                month_start, month_end = month_bounds(month)
+                query = self._filtered(
+                    table, select(table), max(start or month_start, month_start),
+                    min(end or month_end, month_end), filters
+                )
+                query = query.order_by(table.c.timestamp.desc(), table.c.id.desc())
+                rows = conn.execute(query.limit(limit - len(results))).all()
+                results.extend(dict(row._mapping) for row in rows)
+                if len(results) >= limit:
+                    break
+
+        if decrypt:
+            self._decrypt_details(results)
+        return results
+
+    def count(self, start: datetime = None, end: datetime = None, **filters) -> int:
+        total = 0
+        with self.db_manager.engine.connect() as conn:
+            for month in self._partitions_between(start, end):
+                table = self.ensure_partition(month)
+                month_start, month_end = month_bounds(month)
+                query = self._filtered(
+                    table, select(func.count()).select_from(table),
+                    max(start or month_start, month_start), min(end or month_end, month_end), filters
+                )
+                total += conn.execute(query).scalar()
+        return total
+
+    def _decrypt_details(self, rows: List[Dict[str, Any]]) -> int:
+        """Ajoute row['details'] ; retourne le nombre de détails indéchiffrables (None)"""
+        encrypted = [row['details_encrypted'] or "" for row in rows]
+        indices = [i for i, value in enumerate(encrypted) if value]
+        decrypted = [encrypted[i] for i in indices]
+        if self.security_manager:
+            decrypted = self.security_manager.decrypt_many(decrypted, return_exceptions=True)
+        for row in rows:
+            row['details'] = None
+        failed = 0
+        for i, value in zip(indices, decrypted):
+            if isinstance(value, Exception):
+                failed += 1
+                rows[i]['details'] = None
+            else:
+                rows[i]['details'] = value
+        return failed
+
+    # ------------------------------------------------------------------ #
+    #  RÉTENTION & ARCHIVES
+    # ------------------------------------------------------------------ #
+    def apply_retention(self, now: datetime = None) -> List[Path]:
+        """Archive puis supprime les mois antérieurs à la fenêtre de rétention"""
+        cutoff = shift_months((now or datetime.utcnow()).replace(day=1), -self.retention_months)
+        archived = []
+        for month in self.list_partitions():
+            if month_bounds(month)[1] <= cutoff:
+                archived.append(self.archive_partition(month))
+        return archived
+
+    def archive_partition(self, month: str, drop: bool = True) -> Path:
+        """
+        Exporte un mois dans un fichier unique : détails déchiffrés, compressés
+        ensemble puis chiffrés d'un bloc (bien plus compact que ligne à ligne).
+
+        Détails indéchiffrables : le chiffré brut est archivé tel quel et la
+        partition est conservée (aucune donnée d'audit perdue).
+        """
+        table = self.ensure_partition(month)
+        month_start, month_end = month_bounds(month)
+        # En natif, table est la table mère : le filtre limite la lecture au mois
+        query = self._filtered(table, select(table), month_start, month_end, {}).order_by(table.c.id)
+        with self.db_manager.engine.connect() as conn:
+            rows = [dict(row._mapping) for row in conn.execute(query)]
+        failed = self._decrypt_details(rows)
+        for row in rows:
+            details_encrypted = row.pop('details_encrypted')
+            if details_encrypted and row['details'] is None:
+                row['details_encrypted'] = details_encrypted
+            row['timestamp'] = row['timestamp'].isoformat()
+
+        payload = self._serialize(rows)
+        if self.security_manager:
+            payload = self.security_manager.encrypt_data(payload).encode('ascii')
+
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        path = self.archive_dir / f"{self.partition_name(month)}{ARCHIVE_EXTENSIONS[self.archive_format]}"
+        tmp_path = path.with_suffix(path.suffix + '.tmp')
+        tmp_path.write_bytes(payload)
+        os.replace(tmp_path, path)
+
+        if drop and failed:
+            self.logger.warning(
+                f"⚠️  Partition {month} conservée: {failed} détails indéchiffrables archivés chiffrés"
+            )
+        elif drop:
+            self._drop_partition(month)
+        self.logger.info(f"📦 Partition {month} archivée: {len(rows)} entrées → {path.name} ({len(payload)} octets)")
+        return path
+
+    def _serialize(self, rows: List[Dict[str, Any]]) -> bytes:
+        if self.archive_format == 'parquet':
+            buffer = io.BytesIO()
+            pq.write_table(pa.Table.from_pylist(rows), buffer, compression='zstd')
+            return buffer.getvalue()
+        lines = "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+        return gzip.compress(lines.encode('utf-8'), compresslevel=9)
+
+    def _drop_partition(self, month: str):
+        name = self.partition_name(month)
+        with self._lock:
+            with self.db_manager.engine.begin() as conn:
+                conn.execute(text(f"DROP TABLE IF EXISTS {name}"))
+            table = self._tables.pop(name, None)
+            if table is not None and not self.native:
+                self._metadata.remove(table)
+
+    def read_archive(self, path) -> Iterator[Dict[str, Any]]:
+        """Relit une archive produite par archive_partition"""
+        path = Path(path)
+        payload = path.read_bytes()
+        if self.security_manager:
+            payload = self.security_manager.decrypt_bytes(payload.decode('ascii'))
+
+        if path.name.endswith(ARCHIVE_EXTENSIONS['parquet']):
+            if not PYARROW_AVAILABLE:
+                raise ImportError("pyarrow n'est pas installé. Utilisez: pip install pyarrow")
+            yield from pq.read_table(io.BytesIO(payload)).to_pylist()
+            return
+        for line in gzip.decompress(payload).decode('utf-8').splitlines():
+            if line:
+                yield json.loads(line)
@@ -2,8 +2,16 @@ from sqlalchemy import create_engine, Column, Integer, String, DateTime, Text, B
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime
-from sqlalchemy import text
+from sqlalchemy import text, or_, select, update, delete, func, inspect
+from sqlalchemy.exc import IntegrityError
+import ast
+import base64
+import hashlib
+import json
 import logging
+import os
+
+from core.observability.metrics import stage_timer
 
 Base = declarative_base()
 
@@ -22,12 +30,32 @@ class Document(Base):
     processed = Column(Boolean, default=False)
     processing_status = Column(String(20), default='pending')  # pending, processing, completed, error
     
+    # File de traitement (cf. data/storage/job_queue.py)
+    worker_id = Column(String(100))  # Worker ayant réclamé le document
+    attempts = Column(Integer, default=0)
+    processing_started_at = Column(DateTime)
+    processing_finished_at = Column(DateTime)
+    processing_time_ms = Column(Integer)
+    result_encrypted = Column(Text)  # Résultat d'extraction chiffré (JSON)
+    error_message = Column(String(500))
+    
     # Index composé pour optimiser les requêtes
     __table_args__ = (
         Index('idx_client_type', 'client_id', 'document_type'),
         Index('idx_created_processed', 'created_at', 'processed'),
+        Index('idx_status_started', 'processing_status', 'processing_started_at'),
+        Index('idx_client_file_hash', 'client_id', 'file_hash', unique=True),
     )
 
+class DocumentAlias(Base):
+    """Noms de fichiers supplémentaires d'un même contenu (déduplication)"""
+    __tablename__ = "document_aliases"
+    
+    id = Column(Integer, primary_key=True)
+    document_id = Column(Integer, nullable=False, index=True)
+    filename = Column(String(255), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
 class AuditLog(Base):
     """Table d'audit pour traçabilité complète"""
     __tablename__ = "audit_logs"
@@ -57,19 +85,329 @@ class User(Base):
     last_login = Column(DateTime)
     failed_login_attempts = Column(Integer, default=0)
 
+class ReencryptionCheckpoint(Base):
+    """Progression des jobs de re-chiffrement (rotation de clés)"""
+    __tablename__ = "reencryption_checkpoints"
+    
+    id = Column(Integer, primary_key=True)
+    job_id = Column(String(50), nullable=False)
+    table_name = Column(String(50), nullable=False)
+    target_key_id = Column(String(32), nullable=False)
+    last_id = Column(Integer, default=0)  # Dernière clé primaire traitée
+    rows_processed = Column(Integer, default=0)
+    rows_failed = Column(Integer, default=0)
+    status = Column(String(20), default='pending')  # pending, running, partial, completed, error
+    started_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        Index('idx_job_table', 'job_id', 'table_name', unique=True),
+    )
+
+class ClientDataVersion(Base):
+    """Version des données listées d'un client (ETag des listings de l'API)"""
+    __tablename__ = "client_data_versions"
+    
+    client_id = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+def bump_data_versions(session, client_ids) -> None:
+    """Incrémente la version des clients touchés, dans la transaction en cours.
+    
+    À appeler par toute écriture visible dans un listing : la version change
+    au commit des données, jamais avant ni après.
+    """
+    now = datetime.utcnow()
+    dialect = session.get_bind().dialect.name
+    # Ordre fixe : pas d'interblocage entre transactions concurrentes
+    for client_id in sorted(set(client_ids)):
+        if dialect in ('postgresql', 'sqlite'):
+            if dialect == 'postgresql':
+                from sqlalchemy.dialects.postgresql import insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert
+            statement = insert(ClientDataVersion).values(client_id=client_id, version=1, updated_at=now)
+            session.execute(statement.on_conflict_do_update(
+                index_elements=['client_id'],
+                set_={'version': ClientDataVersion.version + 1, 'updated_at': now}
+            ))
+        else:
+            updated = session.execute(
+                update(ClientDataVersion)
+                .where(ClientDataVersion.client_id == client_id)
+                .values(version=ClientDataVersion.version + 1, updated_at=now)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            if not updated:
+                session.add(ClientDataVersion(client_id=client_id, version=1, updated_at=now))
+                session.flush()
+
+def bump_document_versions(session, document_ids) -> None:
+    """bump_data_versions pour les clients propriétaires de ces documents"""
+    if not document_ids:
+        return
+    client_ids = session.execute(
+        select(Document.client_id).where(Document.id.in_(list(document_ids))).distinct()
+    ).scalars().all()
+    bump_data_versions(session, client_ids)
+
+def upgrade_schema(connection) -> list:
+    """Met à niveau une base déjà déployée (create_all ne modifie pas les tables existantes).
+    
+    Ajoute les colonnes et index de documents apparus depuis (file de
+    traitement : worker_id, attempts, processing_*…). Avant l'index unique
+    idx_client_file_hash, les doublons existants sont rattachés en alias
+    (cf. fold_duplicate_documents). Idempotent ; retourne les éléments ajoutés.
+    """
+    table = Document.__table__
+    inspector = inspect(connection)
+    existing_columns = {column['name'] for column in inspector.get_columns(table.name)}
+    existing_indexes = {index['name'] for index in inspector.get_indexes(table.name)}
+    preparer = connection.dialect.identifier_preparer
+    added = []
+    
+    for column in table.columns:
+        if column.name not in existing_columns:
+            column_type = column.type.compile(dialect=connection.dialect)
+            connection.execute(text(
+                f"ALTER TABLE {preparer.format_table(table)} "
+                f"ADD COLUMN {preparer.format_column(column)} {column_type}"
+            ))
+            added.append(column.name)
+    
+    for index in table.indexes:
+        if index.name not in existing_indexes:
+            if index.unique:
+                fold_duplicate_documents(connection)
+            index.create(connection)
+            added.append(index.name)
+    return added
+
+def fold_duplicate_documents(connection) -> int:
+    """Un seul document par (client_id, file_hash) : les autres deviennent des alias.
+    
+    Conservé : un document déjà traité s'il y en a un, sinon le plus ancien.
+    Les noms de fichiers (et alias) des doublons sont rattachés au document
+    conservé, puis les doublons supprimés. Retourne le nombre de lignes supprimées.
+    """
+    groups = connection.execute(
+        select(Document.client_id, Document.file_hash)
+        .where(Document.file_hash.isnot(None))
+        .group_by(Document.client_id, Document.file_hash)
+        .having(func.count() > 1)
+    ).all()
+    
+    removed = 0
+    for client_id, file_hash in groups:
+        rows = connection.execute(
+            select(Document.id, Document.filename, Document.processing_status)
+            .where(Document.client_id == client_id, Document.file_hash == file_hash)
+            .order_by(Document.id)
+        ).all()
+        keeper = next((row for row in rows if row.processing_status == 'completed'), rows[0])
+        duplicate_ids = [row.id for row in rows if row.id != keeper.id]
+        
+        known = {keeper.filename} | set(connection.execute(
+            select(DocumentAlias.filename).where(DocumentAlias.document_id == keeper.id)
+        ).scalars())
+        filenames = [row.filename for row in rows if row.id != keeper.id]
+        filenames += connection.execute(
+            select(DocumentAlias.filename).where(DocumentAlias.document_id.in_(duplicate_ids))
+        ).scalars().all()
+        for filename in filenames:
+            if filename not in known:
+                connection.execute(DocumentAlias.__table__.insert().values(
+                    document_id=keeper.id, filename=filename, created_at=datetime.utcnow()
+                ))
+                known.add(filename)
+        
+        connection.execute(delete(DocumentAlias).where(DocumentAlias.document_id.in_(duplicate_ids)))
+        connection.execute(delete(Document).where(Document.id.in_(duplicate_ids)))
+        removed += len(duplicate_ids)
+    
+    if removed:
+        logging.getLogger(__name__).warning(
+            f"♻️  {removed} documents en double rattachés en alias avant idx_client_file_hash"
+        )
+    return removed
+
+# Colonnes non chiffrées renvoyées par les listings
+DOCUMENT_PLAINTEXT_COLUMNS = (
+    'id', 'client_id', 'filename', 'document_type',
+    'created_at', 'processed', 'processing_status'
+)
+MAX_PAGE_SIZE = 500
+
+# ---------------------------------------------------------------------- #
+#  Requêtes partagées par DatabaseManager et AsyncDatabaseManager
+# ---------------------------------------------------------------------- #
+
+def document_hash(content: str) -> str:
+    """SHA-256 du contenu en clair (intégrité et déduplication)"""
+    return hashlib.sha256(content.encode()).hexdigest()
+
+def dump_metadata(metadata: dict) -> str:
+    """Métadonnées en JSON avant chiffrement"""
+    return json.dumps(metadata or {}, ensure_ascii=False, default=str)
+
+def load_metadata(payload: str) -> dict:
+    """JSON ; les lignes écrites avant le passage au JSON (repr Python)
+    sont relues par ast.literal_eval, jamais exécutées"""
+    if not payload:
+        return {}
+    try:
+        return json.loads(payload)
+    except ValueError:
+        return ast.literal_eval(payload)
+
+def ingest_result(document_id: int, duplicate: bool, processing_status: str, result=None) -> dict:
+    return {
+        'document_id': document_id,
+        'duplicate': duplicate,
+        'processing_status': processing_status,
+        'result': result
+    }
+
+def link_duplicate_alias(session, client_id: str, file_hash: str, filename: str):
+    """Document de même contenu pour ce client (id, filename, processing_status).
+    
+    Rattache filename comme alias s'il est nouveau (commit à la charge de
+    l'appelant) ; None si le contenu est inédit.
+    """
+    existing = session.execute(
+        select(Document.id, Document.filename, Document.processing_status)
+        .filter_by(client_id=client_id, file_hash=file_hash)
+    ).first()
+    if not existing:
+        return None
+    
+    already_linked = existing.filename == filename or session.execute(
+        select(DocumentAlias.id).filter_by(document_id=existing.id, filename=filename)
+    ).first()
+    if not already_linked:
+        session.add(DocumentAlias(document_id=existing.id, filename=filename))
+    return existing
+
+def document_list_query(client_id: str = None, document_type: str = None,
+                        processing_status: str = None, created_from: datetime = None,
+                        created_to: datetime = None, limit: int = 50, cursor: str = None,
+                        decrypt: bool = False):
+    """select() d'une page de list_documents, une ligne de plus que limit
+    pour savoir s'il existe une page suivante (cf. document_page).
+    
+    - client_id (± document_type) sans plage de dates : parcours de
+      idx_client_type dans l'ordre des id décroissants ;
+    - sinon : parcours de idx_created_processed sur (created_at, id) décroissants.
+    """
+    by_id = client_id is not None and created_from is None and created_to is None
+    
+    columns = [getattr(Document, name) for name in DOCUMENT_PLAINTEXT_COLUMNS]
+    if decrypt:
+        columns += [Document.content_encrypted, Document.metadata_encrypted]
+    
+    query = select(*columns)
+    if client_id is not None:
+        query = query.where(Document.client_id == client_id)
+    if document_type is not None:
+        query = query.where(Document.document_type == document_type)
+    if processing_status is not None:
+        query = query.where(Document.processing_status == processing_status)
+    if created_from is not None:
+        query = query.where(Document.created_at >= created_from)
+    if created_to is not None:
+        query = query.where(Document.created_at < created_to)
+    
+    if cursor:
+        last_created_at, last_id = DatabaseManager._decode_cursor(cursor)
+        if by_id:
+            query = query.where(Document.id < last_id)
+        else:
+            # Borne "<=" exploitable par l'index, départage des ex-aequo par id
+            query = query.where(
+                Document.created_at <= last_created_at,
+                or_(Document.created_at < last_created_at, Document.id < last_id)
+            )
+    
+    if by_id:
+        query = query.order_by(Document.id.desc())
+    else:
+        query = query.order_by(Document.created_at.desc(), Document.id.desc())
+    return query.limit(max(1, min(limit, MAX_PAGE_SIZE)) + 1)
+
+def document_page(rows: list, limit: int):
+    """(lignes de la page, dictionnaires en clair, curseur suivant ou None)"""
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    results = [dict(zip(DOCUMENT_PLAINTEXT_COLUMNS, row)) for row in rows]
+    
+    next_cursor = None
+    if has_more and results:
+        next_cursor = DatabaseManager._encode_cursor(results[-1]['created_at'], results[-1]['id'])
+    return rows, results, next_cursor
+
+def encrypted_document_fields(rows: list) -> list:
+    """Contenus puis métadonnées chiffrés, en un seul lot pour decrypt_many"""
+    return [r.content_encrypted for r in rows] + [r.metadata_encrypted for r in rows]
+
+def attach_document_content(results: list, rows: list, decrypted: list = None, logger=None):
+    """Ajoute content/metadata aux résultats.
+    
+    decrypted : sortie de decrypt_many(encrypted_document_fields(rows),
+    return_exceptions=True), ou None pour les valeurs stockées telles quelles.
+    Un document indéchiffrable est marqué decryption_failed.
+    """
+    if decrypted is None:
+        for result, row in zip(results, rows):
+            result['content'] = row.content_encrypted
+            result['metadata'] = row.metadata_encrypted
+        return
+    
+    contents, metadatas = decrypted[:len(rows)], decrypted[len(rows):]
+    for result, content, metadata in zip(results, contents, metadatas):
+        if isinstance(content, Exception) or isinstance(metadata, Exception):
+            (logger or logging.getLogger(__name__)).warning(
+                f"⚠️  Impossible de déchiffrer document {result['id']}"
+            )
+            result['content'] = "[CHIFFRÉ]"
+            result['metadata'] = {}
+            result['decryption_failed'] = True
+        else:
+            result['content'] = content
+            result['metadata'] = load_metadata(metadata)
+
+# Dimensionnement du pool de connexions (surchargé par la config ou l'environnement)
+DEFAULT_POOL_CONFIG = {
+    'pool_size': 10,
+    'max_overflow': 20,
+    'pool_timeout': 30,
+}
+
+def get_pool_config(overrides: dict = None) -> dict:
+    """Config du pool : défauts < FISCAL_AI_DB_POOL_SIZE, ... < overrides"""
+    config = dict(DEFAULT_POOL_CONFIG)
+    for key in config:
+        env_value = os.getenv(f"FISCAL_AI_DB_{key.upper()}")
+        if env_value:
+            config[key] = int(env_value)
+    config.update(overrides or {})
+    return config
+
 class DatabaseManager:
     """Gestionnaire de base de données avec sécurité intégrée"""
     
-    def __init__(self, database_url: str, security_manager=None):
+    def __init__(self, database_url: str, security_manager=None, pool_config: dict = None):
         self.database_url = database_url
         self.security_manager = security_manager
         self.logger = logging.getLogger(__name__)
+        self.pool_config = get_pool_config(pool_config)
+        self.audit_partitions = None
         
         # Configuration moteur avec pool de connexions
         self.engine = create_engine(
             database_url,
-            pool_size=10,
-            max_overflow=20,
+            **self.pool_config,
             pool_pre_ping=True,  # Vérification connexions
             echo=False  # Mettre à True pour debug SQL
         )
@@ -81,8 +419,12 @@ class DatabaseManager:
             autoflush=False
         )
         
-        # Création des tables
+        # Création des tables, puis mise à niveau des tables existantes
         Base.metadata.create_all(self.engine)
+        with self.engine.begin() as conn:
+            upgraded = upgrade_schema(conn)
+        if upgraded:
+            self.logger.info(f"♻️  Schéma mis à niveau: {', '.join(upgraded)}")
         self.logger.info("✅ Base de données initialisée avec succès")
     
     def get_session(self):
@@ -91,22 +433,40 @@ class DatabaseManager:
     
     def create_document(self, client_id: str, filename: str, content: str, 
                         document_type: str = "unknown", metadata: dict = None) -> int:
-        """Création sécurisée d'un document"""
+        """Création sécurisée d'un document (dédupliqué par contenu).
+        
+        Un contenu déjà connu pour ce client ne crée pas de ligne : filename est
+        rattaché en alias et l'id du document existant est renvoyé. Utiliser
+        ingest_document pour savoir s'il s'agit d'un doublon.
+        """
+        return self.ingest_document(client_id, filename, content, document_type, metadata)['document_id']
+    
+    def ingest_document(self, client_id: str, filename: str, content: str,
+                        document_type: str = "unknown", metadata: dict = None) -> dict:
+        """Création avec déduplication par contenu (client_id, file_hash).
+        
+        Un contenu déjà connu pour ce client n'est ni re-chiffré ni re-traité :
+        le nouveau nom de fichier est rattaché au document existant et
+        l'extraction déjà calculée est renvoyée.
+        
+        Retourne {'document_id', 'duplicate', 'processing_status', 'result'}.
+        """
+        # Calcul hash pour intégrité et déduplication (avant tout chiffrement)
+        file_hash = document_hash(content)
+        
+        duplicate = self._link_duplicate(client_id, file_hash, filename)
+        if duplicate:
+            return duplicate
+        
         session = self.get_session()
         try:
             # Chiffrement du contenu si security_manager disponible
             if self.security_manager:
                 content_encrypted = self.security_manager.encrypt_data(content)
-                metadata_encrypted = self.security_manager.encrypt_data(
-                    str(metadata) if metadata else "{}"
-                )
+                metadata_encrypted = self.security_manager.encrypt_data(dump_metadata(metadata))
             else:
                 content_encrypted = content
-                metadata_encrypted = str(metadata) if metadata else "{}"
-            
-            # Calcul hash pour intégrité
-            import hashlib
-            file_hash = hashlib.sha256(content.encode()).hexdigest()
+                metadata_encrypted = dump_metadata(metadata)
             
             document = Document(
                 client_id=client_id,
@@ -117,14 +477,23 @@ class DatabaseManager:
                 file_hash=file_hash
             )
             
-            session.add(document)
-            session.commit()
+            with stage_timer("db_write"):
+                session.add(document)
+                bump_data_versions(session, [client_id])
+                session.commit()
             
             doc_id = document.id
             self.logger.info(f"✅ Document {doc_id} créé pour client {client_id}")
             
-            return doc_id
+            return ingest_result(doc_id, False, document.processing_status)
             
+        except IntegrityError:
+            # Envoi simultané du même contenu : l'autre insertion a gagné
+            session.rollback()
+            duplicate = self._link_duplicate(client_id, file_hash, filename)
+            if duplicate:
+                return duplicate
+            raise
         except Exception as e:
             session.rollback()
             self.logger.error(f"❌ Erreur création document: {str(e)}")
@@ -132,6 +501,55 @@ class DatabaseManager:
         finally:
             session.close()
     
+    def _link_duplicate(self, client_id: str, file_hash: str, filename: str) -> dict:
+        """Rattache filename au document de même contenu, s'il existe"""
+        session = self.get_session()
+        try:
+            existing = link_duplicate_alias(session, client_id, file_hash, filename)
+            if not existing:
+                return None
+            session.commit()
+            
+            self.logger.info(f"♻️  Contenu déjà connu: {filename} → document {existing.id}")
+            return ingest_result(existing.id, True, existing.processing_status,
+                                 self.get_processing_result(existing.id))
+        except Exception as e:
+            session.rollback()
+            self.logger.error(f"❌ Erreur déduplication document: {str(e)}")
+            raise
+        finally:
+            session.close()
+    
+    def get_document_filenames(self, document_id: int) -> list:
+        """Nom d'origine puis noms rattachés par déduplication"""
+        session = self.get_session()
+        try:
+            document = session.query(Document.filename).filter_by(id=document_id).first()
+            if not document:
+                return []
+            aliases = (
+                session.query(DocumentAlias.filename)
+                .filter_by(document_id=document_id)
+                .order_by(DocumentAlias.id)
+                .all()
+            )
+            return [document.filename] + [alias.filename for alias in aliases]
+        finally:
+            session.close()
+    
+    def get_processing_result(self, document_id: int) -> dict:
+        """Résultat d'extraction déchiffré (None si pas encore traité)"""
+        session = self.get_session()
+        try:
+            payload = session.query(Document.result_encrypted).filter_by(id=document_id).scalar()
+        finally:
+            session.close()
+        if not payload:
+            return None
+        if self.security_manager:
+            payload = self.security_manager.decrypt_data(payload)
+        return json.loads(payload)
+    
     def get_document(self, document_id: int, decrypt: bool = True) -> dict:
         """Récupération sécurisée d'un document"""
         session = self.get_session()
@@ -141,25 +559,18 @@ class DatabaseManager:
             if not document:
                 return None
             
-            result = {
-                'id': document.id,
-                'client_id': document.client_id,
-                'filename': document.filename,
-                'document_type': document.document_type,
-                'created_at': document.created_at,
-                'processed': document.processed,
-                'processing_status': document.processing_status
-            }
+            result = self._document_to_dict(document)
             
             # Déchiffrement si demandé et possible
             if decrypt and self.security_manager:
                 try:
                     result['content'] = self.security_manager.decrypt_data(document.content_encrypted)
-                    result['metadata'] = eval(self.security_manager.decrypt_data(document.metadata_encrypted))
+                    result['metadata'] = load_metadata(self.security_manager.decrypt_data(document.metadata_encrypted))
                 except Exception as e:
                     self.logger.warning(f"⚠️  Impossible de déchiffrer document {document_id}: {str(e)}")
                     result['content'] = "[CHIFFRÉ]"
                     result['metadata'] = {}
+                    result['decryption_failed'] = True
             else:
                 result['content'] = document.content_encrypted
                 result['metadata'] = document.metadata_encrypted
@@ -172,9 +583,191 @@ class DatabaseManager:
         finally:
             session.close()
     
+    def get_documents(self, document_ids: list, decrypt: bool = True) -> list:
+        """Récupération groupée (une requête IN) avec déchiffrement parallèle.
+        
+        Les résultats suivent l'ordre de document_ids ; les ids absents sont ignorés.
+        """
+        if not document_ids:
+            return []
+        
+        session = self.get_session()
+        try:
+            documents = session.query(Document).filter(Document.id.in_(document_ids)).all()
+            by_id = {document.id: document for document in documents}
+            ordered = [by_id[doc_id] for doc_id in document_ids if doc_id in by_id]
+            results = [self._document_to_dict(document) for document in ordered]
+            self._attach_content(results, ordered, decrypt)
+            return results
+            
+        except Exception as e:
+            self.logger.error(f"❌ Erreur récupération documents {document_ids}: {str(e)}")
+            raise
+        finally:
+            session.close()
+    
+    def list_documents(self, client_id: str = None, document_type: str = None,
+                       processing_status: str = None, created_from: datetime = None,
+                       created_to: datetime = None, limit: int = 50, cursor: str = None,
+                       decrypt: bool = False) -> dict:
+        """Listing paginé par clé (seek) : coût constant quelle que soit la page.
+        
+        - client_id (± document_type) sans plage de dates : parcours de
+          idx_client_type dans l'ordre des id décroissants ;
+        - sinon : parcours de idx_created_processed sur (created_at, id) décroissants.
+        
+        Seules les colonnes en clair sont lues, sauf si decrypt=True.
+        Retourne {'documents': [...], 'next_cursor': str | None}.
+        """
+        query = document_list_query(client_id, document_type, processing_status,
+                                    created_from, created_to, limit, cursor, decrypt)
+        
+        session = self.get_session()
+        try:
+            rows, results, next_cursor = document_page(session.execute(query).all(), limit)
+            if decrypt:
+                self._attach_content(results, rows, decrypt=True)
+            
+            return {'documents': results, 'next_cursor': next_cursor}
+            
+        except Exception as e:
+            self.logger.error(f"❌ Erreur listing documents: {str(e)}")
+            raise
+        finally:
+            session.close()
+    
+    def get_data_version(self, client_id: str) -> tuple:
+        """(version, updated_at) des données du client ; (0, None) si jamais modifiées"""
+        session = self.get_session()
+        try:
+            row = session.execute(
+                select(ClientDataVersion.version, ClientDataVersion.updated_at)
+                .where(ClientDataVersion.client_id == client_id)
+            ).first()
+            return (row.version, row.updated_at) if row else (0, None)
+        finally:
+            session.close()
+    
+    @staticmethod
+    def _encode_cursor(created_at: datetime, document_id: int) -> str:
+        payload = f"{created_at.isoformat() if created_at else ''}|{document_id}"
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+    
+    @staticmethod
+    def _decode_cursor(cursor: str):
+        try:
+            created_at, document_id = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8').split('|')
+            return (datetime.fromisoformat(created_at) if created_at else None), int(document_id)
+        except Exception:
+            raise ValueError(f"Curseur de pagination invalide: {cursor}")
+    
+    def _attach_content(self, results: list, rows: list, decrypt: bool):
+        """Ajoute content/metadata ; déchiffrement en un seul lot parallèle"""
+        decrypted = None
+        if decrypt and self.security_manager:
+            decrypted = self.security_manager.decrypt_many(
+                encrypted_document_fields(rows), return_exceptions=True
+            )
+        attach_document_content(results, rows, decrypted, self.logger)
+    
+    @staticmethod
+    def _document_to_dict(document: Document) -> dict:
+        """Colonnes en clair d'un document"""
+        return {
+            'id': document.id,
+            'client_id': document.client_id,
+            'filename': document.filename,
+            'document_type': document.document_type,
+            'created_at': document.created_at,
+            'processed': document.processed,
+            'processing_status': document.processing_status
+        }
+    
+    def create_user(self, username: str, email: str, password: str, role: str = 'user') -> int:
+        """Création d'un utilisateur avec mot de passe haché"""
+        if not self.security_manager:
+            raise ValueError("security_manager requis pour hacher les mots de passe")
+        
+        session = self.get_session()
+        try:
+            user = User(
+                username=username,
+                email=email,
+                password_hash=self.security_manager.hash_password(password),
+                role=role
+            )
+            session.add(user)
+            session.commit()
+            
+            self.logger.info(f"✅ Utilisateur {username} créé")
+            return user.id
+            
+        except Exception as e:
+            session.rollback()
+            self.logger.error(f"❌ Erreur création utilisateur {username}: {str(e)}")
+            raise
+        finally:
+            session.close()
+    
+    def authenticate_user(self, username: str, password: str, max_attempts: int = 5) -> dict:
+        """Authentification avec migration transparente des anciens hash
+        
+        Retourne les informations de l'utilisateur, ou None si refusé
+        (inconnu, inactif, verrouillé après max_attempts échecs, mot de passe faux).
+        """
+        if not self.security_manager:
+            raise ValueError("security_manager requis pour vérifier les mots de passe")
+        
+        session = self.get_session()
+        try:
+            user = session.query(User).filter_by(username=username).first()
+            
+            if not user or not user.is_active:
+                return None
+            if (user.failed_login_attempts or 0) >= max_attempts:
+                self.logger.warning(f"⚠️  Compte {username} verrouillé")
+                return None
+            
+            is_valid, new_hash = self.security_manager.verify_and_update_password(
+                password, user.password_hash
+            )
+            
+            if not is_valid:
+                user.failed_login_attempts = (user.failed_login_attempts or 0) + 1
+                session.commit()
+                return None
+            
+            if new_hash:
+                user.password_hash = new_hash
+            user.failed_login_attempts = 0
+            user.last_login = datetime.utcnow()
+            session.commit()
+            
+            return {
+                'id': user.id,
+                'username': user.username,
+                'email': user.email,
+                'role': user.role,
+                'last_login': user.last_login
+            }
+            
+        except Exception as e:
+            session.rollback()
+            self.logger.error(f"❌ Erreur authentification {username}: {str(e)}")
+            raise
+        finally:
+            session.close()
+    
     def log_audit(self, user_id: str, action: str, resource_type: str = None, 
                   resource_id: str = None, details: dict = None, success: bool = True):
         """Enregistrement d'audit sécurisé"""
+        if self.audit_partitions is not None:
+            try:
+                self.audit_partitions.write(user_id, action, resource_type, resource_id, details, success)
+            except Exception as e:
+                self.logger.error(f"❌ Erreur log audit: {str(e)}")
+            return
+
         session = self.get_session()
         try:
             # Chiffrement des détails
@@ -200,6 +793,12 @@ class DatabaseManager:
         finally:
             session.close()
     
+    def enable_audit_partitioning(self, **options):
+        """Bascule log_audit vers le journal partitionné par mois (cf. audit_partitions)"""
+        from data.storage.audit_partitions import AuditPartitionManager
+        self.audit_partitions = AuditPartitionManager(self, **options)
+        return self.audit_partitions
+    
     def health_check(self) -> bool:
         """Vérification de l'état de la base de données"""
         try:
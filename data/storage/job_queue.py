@@ -0,0 +1,385 @@
+"""
+File de traitement persistante adossée à documents.processing_status.
+
+• claim()          : réclamation atomique des documents 'pending'
+                     (UPDATE ... RETURNING, + FOR UPDATE SKIP LOCKED sur PostgreSQL)
+• complete()/fail(): enregistrement du résultat chiffré, des durées et des erreurs
+• heartbeat()      : rafraîchit processing_started_at des documents en cours
+• recover_stale()  : remise en file des documents 'processing' d'un worker
+                     disparu (sans heartbeat depuis stale_after)
+• ProcessingWorker : boucle claim → extraction (pool de workers) → résultat
+
+Aucun broker externe : plusieurs nœuds partagent la même base.
+"""
+
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import func, select, update
+
+from core.observability.metrics import call_collecting, record_document, stage_timer, unwrap_collected
+from data.storage.database import Document, bump_document_versions
+
+logger = logging.getLogger(__name__)
+
+STATUS_PENDING = 'pending'
+STATUS_PROCESSING = 'processing'
+STATUS_COMPLETED = 'completed'
+STATUS_ERROR = 'error'
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def extract_invoice_from_content(document: Dict[str, Any]) -> Dict[str, Any]:
+    """Pipeline par défaut : FastPdfInvoiceEngine sur le contenu texte stocké."""
+    from modules.ocr.fast_pdf_invoice_engine import FastPdfInvoiceEngine
+
+    result = FastPdfInvoiceEngine({}).process_text(document['content'] or "")
+    return asdict(result)
+
+
+class DocumentJobQueue:
+    """Opérations de file sur la table documents"""
+
+    def __init__(self, db_manager, max_attempts: int = 3,
+                 stale_after: timedelta = timedelta(minutes=5)):
+        self.db_manager = db_manager
+        self.max_attempts = max_attempts
+        self.stale_after = stale_after
+        self.logger = logging.getLogger(__name__)
+
+    # ------------------------------------------------------------------ #
+    #  RÉCLAMATION
+    # ------------------------------------------------------------------ #
+    def claim(self, worker_id: str, limit: int = 10) -> List[int]:
+        """Passe au plus `limit` documents de pending à processing pour ce worker."""
+        dialect = self.db_manager.engine.dialect
+        candidates = (
+            select(Document.id)
+            .where(Document.processing_status == STATUS_PENDING)
+            .order_by(Document.id)
+            .limit(limit)
+        )
+        if dialect.name == 'postgresql':
+            candidates = candidates.with_for_update(skip_locked=True)
+
+        values = dict(
+            processing_status=STATUS_PROCESSING,
+            worker_id=worker_id,
+            processing_started_at=datetime.utcnow(),
+            attempts=func.coalesce(Document.attempts, 0) + 1,
+        )
+
+        session = self.db_manager.get_session()
+        try:
+            if getattr(dialect, 'update_returning', False):
+                statement = (
+                    update(Document)
+                    .where(Document.id.in_(candidates.scalar_subquery()),
+                           Document.processing_status == STATUS_PENDING)
+                    .values(**values)
+                    .returning(Document.id)
+                    .execution_options(synchronize_session=False)
+                )
+                claimed = [row[0] for row in session.execute(statement)]
+            else:
+                # Sans RETURNING : UPDATE conditionnel ligne à ligne, rowcount = victoire
+                claimed = []
+                for doc_id in session.execute(candidates).scalars().all():
+                    result = session.execute(
+                        update(Document)
+                        .where(Document.id == doc_id,
+                               Document.processing_status == STATUS_PENDING)
+                        .values(**values)
+                        .execution_options(synchronize_session=False)
+                    )
+                    if result.rowcount == 1:
+                        claimed.append(doc_id)
+            # Statut visible dans les listings : nouvelle version (ETag) du client
+            bump_document_versions(session, claimed)
+            session.commit()
+            return sorted(claimed)
+        except Exception as e:
+            session.rollback()
+            self.logger.error(f"❌ Erreur réclamation documents ({worker_id}): {str(e)}")
+            raise
+        finally:
+            session.close()
+
+    # ------------------------------------------------------------------ #
+    #  RÉSULTATS
+    # ------------------------------------------------------------------ #
+    def complete(self, document_id: int, worker_id: str, result: Dict[str, Any],
+                 processing_time_ms: int) -> bool:
+        payload = json.dumps(result, ensure_ascii=False, default=str)
+        security = self.db_manager.security_manager
+        return self._finish(document_id, worker_id, dict(
+            processing_status=STATUS_COMPLETED,
+            processed=True,
+            result_encrypted=security.encrypt_data(payload) if security else payload,
+            processing_time_ms=processing_time_ms,
+            error_message=None,
+        ))
+
+    def fail(self, document_id: int, worker_id: str, error: str,
+             processing_time_ms: int, attempts: int) -> bool:
+        # Nouvelle tentative tant que max_attempts n'est pas atteint
+        status = STATUS_PENDING if attempts < self.max_attempts else STATUS_ERROR
+        return self._finish(document_id, worker_id, dict(
+            processing_status=status,
+            processing_time_ms=processing_time_ms,
+            error_message=error[:500],
+        ))
+
+    def _finish(self, document_id: int, worker_id: str, values: Dict[str, Any]) -> bool:
+        """Écrit le résultat si le document appartient encore à ce worker."""
+        values['processing_finished_at'] = datetime.utcnow()
+        session = self.db_manager.get_session()
+        try:
+            with stage_timer("db_write"):
+                result = session.execute(
+                    update(Document)
+                    .where(Document.id == document_id,
+                           Document.worker_id == worker_id,
+                           Document.processing_status == STATUS_PROCESSING)
+                    .values(**values)
+                    .execution_options(synchronize_session=False)
+                )
+                if result.rowcount == 1:
+                    bump_document_versions(session, [document_id])
+                session.commit()
+            if result.rowcount != 1:
+                self.logger.warning(f"⚠️  Document {document_id} repris par un autre worker")
+            return result.rowcount == 1
+        except Exception as e:
+            session.rollback()
+            self.logger.error(f"❌ Erreur enregistrement résultat {document_id}: {str(e)}")
+            raise
+        finally:
+            session.close()
+
+    def heartbeat(self, worker_id: str, document_ids: List[int]) -> int:
+        """Le worker est vivant : ses documents en cours ne sont pas « bloqués »."""
+        if not document_ids:
+            return 0
+        session = self.db_manager.get_session()
+        try:
+            refreshed = session.execute(
+                update(Document)
+                .where(Document.id.in_(document_ids),
+                       Document.worker_id == worker_id,
+                       Document.processing_status == STATUS_PROCESSING)
+                .values(processing_started_at=datetime.utcnow())
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            session.commit()
+            return refreshed
+        except Exception as e:
+            session.rollback()
+            self.logger.error(f"❌ Erreur heartbeat ({worker_id}): {str(e)}")
+            raise
+        finally:
+            session.close()
+
+    def get_result(self, document_id: int) -> Optional[Dict[str, Any]]:
+        return self.db_manager.get_processing_result(document_id)
+
+    # ------------------------------------------------------------------ #
+    #  RÉCUPÉRATION & SUPERVISION
+    # ------------------------------------------------------------------ #
+    def recover_stale(self, now: Optional[datetime] = None) -> int:
+        """Remet en file les documents bloqués en processing depuis stale_after."""
+        deadline = (now or datetime.utcnow()) - self.stale_after
+        stale = (
+            (Document.processing_status == STATUS_PROCESSING)
+            & (Document.processing_started_at < deadline)
+        )
+        attempts = func.coalesce(Document.attempts, 0)
+        session = self.db_manager.get_session()
+        try:
+            stale_ids = session.execute(select(Document.id).where(stale)).scalars().all()
+            requeued = session.execute(
+                update(Document)
+                .where(stale, attempts < self.max_attempts)
+                .values(processing_status=STATUS_PENDING, worker_id=None,
+                        error_message="Worker interrompu")
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            failed = session.execute(
+                update(Document)
+                .where(stale, attempts >= self.max_attempts)
+                .values(processing_status=STATUS_ERROR,
+                        error_message="Worker interrompu (tentatives épuisées)")
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            if requeued or failed:
+                bump_document_versions(session, stale_ids)
+            session.commit()
+            if requeued or failed:
+                self.logger.warning(f"♻️  Documents bloqués: {requeued} remis en file, {failed} en erreur")
+            return requeued + failed
+        except Exception as e:
+            session.rollback()
+            self.logger.error(f"❌ Erreur récupération documents bloqués: {str(e)}")
+            raise
+        finally:
+            session.close()
+
+    def stats(self) -> Dict[str, int]:
+        """Nombre de documents par statut (profondeur de file)."""
+        session = self.db_manager.get_session()
+        try:
+            rows = session.execute(
+                select(Document.processing_status, func.count(Document.id))
+                .group_by(Document.processing_status)
+            ).all()
+            return {status: count for status, count in rows}
+        finally:
+            session.close()
+
+
+def _timed_call(processor: Callable, document: Dict[str, Any]):
+    """Exécuté dans le pool : (résultat, erreur, durée ms)."""
+    start = time.perf_counter()
+    try:
+        result, error = processor(document), None
+    except Exception as e:
+        result, error = None, f"{type(e).__name__}: {e}"
+    return result, error, int((time.perf_counter() - start) * 1000)
+
+
+class ProcessingWorker:
+    """Consommateur de la file : un par nœud, N processus d'extraction"""
+
+    def __init__(self, db_manager, processor: Callable = extract_invoice_from_content,
+                 max_workers: Optional[int] = None, batch_size: int = 10,
+                 poll_interval: float = 2.0, worker_id: Optional[str] = None,
+                 executor=None, queue: Optional[DocumentJobQueue] = None):
+        self.db_manager = db_manager
+        self.processor = processor
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.worker_id = worker_id or default_worker_id()
+        self.queue = queue or DocumentJobQueue(db_manager)
+        self._executor = executor or ProcessPoolExecutor(max_workers=max_workers)
+        self._owns_executor = executor is None
+        # Processus fils : métriques rapatriées avec chaque résultat
+        self._collect_metrics = isinstance(self._executor, ProcessPoolExecutor)
+        self._stop_event = threading.Event()
+        self.logger = logging.getLogger(__name__)
+
+    def run_once(self) -> int:
+        """Un cycle : récupération, réclamation, extraction, résultats. Retourne le nb traité."""
+        self.queue.recover_stale()
+        claimed = self.queue.claim(self.worker_id, self.batch_size)
+        if not claimed:
+            return 0
+
+        documents = self.db_manager.get_documents(claimed, decrypt=True)
+        attempts = self._attempts(claimed)
+
+        # Contenu indéchiffrable : l'extraction tournerait sur le texte "[CHIFFRÉ]"
+        readable = []
+        for document in documents:
+            if document.get('decryption_failed'):
+                record_document("failed")
+                self.queue.fail(document['id'], self.worker_id, "Contenu indéchiffrable", 0,
+                                attempts.get(document['id'], 1))
+                self.logger.warning(f"⚠️  Document {document['id']} en échec: contenu indéchiffrable")
+            else:
+                readable.append(document)
+
+        futures = [
+            (document['id'], self._submit(document))
+            for document in readable
+        ]
+
+        stop_heartbeat = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat_loop, args=([doc_id for doc_id, _ in futures], stop_heartbeat),
+            name=f"heartbeat-{self.worker_id}", daemon=True,
+        )
+        heartbeat.start()
+        try:
+            self._collect(futures, attempts)
+        finally:
+            stop_heartbeat.set()
+            heartbeat.join()
+
+        # Documents réclamés mais supprimés entre-temps
+        missing = set(claimed) - {document['id'] for document in documents}
+        for document_id in missing:
+            self.queue.fail(document_id, self.worker_id, "Document introuvable", 0, self.queue.max_attempts)
+
+        return len(documents)
+
+    def _heartbeat_loop(self, document_ids: List[int], stop: threading.Event):
+        """Rafraîchit les documents en cours tant que le lot n'est pas terminé."""
+        interval = max(1.0, self.queue.stale_after.total_seconds() / 3)
+        while not stop.wait(interval):
+            try:
+                self.queue.heartbeat(self.worker_id, document_ids)
+            except Exception:
+                pass  # déjà journalisé ; nouvel essai au prochain intervalle
+
+    def _collect(self, futures, attempts: Dict[int, int]):
+        for document_id, future in futures:
+            outcome = future.result()
+            result, error, duration_ms = unwrap_collected(outcome) if self._collect_metrics else outcome
+            if error is None:
+                self.queue.complete(document_id, self.worker_id, result, duration_ms)
+                record_document(result.get('processing_method') if isinstance(result, dict) else None)
+                self.logger.info(f"✅ Document {document_id} traité en {duration_ms} ms")
+            else:
+                record_document("failed")
+                self.queue.fail(document_id, self.worker_id, error, duration_ms,
+                                attempts.get(document_id, 1))
+                self.logger.warning(f"⚠️  Document {document_id} en échec: {error}")
+
+    def _submit(self, document: Dict[str, Any]):
+        if self._collect_metrics:
+            return self._executor.submit(call_collecting, _timed_call, self.processor, document)
+        return self._executor.submit(_timed_call, self.processor, document)
+
+    def run_forever(self):
+        self.logger.info(f"🚀 Worker {self.worker_id} démarré")
+        try:
+            while not self._stop_event.is_set():
+                if self.run_once() == 0:
+                    self._stop_event.wait(self.poll_interval)
+        finally:
+            self.shutdown()
+
+    def start(self) -> threading.Thread:
+        thread = threading.Thread(target=self.run_forever, name=f"worker-{self.worker_id}", daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        self._stop_event.set()
+
+    def shutdown(self):
+        if self._owns_executor:
+            self._executor.shutdown(wait=True)
+        self.logger.info(f"🛑 Worker {self.worker_id} arrêté")
+
+    def _attempts(self, document_ids: List[int]) -> Dict[int, int]:
+        session = self.db_manager.get_session()
+        try:
+            rows = session.execute(
+                select(Document.id, Document.attempts).where(Document.id.in_(document_ids))
+            ).all()
+            return {doc_id: attempts or 0 for doc_id, attempts in rows}
+        finally:
+            session.close()
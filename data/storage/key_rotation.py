@@ -0,0 +1,331 @@
+"""
+Job de re-chiffrement pour la rotation des clés (PRODUCTION_CONFIG['key_rotation_days']).
+
+• Parcourt documents / audit_logs par plages de clé primaire (WHERE id > last_id)
+• Déchiffre + re-chiffre dans un pool de processus
+• Réécrit chaque lot dans une transaction unique avec le checkpoint, ligne
+  à ligne en compare-and-set (WHERE colonne = ancien chiffré) : une ligne
+  modifiée entre lecture et écriture n'est pas écrasée (conflit)
+• Reprise possible après arrêt : le checkpoint mémorise le dernier id traité
+• Échecs ou conflits : table « partial », le passage suivant reprend depuis
+  le début (les lignes déjà sous la clé cible sont ignorées sans écriture)
+"""
+
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import update
+
+from core.security.encryption import SecurityManager, PRODUCTION_CONFIG
+from data.storage.database import Document, AuditLog, ReencryptionCheckpoint
+
+logger = logging.getLogger(__name__)
+
+# table → (modèle, colonnes chiffrées)
+REENCRYPTION_TARGETS = {
+    "documents": (Document, ("content_encrypted", "metadata_encrypted")),
+    "audit_logs": (AuditLog, ("details_encrypted",)),
+}
+
+Row = Tuple[int, Dict[str, Optional[str]]]
+
+# SecurityManager propre à chaque processus worker (clés dérivées une fois)
+_worker_security: Optional[SecurityManager] = None
+
+
+def _init_worker(new_password: str, old_passwords: List[str]):
+    global _worker_security
+    _worker_security = SecurityManager(new_password, previous_passwords=old_passwords)
+
+
+def _reencrypt_rows(rows: List[Row]) -> List[Tuple[int, Dict[str, str], Dict[str, str], Optional[str]]]:
+    """Re-chiffre un lot de lignes ; retourne (id, colonnes modifiées, anciens chiffrés, erreur)."""
+    security = _worker_security
+    results = []
+    for row_id, values in rows:
+        changes = {}
+        try:
+            for column, value in values.items():
+                # Valeurs vides ou déjà chiffrées avec la clé cible : rien à faire
+                if not value or security.get_key_id(value) == security.key_id:
+                    continue
+                changes[column] = security.encrypt_data(security.decrypt_data(value))
+            results.append((row_id, changes, {column: values[column] for column in changes}, None))
+        except Exception as e:
+            results.append((row_id, {}, {}, str(e)))
+    return results
+
+
+class KeyRotationJob:
+    """Re-chiffrement par lots, reprenable et limitable en débit"""
+
+    def __init__(self, db_manager, new_password: str, old_passwords: List[str],
+                 job_id: Optional[str] = None, chunk_size: int = 500,
+                 max_workers: Optional[int] = None, throttle_seconds: float = 0.0,
+                 tables: Optional[List[str]] = None):
+        self.db_manager = db_manager
+        self.new_password = new_password
+        self.old_passwords = list(old_passwords)
+        self.job_id = job_id or uuid.uuid4().hex[:12]
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers  # 0 → traitement dans le processus courant
+        self.throttle_seconds = throttle_seconds
+        self.tables = tables or list(REENCRYPTION_TARGETS)
+        self.logger = logging.getLogger(__name__)
+        self._stop_event = threading.Event()
+
+        # Dérivation dans le processus parent : key_id cible pour le checkpoint
+        self.target_key_id = SecurityManager(new_password, previous_passwords=[]).key_id
+
+    # ------------------------------------------------------------------ #
+    #  EXÉCUTION
+    # ------------------------------------------------------------------ #
+    def run(self, max_chunks: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        """Exécute (ou reprend) le job ; max_chunks limite le nombre de lots par appel."""
+        self._stop_event.clear()
+        summary = {}
+
+        if self.max_workers == 0:
+            _init_worker(self.new_password, self.old_passwords)
+            executor = None
+        else:
+            executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_worker,
+                initargs=(self.new_password, self.old_passwords),
+            )
+
+        try:
+            remaining = max_chunks
+            for table_name in self.tables:
+                summary[table_name], used = self._run_table(table_name, executor, remaining)
+                if remaining is not None:
+                    remaining -= used
+                    if remaining <= 0:
+                        break
+                if self._stop_event.is_set():
+                    break
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+
+        return summary
+
+    def run_in_background(self, max_chunks: Optional[int] = None) -> threading.Thread:
+        """Lance le job dans un thread démon (arrêt propre via stop())."""
+        thread = threading.Thread(
+            target=self.run, kwargs={"max_chunks": max_chunks},
+            name=f"key-rotation-{self.job_id}", daemon=True
+        )
+        thread.start()
+        return thread
+
+    def stop(self):
+        """Demande l'arrêt après le lot en cours ; le checkpoint permet la reprise."""
+        self._stop_event.set()
+
+    def _run_table(self, table_name: str, executor, max_chunks: Optional[int]):
+        model, columns = REENCRYPTION_TARGETS[table_name]
+        checkpoint = self._load_checkpoint(table_name)
+        if checkpoint["status"] == "completed":
+            return checkpoint, 0
+        if checkpoint["status"] == "partial":
+            # Lignes en échec ou en conflit au passage précédent : nouveau passage complet
+            checkpoint = self._restart(table_name)
+
+        last_id = checkpoint["last_id"]
+        in_flight = deque()
+        # max_workers=None : le pool a os.cpu_count() processus, tous alimentés
+        workers = 1 if executor is None else (self.max_workers or os.cpu_count() or 1)
+        max_in_flight = workers * 2
+        chunks_read = 0
+        exhausted = False
+
+        self.logger.info(f"🔄 Re-chiffrement {table_name} depuis id > {last_id} (job {self.job_id})")
+
+        while True:
+            # Lecture anticipée des plages suivantes pendant que les workers chiffrent
+            while (not exhausted and len(in_flight) < max_in_flight
+                   and not self._stop_event.is_set()
+                   and (max_chunks is None or chunks_read < max_chunks)):
+                rows = self._fetch_chunk(model, columns, last_id)
+                if not rows:
+                    exhausted = True
+                    break
+                last_id = rows[-1][0]
+                chunks_read += 1
+                if executor is None:
+                    in_flight.append((last_id, len(rows), _reencrypt_rows(rows)))
+                else:
+                    in_flight.append((last_id, len(rows), executor.submit(_reencrypt_rows, rows)))
+
+            if not in_flight:
+                break
+
+            # Écriture dans l'ordre des plages : le checkpoint reste monotone
+            chunk_last_id, _, pending = in_flight.popleft()
+            results = pending if executor is None else pending.result()
+            checkpoint = self._write_chunk(model, table_name, results, chunk_last_id)
+
+            if self.throttle_seconds:
+                time.sleep(self.throttle_seconds)
+
+        if exhausted and not in_flight:
+            if checkpoint["rows_failed"]:
+                # Lignes restées sur l'ancienne clé : la rotation n'est pas terminée
+                checkpoint = self._mark(table_name, "partial")
+                self.logger.warning(
+                    f"⚠️  {table_name} partiellement re-chiffrée: {checkpoint['rows_failed']} "
+                    f"lignes en échec ou en conflit, à reprendre au prochain passage"
+                )
+            else:
+                checkpoint = self._mark(table_name, "completed")
+                self.logger.info(f"✅ {table_name} re-chiffrée: {checkpoint['rows_processed']} lignes")
+        return checkpoint, chunks_read
+
+    # ------------------------------------------------------------------ #
+    #  ACCÈS BASE
+    # ------------------------------------------------------------------ #
+    def _fetch_chunk(self, model, columns, last_id: int) -> List[Row]:
+        session = self.db_manager.get_session()
+        try:
+            query = (
+                session.query(model.id, *[getattr(model, c) for c in columns])
+                .filter(model.id > last_id)
+                .order_by(model.id)
+                .limit(self.chunk_size)
+            )
+            return [(row[0], dict(zip(columns, row[1:]))) for row in query]
+        finally:
+            session.close()
+
+    def _write_chunk(self, model, table_name: str, results, chunk_last_id: int) -> Dict[str, Any]:
+        session = self.db_manager.get_session()
+        try:
+            failed = [(row_id, error) for row_id, _, _, error in results if error]
+            for row_id, changes, originals, _ in results:
+                if not changes:
+                    continue
+                # Compare-and-set : la ligne n'a pas changé depuis _fetch_chunk
+                statement = (
+                    update(model)
+                    .where(model.id == row_id,
+                           *[getattr(model, column) == old for column, old in originals.items()])
+                    .values(**changes)
+                    .execution_options(synchronize_session=False)
+                )
+                if session.execute(statement).rowcount != 1:
+                    failed.append((row_id, "conflit : ligne modifiée pendant le re-chiffrement"))
+
+            checkpoint = self._get_or_create_checkpoint(session, table_name)
+            checkpoint.last_id = chunk_last_id
+            checkpoint.rows_processed = (checkpoint.rows_processed or 0) + len(results) - len(failed)
+            checkpoint.rows_failed = (checkpoint.rows_failed or 0) + len(failed)
+            checkpoint.status = "running"
+            checkpoint.updated_at = datetime.utcnow()
+            session.commit()
+
+            for row_id, error in failed:
+                self.logger.warning(f"⚠️  {table_name} #{row_id} non re-chiffré: {error}")
+            return self._as_dict(checkpoint)
+        except Exception as e:
+            session.rollback()
+            self.logger.error(f"❌ Erreur écriture lot {table_name} (id ≤ {chunk_last_id}): {str(e)}")
+            raise
+        finally:
+            session.close()
+
+    def _load_checkpoint(self, table_name: str) -> Dict[str, Any]:
+        session = self.db_manager.get_session()
+        try:
+            checkpoint = self._get_or_create_checkpoint(session, table_name)
+            session.commit()
+            return self._as_dict(checkpoint)
+        finally:
+            session.close()
+
+    def _restart(self, table_name: str) -> Dict[str, Any]:
+        session = self.db_manager.get_session()
+        try:
+            checkpoint = self._get_or_create_checkpoint(session, table_name)
+            checkpoint.last_id = 0
+            checkpoint.rows_processed = 0
+            checkpoint.rows_failed = 0
+            checkpoint.status = "running"
+            checkpoint.updated_at = datetime.utcnow()
+            session.commit()
+            self.logger.info(f"🔁 Nouveau passage de re-chiffrement pour {table_name}")
+            return self._as_dict(checkpoint)
+        finally:
+            session.close()
+
+    def _mark(self, table_name: str, status: str) -> Dict[str, Any]:
+        session = self.db_manager.get_session()
+        try:
+            checkpoint = self._get_or_create_checkpoint(session, table_name)
+            checkpoint.status = status
+            checkpoint.updated_at = datetime.utcnow()
+            session.commit()
+            return self._as_dict(checkpoint)
+        finally:
+            session.close()
+
+    def _get_or_create_checkpoint(self, session, table_name: str) -> ReencryptionCheckpoint:
+        checkpoint = (
+            session.query(ReencryptionCheckpoint)
+            .filter_by(job_id=self.job_id, table_name=table_name)
+            .first()
+        )
+        if checkpoint is None:
+            checkpoint = ReencryptionCheckpoint(
+                job_id=self.job_id,
+                table_name=table_name,
+                target_key_id=self.target_key_id,
+                last_id=0,
+                rows_processed=0,
+                rows_failed=0,
+                status="pending",
+            )
+            session.add(checkpoint)
+            session.flush()
+        return checkpoint
+
+    @staticmethod
+    def _as_dict(checkpoint: ReencryptionCheckpoint) -> Dict[str, Any]:
+        return {
+            "job_id": checkpoint.job_id,
+            "table_name": checkpoint.table_name,
+            "target_key_id": checkpoint.target_key_id,
+            "last_id": checkpoint.last_id,
+            "rows_processed": checkpoint.rows_processed,
+            "rows_failed": checkpoint.rows_failed,
+            "status": checkpoint.status,
+        }
+
+    # ------------------------------------------------------------------ #
+    #  PLANIFICATION
+    # ------------------------------------------------------------------ #
+    @staticmethod
+    def is_rotation_due(db_manager, now: Optional[datetime] = None) -> bool:
+        """Vrai si aucune rotation complète depuis key_rotation_days jours."""
+        session = db_manager.get_session()
+        try:
+            last = (
+                session.query(ReencryptionCheckpoint.updated_at)
+                .filter_by(status="completed")
+                .order_by(ReencryptionCheckpoint.updated_at.desc())
+                .first()
+            )
+        finally:
+            session.close()
+        if last is None:
+            return True
+        now = now or datetime.utcnow()
+        return now - last[0] >= timedelta(days=PRODUCTION_CONFIG['key_rotation_days'])
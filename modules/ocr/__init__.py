@@ -0,0 +1,41 @@
+# modules/ocr/__init__.py
+"""
+Moteurs OCR / extraction de factures.
+
+Les classes sont exposées paresseusement (PEP 562) : `import modules.ocr`
+ne charge aucun moteur ; `modules.ocr.FastPdfInvoiceEngine` importe
+uniquement fast_pdf_invoice_engine (et PyMuPDF à la première ouverture).
+"""
+
+import importlib
+
+_EXPORTS = {
+    "InvoiceExtractionResult": "invoice_extraction_result",
+    "FastPdfInvoiceEngine": "fast_pdf_invoice_engine",
+    "BaseOCR": "base_ocr",
+    "ConfigurableInvoiceOCR": "configurable_invoice_ocr",
+    "InvoiceProcessorWithFallback": "fallback_wrapper",
+    "HybridInvoiceProcessor": "hybrid_invoice_processor",
+    "PrivacyCompliantOCR": "privacy_compliant_ocr",
+    "AnonymizedInvoiceData": "privacy_compliant_ocr",
+    "InvoiceData": "field_extractor",
+    "UniversalFieldExtractor": "field_extractor",
+    "IntelligentLayoutDetector": "layout_detector",
+    "InvoiceLearningEngine": "learning_engine",
+    "ModularOCRProcessor": "modular_ocr",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    submodule = _EXPORTS.get(name)
+    if submodule is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{submodule}", __name__), name)
+    globals()[name] = value  # accès suivants sans passer par __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -6,15 +6,40 @@ BaseOCR – couche minimale commune à tous les moteurs OCR
 from __future__ import annotations
 import time
 import logging
-from pathlib import Path
-from typing import Dict, Any, Tuple
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple
 
-import pytesseract
-from PIL import Image, ImageFilter  # ← ImageFilter était manquant
+from core.observability.metrics import timed
+from core.observability.tracing import span
+
+from .document_source import DocumentSource, as_buffer, image_stream, is_path, is_pdf, source_name
+from .lazy_loader import lazy_import
+
+# Chargés au premier OCR, pas à l'import du module
+pytesseract = lazy_import("pytesseract")
+Image = lazy_import("PIL.Image")
+ImageFilter = lazy_import("PIL.ImageFilter")
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class OCRResult:
+    """Résultat d'un traitement OCR (ModularOCRProcessor et handlers)."""
+    text: str
+    confidence: float
+    word_count: int
+    processing_time: float
+    preprocessing_applied: List[str] = field(default_factory=list)
+    page_count: int = 1
+    detected_language: Optional[str] = None
+    extracted_entities: Optional[Dict[str, Any]] = None
+    success: bool = True
+    error_message: Optional[str] = None
+    document_type_detected: Optional[str] = None
+    handler_used: Optional[str] = None
+
+
 class BaseOCR:
     """
     Socle OCR :
@@ -32,10 +57,25 @@ class BaseOCR:
         logger.info("   - Seuil de confiance: %s", self.conf_threshold)
         logger.info("   - Préprocessing: %s", self.preprocessing)
 
+    def warm_up(self) -> None:
+        """
+        Pré-chauffage : charge Pillow/pytesseract et fait un premier passage
+        Tesseract (traineddata des langues configurées en cache disque).
+        """
+        try:
+            available = set(pytesseract.get_languages(config=""))
+            missing = [lang for lang in self.languages.split("+") if lang not in available]
+            if missing:
+                logger.warning("⚠️  Traineddata manquants: %s", missing)
+            pytesseract.image_to_string(Image.new("L", (32, 32), 255), lang=self.languages)
+        except Exception as exc:
+            logger.warning("⚠️  Pré-chauffage Tesseract impossible: %s", exc)
+
     # ------------------------------------------------------------------ #
     #  POINT D’ENTRÉE PUBLIC
     # ------------------------------------------------------------------ #
-    def extract_text(self, file_path: Path) -> Tuple[str, float]:
+    @timed("ocr")
+    def extract_text(self, file_path: DocumentSource) -> Tuple[str, float]:
         """
         Retourne le texte OCR + score de confiance global rudimentaire.
 
@@ -46,16 +86,18 @@ class BaseOCR:
         image = self._load_image(file_path)
         image = self._apply_preprocessing(image)
 
-        data = pytesseract.image_to_data(
-            image, lang=self.languages, output_type=pytesseract.Output.DICT
-        )
-        confidences = [
-            float(c) / 100 for c in data["conf"] if c and c != "-1"
-        ]
-        text = "\n".join(data["text"])
-        conf = sum(confidences) / len(confidences) if confidences else 0.0
-
-        logger.info("🔍 Traitement document: %s", file_path.name)
+        with span("tesseract", {"ocr.languages": self.languages}) as current:
+            data = pytesseract.image_to_data(
+                image, lang=self.languages, output_type=pytesseract.Output.DICT
+            )
+            confidences = [
+                float(c) / 100 for c in data["conf"] if c and c != "-1"
+            ]
+            text = "\n".join(data["text"])
+            conf = sum(confidences) / len(confidences) if confidences else 0.0
+            current.set_attributes({"text.length": len(text), "ocr.confidence": conf})
+
+        logger.info("🔍 Traitement document: %s", source_name(file_path))
         logger.info(
             "✅ Document traité en %.2fs - Confiance: %.2f",
             time.perf_counter() - start,
@@ -67,14 +109,18 @@ class BaseOCR:
     #  OUTILS INTERNS
     # ------------------------------------------------------------------ #
     @staticmethod
-    def _load_image(file_path: Path) -> Image.Image:
-        if file_path.suffix.lower() == ".pdf":
+    def _load_image(file_path: DocumentSource) -> Image.Image:
+        """Première page (PDF) ou image, depuis un chemin, des octets ou un flux."""
+        if is_pdf(file_path):
             try:
-                from pdf2image import convert_from_path
+                from pdf2image import convert_from_bytes, convert_from_path
             except ImportError as exc:  # pragma: no cover
                 raise ImportError("pdf2image manquant : pip install pdf2image") from exc
-            return convert_from_path(str(file_path))[0]
-        return Image.open(file_path)
+            with span("pdf2image", {"pdf.pages_rendered": 1}):
+                if is_path(file_path):
+                    return convert_from_path(str(file_path), first_page=1, last_page=1)[0]
+                return convert_from_bytes(bytes(as_buffer(file_path)), first_page=1, last_page=1)[0]
+        return Image.open(image_stream(file_path))
 
     def _apply_preprocessing(self, img: Image.Image) -> Image.Image:
         # pré-traitements très basiques ; à étoffer si nécessaire
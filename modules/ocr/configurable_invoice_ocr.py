@@ -2,9 +2,12 @@
 import re
 import unicodedata
 import logging
-from pathlib import Path
 from typing import Optional, Dict, Any
+
+from core.observability.tracing import span
+
 from .base_ocr import BaseOCR
+from .document_source import DocumentSource, source_name
 from .invoice_extraction_result import InvoiceExtractionResult
 
 logger = logging.getLogger(__name__)
@@ -15,6 +18,9 @@ class ConfigurableInvoiceOCR(BaseOCR):
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self.patterns = self._load_patterns()
+        self._compiled_patterns = {
+            key: re.compile(pattern, re.IGNORECASE) for key, pattern in self.patterns.items()
+        }
         logger.info("🔧 Module OCR Configurable Finalisé Initialisé.")
         logger.info("   - Patterns chargés: %d catégories", len(self.patterns))
 
@@ -27,15 +33,16 @@ class ConfigurableInvoiceOCR(BaseOCR):
             "vat_numbers": r'\b((?:FR|DE|IT|ES|BE|NL)[0-9A-Z\s]{8,15})\b'
         }
 
-    def process_invoice(self, file_path: Path) -> InvoiceExtractionResult:
-        """Point d'entrée principal pour traiter une facture."""
-        logger.info("--- Début du traitement pour : %s ---", file_path.name)
+    def process_invoice(self, file_path: DocumentSource) -> InvoiceExtractionResult:
+        """Point d'entrée principal pour traiter une facture (chemin, octets ou flux)."""
+        logger.info("--- Début du traitement pour : %s ---", source_name(file_path))
         
         # 1. Extraction OCR
         raw_text, confidence = self.extract_text(file_path)
         
         # 2. Extraction par regex
-        extracted_data = self._extract_data_with_patterns(raw_text)
+        with span("regex", {"text.length": len(raw_text)}):
+            extracted_data = self._extract_data_with_patterns(raw_text)
         logger.info("Données brutes extraites par regex: %s", extracted_data)
         
         # 3. Sélection intelligente du montant TTC
@@ -76,8 +83,8 @@ class ConfigurableInvoiceOCR(BaseOCR):
     def _extract_data_with_patterns(self, text: str) -> Dict[str, list]:
         """Applique tous les patterns regex sur le texte."""
         results = {}
-        for key, pattern in self.patterns.items():
-            matches = re.findall(pattern, text, re.IGNORECASE)
+        for key, pattern in self._compiled_patterns.items():
+            matches = pattern.findall(text)
             results[key] = matches
         return results
 
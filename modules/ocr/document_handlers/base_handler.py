@@ -1,5 +1,6 @@
+import re
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, List
 from pathlib import Path
 
 class BaseDocumentHandler(ABC):
@@ -13,3 +14,28 @@ class BaseDocumentHandler(ABC):
     @abstractmethod
     def process_document(self, file_path: Path, text: str) -> Dict[str, Any]:
         pass
+
+
+class DocumentHandler(ABC):
+    """Handler par type de document pour ModularOCRProcessor (patterns sur le texte OCR)"""
+
+    def __init__(self, document_type: str, supported_extensions: List[str],
+                 confidence_threshold: float, preprocessing_options: List[str]):
+        self.document_type = document_type
+        self.supported_extensions = supported_extensions
+        self.confidence_threshold = confidence_threshold
+        self.preprocessing_options = preprocessing_options
+
+    @abstractmethod
+    def get_patterns(self) -> Dict[str, re.Pattern]:
+        pass
+
+    @abstractmethod
+    def validate_document(self, text: str) -> float:
+        """Score (0-1) d'appartenance du texte à ce type de document"""
+
+    def get_tesseract_config(self) -> str:
+        return "--oem 3 --psm 6"
+
+    def postprocess_entities(self, entities: Dict, text: str) -> Dict:
+        return entities
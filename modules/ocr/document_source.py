@@ -0,0 +1,79 @@
+# modules/ocr/document_source.py
+"""
+Sources de documents acceptées par les moteurs : chemin (str/Path), octets
+(bytes, bytearray, memoryview) ou flux binaire (BytesIO, fichier ouvert…).
+
+Les octets sont passés sans copie à fitz.open(stream=...) et à
+PIL.Image.open(BytesIO) ; un document déchiffré ou uploadé n'a donc
+jamais besoin d'être écrit sur disque.
+"""
+
+import io
+from pathlib import Path
+from typing import IO, Union
+
+from .lazy_loader import lazy_import
+
+fitz = lazy_import("fitz")
+
+DocumentSource = Union[str, Path, bytes, bytearray, memoryview, IO[bytes]]
+
+PDF_MAGIC = b"%PDF-"
+
+
+def is_path(source: DocumentSource) -> bool:
+    return isinstance(source, (str, Path))
+
+
+def as_buffer(source: DocumentSource) -> Union[bytes, bytearray, memoryview]:
+    """Contenu en mémoire d'une source non-chemin (sans copie si possible)."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return source
+    if isinstance(source, io.BytesIO):
+        return source.getbuffer()
+    if hasattr(source, "read"):
+        return source.read()
+    raise TypeError(f"Source de document non supportée: {type(source).__name__}")
+
+
+def source_name(source: DocumentSource) -> str:
+    """Nom lisible pour les logs."""
+    if is_path(source):
+        return Path(source).name
+    name = getattr(source, "name", None)
+    if isinstance(name, str):
+        return Path(name).name
+    return f"<{type(source).__name__}>"
+
+
+def is_pdf(source: DocumentSource) -> bool:
+    if is_path(source):
+        return Path(source).suffix.lower() == ".pdf"
+    if hasattr(source, "read") and hasattr(source, "seek") and not isinstance(source, io.BytesIO):
+        position = source.tell()
+        head = source.read(len(PDF_MAGIC))
+        source.seek(position)
+        return head == PDF_MAGIC
+    return bytes(as_buffer(source)[:len(PDF_MAGIC)]) == PDF_MAGIC
+
+
+def open_pdf(source: DocumentSource):
+    """fitz.Document depuis un chemin ou depuis la mémoire."""
+    if is_path(source):
+        return fitz.open(source)
+    return fitz.open(stream=as_buffer(source), filetype="pdf")
+
+
+def pdf_text(source: DocumentSource) -> str:
+    """Texte brut de toutes les pages."""
+    with open_pdf(source) as doc:
+        return "\n".join(page.get_text("text") for page in doc)
+
+
+def image_stream(source: DocumentSource) -> Union[str, IO[bytes]]:
+    """Argument pour PIL.Image.open : chemin, ou flux en mémoire."""
+    if is_path(source):
+        return str(source)
+    if hasattr(source, "read"):
+        return source
+    return io.BytesIO(as_buffer(source))
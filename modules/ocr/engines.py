@@ -0,0 +1,80 @@
+# modules/ocr/engines.py
+"""
+Moteurs OCR partagés du processus, gérés par le ModuleRegistry.
+
+Les fabriques importent leur moteur à la demande (démarrage léger) ;
+warm_up_ocr_engines() les construit et les pré-chauffe au lancement de
+l'API ou du worker pour que les requêtes ne paient aucune initialisation.
+"""
+
+import threading
+from typing import Any, Dict, Iterable, Optional
+
+from core.engine.module_registry import ModuleRegistry, get_registry
+
+ENGINE_FAST_PDF = "fast_pdf"
+ENGINE_PDF_TEXT = "invoice_processor"
+ENGINE_CONFIGURABLE_OCR = "configurable_ocr"
+ENGINE_BASE_OCR = "base_ocr"
+ENGINE_LEARNING = "learning_engine"
+
+# Moteurs pré-chauffés par défaut (chemin facture : PDF rapide + fallback OCR)
+DEFAULT_WARMUP = (ENGINE_FAST_PDF, ENGINE_PDF_TEXT, ENGINE_CONFIGURABLE_OCR)
+
+
+def _fast_pdf(config: Dict[str, Any]):
+    from .fast_pdf_invoice_engine import FastPdfInvoiceEngine
+    return FastPdfInvoiceEngine(config)
+
+
+def _pdf_text(config: Dict[str, Any]):
+    from .processors.invoice_processor import InvoiceProcessor
+    return InvoiceProcessor(config)
+
+
+def _configurable_ocr(config: Dict[str, Any]):
+    from .configurable_invoice_ocr import ConfigurableInvoiceOCR
+    return ConfigurableInvoiceOCR(config)
+
+
+def _base_ocr(config: Dict[str, Any]):
+    from .base_ocr import BaseOCR
+    return BaseOCR(config)
+
+
+def _learning_engine(config: Dict[str, Any]):
+    from .learning_engine import InvoiceLearningEngine
+    return InvoiceLearningEngine()
+
+
+def register_ocr_engines(registry: ModuleRegistry) -> ModuleRegistry:
+    """Déclare les moteurs OCR (sans les construire)."""
+    registry.register_engine(ENGINE_FAST_PDF, _fast_pdf)
+    registry.register_engine(ENGINE_PDF_TEXT, _pdf_text)
+    registry.register_engine(ENGINE_CONFIGURABLE_OCR, _configurable_ocr)
+    registry.register_engine(ENGINE_BASE_OCR, _base_ocr)
+    # Données d'entraînement mutables : une instance par appelant
+    registry.register_engine(ENGINE_LEARNING, _learning_engine, exclusive=True)
+    return registry
+
+
+_registered = False
+_registered_lock = threading.Lock()
+
+
+def get_ocr_registry() -> ModuleRegistry:
+    """Registre du processus, moteurs OCR déclarés."""
+    global _registered
+    registry = get_registry()
+    if not _registered:
+        with _registered_lock:
+            if not _registered:
+                register_ocr_engines(registry)
+                _registered = True
+    return registry
+
+
+def warm_up_ocr_engines(config: Optional[Dict[str, Any]] = None,
+                        engines: Iterable[str] = DEFAULT_WARMUP) -> Dict[str, Any]:
+    """À appeler au démarrage (API, worker) avec la configuration de production."""
+    return get_ocr_registry().warm_up({name: config for name in engines})
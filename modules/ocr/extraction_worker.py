@@ -0,0 +1,138 @@
+# modules/ocr/extraction_worker.py
+"""
+Extraction de factures dans des pools de processus.
+
+L'extraction PDF (PyMuPDF + regex) est CPU-bound : exécutée dans le
+processus de l'API elle bloquerait la boucle asyncio et serait
+sérialisée par le GIL. Les pools sont gérés par core/engine/executors.py :
+
+• fast_pdf : extract_invoice, FastPdfInvoiceEngine pré-chauffé par processus
+• ocr      : complete_with_ocr, uniquement pour les résultats incomplets
+
+Chaque appel ouvre le span de son document dans le processus fils (traçage
+configuré par l'environnement, cf. core/observability/tracing.py) : span
+racine, ou enfant du span de l'appelant via tracing.traced_call (lots).
+"""
+
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from core.engine.executors import POOL_FAST_PDF, POOL_OCR, get_executor_manager
+from core.observability.tracing import span
+
+from .document_source import source_name
+from .invoice_extraction_result import InvoiceExtractionResult
+from .serialization import to_dict
+
+logger = logging.getLogger(__name__)
+
+_engine = None
+_fallback_processor = None
+
+
+def _worker_engine():
+    """Moteur du processus courant (créé une fois par processus)."""
+    global _engine
+    if _engine is None:
+        from .fast_pdf_invoice_engine import FastPdfInvoiceEngine
+        _engine = FastPdfInvoiceEngine({})
+        _engine.warm_up()
+    return _engine
+
+
+def extract_invoice(source: Union[str, bytes]) -> Dict[str, Any]:
+    """Extraction d'un PDF (chemin de fichier ou contenu en mémoire) → dict."""
+    if isinstance(source, str):
+        source = Path(source)
+    with span("invoice.process", {"document.name": source_name(source),
+                                  "invoice.processor": "fast_pdf"}) as document_span:
+        result = _worker_engine().process_invoice(source)
+        document_span.set_attributes(result.span_attributes())
+    return to_dict(result)
+
+
+def _worker_fallback_processor():
+    global _fallback_processor
+    if _fallback_processor is None:
+        from .fallback_wrapper import InvoiceProcessorWithFallback
+        _fallback_processor = InvoiceProcessorWithFallback({})
+    return _fallback_processor
+
+
+def extract_invoice_with_fallback(source: Union[str, bytes]) -> Dict[str, Any]:
+    """
+    FastPdfInvoiceEngine puis complétion OCR si des champs clés manquent.
+    Si l'OCR est indisponible (Tesseract absent…), le résultat PDF est renvoyé.
+    """
+    if isinstance(source, str):
+        source = Path(source)
+    try:
+        result = _worker_fallback_processor().process_invoice(source)
+    except Exception as exc:
+        logger.warning("⚠️  Fallback OCR indisponible pour %s: %s", source_name(source), exc)
+        return extract_invoice(source)
+    return to_dict(result)
+
+
+def needs_ocr(result: Dict[str, Any]) -> bool:
+    """Un des champs clés manque dans le résultat fast-PDF."""
+    return not InvoiceExtractionResult(**result).has_key_fields()
+
+
+def complete_with_ocr(source: Union[str, bytes], result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Complète un résultat fast-PDF par l'OCR (pool ocr), sans ré-extraire le PDF.
+    OCR indisponible : le résultat est renvoyé tel quel.
+    """
+    if isinstance(source, str):
+        source = Path(source)
+    fast_result = InvoiceExtractionResult(**result)
+    with span("invoice.complete", {"document.name": source_name(source),
+                                   "invoice.processor": "ocr_completion"}) as document_span:
+        document_span.set_attribute("fallback.reason", "missing_fields:" + ",".join(fast_result.missing_key_fields()))
+        try:
+            processor = _worker_fallback_processor()
+            ocr_result = processor.ocr.process_invoice(source)
+        except Exception as exc:
+            logger.warning("⚠️  Complétion OCR indisponible pour %s: %s", source_name(source), exc)
+            return result
+        completed = processor.complete(fast_result, ocr_result)
+        document_span.set_attributes(completed.span_attributes())
+    return to_dict(completed)
+
+
+def _spawn_pool(max_workers: int, initializer) -> ProcessPoolExecutor:
+    # spawn : pas de fork d'un processus multi-thread (boucle, pools)
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=initializer,
+    )
+
+
+def _warm_ocr_worker() -> None:
+    # Une exception dans l'initializer casserait tout le pool
+    try:
+        _worker_fallback_processor()
+    except Exception as exc:
+        logger.warning("⚠️  Pré-chauffage OCR impossible: %s", exc)
+
+
+def create_fast_pdf_executor(max_workers: int) -> ProcessPoolExecutor:
+    return _spawn_pool(max_workers, _worker_engine)
+
+
+def create_ocr_executor(max_workers: int) -> ProcessPoolExecutor:
+    return _spawn_pool(max_workers, _warm_ocr_worker)
+
+
+def get_extraction_executor(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """Pool fast_pdf partagé, sans contrôle d'admission (créé au premier appel)."""
+    return get_executor_manager().pool(POOL_FAST_PDF, max_workers).executor
+
+
+def shutdown_extraction_executor() -> None:
+    get_executor_manager().shutdown(POOL_FAST_PDF, POOL_OCR)
@@ -5,13 +5,17 @@ InvoiceProcessorWithFallback
 2. Vérifie la présence des 4 champs clés.
 3. Si l’un manque ➜ fallback ConfigurableInvoiceOCR.
 4. Complète les champs manquants, ne touche pas aux déjà corrects.
+
+La facture peut être un chemin, des octets (bytes, memoryview) ou un flux.
 """
 
-from pathlib import Path
 from typing import Dict, Any
 
+from core.observability.tracing import span
+
 from .fast_pdf_invoice_engine import FastPdfInvoiceEngine
 from .configurable_invoice_ocr import ConfigurableInvoiceOCR
+from .document_source import DocumentSource, as_buffer, is_path, source_name
 from .invoice_extraction_result import InvoiceExtractionResult
 
 
@@ -21,39 +25,48 @@ class InvoiceProcessorWithFallback:
         self.ocr = ConfigurableInvoiceOCR(cfg)
 
     # ------------------------------------------------------------------ #
-    def process_invoice(self, pdf_path: Path) -> InvoiceExtractionResult:
-        fast_res = self.fast.process_invoice(pdf_path)
+    def process_invoice(self, pdf_path: DocumentSource) -> InvoiceExtractionResult:
+        with span("invoice.process", {"document.name": source_name(pdf_path),
+                                      "invoice.processor": "fallback"}) as document_span:
+            if not is_path(pdf_path):
+                # Un flux ne se lit qu'une fois : les deux moteurs partagent le même buffer
+                pdf_path = as_buffer(pdf_path)
+            fast_res = self.fast.process_invoice(pdf_path)
 
-        if self._all_fields_present(fast_res):
-            return fast_res  # 100 % OK
+            missing = fast_res.missing_key_fields()
+            if not missing:
+                document_span.set_attributes(fast_res.span_attributes())
+                return fast_res  # 100 % OK
 
-        ocr_res = self.ocr.process_invoice(pdf_path)
+            document_span.set_attribute("fallback.reason", "missing_fields:" + ",".join(missing))
+            ocr_res = self.ocr.process_invoice(pdf_path)
+            result = self.complete(fast_res, ocr_res)
+            document_span.set_attributes(result.span_attributes())
+            return result
 
-        # complétion
-        for fld in ("total_amount", "invoice_date", "invoice_number"):
-            if not getattr(fast_res, fld) and getattr(ocr_res, fld):
-                setattr(fast_res, fld, getattr(ocr_res, fld))
+    # ------------------------------------------------------------------ #
+    @classmethod
+    def complete(cls, fast_res: InvoiceExtractionResult,
+                 ocr_res: InvoiceExtractionResult) -> InvoiceExtractionResult:
+        """Complète les champs manquants de fast_res, sans toucher aux autres."""
+        with span("merge") as current:
+            for fld in ("total_amount", "invoice_date", "invoice_number"):
+                if not getattr(fast_res, fld) and getattr(ocr_res, fld):
+                    setattr(fast_res, fld, getattr(ocr_res, fld))
 
-        if (
-            not fast_res.legal_identifiers.get("numero_tva")
-            and ocr_res.legal_identifiers.get("numero_tva")
-        ):
-            fast_res.legal_identifiers["numero_tva"] = ocr_res.legal_identifiers["numero_tva"]
+            if (
+                not fast_res.legal_identifiers.get("numero_tva")
+                and ocr_res.legal_identifiers.get("numero_tva")
+            ):
+                fast_res.legal_identifiers["numero_tva"] = ocr_res.legal_identifiers["numero_tva"]
 
-        fast_res.processing_method = (
-            "hybrid" if self._all_fields_present(fast_res) else "hybrid_partial"
-        )
+            fast_res.processing_method = (
+                "hybrid" if cls._all_fields_present(fast_res) else "hybrid_partial"
+            )
+            current.set_attribute("invoice.fields_found", fast_res.key_fields_found())
         return fast_res
 
     # ------------------------------------------------------------------ #
     @staticmethod
     def _all_fields_present(res: InvoiceExtractionResult) -> bool:
-        return all(
-            [
-                res.total_amount,
-                res.invoice_date,
-                res.invoice_number,
-                res.legal_identifiers.get("numero_tva"),
-            ]
-        )
-
+        return res.has_key_fields()
@@ -13,14 +13,18 @@ Extraction 100% texte PDF avec normalisation des dates + taux TVA + montant HT.
 
 from __future__ import annotations
 
-from pathlib import Path
 import re
 import unicodedata
 from typing import Dict, Any, Optional, List
 
-import fitz  # PyMuPDF
+from core.observability.metrics import timed
+from core.observability.tracing import span
 
+from .document_source import DocumentSource, open_pdf
 from .invoice_extraction_result import InvoiceExtractionResult
+from .lazy_loader import lazy_import, load
+
+fitz = lazy_import("fitz")  # PyMuPDF, chargé à la première ouverture de PDF
 
 
 class FastPdfInvoiceEngine:
@@ -103,9 +107,23 @@ class FastPdfInvoiceEngine:
         """Aucune configuration requise pour l'extraction PDF."""
         pass
 
-    def process_invoice(self, pdf_path: Path) -> InvoiceExtractionResult:
-        """Traite une facture PDF et retourne les données structurées."""
-        text = self._extract_text(pdf_path)
+    def warm_up(self) -> None:
+        """Charge PyMuPDF maintenant plutôt qu'au premier document."""
+        load(fitz)
+
+    def process_invoice(self, pdf_path: DocumentSource) -> InvoiceExtractionResult:
+        """Traite une facture PDF (chemin, octets ou flux) et retourne les données structurées."""
+        return self.process_text(self._extract_text(pdf_path))
+
+    def process_text(self, text: str) -> InvoiceExtractionResult:
+        """Extraction depuis un texte déjà extrait (ex. contenu stocké en base)."""
+        with span("regex", {"text.length": len(text)}) as current:
+            result = self._process_text(text)
+            current.set_attribute("invoice.fields_found", result.key_fields_found())
+        return result
+
+    @timed("regex_extraction")
+    def _process_text(self, text: str) -> InvoiceExtractionResult:
         lines = text.splitlines()
 
         result = InvoiceExtractionResult()
@@ -458,10 +476,13 @@ class FastPdfInvoiceEngine:
     # ================================================================= #
     
     @staticmethod
-    def _extract_text(pdf_path: Path) -> str:
+    @timed("text_extraction")
+    def _extract_text(pdf_path: DocumentSource) -> str:
         """Extrait le texte brut de toutes les pages du PDF."""
-        with fitz.open(pdf_path) as doc:
-            return "\n".join(page.get_text("text") for page in doc)
+        with span("fitz") as current, open_pdf(pdf_path) as doc:
+            text = "\n".join(page.get_text("text") for page in doc)
+            current.set_attributes({"pdf.page_count": doc.page_count, "text.length": len(text)})
+        return text
 
     @staticmethod
     def _to_float(raw: str) -> Optional[float]:
@@ -2,6 +2,8 @@
 import re
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, field
+
+from core.observability.metrics import timed
 from .layout_detector import TextRegion, LayoutType
 
 @dataclass
@@ -131,6 +133,7 @@ class UniversalFieldExtractor:
             ]
         }
     
+    @timed("field_extraction")
     def extract_fields(self, regions: List[TextRegion]) -> InvoiceData:
         """Extraction intelligente de tous les champs"""
         invoice = InvoiceData()
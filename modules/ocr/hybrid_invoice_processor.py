@@ -9,8 +9,10 @@ Processeur hybride intelligent :
 import logging
 from pathlib import Path
 from typing import Dict, Any, Optional
-from .processors.invoice_processor import InvoiceProcessor
-from .configurable_invoice_ocr import ConfigurableInvoiceOCR
+
+from core.observability.tracing import span
+
+from .engines import ENGINE_CONFIGURABLE_OCR, ENGINE_PDF_TEXT, get_ocr_registry
 from .invoice_extraction_result import InvoiceExtractionResult
 
 logger = logging.getLogger(__name__)
@@ -19,14 +21,16 @@ logger = logging.getLogger(__name__)
 class HybridInvoiceProcessor:
     """Processeur hybride avec fallback intelligent."""
 
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], registry=None):
         self.config = config
+        registry = registry or get_ocr_registry()
 
+        # Moteurs partagés du registre (construits une fois par configuration)
         # Moteur principal : extraction PDF rapide
-        self.fast_processor = InvoiceProcessor(config)
+        self.fast_pool = registry.engine_pool(ENGINE_PDF_TEXT, config)
 
         # Moteur de fallback : OCR complet
-        self.ocr_processor = ConfigurableInvoiceOCR(config)
+        self.ocr_pool = registry.engine_pool(ENGINE_CONFIGURABLE_OCR, config)
 
         # Seuils de confiance
         self.confidence_threshold = config.get("confidence_threshold", 0.75)
@@ -36,8 +40,30 @@ class HybridInvoiceProcessor:
         logger.info("   - Seuil confiance: %.2f", self.confidence_threshold)
         logger.info("   - Seuil fallback OCR: %.2f", self.ocr_fallback_threshold)
 
+    def bind_config(self, config_manager, config_name: str = "hybrid"):
+        """Seuils mis à jour à chaud à chaque rechargement de la configuration."""
+        def updater(attribute):
+            def on_change(_config_name, value):
+                if value is not None:
+                    setattr(self, attribute, float(value))
+                    logger.info("🔧 %s → %.2f", attribute, float(value))
+            return on_change
+
+        unsubscribers = [
+            config_manager.subscribe(config_name, updater(key), key_path=key)
+            for key in ("confidence_threshold", "ocr_fallback_threshold")
+        ]
+        return lambda: [unsubscribe() for unsubscribe in unsubscribers]
+
     def process_invoice(self, file_path: Path) -> InvoiceExtractionResult:
-        """Point d'entrée principal avec stratégie hybride."""
+        """Point d'entrée principal avec stratégie hybride (un span par document)."""
+        with span("invoice.process", {"document.name": file_path.name,
+                                      "invoice.processor": "hybrid"}) as document_span:
+            result = self._process_invoice(file_path, document_span)
+            document_span.set_attributes(result.span_attributes())
+            return result
+
+    def _process_invoice(self, file_path: Path, document_span) -> InvoiceExtractionResult:
         logger.info("🚀 Traitement hybride: %s", file_path.name)
 
         # ================================================================
@@ -45,9 +71,11 @@ class HybridInvoiceProcessor:
         # ================================================================
         try:
             logger.info("⚡ Tentative extraction PDF rapide...")
-            result_fast = self._try_fast_extraction(file_path)
+            with span("fast_pdf"):
+                result_fast = self._try_fast_extraction(file_path)
 
-            if self._is_result_reliable(result_fast):
+            fallback_reason = self._unreliable_reason(result_fast)
+            if fallback_reason is None:
                 logger.info("✅ Extraction rapide réussie - Confiance: %.2f",
                             result_fast.extraction_confidence)
                 result_fast.processing_method = "fast_pdf"
@@ -59,13 +87,16 @@ class HybridInvoiceProcessor:
         except Exception as e:
             logger.warning("❌ Extraction PDF échouée: %s", str(e))
             result_fast = None
+            fallback_reason = f"fast_pdf_error:{type(e).__name__}"
 
         # ================================================================
         # ÉTAPE 2 : Fallback OCR complet
         # ================================================================
         logger.info("🔍 Activation fallback OCR...")
+        document_span.set_attribute("fallback.reason", fallback_reason)
         try:
-            result_ocr = self._try_ocr_extraction(file_path)
+            with span("ocr"):
+                result_ocr = self._try_ocr_extraction(file_path)
 
             if self._is_result_reliable(result_ocr):
                 logger.info("✅ Extraction OCR réussie - Confiance: %.2f",
@@ -85,7 +116,8 @@ class HybridInvoiceProcessor:
         # ================================================================
         if result_fast and result_ocr:
             logger.info("🔀 Fusion des résultats des deux moteurs")
-            return self._merge_results(result_fast, result_ocr)
+            with span("merge"):
+                return self._merge_results(result_fast, result_ocr)
         elif result_fast:
             logger.info("📋 Retour résultat PDF (seul disponible)")
             result_fast.processing_method = "fast_pdf_only"
@@ -108,25 +140,33 @@ class HybridInvoiceProcessor:
         }
 
         # Utilise la logique éprouvée d'InvoiceProcessor
-        return self.fast_processor.structure_results(extracted_data, "")
+        with self.fast_pool.acquire() as fast_processor:
+            return fast_processor.structure_results(extracted_data, "")
 
     def _try_ocr_extraction(self, file_path: Path) -> InvoiceExtractionResult:
         """Extraction OCR complète avec le moteur configurable."""
-        return self.ocr_processor.process_invoice(file_path)
+        with self.ocr_pool.acquire() as ocr_processor:
+            return ocr_processor.process_invoice(file_path)
 
     def _is_result_reliable(self, result: Optional[InvoiceExtractionResult]) -> bool:
         """Évalue la fiabilité d'un résultat d'extraction."""
+        return self._unreliable_reason(result) is None
+
+    def _unreliable_reason(self, result: Optional[InvoiceExtractionResult]) -> Optional[str]:
+        """Motif de rejet d'un résultat (raison du fallback), None s'il est fiable."""
         if not result:
-            return False
+            return "no_result"
 
         has_amount = bool(result.total_amount and result.total_amount > 0)
         has_date = bool(result.invoice_date)
         has_number = bool(result.invoice_number)
-        confidence_ok = result.extraction_confidence >= self.confidence_threshold
 
         # Au minimum : montant + (date OU numéro) + confiance suffisante
-        core_fields = has_amount and (has_date or has_number)
-        return core_fields and confidence_ok
+        if not (has_amount and (has_date or has_number)):
+            return "missing_fields"
+        if result.extraction_confidence < self.confidence_threshold:
+            return "low_confidence"
+        return None
 
     def _merge_results(
         self,
@@ -31,3 +31,28 @@ class InvoiceExtractionResult:
             self.legal_identifiers = {}
         if self.amounts_found is None:
             self.amounts_found = []
+    
+    def missing_key_fields(self) -> List[str]:
+        """Champs clés absents, dans l'ordre montant, date, numéro, n° de TVA"""
+        key_fields = {
+            "total_amount": self.total_amount,
+            "invoice_date": self.invoice_date,
+            "invoice_number": self.invoice_number,
+            "numero_tva": self.legal_identifiers.get("numero_tva"),
+        }
+        return [name for name, value in key_fields.items() if not value]
+
+    def key_fields_found(self) -> int:
+        return 4 - len(self.missing_key_fields())
+
+    def has_key_fields(self) -> bool:
+        """Montant, date, numéro et n° de TVA présents (sinon complétion OCR)"""
+        return not self.missing_key_fields()
+
+    def span_attributes(self) -> Dict[str, Any]:
+        """Attributs de trace du résultat (cf. core/observability/tracing.py)"""
+        return {
+            "invoice.processing_method": self.processing_method,
+            "invoice.fields_found": self.key_fields_found(),
+            "invoice.confidence": self.extraction_confidence,
+        }
@@ -4,6 +4,8 @@ from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 from enum import Enum
 
+from core.observability.metrics import timed
+
 class LayoutType(Enum):
     HEADER = "header"
     SUPPLIER = "supplier"
@@ -51,6 +53,7 @@ class IntelligentLayoutDetector:
             ]
         }
     
+    @timed("layout")
     def analyze_layout(self, ocr_data: Dict) -> List[TextRegion]:
         """Analyse intelligente du layout de la facture"""
         regions = []
@@ -0,0 +1,67 @@
+# modules/ocr/lazy_loader.py
+"""
+Chargement différé des dépendances lourdes (PyMuPDF, Tesseract, Pillow,
+scikit-learn…) : le module réel n'est importé qu'au premier attribut lu.
+
+    fitz = lazy_import("fitz")          # rien n'est chargé ici
+    with fitz.open(path) as doc: ...    # import effectif ici
+"""
+
+from __future__ import annotations
+
+import importlib
+import sys
+import threading
+import types
+
+
+class LazyModule(types.ModuleType):
+    """Proxy de module : importe `name` au premier accès, puis délègue."""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_module"] = None
+        self.__dict__["_lazy_lock"] = threading.Lock()
+
+    def load(self) -> types.ModuleType:
+        """Import effectif (pré-chauffage) ; retourne le module réel."""
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            with self.__dict__["_lazy_lock"]:
+                module = self.__dict__["_lazy_module"]
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self.load(), attr)
+
+    def __dir__(self):
+        return dir(self.load())
+
+    def __repr__(self) -> str:
+        state = "chargé" if self.__dict__["_lazy_module"] is not None else "différé"
+        return f"<module '{self.__name__}' ({state})>"
+
+
+def lazy_import(name: str):
+    """Module déjà importé → retourné tel quel ; sinon proxy LazyModule."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
+
+
+def load(module) -> types.ModuleType:
+    """Module réel, proxy LazyModule ou non : force l'import si différé."""
+    if isinstance(module, LazyModule):
+        return module.load()
+    return module
+
+
+def is_loaded(module) -> bool:
+    """Vrai si le module (ou son proxy) a déjà été réellement importé."""
+    if isinstance(module, LazyModule):
+        return module.__dict__["_lazy_module"] is not None
+    return True
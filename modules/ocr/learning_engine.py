@@ -6,16 +6,19 @@ Moteur d'apprentissage pour améliorer l'extraction
 import json
 from pathlib import Path
 from typing import Dict, List, Tuple, Any  # Ajout de Any
-import joblib
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.ensemble import RandomForestClassifier
+from .lazy_loader import lazy_import
+
+# scikit-learn / joblib : chargés à la création du moteur
+joblib = lazy_import("joblib")
+sklearn_text = lazy_import("sklearn.feature_extraction.text")
+sklearn_ensemble = lazy_import("sklearn.ensemble")
 
 
 class InvoiceLearningEngine:
     def __init__(self):
-        self.vectorizer = TfidfVectorizer(max_features=1000, ngram_range=(1, 3))
-        self.amount_classifier = RandomForestClassifier(n_estimators=100)
-        self.number_classifier = RandomForestClassifier(n_estimators=100)
+        self.vectorizer = sklearn_text.TfidfVectorizer(max_features=1000, ngram_range=(1, 3))
+        self.amount_classifier = sklearn_ensemble.RandomForestClassifier(n_estimators=100)
+        self.number_classifier = sklearn_ensemble.RandomForestClassifier(n_estimators=100)
 
         self.training_data = []
 
@@ -81,24 +81,28 @@ class ModularOCRProcessor:
         start_time = time.time()
         
         try:
-            # Lecture OCR de base (réutilise la logique existante)
-            from .base_ocr import FiscalOCRModule
+            # Lecture OCR de base (moteur partagé du registre)
+            from .engines import ENGINE_BASE_OCR, get_ocr_registry
             
             # Configuration temporaire pour OCR de base
             base_config = {
                 "languages": self.languages,
                 "confidence_threshold": self.config.get('confidence_threshold', 0.7),
                 "preprocessing": self.config.get('preprocessing', ['contrast', 'denoise']),
-                "fiscal_mode": False  # Désactivé car on gère manuellement
             }
             
-            base_ocr = FiscalOCRModule(base_config)
-            
             # OCR de base pour extraire le texte
-            base_result = base_ocr.process_document(file_path, "generic")
+            with get_ocr_registry().acquire_engine(ENGINE_BASE_OCR, base_config) as base_ocr:
+                text, confidence = base_ocr.extract_text(file_path)
             
-            if not base_result.success:
-                return base_result
+            base_result = OCRResult(
+                text=text,
+                confidence=confidence,
+                word_count=len(text.split()),
+                processing_time=time.time() - start_time,
+                preprocessing_applied=base_config['preprocessing'],
+                success=True
+            )
             
             # Détection du type de document si non spécifié
             if document_type is None or document_type == 'auto':
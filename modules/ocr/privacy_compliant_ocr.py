@@ -123,20 +123,19 @@ class PrivacyCompliantOCR:
     def _extract_text_ocr(self, file_path: Path) -> str:
         """Extraction OCR basique (réutilise votre module existant)"""
         try:
-            # Utilisation de votre module OCR existant
-            from .base_ocr import FiscalOCRModule
+            # Moteur OCR partagé du registre (pas de reconstruction par document)
+            from .engines import ENGINE_BASE_OCR, get_ocr_registry
             
             base_config = {
                 "languages": self.config.get('languages', ['fra']),
                 "confidence_threshold": 0.7,
-                "preprocessing": ["contrast", "denoise"],
-                "fiscal_mode": False
+                "preprocessing": ["contrast", "denoise"]
             }
             
-            ocr = FiscalOCRModule(base_config)
-            result = ocr.process_document(file_path, "invoice")
+            with get_ocr_registry().acquire_engine(ENGINE_BASE_OCR, base_config) as ocr:
+                text, _confidence = ocr.extract_text(file_path)
             
-            return result.text if result.success else ""
+            return text
             
         except Exception as e:
             print(f"❌ Erreur OCR: {e}")
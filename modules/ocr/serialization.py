@@ -0,0 +1,78 @@
+# modules/ocr/serialization.py
+"""
+Sérialisation JSON des résultats d'extraction.
+
+• to_dict() : sérialiseur précompilé par dataclass (attrgetter sur la liste
+  des champs, calculée une fois) au lieu de dataclasses.asdict, qui recopie
+  récursivement chaque valeur
+• dumps()   : orjson si installé (dataclasses, Enum, datetime natifs),
+  sinon json de la bibliothèque standard avec to_dict() en hook
+"""
+
+import json
+from dataclasses import fields, is_dataclass
+from datetime import date, datetime
+from enum import Enum
+from operator import attrgetter
+from typing import Any, Callable, Dict
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from .field_extractor import InvoiceData, InvoiceField
+from .invoice_extraction_result import InvoiceExtractionResult
+from .privacy_compliant_ocr import AnonymizedInvoiceData
+
+ORJSON_AVAILABLE = orjson is not None
+
+_SERIALIZERS: Dict[type, Callable[[Any], Dict[str, Any]]] = {}
+
+
+def compile_serializer(cls: type) -> Callable[[Any], Dict[str, Any]]:
+    """Sérialiseur d'une dataclass : dict de premier niveau, sans copie des valeurs."""
+    names = tuple(f.name for f in fields(cls))
+    getter = attrgetter(*names)
+    if len(names) == 1:
+        serializer = lambda obj: {names[0]: getter(obj)}
+    else:
+        serializer = lambda obj: dict(zip(names, getter(obj)))
+    _SERIALIZERS[cls] = serializer
+    return serializer
+
+
+for _cls in (InvoiceExtractionResult, InvoiceData, InvoiceField, AnonymizedInvoiceData):
+    compile_serializer(_cls)
+
+
+def to_dict(obj: Any) -> Dict[str, Any]:
+    """Dict d'une dataclass ; les valeurs imbriquées restent à sérialiser par dumps()."""
+    serializer = _SERIALIZERS.get(type(obj))
+    if serializer is None:
+        serializer = compile_serializer(type(obj))
+    return serializer(obj)
+
+
+def _default(obj: Any) -> Any:
+    serializer = _SERIALIZERS.get(type(obj))
+    if serializer is not None:
+        return serializer(obj)
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return to_dict(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if isinstance(obj, (bytes, memoryview)):
+        return bytes(obj).decode("utf-8", errors="replace")
+    return str(obj)
+
+
+def dumps(content: Any) -> bytes:
+    """JSON compact en UTF-8 (pas d'échappement ASCII)."""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
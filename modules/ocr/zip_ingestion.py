@@ -0,0 +1,118 @@
+# modules/ocr/zip_ingestion.py
+"""
+Ingestion d'archives ZIP sans extraction sur disque.
+
+Les membres PDF sont lus un par un (flux décompressé, taille bornée) et
+leurs octets passés tels quels aux workers, qui les ouvrent avec
+fitz.open(stream=...). Le nombre de membres lus mais pas encore traités
+est borné : une archive de plusieurs Go est traitée en mémoire constante,
+et les premiers résultats arrivent avant la fin de la lecture.
+"""
+
+import asyncio
+import logging
+import zipfile
+from concurrent.futures import Executor
+from pathlib import PurePosixPath
+from typing import IO, Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+ZIP_MAGIC = b"PK\x03\x04"
+DEFAULT_MAX_MEMBER_BYTES = 50 * 1024 * 1024
+READ_CHUNK = 1024 * 1024
+
+ArchiveSource = Union[str, IO[bytes]]
+
+
+class ArchiveTooLarge(Exception):
+    """Archive ZIP dépassant les limites (nombre de fichiers ou taille d'un membre)."""
+
+
+def list_pdf_members(archive: Union[ArchiveSource, zipfile.ZipFile],
+                     max_files: Optional[int] = None) -> List[str]:
+    """Noms des membres PDF (lecture du répertoire central uniquement)."""
+    zf = archive if isinstance(archive, zipfile.ZipFile) else zipfile.ZipFile(archive)
+    try:
+        names = [
+            info.filename for info in zf.infolist()
+            if not info.is_dir() and info.filename.lower().endswith(".pdf")
+            and not PurePosixPath(info.filename).name.startswith(".")
+        ]
+    finally:
+        if zf is not archive:
+            zf.close()
+    if max_files is not None and len(names) > max_files:
+        raise ArchiveTooLarge(f"Plus de {max_files} fichiers dans l'archive")
+    return names
+
+
+def read_member(zf: zipfile.ZipFile, name: str,
+                max_bytes: int = DEFAULT_MAX_MEMBER_BYTES) -> bytes:
+    """
+    Contenu décompressé d'un membre. La taille annoncée par l'archive n'est
+    pas crue : la lecture s'arrête dès que max_bytes est dépassé.
+    """
+    buffer = bytearray()
+    with zf.open(name) as member:
+        while True:
+            chunk = member.read(READ_CHUNK)
+            if not chunk:
+                break
+            buffer += chunk
+            if len(buffer) > max_bytes:
+                raise ArchiveTooLarge(f"'{name}' décompressé > {max_bytes // (1024 * 1024)} Mo")
+    return bytes(buffer)
+
+
+def iter_pdf_members(archive: ArchiveSource,
+                     max_member_bytes: int = DEFAULT_MAX_MEMBER_BYTES) -> Iterator[Tuple[str, bytes]]:
+    """(nom, octets) pour chaque PDF de l'archive, un membre en mémoire à la fois."""
+    with zipfile.ZipFile(archive) as zf:
+        for name in list_pdf_members(zf):
+            yield name, read_member(zf, name, max_member_bytes)
+
+
+async def extract_archive(
+    archive: ArchiveSource,
+    processor: Callable[[bytes], Dict[str, Any]],
+    executor: Optional[Executor] = None,
+    max_in_flight: int = 8,
+    max_member_bytes: int = DEFAULT_MAX_MEMBER_BYTES,
+) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Extrait chaque PDF de l'archive dans l'executor, au fil de la lecture.
+    Produit (nom, résultat) — ou (nom, exception) — dans l'ordre d'achèvement ;
+    au plus max_in_flight membres sont en mémoire simultanément.
+    """
+    loop = asyncio.get_running_loop()
+    pending = set()
+    names: Dict[asyncio.Future, str] = {}
+
+    def completed(done) -> List[Tuple[str, Any]]:
+        results = []
+        for future in done:
+            name = names.pop(future)
+            error = future.exception()
+            results.append((name, error if error is not None else future.result()))
+        return results
+
+    with zipfile.ZipFile(archive) as zf:
+        for name in await asyncio.to_thread(list_pdf_members, zf):
+            while len(pending) >= max_in_flight:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for item in completed(done):
+                    yield item
+            try:
+                content = await asyncio.to_thread(read_member, zf, name, max_member_bytes)
+            except ArchiveTooLarge as exc:
+                yield name, exc
+                continue
+            future = loop.run_in_executor(executor, processor, content)
+            names[future] = name
+            pending.add(future)
+
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for item in completed(done):
+            yield item
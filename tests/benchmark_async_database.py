@@ -0,0 +1,118 @@
+# tests/benchmark_async_database.py
+"""
+Test de charge : routes FastAPI async adossées à DatabaseManager (synchrone,
+bloque la boucle) vs AsyncDatabaseManager. Mesure débit, latence p95 et
+retard maximal de la boucle d'événements sous N requêtes concurrentes.
+
+    python tests/benchmark_async_database.py --requests 2000 --concurrency 100
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from fastapi import FastAPI
+
+from core.security.encryption import SecurityManager
+from data.storage.database import DatabaseManager
+from data.storage.async_database import AsyncDatabaseManager
+
+
+def build_app(sync_db: DatabaseManager, async_db: AsyncDatabaseManager) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/sync/documents/{document_id}")
+    async def get_document_sync(document_id: int):
+        return sync_db.get_document(document_id)
+
+    @app.get("/async/documents/{document_id}")
+    async def get_document_async(document_id: int):
+        return await async_db.get_document(document_id)
+
+    return app
+
+
+async def _loop_lag(stop: asyncio.Event, samples: list, interval: float = 0.005):
+    """Retard du réveil d'une tâche périodique = temps où la boucle était bloquée."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append((time.perf_counter() - start - interval) * 1000)
+
+
+async def run_load(app: FastAPI, prefix: str, document_ids: list,
+                   total: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, lag = [], []
+    stop = asyncio.Event()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one(i: int):
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get(f"{prefix}/documents/{document_ids[i % len(document_ids)]}")
+                latencies.append((time.perf_counter() - start) * 1000)
+                assert response.status_code == 200
+
+        monitor = asyncio.create_task(_loop_lag(stop, lag))
+        start = time.perf_counter()
+        await asyncio.gather(*[one(i) for i in range(total)])
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await monitor
+
+    latencies.sort()
+    return {
+        "rps": total / elapsed,
+        "p50": statistics.median(latencies),
+        "p95": latencies[int(len(latencies) * 0.95) - 1],
+        "max_lag": max(lag) if lag else 0.0,
+    }
+
+
+async def main_async(args):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        database_url = f"sqlite:///{tmp_dir}/load.db"
+        security = SecurityManager("benchmark_key", previous_passwords=[])
+        pool_config = {"pool_size": args.pool_size, "max_overflow": 0}
+
+        sync_db = DatabaseManager(database_url, security, pool_config=pool_config)
+        async_db = await AsyncDatabaseManager.create(database_url, security, pool_config=pool_config)
+
+        payload = "Facture " * (args.content_kb * 128)
+        document_ids = [
+            sync_db.create_document("CLIENT_LOAD", f"doc_{i}.pdf", f"{i} {payload}", "facture")
+            for i in range(args.documents)
+        ]
+
+        app = build_app(sync_db, async_db)
+        print(f"🚀 {args.requests} requêtes, concurrence {args.concurrency}, pool {args.pool_size}")
+        for label, prefix in (("DatabaseManager (sync)", "/sync"), ("AsyncDatabaseManager", "/async")):
+            stats = await run_load(app, prefix, document_ids, args.requests, args.concurrency)
+            print(f"   - {label:<24}: {stats['rps']:7.0f} req/s | p50 {stats['p50']:7.1f} ms"
+                  f" | p95 {stats['p95']:7.1f} ms | boucle bloquée max {stats['max_lag']:6.1f} ms")
+
+        await async_db.dispose()
+        sync_db.engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--documents", type=int, default=200)
+    parser.add_argument("--content-kb", type=int, default=64)
+    parser.add_argument("--pool-size", type=int, default=10)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# tests/benchmark_auth.py
+"""
+Coût de l'authentification par requête (verify_token) face à un serveur
+JWKS local remplaçant Keycloak :
+
+• vérification complète (parsing + RSA) vs jeton déjà en cache
+• démarrage à froid sous N requêtes concurrentes : appels JWKS avec
+  l'ancien chargement (un client HTTP par échec de cache, sans single-flight)
+  vs JwksCache
+
+    python tests/benchmark_auth.py --requests 5000 --tokens 100 --concurrency 100
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from starlette.requests import Request
+
+from api.middleware import auth
+from config.keycloak_settings import SETTINGS
+from tests.jwks_stub import JwksStub
+
+
+def _request(token: str) -> Request:
+    return Request({"type": "http", "method": "GET", "headers": [(b"authorization", f"Bearer {token}".encode())]})
+
+
+async def _legacy_get_jwks(cache: dict) -> dict:
+    """Ancien chargement : TTLCache simple, nouveau AsyncClient à chaque échec."""
+    if "jwks" in cache:
+        return cache["jwks"]
+    async with httpx.AsyncClient(timeout=5) as client:
+        r = await client.get(SETTINGS.jwks_url)
+        r.raise_for_status()
+        cache["jwks"] = r.json()
+        return cache["jwks"]
+
+
+async def per_request_cost(tokens: list, total: int, clear_tokens: bool) -> dict:
+    timings = []
+    for i in range(total):
+        if clear_tokens:
+            auth._token_cache.clear()
+        request = _request(tokens[i % len(tokens)])
+        start = time.perf_counter()
+        await auth.verify_token(request)
+        timings.append((time.perf_counter() - start) * 1e6)
+    timings.sort()
+    return {
+        "mean": statistics.fmean(timings),
+        "p50": timings[len(timings) // 2],
+        "p95": timings[int(len(timings) * 0.95)],
+    }
+
+
+async def cold_start_hits(stub: JwksStub, tokens: list, concurrency: int) -> dict:
+    hits = {}
+
+    stub.hits = 0
+    legacy_cache: dict = {}
+    await asyncio.gather(*[_legacy_get_jwks(legacy_cache) for _ in range(concurrency)])
+    hits["legacy"] = stub.hits
+
+    stub.hits = 0
+    auth.clear_auth_caches()
+    await asyncio.gather(*[auth.verify_token(_request(tokens[i % len(tokens)])) for i in range(concurrency)])
+    hits["jwks_cache"] = stub.hits
+    return hits
+
+
+async def main_async(args):
+    with JwksStub(latency=args.jwks_latency_ms / 1000) as stub:
+        SETTINGS.issuer, SETTINGS.jwks_url = stub.issuer, stub.url
+        tokens = [stub.token(subject=f"user_{i}") for i in range(args.tokens)]
+
+        print(f"🚀 {args.requests} requêtes, {args.tokens} jetons distincts, JWKS +{args.jwks_latency_ms} ms")
+        hits = await cold_start_hits(stub, tokens, args.concurrency)
+        print(f"   - Démarrage à froid ({args.concurrency} requêtes concurrentes) : "
+              f"{hits['legacy']} appels JWKS avant, {hits['jwks_cache']} avec JwksCache")
+
+        for label, clear in (("Vérification complète", True), ("Jeton en cache", False)):
+            stats = await per_request_cost(tokens, args.requests, clear)
+            print(f"   - {label:<22}: moyenne {stats['mean']:8.1f} µs | p50 {stats['p50']:8.1f} µs"
+                  f" | p95 {stats['p95']:8.1f} µs")
+
+        await auth.close_auth_client()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--tokens", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--jwks-latency-ms", type=float, default=20.0)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# tests/benchmark_document_listing.py
+"""
+Benchmark du listing de documents : pagination par clé (seek) vs OFFSET
+sur une base SQLite de 1M lignes (taille réglable : --rows).
+
+    python tests/benchmark_document_listing.py --rows 1000000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from data.storage.database import DatabaseManager
+
+CLIENTS = 200
+DOCUMENT_TYPES = ("facture", "releve", "avis_imposition", "contrat")
+STATUSES = ("pending", "processing", "completed", "error")
+
+
+def build_fixture(db_manager: DatabaseManager, rows: int, batch: int = 50000):
+    """Insertion brute (executemany) : colonnes chiffrées remplies d'un texte fixe."""
+    start = datetime(2020, 1, 1)
+    payload = "x" * 512
+    with db_manager.engine.begin() as conn:
+        for offset in range(0, rows, batch):
+            conn.execute(
+                text(
+                    "INSERT INTO documents (client_id, filename, document_type, content_encrypted, "
+                    "metadata_encrypted, created_at, processed, processing_status) "
+                    "VALUES (:client_id, :filename, :document_type, :content, '{}', "
+                    ":created_at, :processed, :status)"
+                ),
+                [
+                    {
+                        "client_id": f"CLIENT_{i % CLIENTS:04d}",
+                        "filename": f"document_{i}.pdf",
+                        "document_type": DOCUMENT_TYPES[i % len(DOCUMENT_TYPES)],
+                        "content": payload,
+                        "created_at": start + timedelta(minutes=i),
+                        "processed": i % 3 == 0,
+                        "status": STATUSES[i % len(STATUSES)],
+                    }
+                    for i in range(offset, min(offset + batch, rows))
+                ],
+            )
+
+
+def time_keyset(db_manager: DatabaseManager, pages: int, **filters) -> float:
+    cursor = None
+    start = time.perf_counter()
+    for _ in range(pages):
+        page = db_manager.list_documents(limit=50, cursor=cursor, **filters)
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    return (time.perf_counter() - start) * 1000 / pages
+
+
+def time_offset_page(db_manager: DatabaseManager, page_index: int) -> float:
+    start = time.perf_counter()
+    with db_manager.engine.connect() as conn:
+        conn.execute(
+            text(
+                "SELECT id, client_id, filename, document_type, created_at, processed, processing_status "
+                "FROM documents ORDER BY created_at DESC, id DESC LIMIT 50 OFFSET :offset"
+            ),
+            {"offset": page_index * 50},
+        ).fetchall()
+    return (time.perf_counter() - start) * 1000
+
+
+def time_deep_keyset_page(db_manager: DatabaseManager, page_index: int) -> float:
+    """Coût d'une page profonde : on part du curseur de la page précédente."""
+    with db_manager.engine.connect() as conn:
+        created_at, doc_id = conn.execute(
+            text("SELECT created_at, id FROM documents ORDER BY created_at DESC, id DESC "
+                 "LIMIT 1 OFFSET :offset"),
+            {"offset": page_index * 50 - 1},
+        ).one()
+    cursor = db_manager._encode_cursor(datetime.fromisoformat(str(created_at)), doc_id)
+    start = time.perf_counter()
+    db_manager.list_documents(limit=50, cursor=cursor)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--pages", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_manager = DatabaseManager(f"sqlite:///{tmp_dir}/listing.db")
+
+        print(f"🏗️  Construction de la base ({args.rows:,} lignes)...")
+        start = time.perf_counter()
+        build_fixture(db_manager, args.rows)
+        print(f"   ✅ {time.perf_counter() - start:.1f}s")
+
+        print("\n📊 Pagination par clé (ms/page, 50 lignes)")
+        print(f"   - Tous documents         : {time_keyset(db_manager, args.pages):.2f}")
+        print(f"   - Client                 : {time_keyset(db_manager, args.pages, client_id='CLIENT_0042'):.2f}")
+        print(f"   - Client + type          : "
+              f"{time_keyset(db_manager, args.pages, client_id='CLIENT_0042', document_type='avis_imposition'):.2f}")
+        print(f"   - Statut 'pending'       : {time_keyset(db_manager, args.pages, processing_status='pending'):.2f}")
+        created_from = datetime(2020, 6, 1)
+        print(f"   - Plage de dates (30 j)  : "
+              f"{time_keyset(db_manager, args.pages, created_from=created_from, created_to=created_from + timedelta(days=30)):.2f}")
+
+        print("\n📉 Page profonde : OFFSET vs curseur (ms)")
+        for page_index in (1, 100, 1000, (args.rows // 50) - 1):
+            if page_index * 50 >= args.rows:
+                continue
+            print(f"   - page {page_index:>6}: OFFSET {time_offset_page(db_manager, page_index):8.2f}"
+                  f" | curseur {time_deep_keyset_page(db_manager, page_index):6.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# tests/benchmark_import_time.py
+"""
+Temps d'import à froid (python -X importtime) des points d'entrée API/CLI.
+
+Échoue (code 1) si api.main dépasse le budget ou charge une dépendance
+OCR/ML lourde au démarrage.
+
+    python tests/benchmark_import_time.py --budget-ms 1500 --top 15
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Ne doivent être chargées qu'au premier traitement de document
+HEAVY_MODULES = ("fitz", "pymupdf", "pytesseract", "PIL", "cv2", "numpy",
+                 "sklearn", "joblib", "spacy", "transformers", "torch")
+
+DEFAULT_BUDGET_MS = 1500.0
+
+_LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+def measure_import(target: str) -> dict:
+    """Importe `target` dans un interpréteur neuf et analyse -X importtime."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=PROJECT_ROOT, capture_output=True, text=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Import de {target} impossible:\n{completed.stderr[-2000:]}")
+
+    modules = {}
+    total_us = 0
+    for line in completed.stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        total_us += int(self_us)
+        depth = (len(indent) - 1) // 2
+        modules[name] = {"self_ms": int(self_us) / 1000, "cumulative_ms": int(cumulative_us) / 1000,
+                         "depth": depth}
+
+    heavy = sorted({name.split(".")[0] for name in modules} & set(HEAVY_MODULES))
+    return {"total_ms": total_us / 1000, "modules": modules, "heavy": heavy}
+
+
+def check_budget(target: str = "api.main", budget_ms: float = DEFAULT_BUDGET_MS) -> list:
+    """Liste des violations (vide si le démarrage respecte le budget)."""
+    report = measure_import(target)
+    problems = []
+    if report["total_ms"] > budget_ms:
+        problems.append(f"{target}: {report['total_ms']:.0f} ms > budget {budget_ms:.0f} ms")
+    if report["heavy"]:
+        problems.append(f"{target}: dépendances lourdes chargées à l'import: {', '.join(report['heavy'])}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--budget-ms", type=float,
+                        default=float(os.getenv("FISCAL_AI_IMPORT_BUDGET_MS", DEFAULT_BUDGET_MS)))
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("targets", nargs="*",
+                        default=["api.main", "modules.ocr", "modules.ocr.fallback_wrapper"])
+    args = parser.parse_args()
+
+    failed = False
+    for target in args.targets:
+        report = measure_import(target)
+        print(f"\n⏱️  import {target}: {report['total_ms']:.1f} ms")
+        top_level = sorted(
+            ((name, info) for name, info in report["modules"].items() if info["depth"] <= 1),
+            key=lambda item: item[1]["cumulative_ms"], reverse=True,
+        )
+        for name, info in top_level[:args.top]:
+            print(f"   - {name:<40} {info['cumulative_ms']:8.1f} ms")
+        if report["heavy"]:
+            print(f"   ⚠️  Dépendances lourdes: {', '.join(report['heavy'])}")
+
+        if target == "api.main":
+            problems = check_budget(target, args.budget_ms)
+            for problem in problems:
+                print(f"   ❌ {problem}")
+            failed = failed or bool(problems)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
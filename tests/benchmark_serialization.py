@@ -0,0 +1,85 @@
+# tests/benchmark_serialization.py
+"""
+Coût d'encodage d'une réponse de lot (N résultats d'extraction) :
+
+• avant : asdict() par résultat, jsonable_encoder puis JSONResponse (json)
+• après : FastJSONResponse (orjson) sur les dicts précompilés du pool,
+  ou directement sur les dataclasses
+• repli : FastJSONResponse sans orjson (json + sérialiseurs précompilés)
+
+    python tests/benchmark_serialization.py --results 1000 --rounds 50
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from dataclasses import asdict
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from api.responses import FastJSONResponse
+from modules.ocr import serialization
+from modules.ocr.invoice_extraction_result import InvoiceExtractionResult
+from modules.ocr.serialization import to_dict
+
+
+def make_results(count: int) -> list:
+    return [
+        InvoiceExtractionResult(
+            total_amount=120.0 + i, invoice_date="15/03/2024", invoice_number=f"FA2024-{i:05d}",
+            legal_identifiers={"numero_tva": "FR12345678901", "siret": "12345678900012"},
+            vat_rate=20.0, amount_ht=100.0 + i, processing_method="fast_pdf",
+            extraction_confidence=0.92, amounts_found=["100,00", "20,00", f"{120 + i},00"],
+        )
+        for i in range(count)
+    ]
+
+
+def measure(label: str, build, rounds: int) -> float:
+    timings = []
+    size = 0
+    for _ in range(rounds):
+        start = time.perf_counter()
+        size = len(build().body)
+        timings.append((time.perf_counter() - start) * 1000)
+    median = statistics.median(timings)
+    print(f"   - {label:<40}: médiane {median:7.2f} ms | min {min(timings):7.2f} ms | {size / 1024:6.0f} Ko")
+    return median
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--results", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    results = make_results(args.results)
+    print(f"🚀 Lot de {args.results} résultats, {args.rounds} encodages par variante"
+          f" (orjson {'disponible' if serialization.ORJSON_AVAILABLE else 'absent'})")
+
+    before = measure("Avant (asdict + jsonable_encoder)",
+                     lambda: JSONResponse(jsonable_encoder({"results": [asdict(r) for r in results]})),
+                     args.rounds)
+    after = measure("Après (to_dict + FastJSONResponse)",
+                    lambda: FastJSONResponse({"results": [to_dict(r) for r in results]}),
+                    args.rounds)
+    measure("Après (dataclasses + FastJSONResponse)",
+            lambda: FastJSONResponse({"results": results}), args.rounds)
+
+    orjson, serialization.orjson = serialization.orjson, None
+    try:
+        measure("Repli json (to_dict + FastJSONResponse)",
+                lambda: FastJSONResponse({"results": [to_dict(r) for r in results]}), args.rounds)
+    finally:
+        serialization.orjson = orjson
+
+    print(f"✅ Gain : x{before / after:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# tests/benchmark_tracing.py
+"""
+Surcoût du traçage par document sur le chemin rapide (fitz + regex) :
+
+• référence : traçage désactivé (contexte sans effet)
+• échantillonné à --ratio (défaut 0.05), puis à 100 %
+• exporteur : fichier JSON lines si opentelemetry-sdk est installé,
+  sinon TracerProvider global de l'API (spans non enregistrés)
+
+    python tests/benchmark_tracing.py --documents 200 --ratio 0.05
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz
+
+from core.observability import tracing
+from modules.ocr.extraction_worker import extract_invoice
+
+
+def make_pdf(pages: int) -> bytes:
+    with fitz.open() as doc:
+        for i in range(pages):
+            doc.new_page().insert_text(
+                (72, 72), f"FACTURE N° FA2024-{i:05d}\nDate : 15/03/2024\nTVA FR12345678901\nTotal TTC : 120,00\n"
+            )
+        return doc.tobytes()
+
+
+def run(pdf: bytes, documents: int) -> float:
+    start = time.perf_counter()
+    for _ in range(documents):
+        extract_invoice(pdf)
+    return (time.perf_counter() - start) / documents * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--documents", type=int, default=200)
+    parser.add_argument("--pages", type=int, default=2)
+    parser.add_argument("--rounds", type=int, default=15)
+    parser.add_argument("--ratio", type=float, default=tracing.DEFAULT_SAMPLE_RATIO)
+    args = parser.parse_args()
+
+    pdf = make_pdf(args.pages)
+    exporter = tracing.EXPORTER_FILE if tracing.SDK_AVAILABLE else tracing.EXPORTER_GLOBAL
+    print(f"🚀 {args.documents} documents de {args.pages} pages, {args.rounds} séries (exporteur {exporter})")
+
+    variants = [("Sans traçage", tracing.EXPORTER_NONE, 0.0),
+                (f"Échantillonnage {args.ratio:.0%}", exporter, args.ratio),
+                ("Échantillonnage 100%", exporter, 1.0)]
+    timings = {label: [] for label, _, _ in variants}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "traces.jsonl")
+        extract_invoice(pdf)  # pré-chauffage du moteur
+        # Variantes alternées à chaque série : la dérive de la machine touche tout le monde
+        for _ in range(args.rounds):
+            for label, mode, ratio in variants:
+                tracing.configure_tracing(mode, sample_ratio=ratio, path=path)
+                try:
+                    timings[label].append(run(pdf, args.documents))
+                finally:
+                    tracing.shutdown_tracing()
+
+    baseline = statistics.median(timings[variants[0][0]])
+    for label, _, _ in variants:
+        median = statistics.median(timings[label])
+        print(f"   - {label:<24}: médiane {median:8.1f} µs/document | surcoût {(median - baseline) / baseline:+.2%}")
+
+
+if __name__ == "__main__":
+    main()
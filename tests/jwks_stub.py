@@ -0,0 +1,90 @@
+# tests/jwks_stub.py
+"""
+Serveur JWKS local (remplaçant de Keycloak) pour les tests et benchmarks
+d'authentification : clés RSA générées à la volée, compteur de requêtes,
+rotation de clé.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+
+
+class SigningKey:
+    def __init__(self, kid: str):
+        self.kid = kid
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self.private_pem = private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+        public_pem = private_key.public_key().public_bytes(
+            serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+        )
+        self.public_jwk = {**jwk.construct(public_pem, "RS256").to_dict(), "kid": kid, "use": "sig"}
+
+
+class JwksStub:
+    """ThreadingHTTPServer servant /certs ; latency simule le réseau."""
+
+    def __init__(self, issuer: str = "http://stub/realms/test", latency: float = 0.0):
+        self.issuer = issuer
+        self.latency = latency
+        self.keys: List[SigningKey] = [SigningKey("key-1")]
+        self.hits = 0
+        self.failing = False
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.hits += 1
+                if stub.latency:
+                    time.sleep(stub.latency)
+                if stub.failing:
+                    self.send_error(503)
+                    return
+                body = json.dumps({"keys": [k.public_jwk for k in stub.keys]}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/certs"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self) -> "JwksStub":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def rotate(self, kid: str) -> SigningKey:
+        key = SigningKey(kid)
+        self.keys = [key]
+        return key
+
+    def token(self, subject: str = "user", ttl: int = 300, audience: str = "fiscal-ui",
+              key: Optional[SigningKey] = None, **claims: Any) -> str:
+        key = key or self.keys[0]
+        now = int(time.time())
+        payload: Dict[str, Any] = {
+            "iss": self.issuer, "aud": audience, "sub": subject,
+            "iat": now, "exp": now + ttl,
+            "realm_access": {"roles": ["files.read"]},
+            **claims,
+        }
+        return jwt.encode(payload, key.private_pem, algorithm="RS256", headers={"kid": key.kid})
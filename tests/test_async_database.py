@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Tests de l'AsyncDatabaseManager (SQLAlchemy asyncio + aiosqlite)"""
+
+import asyncio
+import sys
+import tempfile
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.security.encryption import SecurityManager
+from data.storage.async_database import AsyncDatabaseManager, to_async_url
+from data.storage.database import DatabaseManager
+
+
+async def _scenario(tmp_dir: str):
+    security = SecurityManager("test_async_key", previous_passwords=[])
+    db_manager = await AsyncDatabaseManager.create(
+        f"sqlite:///{tmp_dir}/async.db", security, pool_config={"pool_size": 5}
+    )
+    try:
+        assert await db_manager.health_check()
+        assert db_manager.pool_config["pool_size"] == 5
+
+        # Écritures concurrentes sur la même boucle
+        ids = await asyncio.gather(*[
+            db_manager.create_document("CLIENT_A", f"doc_{i}.pdf", f"Contenu {i}", "facture", {"i": i})
+            for i in range(10)
+        ])
+        assert len(set(ids)) == 10
+
+        document = await db_manager.get_document(ids[3])
+        assert document["content"] == "Contenu 3"
+        assert document["metadata"] == {"i": 3}
+
+        duplicate = await db_manager.ingest_document("CLIENT_A", "copie.pdf", "Contenu 3")
+        assert duplicate["duplicate"] and duplicate["document_id"] == ids[3]
+
+        page = await db_manager.list_documents(client_id="CLIENT_A", limit=4)
+        assert len(page["documents"]) == 4 and page["next_cursor"]
+        page = await db_manager.list_documents(client_id="CLIENT_A", limit=10, cursor=page["next_cursor"])
+        assert len(page["documents"]) == 6 and page["next_cursor"] is None
+
+        await db_manager.log_audit("admin", "READ_DOCUMENT", "document", str(ids[0]), {"via": "async"})
+
+        # Journal partitionné : écrit en asynchrone, relu par le gestionnaire synchrone
+        db_manager.enable_audit_partitioning(archive_dir=f"{tmp_dir}/archive")
+        await asyncio.gather(*[
+            db_manager.log_audit("admin", "LIST_DOCUMENTS", details={"page": i}) for i in range(3)
+        ])
+        sync_manager = DatabaseManager(f"sqlite:///{tmp_dir}/async.db", security)
+        partitions = sync_manager.enable_audit_partitioning(archive_dir=f"{tmp_dir}/archive")
+        entries = partitions.query(action="LIST_DOCUMENTS", decrypt=True)
+        assert sorted(entry["details"] for entry in entries) == [str({"page": i}) for i in range(3)]
+        sync_manager.engine.dispose()
+    finally:
+        await db_manager.dispose()
+
+
+def test_async_database_manager():
+    """API documents / audit / santé en asynchrone"""
+    print("🧪 Test AsyncDatabaseManager...")
+
+    assert to_async_url("sqlite:///x.db") == "sqlite+aiosqlite:///x.db"
+    assert to_async_url("postgresql://localhost/fiscal_ai_db") == "postgresql+asyncpg://localhost/fiscal_ai_db"
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        asyncio.run(_scenario(tmp_dir))
+
+    print("✅ AsyncDatabaseManager validé")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if test_async_database_manager() else 1)
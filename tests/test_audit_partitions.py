@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Tests du journal d'audit partitionné par mois"""
+
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import inspect, update
+
+from core.security.encryption import SecurityManager
+from data.storage.database import DatabaseManager
+from data.storage.audit_partitions import month_bounds, shift_months
+
+
+def test_audit_partitions_retention():
+    """Partitions mensuelles, élagage des requêtes, archivage chiffré"""
+    print("🧪 Test journal d'audit partitionné...")
+
+    assert month_bounds("202412") == (datetime(2024, 12, 1), datetime(2025, 1, 1))
+    assert shift_months(datetime(2025, 3, 15), -3) == datetime(2024, 12, 1)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        security = SecurityManager("test_audit_key", previous_passwords=[])
+        db_manager = DatabaseManager(f"sqlite:///{tmp_dir}/audit.db", security)
+
+        # Anciennes lignes de la table unique, migrées ensuite
+        db_manager.log_audit("legacy", "LOGIN", details={"ip": "10.0.0.1"})
+
+        audit = db_manager.enable_audit_partitioning(
+            archive_dir=f"{tmp_dir}/archive", retention_months=3
+        )
+        assert audit.migrate_legacy() == 1
+
+        audit.write_many([
+            dict(user_id=f"user_{i % 3}", action="READ_DOCUMENT", resource_type="document",
+                 resource_id=str(i), details={"i": i}, timestamp=datetime(2024, 1 + i % 6, 10, 12))
+            for i in range(60)
+        ])
+        db_manager.log_audit("admin", "UPDATE_CONFIG", "config", "ocr", {"key": "dpi"})
+
+        months = audit.list_partitions()
+        assert {"202401", "202406"} <= set(months)
+
+        march = audit.query(datetime(2024, 3, 1), datetime(2024, 4, 1), decrypt=True)
+        assert len(march) == 10
+        assert {row["details"] for row in march} == {str({"i": i}) for i in range(60) if i % 6 == 2}
+        assert audit.count(datetime(2024, 1, 1), datetime(2024, 7, 1), user_id="user_0") == 20
+        assert len(audit.query(datetime(2024, 1, 1), datetime(2024, 7, 1), limit=15)) == 15
+
+        # Rétention de 3 mois au 15/07/2024 : janvier à mars archivés
+        archives = audit.apply_retention(now=datetime(2024, 7, 15))
+        assert len(archives) == 3
+        tables = inspect(db_manager.engine).get_table_names()
+        assert "audit_logs_202401" not in tables and "audit_logs_202404" in tables
+        assert audit.count(datetime(2024, 1, 1), datetime(2024, 4, 1)) == 0
+
+        archived_rows = list(audit.read_archive(archives[0]))
+        assert len(archived_rows) == 10
+        assert archived_rows[0]["details"] == str({"i": 0})
+        assert b"READ_DOCUMENT" not in archives[0].read_bytes()
+
+        # Détail indéchiffrable : chiffré brut archivé, partition conservée
+        april = audit.ensure_partition("202404")
+        with db_manager.engine.begin() as conn:
+            conn.execute(update(april).where(april.c.resource_id == "3").values(details_encrypted="corrompu"))
+        path = audit.archive_partition("202404")
+        assert "audit_logs_202404" in inspect(db_manager.engine).get_table_names()
+        corrupted = [row for row in audit.read_archive(path) if row["resource_id"] == "3"]
+        assert corrupted[0]["details"] is None and corrupted[0]["details_encrypted"] == "corrompu"
+        assert audit.count(datetime(2024, 4, 1), datetime(2024, 5, 1)) == 10
+
+    print("✅ Journal d'audit partitionné validé")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if test_audit_partitions_retention() else 1)
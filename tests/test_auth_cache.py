@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Tests du cache de vérification JWT et du JWKS partagé (api/middleware/auth.py)"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from api.middleware import auth
+from config.keycloak_settings import SETTINGS
+from tests.jwks_stub import JwksStub, SigningKey
+
+
+def _request(token: str) -> Request:
+    return Request({"type": "http", "method": "GET", "headers": [(b"authorization", f"Bearer {token}".encode())]})
+
+
+async def _expect_401(token: str) -> str:
+    try:
+        await auth.verify_token(_request(token))
+    except HTTPException as e:
+        assert e.status_code == 401
+        return e.detail
+    raise AssertionError("401 attendu")
+
+
+async def _scenario(stub: JwksStub):
+    # Démarrage à froid : 50 requêtes concurrentes, un seul appel JWKS
+    tokens = [stub.token(subject=f"user_{i}") for i in range(50)]
+    payloads = await asyncio.gather(*[auth.verify_token(_request(t)) for t in tokens])
+    assert [p["sub"] for p in payloads] == [f"user_{i}" for i in range(50)]
+    assert stub.hits == 1
+
+    # Jeton déjà vérifié : plus de décodage
+    decode_calls = []
+    original_decode = auth.jwt.decode
+    auth.jwt.decode = lambda *a, **kw: decode_calls.append(1) or original_decode(*a, **kw)
+    try:
+        for _ in range(20):
+            assert (await auth.verify_token(_request(tokens[0])))["sub"] == "user_0"
+    finally:
+        auth.jwt.decode = original_decode
+    assert decode_calls == []
+
+    # L'entrée du cache ne survit pas à l'exp du jeton
+    leeway = SETTINGS.leeway
+    SETTINGS.leeway = 0
+    try:
+        short = stub.token(subject="short", ttl=1)
+        assert (await auth.verify_token(_request(short)))["sub"] == "short"
+        await asyncio.sleep(2.1)  # exp à la seconde près
+        assert await _expect_401(short) == "Token expired"
+    finally:
+        SETTINGS.leeway = leeway
+
+    # kid inconnu : un rechargement forcé, puis limité par l'intervalle minimal
+    foreign = stub.token(key=SigningKey("foreign"))
+    hits = stub.hits
+    assert "unknown signing key" in await _expect_401(foreign)
+    assert "unknown signing key" in await _expect_401(foreign)
+    assert stub.hits == hits + 1
+
+    # Rotation de clé côté Keycloak : le nouveau kid est chargé à la demande
+    SETTINGS.jwks_min_refresh_interval = 0
+    new_key = stub.rotate("key-2")
+    payload = await auth.verify_token(_request(stub.token(subject="rotated", key=new_key)))
+    assert payload["sub"] == "rotated"
+    assert "key-2" in auth._jwks.keys
+
+    # Rafraîchissement anticipé en tâche de fond (la requête n'attend pas)
+    auth._jwks._fetched_at = time.monotonic() - (SETTINGS.jwks_ttl - SETTINGS.jwks_refresh_ahead) - 1
+    hits = stub.hits
+    await auth.verify_token(_request(stub.token(subject="background", key=new_key)))
+    await auth._jwks._refresh_task
+    assert stub.hits == hits + 1
+
+    # Keycloak indisponible : clés périmées servies, pas de nouvel essai avant le backoff
+    stub.failing = True
+    auth._jwks._fetched_at = time.monotonic() - SETTINGS.jwks_ttl - 1
+    hits = stub.hits
+    payload = await auth.verify_token(_request(stub.token(subject="stale", key=new_key)))
+    assert payload["sub"] == "stale" and stub.hits == hits + 1
+    for i in range(5):
+        await auth.verify_token(_request(stub.token(subject=f"stale_{i}", key=new_key)))
+    assert stub.hits == hits + 1
+    # Backoff écoulé : nouvel essai en tâche de fond, Keycloak revenu
+    stub.failing = False
+    auth._jwks._fetched_at -= SETTINGS.jwks_refresh_backoff + 1
+    await auth.verify_token(_request(stub.token(subject="recovered", key=new_key)))
+    await auth._jwks._refresh_task
+    assert stub.hits == hits + 2
+    assert time.monotonic() - auth._jwks._fetched_at < 1
+
+    await auth.close_auth_client()
+
+
+def test_auth_token_cache():
+    """Cache des jetons vérifiés, JWKS single-flight, rotation et rafraîchissement"""
+    print("🧪 Test cache d'authentification JWT...")
+    saved = (SETTINGS.issuer, SETTINGS.jwks_url, SETTINGS.jwks_min_refresh_interval)
+    with JwksStub(latency=0.05) as stub:
+        SETTINGS.issuer, SETTINGS.jwks_url = stub.issuer, stub.url
+        auth.clear_auth_caches()
+        try:
+            asyncio.run(_scenario(stub))
+        finally:
+            SETTINGS.issuer, SETTINGS.jwks_url, SETTINGS.jwks_min_refresh_interval = saved
+            auth.clear_auth_caches()
+    print("✅ Cache d'authentification validé")
+    return True
+
+
+if __name__ == "__main__":
+    success = test_auth_token_cache()
+    sys.exit(0 if success else 1)
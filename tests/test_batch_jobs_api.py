@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Tests des lots d'extraction (POST /invoices/batch + SSE /events + annulation)"""
+
+import asyncio
+import io
+import json
+import sys
+import zipfile
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import fitz
+import httpx
+from fastapi import FastAPI
+
+from api import batch_jobs
+from api.batch_jobs import BatchJobManager
+from api.middleware.auth import verify_token
+from api.routes import invoices
+from modules.ocr.extraction_worker import shutdown_extraction_executor
+
+
+def _make_pdf(total: str) -> bytes:
+    with fitz.open() as doc:
+        page = doc.new_page()
+        page.insert_text((72, 72), f"FACTURE N° FA2024-00123\nDate : 15/03/2024\nTotal TTC : {total}\n")
+        return doc.tobytes()
+
+
+def _make_app(tenant: str) -> FastAPI:
+    app = FastAPI()
+    app.include_router(invoices.router)
+    app.dependency_overrides[verify_token] = lambda: {
+        "sub": tenant, "realm_access": {"roles": ["files.read", "files.write"]}
+    }
+    return app
+
+
+def _parse_sse(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+        if fields:
+            events.append({"id": int(fields["id"]), "event": fields["event"], "data": json.loads(fields["data"])})
+    return events
+
+
+async def _scenario():
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=_make_app("tenant_a")),
+                                 base_url="http://test") as client:
+        # PDF individuels + archive ZIP + fichier non PDF
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("lot/facture_3.pdf", _make_pdf("300,00"))
+            zf.writestr("lot/lisez-moi.txt", "ignoré")
+        files = [
+            ("files", ("facture_1.pdf", _make_pdf("100,00"), "application/pdf")),
+            ("files", ("facture_2.pdf", _make_pdf("200,00"), "application/pdf")),
+            ("files", ("archive.zip", archive.getvalue(), "application/zip")),
+            ("files", ("notes.txt", b"pas un pdf", "text/plain")),
+        ]
+        response = await client.post("/invoices/batch", files=files)
+        assert response.status_code == 202, response.text
+        job = response.json()
+        assert job["total"] == 3 and job["rejected"] == ["notes.txt"]
+
+        response = await client.get(job["events_url"])
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = _parse_sse(response.text)
+        assert events[0]["event"] == "accepted" and events[-1]["event"] == "end"
+        documents = [e["data"] for e in events if e["event"] == "document"]
+        assert sorted(d["result"]["total_amount"] for d in documents) == [100.0, 200.0, 300.0]
+        assert events[-1]["data"]["status"] == "completed"
+
+        # Reprise après déconnexion : seuls les événements suivants sont rejoués
+        response = await client.get(job["events_url"], headers={"Last-Event-ID": str(events[-2]["id"])})
+        assert [e["event"] for e in _parse_sse(response.text)] == ["end"]
+
+        # Quota : un seul lot actif par tenant ; annulation
+        response = await client.post("/invoices/batch", files=[
+            ("files", (f"f{i}.pdf", _make_pdf("10,00"), "application/pdf")) for i in range(20)
+        ])
+        assert response.status_code == 202
+        job = response.json()
+        response = await client.post("/invoices/batch", files=[("files", ("f.pdf", _make_pdf("1,00"), "application/pdf"))])
+        assert response.status_code == 429
+
+        response = await client.delete(f"/invoices/batch/{job['job_id']}")
+        assert response.json()["status"] == "cancelled"
+        events = _parse_sse((await client.get(job["events_url"])).text)
+        assert events[-1]["data"]["status"] == "cancelled"
+        assert events[-1]["data"]["done"] < 20
+
+    # Un autre tenant ne voit pas le lot
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=_make_app("tenant_b")),
+                                 base_url="http://test") as client:
+        response = await client.get(f"/invoices/batch/{job['job_id']}")
+        assert response.status_code == 404
+
+    await batch_jobs.shutdown_batch_manager()
+
+
+def test_batch_jobs_endpoint():
+    """Lots : ZIP, SSE, reprise, quotas tenant et annulation"""
+    print("🧪 Test POST /invoices/batch...")
+    batch_jobs._manager = BatchJobManager(workers=2, tenant_concurrency=1, tenant_max_jobs=1)
+    try:
+        asyncio.run(_scenario())
+    finally:
+        batch_jobs._manager = None
+        shutdown_extraction_executor()
+    print("✅ Lots d'extraction validés")
+    return True
+
+
+if __name__ == "__main__":
+    success = test_batch_jobs_endpoint()
+    sys.exit(0 if success else 1)
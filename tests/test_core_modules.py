@@ -64,6 +64,136 @@ def test_module_registry():
     print("✅ ModuleRegistry validé")
     return True
 
+def test_engine_pools():
+    """Test des moteurs partagés et pré-chauffés du ModuleRegistry"""
+    print("🧪 Test moteurs partagés...")
+    import threading
+    from modules.ocr.engines import ENGINE_CONFIGURABLE_OCR, ENGINE_PDF_TEXT, register_ocr_engines
+    from modules.ocr.hybrid_invoice_processor import HybridInvoiceProcessor
+    
+    registry = ModuleRegistry()
+    constructions = []
+    
+    class CountingEngine:
+        def __init__(self, config):
+            constructions.append(config)
+            self.warm = False
+        
+        def warm_up(self):
+            self.warm = True
+    
+    registry.register_engine("shared", CountingEngine)
+    registry.register_engine("exclusive", CountingEngine, pool_size=2, exclusive=True)
+    
+    # Pré-chauffage : construction au démarrage, pas à la première requête
+    registry.warm_up({"shared": {"lang": "fra"}})
+    assert len(constructions) == 1
+    
+    seen = []
+    def use(name, config):
+        with registry.acquire_engine(name, config) as engine:
+            assert engine.warm
+            seen.append((name, id(engine)))
+    
+    threads = [threading.Thread(target=use, args=("shared", {"lang": "fra"})) for _ in range(20)]
+    threads += [threading.Thread(target=use, args=("exclusive", None)) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    # Une instance partagée + au plus 2 instances exclusives
+    assert len({i for name, i in seen if name == "shared"}) == 1
+    assert len({i for name, i in seen if name == "exclusive"}) <= 2
+    assert len(constructions) <= 3
+    
+    stats = registry.engine_stats()
+    assert stats["shared"][0]["uses"] == 20
+    assert stats["exclusive"][0]["uses"] == 20
+    assert all(s["in_flight"] == 0 for s in stats["exclusive"][0]["instances"])
+    
+    # Autre configuration → autre pool
+    use("shared", {"lang": "eng"})
+    assert len(registry.engine_stats()["shared"]) == 2
+    
+    # Les processeurs hybrides réutilisent les moteurs du registre
+    register_ocr_engines(registry)
+    first = HybridInvoiceProcessor({"languages": ["fra"]}, registry=registry)
+    second = HybridInvoiceProcessor({"languages": ["fra"]}, registry=registry)
+    assert first.ocr_pool is second.ocr_pool
+    assert first.ocr_pool.get() is second.ocr_pool.get()
+    assert registry.engine_pool(ENGINE_PDF_TEXT, {"languages": ["fra"]}) is first.fast_pool
+    assert registry.engine_pool(ENGINE_CONFIGURABLE_OCR, {"languages": ["fra"]}).stats()["created"] == 1
+    
+    registry.shutdown_engines()
+    print("✅ Moteurs partagés validés")
+    return True
+
+def test_engine_pool_loans():
+    """Test des prêts d'instances exclusives et de la fermeture du pool"""
+    print("🧪 Test prêts et fermeture d'EnginePool...")
+    import threading
+    import time
+    from core.engine.engine_pool import EnginePool, EnginePoolClosed, EnginePoolTimeout
+    
+    class Engine:
+        def __init__(self, config):
+            self.cleaned = False
+        
+        def cleanup(self):
+            self.cleaned = True
+    
+    pool = EnginePool("exclusive", Engine, size=2, exclusive=True)
+    
+    # L'instance créée à la demande est remise à l'appelant, pas à la file
+    with pool.acquire(timeout=1) as first:
+        assert pool._idle.qsize() == 0
+        with pool.acquire(timeout=1) as second:
+            assert second is not first
+            try:
+                with pool.acquire(timeout=0.05):
+                    assert False, "pool plein"
+            except EnginePoolTimeout:
+                pass
+    assert pool._idle.qsize() == 2
+    
+    # close() attend le retour des instances prêtées avant le cleanup
+    released = threading.Event()
+    loaned = threading.Event()
+    def borrow():
+        with pool.acquire(timeout=1) as engine:
+            loaned.set()
+            released.wait(5)
+            assert not engine.cleaned
+    borrower = threading.Thread(target=borrow)
+    borrower.start()
+    loaned.wait(5)
+    closer = threading.Thread(target=pool.close)
+    closer.start()
+    time.sleep(0.1)
+    assert closer.is_alive()
+    try:
+        with pool.acquire(timeout=1):
+            assert False, "pool fermé"
+    except EnginePoolClosed:
+        pass
+    released.set()
+    borrower.join(5)
+    closer.join(5)
+    assert not closer.is_alive()
+    assert first.cleaned and second.cleaned
+    assert pool._idle.qsize() == 0 and pool.stats()["created"] == 0
+    
+    # Délai dépassé : fermeture quand même, instance non remise en file
+    pool = EnginePool("exclusive", Engine, size=1, exclusive=True)
+    with pool.acquire() as engine:
+        pool.close(timeout=0.05)
+        assert engine.cleaned
+    assert pool._idle.qsize() == 0
+    
+    print("✅ Prêts et fermeture d'EnginePool validés")
+    return True
+
 def test_config_manager():
     """Test du ConfigManager"""
     print("🧪 Test ConfigManager...")
@@ -122,6 +252,104 @@ def test_config_manager():
     
     return True
 
+def test_config_hot_reload():
+    """Test du rechargement à chaud et du cache des clés"""
+    print("🧪 Test rechargement à chaud ConfigManager...")
+    import json
+    import time
+    import tempfile
+    from modules.ocr.engines import register_ocr_engines
+    from modules.ocr.hybrid_invoice_processor import HybridInvoiceProcessor
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config_manager = ConfigManager(tmp_dir)
+        config_manager.save_config("hybrid", {"confidence_threshold": 0.75, "ocr": {"dpi": 300}})
+        
+        # Lectures répétées : résolues une fois puis servies par le cache
+        assert config_manager.get_config("hybrid", "ocr.dpi") == 300
+        assert config_manager._resolved["hybrid"][1]["ocr.dpi"] == 300
+        assert config_manager.get_config("hybrid", "ocr.missing") is None
+        
+        registry = register_ocr_engines(ModuleRegistry())
+        processor = HybridInvoiceProcessor({"confidence_threshold": 0.75}, registry=registry)
+        processor.bind_config(config_manager, "hybrid")
+        events = []
+        config_manager.subscribe("hybrid", lambda name, config: events.append(config))
+        
+        # Modification externe du fichier, détectée par le watcher
+        config_manager.start_watching(interval=0.05)
+        try:
+            config_path = Path(tmp_dir) / "hybrid.json"
+            config_path.write_text(json.dumps({"confidence_threshold": 0.9, "ocr": {"dpi": 400}}))
+            future = time.time() + 5
+            os.utime(config_path, (future, future))
+            
+            deadline = time.time() + 5
+            while not events and time.time() < deadline:
+                time.sleep(0.02)
+        finally:
+            config_manager.stop_watching()
+        
+        assert events and events[-1]["ocr"]["dpi"] == 400
+        assert config_manager.get_config("hybrid", "ocr.dpi") == 400
+        assert processor.confidence_threshold == 0.9
+        
+        # Fichier invalide : l'ancienne configuration reste active
+        config_path.write_text("{ invalide")
+        os.utime(config_path, (future + 5, future + 5))
+        assert config_manager.reload_changed() == []
+        assert config_manager.get_config("hybrid", "ocr.dpi") == 400
+        
+        # update_config invalide aussi le cache
+        config_manager.update_config("hybrid", {"ocr": {"dpi": 600}}, save_to_file=False)
+        assert config_manager.get_config("hybrid", "ocr.dpi") == 600
+    
+    print("✅ Rechargement à chaud validé")
+    return True
+
+
+def test_config_history_and_backups():
+    """Test de l'historique borné et du store de backups dédupliqué"""
+    print("🧪 Test historique et backups ConfigManager...")
+    import json
+    import tempfile
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config_manager = ConfigManager(tmp_dir, history_size=5, backup_keep=4)
+        base = {"rules": {f"rule_{i}": {"pattern": f"p{i}", "weight": i} for i in range(50)}}
+        
+        for i in range(30):
+            config = json.loads(json.dumps(base))
+            config["rules"]["rule_0"]["weight"] = i % 3
+            config_manager.save_config("fiscal", config)
+        
+        # Historique en anneau
+        assert len(config_manager.get_history("fiscal")) == 5
+        assert config_manager.list_configs()["fiscal"]["history_entries"] == 5
+        
+        # Rétention : keep_last versions, objets inaccessibles supprimés
+        backups = config_manager.list_backups("fiscal")
+        assert len(backups) == 4
+        stats = config_manager.backup_store.stats()
+        assert stats["stored_bytes"] < stats["logical_bytes"]
+        assert not list((Path(tmp_dir) / "backups").glob("fiscal_*"))
+        
+        # Sauvegarde identique à la dernière version : pas de nouvelle entrée
+        current = config_manager.get_config("fiscal")
+        config_manager.save_config("fiscal", current)
+        config_manager.save_config("fiscal", current)
+        assert len(config_manager.list_backups("fiscal")) == 4
+        
+        # Restauration (reconstruction depuis les deltas)
+        oldest = config_manager.list_backups("fiscal")[0]
+        expected = json.loads(config_manager.backup_store.read(oldest["hash"]))
+        assert config_manager.restore_backup("fiscal", oldest["hash"])
+        assert config_manager.get_config("fiscal") == expected
+        assert config_manager.restore_backup("fiscal", "inconnu") is False
+    
+    print("✅ Historique et backups validés")
+    return True
+
 def main():
     """Exécution des tests de validation"""
     print("🚀 Démarrage des tests de validation Étape 1")
@@ -130,7 +358,11 @@ def main():
     try:
         # Tests
         test_module_registry()
+        test_engine_pools()
+        test_engine_pool_loans()
         test_config_manager()
+        test_config_hot_reload()
+        test_config_history_and_backups()
         
         print("=" * 50)
         print("🎉 TOUS LES TESTS VALIDÉS - ÉTAPE 1 TERMINÉE")
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Tests des sources en mémoire (bytes, memoryview, flux) dans les moteurs de factures"""
+
+import io
+import sys
+import tempfile
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import fitz
+
+from modules.ocr.document_source import as_buffer, image_stream, is_pdf, source_name
+from modules.ocr.fallback_wrapper import InvoiceProcessorWithFallback
+from modules.ocr.fast_pdf_invoice_engine import FastPdfInvoiceEngine
+
+INVOICE_TEXT = (
+    "FACTURE N° FA2024-00123\n"
+    "Date : 15/03/2024\n"
+    "TVA FR 12 345678901\n"
+    "Total TTC : 120,00\n"
+)
+
+
+def _make_pdf() -> bytes:
+    with fitz.open() as doc:
+        doc.new_page().insert_text((72, 72), INVOICE_TEXT)
+        return doc.tobytes()
+
+
+def test_engines_accept_memory_sources():
+    """Chemin, bytes, bytearray, memoryview et flux donnent le même résultat"""
+    print("🧪 Test sources en mémoire des moteurs...")
+    pdf = _make_pdf()
+    engine = FastPdfInvoiceEngine({})
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pdf_path = Path(tmp_dir) / "facture.pdf"
+        pdf_path.write_bytes(pdf)
+        expected = engine.process_invoice(pdf_path)
+        assert expected.total_amount == 120.0
+
+        with open(pdf_path, "rb") as handle:
+            sources = [pdf, bytearray(pdf), memoryview(pdf), io.BytesIO(pdf), handle]
+            for source in sources:
+                assert engine.process_invoice(source) == expected, type(source).__name__
+            handle.seek(0)
+            assert is_pdf(handle) and handle.tell() == 0
+            assert source_name(handle) == "facture.pdf"
+
+    # Flux lu une seule fois, partagé par les deux moteurs du fallback
+    processor = InvoiceProcessorWithFallback({})
+    result = processor.process_invoice(io.BytesIO(pdf))
+    assert result.total_amount == 120.0
+    assert result.legal_identifiers["numero_tva"] == "FR12345678901"
+
+    assert is_pdf(memoryview(pdf)) and not is_pdf(b"\x89PNG\r\n")
+    assert isinstance(as_buffer(io.BytesIO(pdf)), memoryview)
+    assert image_stream(b"\x89PNG").read() == b"\x89PNG"
+    assert source_name(pdf) == "<bytes>"
+
+    print("✅ Sources en mémoire validées")
+    return True
+
+
+if __name__ == "__main__":
+    success = test_engines_accept_memory_sources()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Tests de l'ExecutorManager : files bornées, priorités et 429 sur /invoices/extract"""
+
+import asyncio
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import fitz
+import httpx
+from fastapi import FastAPI
+
+from api.middleware.auth import verify_token
+from api.routes import invoices
+from core.engine import executors
+from core.engine.executors import (
+    POOL_FAST_PDF, PRIORITY_BULK, PRIORITY_INTERACTIVE,
+    ExecutorManager, ExecutorSaturated, PoolSpec,
+)
+
+
+def _thread_pool(max_workers: int):
+    return ThreadPoolExecutor(max_workers=max_workers)
+
+
+async def _wait_until(predicate, timeout: float = 5.0):
+    for _ in range(int(timeout / 0.01)):
+        if predicate():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition non atteinte")
+
+
+async def _scenario_lanes():
+    manager = ExecutorManager({"cpu": PoolSpec(_thread_pool, 1, queue_limits=(1, 2))})
+    pool = manager.pool("cpu")
+    gate = threading.Event()
+    order = []
+
+    blocker = asyncio.ensure_future(pool.run(gate.wait))
+    await _wait_until(lambda: pool.stats()["running"] == 1)
+
+    # Deux lots en attente, puis un upload unitaire : servi avant les lots
+    bulk = [asyncio.ensure_future(pool.run(order.append, f"bulk_{i}", priority=PRIORITY_BULK)) for i in range(2)]
+    await _wait_until(lambda: pool.queue_depth(PRIORITY_BULK) == 2)
+    interactive = asyncio.ensure_future(pool.run(order.append, "interactive", priority=PRIORITY_INTERACTIVE))
+    await _wait_until(lambda: pool.queue_depth(PRIORITY_INTERACTIVE) == 1)
+
+    # Files pleines : refus immédiat avec Retry-After, sauf appelant bloquant
+    for priority in (PRIORITY_BULK, PRIORITY_INTERACTIVE):
+        try:
+            await pool.run(order.append, "refusé", priority=priority)
+            raise AssertionError("ExecutorSaturated attendu")
+        except ExecutorSaturated as e:
+            assert e.retry_after >= 1 and e.pool == "cpu"
+    try:
+        pool.check_admission(PRIORITY_INTERACTIVE)
+        raise AssertionError("ExecutorSaturated attendu")
+    except ExecutorSaturated:
+        pass
+    blocking = asyncio.ensure_future(pool.run(order.append, "bulk_block", block=True))
+
+    # Un appelant annulé rend sa place dans la file
+    cancelled = asyncio.ensure_future(pool.run(order.append, "annulé", block=True))
+    await _wait_until(lambda: pool.queue_depth(PRIORITY_BULK) == 4)
+    cancelled.cancel()
+    await _wait_until(lambda: pool.queue_depth(PRIORITY_BULK) == 3)
+
+    gate.set()
+    await asyncio.gather(blocker, interactive, blocking, *bulk)
+    assert order == ["interactive", "bulk_0", "bulk_1", "bulk_block"]
+
+    stats = pool.stats()
+    assert stats["running"] == 0 and stats["waiting"] == {"interactive": 0, "bulk": 0}
+    assert stats["completed"] == 5 and stats["rejected"] == 3
+    manager.shutdown()
+
+
+def _make_pdf() -> bytes:
+    with fitz.open() as doc:
+        doc.new_page().insert_text((72, 72), "FACTURE N° FA2024-00123\nTotal TTC : 120,00\n")
+        return doc.tobytes()
+
+
+async def _scenario_api():
+    app = FastAPI()
+    app.include_router(invoices.router)
+    app.dependency_overrides[verify_token] = lambda: {"realm_access": {"roles": ["files.write"]}}
+    pool = executors.get_executor_manager().pool(POOL_FAST_PDF)
+    files = {"file": ("facture.pdf", _make_pdf(), "application/pdf")}
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post("/invoices/extract", files=files)
+        assert response.status_code == 200 and response.json()["total_amount"] == 120.0
+
+        # Seule place occupée, file interactive de taille nulle : 429 avant l'upload
+        gate = threading.Event()
+        blocker = asyncio.ensure_future(pool.run(gate.wait))
+        await _wait_until(lambda: pool.stats()["running"] == 1)
+        response = await client.post("/invoices/extract", files=files)
+        assert response.status_code == 429
+        assert int(response.headers["retry-after"]) >= 1
+        gate.set()
+        await blocker
+
+
+def test_executor_manager():
+    """Voies interactive/bulk, files bornées, annulation et admission HTTP"""
+    print("🧪 Test ExecutorManager...")
+    asyncio.run(_scenario_lanes())
+
+    saved = executors._manager
+    executors._manager = ExecutorManager({POOL_FAST_PDF: PoolSpec(_thread_pool, 1, queue_limits=(0, 4))})
+    try:
+        asyncio.run(_scenario_api())
+    finally:
+        executors._manager.shutdown()
+        executors._manager = saved
+    print("✅ ExecutorManager validé")
+    return True
+
+
+if __name__ == "__main__":
+    success = test_executor_manager()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Tests des réponses conditionnelles (ETag / 304) et de la compression des listings"""
+
+import sys
+import tempfile
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.database import close_async_database, open_async_database
+from api.middleware.auth import verify_token
+from api.middleware.compression import CompressionMiddleware, accepted_encodings
+from api.routes import espocrm_bridge, files
+from data.storage.database import DatabaseManager
+from data.storage.job_queue import DocumentJobQueue
+
+
+def _make_app(database_url: str) -> FastAPI:
+    # Même cycle de vie que api.main.lifespan, sur la base temporaire
+    @asynccontextmanager
+    async def lifespan(_app):
+        await open_async_database(database_url)
+        try:
+            yield
+        finally:
+            await close_async_database()
+
+    app = FastAPI(lifespan=lifespan)
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+    app.include_router(files.router)
+    app.include_router(espocrm_bridge.router)
+    app.dependency_overrides[verify_token] = lambda: {
+        "tenant": "client_a", "realm_access": {"roles": ["files.read", "espocrm.read"]}
+    }
+    return app
+
+
+def test_conditional_listings():
+    """ETag par version de données client, 304, gzip au-delà du seuil"""
+    print("🧪 Test ETag / 304 / compression des listings...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        database_url = f"sqlite:///{tmp_dir}/cache.db"
+        db = DatabaseManager(database_url)
+        with TestClient(_make_app(database_url)) as client:
+            identity = {"Accept-Encoding": "identity"}
+
+            # Client sans données : liste vide, version 0
+            assert db.get_data_version("client_a") == (0, None)
+            first = client.get("/files/list", headers=identity)
+            assert first.status_code == 200 and first.json()["files"] == []
+            etag = first.headers["etag"]
+            assert etag.startswith('"') and first.headers["cache-control"] == "private, no-cache"
+
+            # Toute écriture du client change la version, donc l'ETag
+            doc_id = db.create_document("client_a", "facture_0.pdf", "contenu 0")
+            assert db.get_data_version("client_a")[0] == 1
+            second = client.get("/files/list", headers={**identity, "If-None-Match": etag})
+            assert second.status_code == 200
+            assert [f["name"] for f in second.json()["files"]] == ["facture_0.pdf"]
+            etag = second.headers["etag"]
+
+            # Données inchangées : 304 sans corps, y compris en W/ ou dans une liste
+            for header in (etag, f"W/{etag}", f'"autre", {etag}'):
+                response = client.get("/files/list", headers={**identity, "If-None-Match": header})
+                assert response.status_code == 304 and response.content == b""
+                assert response.headers["etag"] == header.split(", ")[-1]
+
+            # Un autre client ne touche pas la version de client_a
+            db.create_document("client_b", "autre.pdf", "contenu b")
+            assert client.get("/files/list", headers={**identity, "If-None-Match": etag}).status_code == 304
+
+            # Doublon (alias) : listing inchangé, ETag inchangé
+            db.create_document("client_a", "copie.pdf", "contenu 0")
+            assert client.get("/files/list", headers={**identity, "If-None-Match": etag}).status_code == 304
+
+            # Changement de statut par la file de traitement
+            queue = DocumentJobQueue(db)
+            assert queue.claim("worker-1") == [doc_id, doc_id + 1]
+            response = client.get("/files/list", headers={**identity, "If-None-Match": etag})
+            assert response.status_code == 200
+            assert response.json()["files"][0]["processing_status"] == "processing"
+            assert queue.complete(doc_id, "worker-1", {"total": 1}, 5)
+            assert db.get_data_version("client_a")[0] == 3
+
+            # Corps au-delà du seuil : gzip, ETag suffixé, revalidation avec ce validateur
+            for i in range(1, 30):
+                db.create_document("client_a", f"facture_{i}.pdf", f"contenu {i}")
+            plain = client.get("/files/list", headers=identity)
+            zipped = client.get("/files/list", headers={"Accept-Encoding": "gzip"})
+            assert "content-encoding" not in plain.headers
+            assert zipped.headers["content-encoding"] == "gzip"
+            assert "Accept-Encoding" in zipped.headers["vary"]
+            assert zipped.headers["etag"] == plain.headers["etag"][:-1] + '-gzip"'
+            assert zipped.json() == plain.json() and len(plain.json()["files"]) == 30
+            revalidated = client.get("/files/list", headers={"Accept-Encoding": "gzip",
+                                                             "If-None-Match": zipped.headers["etag"]})
+            assert revalidated.status_code == 304
+            assert revalidated.headers["etag"] == zipped.headers["etag"]
+
+            # Pagination : l'ETag dépend aussi des paramètres
+            page = client.get("/files/list?limit=10", headers=identity)
+            assert page.headers["etag"] != plain.headers["etag"] and page.json()["next_cursor"]
+            assert client.get("/files/list?cursor=invalide", headers=identity).status_code == 400
+
+            # Dossiers : corps constant, sérialisé une fois
+            dossiers = client.get("/espocrm/dossiers")
+            assert dossiers.status_code == 200 and len(dossiers.json()["dossiers"]) == 3
+            again = client.get("/espocrm/dossiers", headers={"If-None-Match": dossiers.headers["etag"]})
+            assert again.status_code == 304
+
+        db.engine.dispose()
+
+    assert accepted_encodings("gzip;q=0, br ;q=0.8, deflate") == {"br", "deflate"}
+
+    print("✅ Réponses conditionnelles validées")
+    return True
+
+
+if __name__ == "__main__":
+    success = test_conditional_listings()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Tests de POST /invoices/extract (upload multipart en flux + pool de processus)"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import fitz
+import httpx
+from fastapi import FastAPI
+
+from api.middleware.auth import verify_token
+from api.routes import invoices
+from config.api_settings import SETTINGS
+from modules.ocr.extraction_worker import shutdown_extraction_executor
+
+INVOICE_TEXT = (
+    "FACTURE N° FA2024-00123\n"
+    "Date : 15/03/2024\n"
+    "TVA FR 12 345678901\n"
+    "Total HT : 100,00\n"
+    "TVA 20 % : 20,00\n"
+    "Total TTC : 120,00\n"
+)
+
+
+def _make_pdf(pages: int = 1) -> bytes:
+    with fitz.open() as doc:
+        for _ in range(pages):
+            page = doc.new_page()
+            page.insert_text((72, 72), INVOICE_TEXT)
+        return doc.tobytes()
+
+
+def _make_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(invoices.router)
+    app.dependency_overrides[verify_token] = lambda: {"realm_access": {"roles": ["files.write"]}}
+    return app
+
+
+async def _scenario():
+    transport = httpx.ASGITransport(app=_make_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        pdf = _make_pdf()
+
+        # Upload en mémoire
+        response = await client.post("/invoices/extract", files={"file": ("facture.pdf", pdf, "application/pdf")})
+        assert response.status_code == 200, response.text
+        result = response.json()
+        assert result["processing_method"] == "fast_pdf"
+        assert result["total_amount"] == 120.0
+        assert result["invoice_date"] == "15/03/2024"
+
+        # Upload écrit dans un fichier temporaire (au-delà du seuil), requêtes concurrentes
+        spool_kb = SETTINGS.upload_spool_kb
+        SETTINGS.upload_spool_kb = 1
+        try:
+            big_pdf = _make_pdf(pages=20)
+            assert len(big_pdf) > 1024
+            responses = await asyncio.gather(*[
+                client.post("/invoices/extract", files={"file": ("gros.pdf", big_pdf, "application/pdf")})
+                for _ in range(3)
+            ])
+            assert all(r.status_code == 200 and r.json()["total_amount"] == 120.0 for r in responses)
+        finally:
+            SETTINGS.upload_spool_kb = spool_kb
+
+        # Rejets
+        response = await client.post("/invoices/extract", files={"file": ("notes.txt", b"bonjour", "text/plain")})
+        assert response.status_code == 415
+        response = await client.post("/invoices/extract", files={"autre": ("facture.pdf", pdf, "application/pdf")})
+        assert response.status_code == 422
+        response = await client.post("/invoices/extract", content=pdf, headers={"content-type": "application/pdf"})
+        assert response.status_code == 415
+
+        max_upload_mb = SETTINGS.max_upload_mb
+        SETTINGS.max_upload_mb = 0
+        try:
+            response = await client.post("/invoices/extract", files={"file": ("facture.pdf", pdf, "application/pdf")})
+            assert response.status_code == 413
+        finally:
+            SETTINGS.max_upload_mb = max_upload_mb
+
+
+def test_invoice_extract_endpoint():
+    """Extraction réelle, spool mémoire/disque et limites"""
+    print("🧪 Test POST /invoices/extract...")
+    try:
+        asyncio.run(_scenario())
+    finally:
+        shutdown_extraction_executor()
+    print("✅ Endpoint d'extraction validé")
+    return True
+
+
+if __name__ == "__main__":
+    success = test_invoice_extract_endpoint()
+    sys.exit(0 if success else 1)
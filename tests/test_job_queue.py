@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""Tests de la file de traitement adossée à processing_status"""
+
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import create_engine, inspect, text
+
+from core.security.encryption import SecurityManager
+from data.storage.database import DatabaseManager, Document, upgrade_schema
+from data.storage.job_queue import DocumentJobQueue, ProcessingWorker
+
+
+def _failing_processor(document):
+    if "ERREUR" in document['content']:
+        raise ValueError("contenu illisible")
+    return {"length": len(document['content'])}
+
+
+def test_concurrent_claims_are_exclusive():
+    """Deux workers ne réclament jamais le même document"""
+    print("🧪 Test réclamation concurrente...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_manager = DatabaseManager(f"sqlite:///{tmp_dir}/queue.db")
+        for i in range(40):
+            db_manager.create_document("CLIENT_Q", f"doc_{i}.pdf", f"Contenu {i}")
+
+        queue = DocumentJobQueue(db_manager)
+        claimed, lock = [], threading.Lock()
+
+        def claim_all(worker):
+            while True:
+                ids = queue.claim(worker, limit=3)
+                if not ids:
+                    return
+                with lock:
+                    claimed.extend(ids)
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(claim_all, [f"w{i}" for i in range(4)]))
+
+        assert sorted(claimed) == list(range(1, 41))
+        assert queue.stats() == {"processing": 40}
+
+    print("✅ Réclamation concurrente validée")
+    return True
+
+
+def test_worker_results_and_stale_recovery():
+    """Résultats chiffrés, échecs avec nouvelle tentative, reprise des documents bloqués"""
+    print("🧪 Test ProcessingWorker...")
+
+    security = SecurityManager("test_queue_key", previous_passwords=[])
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_manager = DatabaseManager(f"sqlite:///{tmp_dir}/worker.db", security)
+        content = "Facture N° FA-2024001 Total TTC 120,00 €"
+        ok_id = db_manager.create_document("CLIENT_Q", "ok.pdf", content)
+        bad_id = db_manager.create_document("CLIENT_Q", "bad.pdf", "ERREUR")
+
+        queue = DocumentJobQueue(db_manager, max_attempts=2)
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            worker = ProcessingWorker(db_manager, processor=_failing_processor,
+                                      executor=pool, queue=queue, worker_id="w-test")
+            assert worker.run_once() == 2
+            assert queue.get_result(ok_id) == {"length": len(content)}
+            assert db_manager.get_document(bad_id)['processing_status'] == "pending"
+
+            # Seconde tentative : erreur définitive
+            assert worker.run_once() == 1
+            assert db_manager.get_document(bad_id)['processing_status'] == "error"
+
+        # Pipeline par défaut : FastPdfInvoiceEngine sur le contenu stocké
+        from data.storage.job_queue import extract_invoice_from_content
+        assert extract_invoice_from_content({"content": content})["total_amount"] == 120.0
+
+        # Document bloqué par un worker disparu
+        stuck_id = db_manager.create_document("CLIENT_Q", "stuck.pdf", "Contenu")
+        assert queue.claim("w-mort", limit=5) == [stuck_id]
+        assert queue.recover_stale(now=datetime.utcnow() + timedelta(minutes=10)) == 1
+        assert db_manager.get_document(stuck_id)['processing_status'] == "pending"
+
+        # Le worker disparu ne peut plus écrire son résultat
+        assert queue.claim("w-nouveau", limit=5) == [stuck_id]
+        assert not queue.complete(stuck_id, "w-mort", {}, 1)
+        assert queue.complete(stuck_id, "w-nouveau", {"ok": True}, 1)
+
+    print("✅ ProcessingWorker validé")
+    return True
+
+
+def test_undecryptable_and_heartbeat():
+    """Contenu indéchiffrable en échec, heartbeat des documents en cours"""
+    print("🧪 Test contenu indéchiffrable et heartbeat...")
+
+    security = SecurityManager("test_queue_key", previous_passwords=[])
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_manager = DatabaseManager(f"sqlite:///{tmp_dir}/heartbeat.db", security)
+        broken_id = db_manager.create_document("CLIENT_Q", "broken.pdf", "Contenu")
+        session = db_manager.get_session()
+        session.get(Document, broken_id).content_encrypted = "pas-un-jeton-fernet"
+        session.commit()
+        session.close()
+
+        queue = DocumentJobQueue(db_manager, max_attempts=1)
+        processed = []
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            worker = ProcessingWorker(db_manager, processor=lambda d: processed.append(d) or {},
+                                      executor=pool, queue=queue, worker_id="w-test")
+            assert worker.run_once() == 1
+        assert processed == []
+        session = db_manager.get_session()
+        broken = session.get(Document, broken_id)
+        assert broken.processing_status == "error"
+        assert "indéchiffrable" in broken.error_message
+        session.close()
+
+        # Heartbeat : un traitement long n'est pas repris par recover_stale
+        long_id = db_manager.create_document("CLIENT_Q", "long.pdf", "Traitement long")
+        assert queue.claim("w-long", limit=5) == [long_id]
+        session = db_manager.get_session()
+        session.get(Document, long_id).processing_started_at = datetime.utcnow() - timedelta(minutes=10)
+        session.commit()
+        session.close()
+        assert queue.heartbeat("w-autre", [long_id]) == 0
+        assert queue.heartbeat("w-long", [long_id]) == 1
+        assert queue.recover_stale() == 0
+        assert queue.recover_stale(now=datetime.utcnow() + timedelta(minutes=10)) == 1
+
+    print("✅ Contenu indéchiffrable et heartbeat validés")
+    return True
+
+
+def test_upgrade_existing_schema():
+    """Base créée avant la file de traitement : colonnes ajoutées au démarrage"""
+    print("🧪 Test mise à niveau du schéma documents...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        url = f"sqlite:///{tmp_dir}/legacy.db"
+        legacy = create_engine(url)
+        with legacy.begin() as conn:
+            conn.execute(text(
+                "CREATE TABLE documents (id INTEGER PRIMARY KEY, client_id VARCHAR(50) NOT NULL, "
+                "filename VARCHAR(255) NOT NULL, document_type VARCHAR(50), content_encrypted TEXT, "
+                "metadata_encrypted TEXT, file_hash VARCHAR(64), created_at DATETIME, "
+                "processed BOOLEAN, processing_status VARCHAR(20))"
+            ))
+            conn.execute(text(
+                "INSERT INTO documents (client_id, filename, content_encrypted, metadata_encrypted, "
+                "file_hash, processing_status) VALUES ('CLIENT_L', 'ancien.pdf', 'Contenu', '{}', 'h1', 'pending')"
+            ))
+        legacy.dispose()
+
+        db_manager = DatabaseManager(url)
+        columns = {column['name'] for column in inspect(db_manager.engine).get_columns("documents")}
+        assert {"worker_id", "attempts", "processing_started_at", "result_encrypted"} <= columns
+        assert db_manager.get_document(1)['content'] == "Contenu"
+
+        queue = DocumentJobQueue(db_manager)
+        assert queue.claim("w-test") == [1]
+        assert queue.complete(1, "w-test", {"ok": True}, 5)
+
+        # Deuxième démarrage : rien à ajouter
+        with db_manager.engine.begin() as conn:
+            assert upgrade_schema(conn) == []
+
+    print("✅ Mise à niveau du schéma validée")
+    return True
+
+
+if __name__ == "__main__":
+    ok = (test_concurrent_claims_are_exclusive() and test_worker_results_and_stale_recovery()
+          and test_undecryptable_and_heartbeat() and test_upgrade_existing_schema())
+    sys.exit(0 if ok else 1)
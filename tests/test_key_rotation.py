@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Tests du job de re-chiffrement (rotation de clés)"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.security.encryption import SecurityManager
+from data.storage.database import DatabaseManager, Document
+from data.storage.key_rotation import KeyRotationJob
+
+
+def _create_database(tmp_dir: str, count: int):
+    old_security = SecurityManager("ancienne_cle_2025", previous_passwords=[])
+    db_manager = DatabaseManager(f"sqlite:///{tmp_dir}/rotation.db", old_security)
+    for i in range(count):
+        db_manager.create_document(
+            client_id="CLIENT_ROT",
+            filename=f"facture_{i}.pdf",
+            content=f"Facture {i}",
+            document_type="facture",
+            metadata={"index": i},
+        )
+        db_manager.log_audit("admin", "CREATE_DOCUMENT", "document", str(i), details={"index": i})
+    return db_manager
+
+
+def test_key_rotation_resumable():
+    """Re-chiffrement par lots avec reprise depuis le checkpoint"""
+    print("🧪 Test KeyRotationJob...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_manager = _create_database(tmp_dir, 7)
+        new_security = SecurityManager("nouvelle_cle_2026", previous_passwords=[])
+
+        job = KeyRotationJob(
+            db_manager, "nouvelle_cle_2026", ["ancienne_cle_2025"],
+            job_id="rotation-test", chunk_size=2, max_workers=0,
+            tables=["documents"],
+        )
+
+        # Premier passage interrompu après 2 lots
+        summary = job.run(max_chunks=2)
+        assert summary["documents"]["last_id"] == 4
+        assert summary["documents"]["status"] == "running"
+
+        # Reprise jusqu'au bout, y compris avec un pool de processus
+        resumed = KeyRotationJob(
+            db_manager, "nouvelle_cle_2026", ["ancienne_cle_2025"],
+            job_id="rotation-test", chunk_size=2, max_workers=2,
+        )
+        summary = resumed.run()
+        assert summary["documents"]["status"] == "completed"
+        assert summary["documents"]["rows_processed"] == 7
+        assert summary["audit_logs"]["status"] == "completed"
+
+        session = db_manager.get_session()
+        try:
+            for document in session.query(Document).all():
+                assert new_security.get_key_id(document.content_encrypted) == new_security.key_id
+                assert new_security.decrypt_data(document.content_encrypted).startswith("Facture")
+        finally:
+            session.close()
+
+        assert not KeyRotationJob.is_rotation_due(db_manager)
+
+    print("✅ KeyRotationJob validé")
+    return True
+
+
+def test_key_rotation_conflicts():
+    """Ligne modifiée entre lecture et écriture : pas d'écrasement, passage « partial » repris"""
+    print("🧪 Test KeyRotationJob (conflits)...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_manager = _create_database(tmp_dir, 3)
+        new_security = SecurityManager("nouvelle_cle_2026", previous_passwords=[])
+        job = KeyRotationJob(
+            db_manager, "nouvelle_cle_2026", ["ancienne_cle_2025"],
+            job_id="rotation-conflit", chunk_size=10, max_workers=0, tables=["documents"],
+        )
+
+        # Mise à jour concurrente juste après la lecture du lot
+        fetch_chunk = job._fetch_chunk
+
+        def fetch_then_update(*args):
+            rows = fetch_chunk(*args)
+            session = db_manager.get_session()
+            try:
+                document = session.get(Document, 2)
+                document.content_encrypted = db_manager.security_manager.encrypt_data("Facture modifiée")
+                session.commit()
+            finally:
+                session.close()
+            return rows
+
+        job._fetch_chunk = fetch_then_update
+        summary = job.run()
+        assert summary["documents"]["status"] == "partial"
+        assert summary["documents"]["rows_failed"] == 1
+        assert KeyRotationJob.is_rotation_due(db_manager)
+
+        job._fetch_chunk = fetch_chunk
+        summary = job.run()
+        assert summary["documents"]["status"] == "completed"
+        assert summary["documents"]["rows_failed"] == 0
+
+        session = db_manager.get_session()
+        try:
+            content = session.get(Document, 2).content_encrypted
+            assert new_security.get_key_id(content) == new_security.key_id
+            assert new_security.decrypt_data(content) == "Facture modifiée"
+        finally:
+            session.close()
+
+    print("✅ KeyRotationJob (conflits) validé")
+    return True
+
+
+if __name__ == "__main__":
+    success = test_key_rotation_resumable() and test_key_rotation_conflicts()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Tests du chargement différé des dépendances OCR/ML"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from benchmark_import_time import HEAVY_MODULES, check_budget
+
+
+def _loaded_after(statement: str) -> list:
+    """Dépendances lourdes présentes dans sys.modules après `statement` (interpréteur neuf)"""
+    code = (f"import sys; {statement}; "
+            f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    completed = subprocess.run([sys.executable, "-W", "ignore", "-c", code], cwd=project_root,
+                               capture_output=True, text=True, check=True)
+    last_line = completed.stdout.strip().splitlines()[-1] if completed.stdout.strip() else ""
+    return [m for m in last_line.split(",") if m]
+
+
+def test_ocr_modules_import_lazily():
+    """Importer les moteurs ne charge ni PyMuPDF, ni Tesseract, ni Pillow"""
+    print("🧪 Test imports différés des moteurs OCR...")
+
+    assert _loaded_after("import modules.ocr") == []
+    assert _loaded_after("from modules.ocr import FastPdfInvoiceEngine, ConfigurableInvoiceOCR") == []
+    assert _loaded_after("import modules.ocr.fallback_wrapper, modules.ocr.hybrid_invoice_processor") == []
+
+    # Premier usage réel : fitz est chargé à ce moment-là
+    loaded = _loaded_after(
+        "from modules.ocr.fast_pdf_invoice_engine import FastPdfInvoiceEngine; FastPdfInvoiceEngine({}).warm_up()"
+    )
+    assert "fitz" in loaded
+
+    print("✅ Imports différés validés")
+    return True
+
+
+def test_api_startup_budget():
+    """api.main démarre sous le budget, sans dépendance OCR/ML"""
+    print("🧪 Test budget de démarrage api.main...")
+
+    problems = check_budget("api.main")
+    assert not problems, problems
+
+    print("✅ Budget de démarrage respecté")
+    return True
+
+
+def test_ocr_exports_resolve():
+    """Chaque nom de modules.ocr.__all__ s'importe (from modules.ocr import *)"""
+    print("🧪 Test exports de modules.ocr...")
+    import modules.ocr
+
+    for name in modules.ocr.__all__:
+        assert getattr(modules.ocr, name).__name__ == name, name
+    namespace = {}
+    exec("from modules.ocr import *", namespace)
+    assert set(modules.ocr.__all__) <= set(namespace)
+
+    print("✅ Exports de modules.ocr validés")
+    return True
+
+
+if __name__ == "__main__":
+    success = test_ocr_modules_import_lazily() and test_ocr_exports_resolve() and test_api_startup_budget()
+    sys.exit(0 if success else 1)
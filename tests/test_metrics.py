@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Tests des métriques Prometheus : histogrammes d'étapes, processus fils et /metrics"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import fitz
+import httpx
+from fastapi import FastAPI
+
+from api.middleware.auth import verify_token
+from api.routes import invoices, metrics
+from core.engine import executors
+from core.engine.executors import POOL_FAST_PDF, ExecutorManager, PoolSpec
+from core.observability.metrics import (
+    DOCUMENTS_TOTAL, REGISTRY, STAGE_DURATION, Counter, Histogram, MetricsRegistry,
+)
+from modules.ocr.extraction_worker import create_fast_pdf_executor, extract_invoice
+
+
+def _make_pdf() -> bytes:
+    with fitz.open() as doc:
+        doc.new_page().insert_text((72, 72), "FACTURE N° FA2024-00123\nTotal TTC : 120,00\n")
+        return doc.tobytes()
+
+
+def test_metrics_registry():
+    """Format d'exposition, drain/merge des deltas"""
+    print("🧪 Test registre de métriques...")
+    registry = MetricsRegistry()
+    histogram = registry.register(Histogram("t_seconds", "aide", ("stage",), buckets=(0.1, 1.0)))
+    counter = registry.register(Counter("t_total", "aide", ("method",)))
+    histogram.observe(0.05, "ocr")
+    histogram.observe(0.5, "ocr")
+    histogram.observe(5.0, "ocr")
+    counter.inc('fa"st')
+
+    text = registry.render()
+    assert "# TYPE t_seconds histogram" in text
+    assert 't_seconds_bucket{stage="ocr",le="0.1"} 1' in text
+    assert 't_seconds_bucket{stage="ocr",le="1"} 2' in text
+    assert 't_seconds_bucket{stage="ocr",le="+Inf"} 3' in text
+    assert 't_seconds_count{stage="ocr"} 3' in text
+    assert 't_total{method="fa\\"st"} 1' in text
+
+    # Delta d'un « processus fils » fusionné dans un autre registre
+    delta = registry.drain_delta()
+    assert histogram.count("ocr") == 0 and registry.drain_delta() == {}
+    registry.merge_delta(delta)
+    registry.merge_delta(delta)
+    assert histogram.count("ocr") == 6 and counter.value('fa"st') == 2
+    print("✅ Registre de métriques validé")
+    return True
+
+
+async def _scenario_process_pool(pdf: bytes):
+    manager = ExecutorManager({POOL_FAST_PDF: PoolSpec(create_fast_pdf_executor, 1)})
+    try:
+        result = await manager.run(POOL_FAST_PDF, extract_invoice, pdf)
+        assert result["total_amount"] == 120.0
+        try:
+            await manager.run(POOL_FAST_PDF, extract_invoice, b"pas un pdf")
+            raise AssertionError("Exception attendue")
+        except AssertionError:
+            raise
+        except Exception:
+            pass
+    finally:
+        manager.shutdown()
+
+
+async def _scenario_api(pdf: bytes):
+    app = FastAPI()
+    app.include_router(invoices.router)
+    app.include_router(metrics.router)
+    app.dependency_overrides[verify_token] = lambda: {"realm_access": {"roles": ["files.write"]}}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post("/invoices/extract", files={"file": ("f.pdf", pdf, "application/pdf")})
+        assert response.status_code == 200
+        response = await client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    return response.text
+
+
+def test_pipeline_metrics():
+    """Étapes mesurées dans les processus fils, compteurs par méthode, /metrics"""
+    print("🧪 Test métriques du pipeline...")
+    pdf = _make_pdf()
+
+    # Pool de processus : mesures rapatriées avec le résultat (succès comme échec)
+    regex_before = STAGE_DURATION.count("regex_extraction")
+    text_before = STAGE_DURATION.count("text_extraction")
+    asyncio.run(_scenario_process_pool(pdf))
+    assert STAGE_DURATION.count("regex_extraction") == regex_before + 1
+    assert STAGE_DURATION.count("text_extraction") == text_before + 2
+
+    saved = executors._manager
+    executors._manager = ExecutorManager({POOL_FAST_PDF: PoolSpec(create_fast_pdf_executor, 1)})
+    fast_pdf_before = DOCUMENTS_TOTAL.value("fast_pdf")
+    try:
+        text = asyncio.run(_scenario_api(pdf))
+    finally:
+        executors._manager.shutdown()
+        executors._manager = saved
+
+    assert DOCUMENTS_TOTAL.value("fast_pdf") == fast_pdf_before + 1
+    assert f'fiscal_ai_documents_total{{processing_method="fast_pdf"}} {int(fast_pdf_before) + 1}' in text
+    assert 'fiscal_ai_stage_duration_seconds_count{stage="regex_extraction"}' in text
+    assert 'fiscal_ai_executor_queue_depth{pool="fast_pdf",lane="interactive"} 0' in text
+    assert "fiscal_ai_batch_queue_depth 0" in text
+    assert REGISTRY.get("fiscal_ai_executor_running") is not None
+    print("✅ Métriques du pipeline validées")
+    return True
+
+
+if __name__ == "__main__":
+    success = test_metrics_registry() and test_pipeline_metrics()
+    sys.exit(0 if success else 1)
@@ -7,8 +7,38 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+from modules.ocr.base_ocr import BaseOCR, OCRResult
+from modules.ocr.engines import ENGINE_BASE_OCR, get_ocr_registry
 from modules.ocr.modular_ocr import ModularOCRProcessor
 
+INVOICE_TEXT = "FACTURE N° FA-2024001\nTotal TTC : 120,00 €\nTVA FR12345678901\n"
+
+
+def test_modular_processor_on_shared_engine():
+    """process_document passe par le moteur base_ocr du registre"""
+    print("🧪 Test ModularOCRProcessor sur le moteur partagé...")
+    calls = []
+    original = BaseOCR.extract_text
+    BaseOCR.extract_text = lambda engine, source: calls.append(engine) or (INVOICE_TEXT, 0.9)
+    try:
+        processor = ModularOCRProcessor({"languages": ["fra"], "preprocessing": []})
+        result = processor.process_document(Path("facture_test.pdf"))
+        processor.process_document(Path("facture_test.pdf"))
+    finally:
+        BaseOCR.extract_text = original
+
+    assert isinstance(result, OCRResult) and result.success
+    assert result.document_type_detected == "invoice"
+    assert result.handler_used == "InvoiceHandler"
+    assert result.confidence == 0.9 and result.word_count == len(INVOICE_TEXT.split())
+    assert "montant_ttc" in result.extracted_entities
+    # Une seule instance, réutilisée d'un document à l'autre
+    assert len(calls) == 2 and calls[0] is calls[1]
+    assert ENGINE_BASE_OCR in get_ocr_registry().engine_stats()
+    print("✅ ModularOCRProcessor validé")
+    return True
+
+
 def test_modular_architecture():
     """Test de l'architecture modulaire"""
     config = {
@@ -64,4 +94,5 @@ def test_modular_architecture():
     print(f"\n✅ Test terminé")
 
 if __name__ == "__main__":
+    test_modular_processor_on_shared_engine()
     test_modular_architecture()
\ No newline at end of file
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Tests de chargement concurrent du ModuleRegistry (single-flight)"""
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.engine.module_registry import ModuleRegistry
+
+CONCURRENT_LOADS = 100
+
+
+def _slow_module(constructions: list, fail_first: bool = False):
+    lock = threading.Lock()
+
+    class SlowEngine:
+        def __init__(self, config):
+            with lock:
+                constructions.append(config)
+                attempt = len(constructions)
+            time.sleep(0.2)   # simulation traineddata / modèles
+            if fail_first and attempt == 1:
+                raise RuntimeError("traineddata introuvable")
+            self.config = config
+
+    return SlowEngine
+
+
+def test_concurrent_load_single_construction():
+    """100 chargements simultanés → une seule construction"""
+    print("🧪 Test chargement concurrent (threads)...")
+
+    registry = ModuleRegistry()
+    constructions = []
+    registry.register_module("slow", _slow_module(constructions))
+
+    barrier = threading.Barrier(CONCURRENT_LOADS)
+    results = [None] * CONCURRENT_LOADS
+
+    def load(index):
+        barrier.wait()
+        results[index] = registry.load_module("slow", {"lang": "fra"})
+
+    threads = [threading.Thread(target=load, args=(i,)) for i in range(CONCURRENT_LOADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(constructions) == 1
+    assert results[0] is not None
+    assert all(result is results[0] for result in results)
+    assert registry.modules["slow"]["status"] == "active"
+
+    print("✅ Chargement concurrent (threads) validé")
+    return True
+
+
+def test_concurrent_async_load_single_construction():
+    """100 aload_module simultanés sur la boucle → une seule construction"""
+    print("🧪 Test chargement concurrent (asyncio)...")
+
+    registry = ModuleRegistry()
+    constructions = []
+    registry.register_module("slow", _slow_module(constructions))
+
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        monitor = asyncio.create_task(ticker())
+        results = await asyncio.gather(*[registry.aload_module("slow") for _ in range(CONCURRENT_LOADS)])
+        monitor.cancel()
+        return results, ticks
+
+    results, ticks = asyncio.run(scenario())
+    assert len(constructions) == 1
+    assert all(result is results[0] for result in results)
+    # La boucle a continué de tourner pendant la construction (0,2 s)
+    assert ticks >= 5
+
+    print("✅ Chargement concurrent (asyncio) validé")
+    return True
+
+
+def test_failed_load_is_retried():
+    """Un échec est partagé par les appelants concurrents puis retenté"""
+    print("🧪 Test échec de chargement...")
+
+    registry = ModuleRegistry()
+    constructions = []
+    registry.register_module("flaky", _slow_module(constructions, fail_first=True))
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.load_module("flaky")))
+               for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(constructions) == 1 and results == [None] * 10
+    assert registry.load_module("flaky") is not None
+    assert len(constructions) == 2
+
+    print("✅ Échec de chargement validé")
+    return True
+
+
+if __name__ == "__main__":
+    success = (test_concurrent_load_single_construction()
+               and test_concurrent_async_load_single_construction()
+               and test_failed_load_is_retried())
+    sys.exit(0 if success else 1)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Tests de la découverte de plug-ins par manifeste (plugin.json)"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.engine.module_registry import ModuleRegistry
+from core.engine.plugin_manifest import resolve_import_path
+
+PLUGIN_COUNT = 50
+
+
+def _write_plugins(root: Path):
+    for i in range(PLUGIN_COUNT):
+        package = root / f"plug_{i:03d}"
+        package.mkdir()
+        (package / "__init__.py").write_text("")
+        (package / "engine.py").write_text(
+            "class Engine:\n"
+            "    def __init__(self, config):\n"
+            "        self.config = config\n"
+        )
+        (package / "plugin.json").write_text(json.dumps({"plugins": [{
+            "name": f"plug_{i:03d}",
+            "class": f"plug_{i:03d}.engine:Engine",
+            "capabilities": ["ocr"] if i % 2 else ["fiscal"],
+            "config_schema": {"languages": {"type": "list", "default": ["fra"]}},
+        }]}))
+
+
+def test_manifest_discovery_without_import():
+    """Enregistrement depuis les manifestes, import au load_module uniquement"""
+    print("🧪 Test découverte par manifeste...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        root = Path(tmp_dir) / "plugins"
+        root.mkdir()
+        _write_plugins(root)
+        cache_path = Path(tmp_dir) / "cache" / "manifest.json"
+        sys.path.insert(0, str(root))
+        try:
+            registry = ModuleRegistry()
+            added = registry.discover_modules([root], cache_path=cache_path, entry_point_group=None)
+            assert added == PLUGIN_COUNT
+            assert cache_path.exists()
+            assert not [name for name in sys.modules if name.startswith("plug_")]
+
+            assert len(registry.find_modules("ocr")) == PLUGIN_COUNT // 2
+            assert registry.modules["plug_007"]["config_schema"]["languages"]["default"] == ["fra"]
+            assert registry.list_modules()["plug_007"]["class"] == "Engine"
+
+            instance = registry.load_module("plug_007", {"languages": ["eng"]})
+            assert instance.config == {"languages": ["eng"]}
+            assert sorted(n for n in sys.modules if n.startswith("plug_")) == ["plug_007", "plug_007.engine"]
+
+            # Cache réutilisé tel quel tant que les manifestes ne changent pas
+            cached = json.loads(cache_path.read_text())
+            assert len(cached["plugins"]) == PLUGIN_COUNT
+
+            # Manifeste modifié → relu
+            manifest = root / "plug_010" / "plugin.json"
+            data = json.loads(manifest.read_text())
+            data["plugins"][0]["capabilities"] = ["ocr", "layout"]
+            manifest.write_text(json.dumps(data))
+            future = time.time() + 5
+            os.utime(manifest, (future, future))
+
+            second = ModuleRegistry()
+            second.discover_modules([root], cache_path=cache_path, entry_point_group=None)
+            assert second.find_modules("layout") == ["plug_010"]
+        finally:
+            sys.path.remove(str(root))
+            for name in [n for n in sys.modules if n.startswith("plug_")]:
+                del sys.modules[name]
+
+    print("✅ Découverte par manifeste validée")
+    return True
+
+
+def test_ocr_manifest():
+    """Le manifeste modules/ocr/plugin.json déclare les moteurs de factures"""
+    print("🧪 Test manifeste OCR...")
+
+    registry = ModuleRegistry()
+    registry.discover_modules(cache_path=None, entry_point_group=None)
+    invoice_modules = registry.find_modules("invoice")
+    assert {"fast_pdf_invoice", "hybrid_invoice", "invoice_fallback"} <= set(invoice_modules)
+
+    engine = registry.load_module("fast_pdf_invoice")
+    assert type(engine).__name__ == "FastPdfInvoiceEngine"
+
+    # Chaque entrée du manifeste doit rester importable
+    manifest = json.loads((Path(__file__).parent.parent / "modules" / "ocr" / "plugin.json").read_text())
+    for plugin in manifest["plugins"]:
+        assert plugin["name"] in registry.list_modules()
+        resolved = resolve_import_path(plugin["class"])
+        assert resolved.__name__ == plugin["class"].rsplit(":", 1)[1]
+
+    print("✅ Manifeste OCR validé")
+    return True
+
+
+if __name__ == "__main__":
+    success = test_manifest_discovery_without_import() and test_ocr_manifest()
+    sys.exit(0 if success else 1)
@@ -9,8 +9,26 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+from modules.ocr.base_ocr import BaseOCR
 from modules.ocr.privacy_compliant_ocr import PrivacyCompliantOCR
 
+
+def test_extract_text_on_shared_engine():
+    """_extract_text_ocr lit le texte via le moteur base_ocr du registre"""
+    print("🧪 Test PrivacyCompliantOCR sur le moteur partagé...")
+    engines = []
+    original = BaseOCR.extract_text
+    BaseOCR.extract_text = lambda engine, source: engines.append(engine) or ("Total TTC : 120,00 €", 0.8)
+    try:
+        privacy_ocr = PrivacyCompliantOCR({"languages": ["fra"]})
+        assert privacy_ocr._extract_text_ocr(Path("facture.pdf")) == "Total TTC : 120,00 €"
+        privacy_ocr._extract_text_ocr(Path("facture.pdf"))
+    finally:
+        BaseOCR.extract_text = original
+    assert len(engines) == 2 and engines[0] is engines[1]
+    print("✅ PrivacyCompliantOCR validé")
+    return True
+
 def test_privacy_compliant_extraction():
     """Test d'extraction respectueuse de la vie privée"""
     
@@ -86,5 +104,6 @@ def test_privacy_compliant_extraction():
         print(f"   ⚖️ {guarantee}")
 
 if __name__ == "__main__":
+    test_extract_text_on_shared_engine()
     test_privacy_compliant_extraction()
 
@@ -50,6 +50,292 @@ def test_security_manager():
         print(f"❌ Erreur SecurityManager: {e}")
         return False
 
+def test_keyring_cache_and_rotation():
+    """Test du trousseau de clés : dérivation unique, key_id, rotation"""
+    print("🧪 Test KeyRing...")
+
+    from core.security.encryption import KeyRing, SecurityError
+
+    keyring = KeyRing()
+    calls = []
+    original_derive = keyring._derive_fernet_key
+    keyring._derive_fernet_key = lambda pwd: calls.append(pwd) or original_derive(pwd)
+
+    first = SecurityManager("cle_rotation_2025", previous_passwords=[], keyring=keyring)
+    second = SecurityManager("cle_rotation_2025", previous_passwords=[], keyring=keyring)
+    assert len(calls) == 1
+    assert first.key_id == second.key_id
+
+    # Le chiffré est étiqueté avec l'identifiant de clé
+    encrypted = first.encrypt_data("Données fiscales")
+    assert first.get_key_id(encrypted) == first.key_id
+
+    # Rotation : l'ancienne clé reste active en déchiffrement
+    old_key_id = first.key_id
+    new_key_id = first.rotate_key("cle_rotation_2026")
+    assert new_key_id != old_key_id
+    assert first.active_key_ids == [new_key_id, old_key_id]
+    assert first.decrypt_data(encrypted) == "Données fiscales"
+    assert first.get_key_id(first.encrypt_data("x")) == new_key_id
+
+    # Un gestionnaire sans l'ancienne clé ne peut pas déchiffrer
+    other = SecurityManager("cle_rotation_2026", previous_passwords=[], keyring=keyring)
+    try:
+        other.decrypt_data(encrypted)
+        assert False, "déchiffrement inattendu"
+    except SecurityError:
+        pass
+
+    # Les anciens chiffrés non étiquetés restent lisibles
+    import base64
+    legacy = base64.urlsafe_b64encode(
+        keyring.get_cipher(old_key_id).encrypt(b"ancien format")
+    ).decode('ascii')
+    assert first.decrypt_data(legacy) == "ancien format"
+
+    print("✅ KeyRing validé")
+    return True
+
+def test_batch_encryption_and_get_documents():
+    """Test du chiffrement par lots et de la récupération groupée"""
+    print("🧪 Test encrypt_many / get_documents...")
+
+    import tempfile
+
+    security = SecurityManager("test_batch_key_2025", previous_passwords=[])
+    items = [f"Facture {i}" for i in range(50)]
+    encrypted = security.encrypt_many(items)
+    assert security.decrypt_many(encrypted) == items
+
+    # Un élément invalide n'interrompt pas le lot
+    mixed = security.decrypt_many([encrypted[0], "corrompu"] + encrypted[1:10], return_exceptions=True)
+    assert mixed[0] == "Facture 0"
+    assert isinstance(mixed[1], Exception)
+    assert mixed[2:] == items[1:10]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_manager = DatabaseManager(f"sqlite:///{tmp_dir}/batch.db", security)
+        ids = [
+            db_manager.create_document("CLIENT_BATCH", f"facture_{i}.pdf", f"Contenu {i}",
+                                       "facture", {"index": i})
+            for i in range(12)
+        ]
+        requested = list(reversed(ids)) + [999999]
+        documents = db_manager.get_documents(requested, decrypt=True)
+        assert [d['id'] for d in documents] == list(reversed(ids))
+        assert documents[0]['content'] == "Contenu 11"
+        assert documents[-1]['metadata'] == {"index": 0}
+
+    print("✅ Lots de chiffrement validés")
+    return True
+
+def test_password_hashing_upgrade():
+    """Test du hachage scrypt, de la migration des anciens hash et du cache"""
+    print("🧪 Test hachage mots de passe...")
+
+    import hashlib
+    import tempfile
+    from core.security.password_hashing import ScryptHasher, calibrate_scrypt
+
+    hasher = ScryptHasher(ln=12)
+    security = SecurityManager("test_password_key", previous_passwords=[], password_hasher=hasher)
+
+    hashed = security.hash_password("MotDePasse2025!")
+    assert hashed.startswith("$scrypt$ln=12,")
+    assert security.verify_password("MotDePasse2025!", hashed)
+    assert not security.verify_password("mauvais", hashed)
+
+    # Ancien format salt_hex$sha256 : valide et migré
+    salt = bytes(32)
+    legacy = f"{salt.hex()}${hashlib.sha256(salt + b'Ancien2024!').hexdigest()}"
+    is_valid, new_hash = security.verify_and_update_password("Ancien2024!", legacy)
+    assert is_valid and new_hash.startswith("$scrypt$")
+
+    # Paramètres obsolètes → nouveau hash
+    stronger = SecurityManager("test_password_key", previous_passwords=[],
+                               password_hasher=ScryptHasher(ln=13))
+    _, rehashed = stronger.verify_and_update_password("MotDePasse2025!", hashed)
+    assert rehashed.startswith("$scrypt$ln=13,")
+
+    # Cache : une seconde vérification ne recalcule pas le hash
+    calls = []
+    original_verify = hasher.verify
+    hasher.verify = lambda pwd, stored: calls.append(pwd) or original_verify(pwd, stored)
+    other = hasher.hash("Rafale2025!")
+    assert security.verify_password("Rafale2025!", other)
+    assert security.verify_password("Rafale2025!", other)
+    assert len(calls) == 1
+
+    assert calibrate_scrypt(target_ms=0.0, min_ln=10, max_ln=11).ln == 10
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_manager = DatabaseManager(f"sqlite:///{tmp_dir}/users.db", security)
+        db_manager.create_user("comptable", "comptable@example.com", "Initial2025!")
+
+        session = db_manager.get_session()
+        from data.storage.database import User
+        user = session.query(User).filter_by(username="comptable").first()
+        user.password_hash = legacy
+        session.commit()
+        session.close()
+
+        assert db_manager.authenticate_user("comptable", "mauvais") is None
+        info = db_manager.authenticate_user("comptable", "Ancien2024!")
+        assert info['username'] == "comptable"
+
+        session = db_manager.get_session()
+        user = session.query(User).filter_by(username="comptable").first()
+        assert user.password_hash.startswith("$scrypt$")
+        assert user.failed_login_attempts == 0
+        session.close()
+
+    print("✅ Hachage mots de passe validé")
+    return True
+
+def test_list_documents_keyset_pagination():
+    """Test du listing paginé par clé avec filtres"""
+    print("🧪 Test list_documents...")
+
+    import tempfile
+
+    security = SecurityManager("test_listing_key", previous_passwords=[])
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_manager = DatabaseManager(f"sqlite:///{tmp_dir}/listing.db", security)
+        ids = [
+            db_manager.create_document(f"CLIENT_{i % 2}", f"doc_{i}.pdf", f"Contenu {i}",
+                                       "facture" if i % 3 else "releve")
+            for i in range(25)
+        ]
+
+        seen, cursor = [], None
+        while True:
+            page = db_manager.list_documents(client_id="CLIENT_0", limit=4, cursor=cursor)
+            assert all('content' not in d for d in page['documents'])
+            seen += [d['id'] for d in page['documents']]
+            cursor = page['next_cursor']
+            if cursor is None:
+                break
+        assert seen == sorted(ids[0::2], reverse=True)
+
+        # Ordre (created_at, id) quand aucun client n'est fourni
+        seen, cursor = [], None
+        while True:
+            page = db_manager.list_documents(document_type="releve", limit=3, cursor=cursor)
+            seen += [d['id'] for d in page['documents']]
+            cursor = page['next_cursor']
+            if cursor is None:
+                break
+        assert sorted(seen) == [ids[i] for i in range(25) if i % 3 == 0]
+        assert len(set(seen)) == len(seen)
+
+        page = db_manager.list_documents(client_id="CLIENT_1", limit=2, decrypt=True)
+        assert page['documents'][0]['content'] == "Contenu 23"
+
+    print("✅ list_documents validé")
+    return True
+
+def test_document_deduplication():
+    """Test de la déduplication par (client_id, file_hash)"""
+    print("🧪 Test déduplication documents...")
+
+    import tempfile
+    from data.storage.job_queue import DocumentJobQueue
+
+    security = SecurityManager("test_dedup_key", previous_passwords=[])
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_manager = DatabaseManager(f"sqlite:///{tmp_dir}/dedup.db", security)
+        first = db_manager.ingest_document("CLIENT_D", "facture_mars.pdf", "Facture 42 - 99,00 €", "facture")
+        assert not first['duplicate']
+
+        queue = DocumentJobQueue(db_manager)
+        assert queue.claim("w-dedup") == [first['document_id']]
+        queue.complete(first['document_id'], "w-dedup", {"total_amount": 99.0}, 3)
+
+        again = db_manager.ingest_document("CLIENT_D", "relance_mars.pdf", "Facture 42 - 99,00 €", "facture")
+        assert again['duplicate']
+        assert again['document_id'] == first['document_id']
+        assert again['result'] == {"total_amount": 99.0}
+        assert db_manager.get_document_filenames(first['document_id']) == ["facture_mars.pdf", "relance_mars.pdf"]
+
+        # Même nom renvoyé une seconde fois : pas de doublon d'alias
+        db_manager.create_document("CLIENT_D", "relance_mars.pdf", "Facture 42 - 99,00 €")
+        assert len(db_manager.get_document_filenames(first['document_id'])) == 2
+
+        # Autre client : document distinct
+        other = db_manager.ingest_document("CLIENT_E", "facture_mars.pdf", "Facture 42 - 99,00 €")
+        assert not other['duplicate'] and other['document_id'] != first['document_id']
+
+    print("✅ Déduplication validée")
+    return True
+
+def test_metadata_serialization():
+    """Métadonnées en JSON ; anciennes lignes (repr) relues sans eval()"""
+    print("🧪 Test sérialisation des métadonnées...")
+
+    import tempfile
+    from data.storage.database import Document, load_metadata
+
+    assert load_metadata("{'legacy': 1, 'ok': True}") == {'legacy': 1, 'ok': True}
+    try:
+        load_metadata("__import__('os').getcwd()")
+        raise AssertionError("Expression exécutée")
+    except (ValueError, SyntaxError):
+        pass
+
+    security = SecurityManager("test_metadata_key", previous_passwords=[])
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_manager = DatabaseManager(f"sqlite:///{tmp_dir}/metadata.db", security)
+        doc_id = db_manager.create_document("CLIENT_M", "m.pdf", "Contenu M", metadata={"montant": 12.5})
+        session = db_manager.get_session()
+        stored = security.decrypt_data(session.get(Document, doc_id).metadata_encrypted)
+        session.close()
+        assert stored == '{"montant": 12.5}'
+        assert db_manager.list_documents(client_id="CLIENT_M", decrypt=True)['documents'][0]['metadata'] == {"montant": 12.5}
+
+    print("✅ Sérialisation des métadonnées validée")
+    return True
+
+def test_deduplication_upgrade_of_existing_database():
+    """Doublons d'une base existante rattachés en alias avant l'index unique"""
+    print("🧪 Test mise à niveau déduplication...")
+
+    import tempfile
+    from sqlalchemy import create_engine, inspect, text
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        url = f"sqlite:///{tmp_dir}/legacy_dedup.db"
+        legacy = create_engine(url)
+        with legacy.begin() as conn:
+            conn.execute(text(
+                "CREATE TABLE documents (id INTEGER PRIMARY KEY, client_id VARCHAR(50) NOT NULL, "
+                "filename VARCHAR(255) NOT NULL, document_type VARCHAR(50), content_encrypted TEXT, "
+                "metadata_encrypted TEXT, file_hash VARCHAR(64), created_at DATETIME, "
+                "processed BOOLEAN, processing_status VARCHAR(20))"
+            ))
+            for filename, status in [("a.pdf", "pending"), ("b.pdf", "completed"),
+                                     ("c.pdf", "pending"), ("a.pdf", "pending")]:
+                conn.execute(text(
+                    "INSERT INTO documents (client_id, filename, content_encrypted, metadata_encrypted, "
+                    "file_hash, processing_status) VALUES ('CLIENT_L', :f, 'Contenu', '{}', 'h1', :s)"
+                ), {"f": filename, "s": status})
+            conn.execute(text(
+                "INSERT INTO documents (client_id, filename, content_encrypted, metadata_encrypted, "
+                "file_hash, processing_status) VALUES ('CLIENT_L', 'autre.pdf', 'Autre', '{}', 'h2', 'pending')"
+            ))
+        legacy.dispose()
+
+        db_manager = DatabaseManager(url)
+        indexes = {index['name']: index for index in inspect(db_manager.engine).get_indexes("documents")}
+        assert indexes['idx_client_file_hash']['unique']
+
+        # Le document déjà traité est conservé, les autres noms deviennent des alias
+        page = db_manager.list_documents(client_id="CLIENT_L")
+        assert sorted(d['id'] for d in page['documents']) == [2, 5]
+        assert db_manager.get_document_filenames(2) == ["b.pdf", "a.pdf", "c.pdf"]
+
+    print("✅ Mise à niveau déduplication validée")
+    return True
+
 def test_database_manager():
     """Test du gestionnaire de base de données avec health check corrigé"""
     print("🧪 Test DatabaseManager...")
@@ -112,7 +398,16 @@ def main():
     
     try:
         # Tests
-        security_ok = test_security_manager()
+        security_ok = (
+            test_security_manager()
+            and test_keyring_cache_and_rotation()
+            and test_batch_encryption_and_get_documents()
+            and test_password_hashing_upgrade()
+            and test_list_documents_keyset_pagination()
+            and test_document_deduplication()
+            and test_deduplication_upgrade_of_existing_database()
+            and test_metadata_serialization()
+        )
         database_ok = test_database_manager()
         
         if security_ok and database_ok:
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Tests de la sérialisation JSON des résultats (orjson et repli json)"""
+
+import json
+import sys
+from dataclasses import asdict
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from api.responses import FastJSONResponse
+from modules.ocr import serialization
+from modules.ocr.field_extractor import InvoiceData, InvoiceField
+from modules.ocr.invoice_extraction_result import InvoiceExtractionResult
+from modules.ocr.layout_detector import LayoutType
+from modules.ocr.privacy_compliant_ocr import AnonymizedInvoiceData
+
+
+def _samples():
+    result = InvoiceExtractionResult(
+        total_amount=120.0, invoice_date="15/03/2024", invoice_number="FA2024-00123",
+        legal_identifiers={"numero_tva": "FR12345678901"}, vat_rate=20.0, amount_ht=100.0,
+        processing_method="fast_pdf", extraction_confidence=0.9, amounts_found=["120,00 €"],
+    )
+    invoice = InvoiceData(
+        supplier_name="Société Générale d'Électricité", total_ttc=120.0, vat_rates=[20.0],
+        extracted_fields=[InvoiceField("total_ttc", 120.0, 0.9, LayoutType.TOTALS, "120,00", (1, 2, 3, 4))],
+    )
+    anonymized = AnonymizedInvoiceData(supplier_id="SUP_1a2b", client_id="CLI_3c4d", total_ttc=120.0)
+    return result, invoice, anonymized
+
+
+def _reference(obj):
+    """Ancien chemin : asdict + json (Enum → valeur)"""
+    return json.loads(json.dumps(asdict(obj), default=lambda o: o.value))
+
+
+def test_result_serialization():
+    """Sérialiseurs précompilés, orjson et repli json donnent le même JSON"""
+    print("🧪 Test sérialisation JSON des résultats...")
+    samples = _samples()
+
+    assert serialization.to_dict(samples[0]) == asdict(samples[0])
+    assert list(serialization.to_dict(samples[1])) == list(asdict(samples[1]))
+
+    expected = [_reference(obj) for obj in samples]
+    encoded = serialization.dumps(list(samples))
+    assert json.loads(encoded) == expected
+    assert "Électricité".encode("utf-8") in encoded
+
+    # Repli sans orjson
+    orjson = serialization.orjson
+    serialization.orjson = None
+    try:
+        fallback = serialization.dumps(list(samples))
+    finally:
+        serialization.orjson = orjson
+    assert json.loads(fallback) == expected
+    assert b"\n" not in fallback and b", " not in fallback
+
+    response = FastJSONResponse({"results": [samples[0]]})
+    assert response.headers["content-type"] == "application/json"
+    assert json.loads(response.body) == {"results": [expected[0]]}
+
+    print("✅ Sérialisation JSON validée")
+    return True
+
+
+if __name__ == "__main__":
+    success = test_result_serialization()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""Tests des spans par document : étapes, attributs, échantillonnage et export fichier"""
+
+import json
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import fitz
+from opentelemetry import trace as otel_trace
+
+from core.observability import tracing
+from modules.ocr.fallback_wrapper import InvoiceProcessorWithFallback
+from modules.ocr.invoice_extraction_result import InvoiceExtractionResult
+
+
+class _RecordingSpan:
+    def __init__(self, name, attributes, parent):
+        self.name = name
+        self.attributes = dict(attributes or {})
+        self.parent = parent
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def set_attributes(self, attributes):
+        self.attributes.update(attributes)
+
+    def is_recording(self):
+        return True
+
+    def record_exception(self, exc):
+        self.attributes["exception"] = repr(exc)
+
+    def set_status(self, status):
+        pass
+
+
+class _RecordingTracer:
+    """Tracer minimal (API start_as_current_span) : spans et parents en mémoire."""
+
+    def __init__(self):
+        self.spans = []
+        self._stack = []
+
+    @contextmanager
+    def start_as_current_span(self, name, attributes=None, **_kwargs):
+        current = _RecordingSpan(name, attributes, self._stack[-1].name if self._stack else None)
+        self.spans.append(current)
+        self._stack.append(current)
+        try:
+            yield current
+        finally:
+            self._stack.pop()
+
+
+def _make_pdf(text: str) -> bytes:
+    with fitz.open() as doc:
+        doc.new_page().insert_text((72, 72), text)
+        doc.new_page()
+        return doc.tobytes()
+
+
+def _process(processor, pdf: bytes, sample_ratio: float) -> _RecordingTracer:
+    tracing.configure_tracing(tracing.EXPORTER_NONE, sample_ratio=sample_ratio)
+    tracer = tracing._tracer = _RecordingTracer()
+    try:
+        processor.process_invoice(pdf)
+    finally:
+        tracing.configure_tracing(tracing.EXPORTER_NONE)
+    return tracer
+
+
+def test_document_spans():
+    """Étapes fitz/regex/merge sous le span du document, fallback et échantillonnage"""
+    print("🧪 Test spans par document...")
+    processor = InvoiceProcessorWithFallback({})
+    processor.ocr.process_invoice = lambda _source: InvoiceExtractionResult(
+        legal_identifiers={"numero_tva": "FR12345678901"}, extraction_confidence=0.8,
+    )
+    pdf = _make_pdf("FACTURE N° FA2024-00123\nDate : 15/03/2024\nTotal TTC : 120,00\n")
+
+    tracer = _process(processor, pdf, sample_ratio=1.0)
+    spans = {span.name: span for span in tracer.spans}
+    assert [span.name for span in tracer.spans] == ["invoice.process", "fitz", "regex", "merge"]
+    assert all(span.parent == "invoice.process" for span in tracer.spans[1:])
+
+    assert spans["fitz"].attributes["pdf.page_count"] == 2
+    assert spans["fitz"].attributes["text.length"] > 0
+    assert spans["regex"].attributes["invoice.fields_found"] == 3
+    assert spans["merge"].attributes["invoice.fields_found"] == 4
+    document = spans["invoice.process"].attributes
+    assert document["fallback.reason"] == "missing_fields:numero_tva"
+    assert document["invoice.processing_method"] == "hybrid"
+    assert document["invoice.fields_found"] == 4
+
+    # Document non échantillonné : aucune étape ne touche au tracer
+    assert _process(processor, pdf, sample_ratio=0.0).spans == []
+
+    # Traçage désactivé : contexte partagé sans effet
+    tracing.configure_tracing(tracing.EXPORTER_NONE)
+    with tracing.span("fitz") as current:
+        assert current is tracing.NOOP_SPAN
+    print("✅ Spans par document validés")
+    return True
+
+
+def _completion_step() -> str:
+    with tracing.span("invoice.complete"):
+        return otel_trace.get_current_span().get_span_context().trace_id
+
+
+def test_cross_process_context():
+    """La complétion (autre processus) reste dans la trace et la décision du document"""
+    print("🧪 Test propagation du contexte de trace...")
+    tracing.configure_tracing(tracing.EXPORTER_NONE, sample_ratio=1.0)
+    tracer = tracing._tracer = _RecordingTracer()
+    try:
+        assert tracing.trace_context() is None
+        parent = otel_trace.NonRecordingSpan(otel_trace.SpanContext(
+            trace_id=0x1234, span_id=0x5678, is_remote=False,
+            trace_flags=otel_trace.TraceFlags(otel_trace.TraceFlags.SAMPLED),
+        ))
+        with otel_trace.use_span(parent), tracing.span("invoice.document"):
+            sampled = tracing.trace_context()
+        assert sampled[tracing.SAMPLED_KEY] == "1" and "traceparent" in sampled
+
+        # Document échantillonné : span produit même si ce processus tirerait « non »
+        tracing._sample_ratio = 0.0
+        assert tracing.traced_call(_completion_step, sampled) == 0x1234
+        assert [span.name for span in tracer.spans] == ["invoice.document", "invoice.complete"]
+
+        # Document non échantillonné : rien, même avec un ratio de 100 %
+        tracing._sample_ratio = 1.0
+        tracer.spans.clear()
+        assert tracing.traced_call(_completion_step, {tracing.SAMPLED_KEY: "0"}) == 0
+        assert tracer.spans == []
+
+        # Sans contexte : tirage local, comme avant
+        tracing.traced_call(_completion_step, None)
+        assert [span.name for span in tracer.spans] == ["invoice.complete"]
+    finally:
+        tracing.configure_tracing(tracing.EXPORTER_NONE)
+    print("✅ Propagation du contexte de trace validée")
+    return True
+
+
+def test_file_exporter():
+    """Export JSON lines via le SDK OpenTelemetry (si installé)"""
+    print("🧪 Test export fichier des traces...")
+    if not tracing.SDK_AVAILABLE:
+        assert not tracing.configure_tracing(tracing.EXPORTER_FILE, sample_ratio=1.0)
+        assert not tracing.tracing_enabled()
+        print("⚠️  opentelemetry-sdk absent : export fichier désactivé proprement")
+        return True
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "traces.jsonl")
+        assert tracing.configure_tracing(tracing.EXPORTER_FILE, sample_ratio=1.0, path=path)
+        try:
+            InvoiceProcessorWithFallback({}).fast.process_invoice(_make_pdf("Total TTC : 120,00\n"))
+        finally:
+            tracing.shutdown_tracing()
+        with open(path, encoding="utf-8") as handle:
+            names = {json.loads(line)["name"] for line in handle}
+        assert {"fitz", "regex"} <= names
+    print("✅ Export fichier des traces validé")
+    return True
+
+
+if __name__ == "__main__":
+    success = test_document_spans() and test_cross_process_context() and test_file_exporter()
+    sys.exit(0 if success else 1)
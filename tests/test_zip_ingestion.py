@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Tests de l'ingestion ZIP en flux (membres lus en mémoire, sans extraction disque)"""
+
+import asyncio
+import io
+import sys
+import zipfile
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import fitz
+
+from modules.ocr import zip_ingestion
+from modules.ocr.extraction_worker import extract_invoice, get_extraction_executor, shutdown_extraction_executor
+from modules.ocr.zip_ingestion import ArchiveTooLarge, extract_archive, iter_pdf_members, list_pdf_members
+
+
+def _make_pdf(total: str) -> bytes:
+    with fitz.open() as doc:
+        page = doc.new_page()
+        page.insert_text((72, 72), f"FACTURE N° FA2024-00123\nTotal TTC : {total}\n")
+        return doc.tobytes()
+
+
+def _make_archive(count: int) -> io.BytesIO:
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zf:
+        for i in range(count):
+            zf.writestr(f"2024-03/facture_{i:03d}.pdf", _make_pdf(f"{i + 1},00"))
+        zf.writestr("2024-03/releve.csv", "date;montant")
+        zf.writestr("__MACOSX/2024-03/._facture_000.pdf", b"\x00\x05\x16\x07")
+    archive.seek(0)
+    return archive
+
+
+def test_zip_members_streamed():
+    """Lecture membre par membre, limites et extraction par le pool"""
+    print("🧪 Test ingestion ZIP en flux...")
+
+    archive = _make_archive(12)
+    assert len(list_pdf_members(archive)) == 12
+    archive.seek(0)
+    name, content = next(iter_pdf_members(archive))
+    assert name == "2024-03/facture_000.pdf" and content.startswith(b"%PDF-")
+
+    archive.seek(0)
+    try:
+        list_pdf_members(archive, max_files=5)
+        assert False, "ArchiveTooLarge attendu"
+    except ArchiveTooLarge:
+        pass
+
+    # Membres en mémoire simultanément bornés par max_in_flight
+    in_memory = {"current": 0, "max": 0}
+    original_read = zip_ingestion.read_member
+
+    def counting_read(*args, **kwargs):
+        content = original_read(*args, **kwargs)
+        in_memory["current"] += 1
+        in_memory["max"] = max(in_memory["max"], in_memory["current"])
+        return content
+
+    async def run():
+        results = {}
+        archive.seek(0)
+        async for name, result in extract_archive(archive, extract_invoice,
+                                                  get_extraction_executor(), max_in_flight=3):
+            in_memory["current"] -= 1
+            results[name] = result
+        return results
+
+    zip_ingestion.read_member = counting_read
+    try:
+        results = asyncio.run(run())
+    finally:
+        zip_ingestion.read_member = original_read
+        shutdown_extraction_executor()
+
+    assert len(results) == 12
+    assert results["2024-03/facture_004.pdf"]["total_amount"] == 5.0
+    assert in_memory["max"] <= 3
+
+    # Membre trop volumineux une fois décompressé : erreur pour ce membre seulement
+    async def run_limited():
+        archive.seek(0)
+        return [item async for item in extract_archive(archive, len, None, max_member_bytes=100)]
+
+    assert all(isinstance(result, ArchiveTooLarge) for _, result in asyncio.run(run_limited()))
+
+    print("✅ Ingestion ZIP en flux validée")
+    return True
+
+
+if __name__ == "__main__":
+    success = test_zip_members_streamed()
+    sys.exit(0 if success else 1)